@@ -0,0 +1,397 @@
+"""Converter throughput benchmark.
+
+This benchmark measures how quickly converters convert the test case
+files, and compares converters head-to-head for each pair of input
+and output formats. The interoperability test harness and converters
+are configured exactly as for the interoperability tests (see
+:mod:`prov_interop.interop_tests.harness`), so the same configuration
+files, and environment variables, are used.
+
+For each converter, each pair of formats supported by the converter
+and for which there is a comparator, and each test case, the
+conversion is run ``w`` times as a warm-up, to populate file system
+caches and, for in-process converters, to load modules, and then
+``k`` times. Test cases in a converter's ``skip-tests`` are not
+run. Each measured run is summarised by:
+
+- ``median``: median time, in seconds.
+- ``mad``: median absolute deviation of the times, in seconds.
+- ``p95``: 95th percentile time, in seconds.
+- ``docs_per_sec``: documents converted per second, based on the
+  median time.
+- ``mb_per_sec``: megabytes (10^6 bytes) of input converted per
+  second, based on the median time.
+
+Results are written in JSON::
+
+    {
+      "python": "2.7.6",
+      "platform": "Linux-3.13.0-x86_64",
+      "warmups": 1,
+      "runs": 5,
+      "results": [
+        {"converter": "ProvPy", "index": 1, "ext_in": "json",
+         "ext_out": "provx", "bytes": 1024, "median": 0.31,
+         "mad": 0.01, "p95": 0.35, "docs_per_sec": 3.2,
+         "mb_per_sec": 0.0033},
+        {"converter": "ProvToolbox", "index": 1, "ext_in": "json",
+         "ext_out": "provx", "bytes": 1024, "error": "..."},
+        ...
+      ],
+      "skipped": [
+        {"converter": "ProvStore", "error": "..."}
+      ],
+      "head_to_head": [
+        {"ext_in": "json", "ext_out": "provx", "converter": "ProvPy",
+         "docs": 5, "bytes": 5120, "seconds": 1.5, "docs_per_sec": 3.3,
+         "mb_per_sec": 0.0034},
+        ...
+      ]
+    }
+
+where ``head_to_head`` aggregates, for each converter and pair of
+formats, the median times over the test cases that the converter
+converted without error. Converters whose configuration is missing,
+or cannot be configured, are not run, and are listed in ``skipped``,
+and a message is printed to standard error for each. A table of the
+head-to-head results is printed to standard output.
+
+Usage::
+
+    usage: converter_throughput.py [-h] [-f FILE] [-c CONVERTERS]
+                                   [-w WARMUPS] [-k RUNS] [-o OUTPUT]
+
+    Benchmark converter throughput.
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -f FILE, --file FILE  Harness configuration file (default
+                            PROV_HARNESS_CONFIGURATION or
+                            localconfig/harness.yaml)
+      -c CONVERTERS, --converters CONVERTERS
+                            Comma-separated converter names (default
+                            ProvPy,ProvStore,ProvToolbox,ProvTranslator)
+      -w WARMUPS, --warmups WARMUPS
+                            Number of warm-up runs (default 1)
+      -k RUNS, --runs RUNS  Number of measured runs (default 5)
+      -o OUTPUT, --output OUTPUT
+                            JSON output file (default none)
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from timeit import default_timer
+
+import requests
+
+from prov_interop import stats
+from prov_interop.component import ConfigError
+from prov_interop.converter import ConversionError
+from prov_interop.interop_tests import harness
+
+SKIP_TESTS = "skip-tests"
+"""str or unicode: converter configuration key for tests to skip, as
+used by
+:class:`prov_interop.interop_tests.test_converter.ConverterTestCase`"""
+
+MEGABYTE = 1000000
+"""int: number of bytes in a megabyte"""
+
+def time_conversions(converter, in_file, out_file, runs, warmups=0):
+  """Convert a file `warmups` times then `runs` times, timing the
+  latter. The output file is removed after each conversion.
+
+  :param converter: Converter
+  :type converter: :class:`prov_interop.converter.Converter`
+  :param in_file: Input file
+  :type in_file: str or unicode
+  :param out_file: Output file
+  :type out_file: str or unicode
+  :param runs: Number of measured runs
+  :type runs: int
+  :param warmups: Number of warm-up runs
+  :type warmups: int
+  :return: times, in seconds
+  :rtype: list of float
+  :raises ConversionError: if a conversion fails
+  """
+  times = []
+  for run in range(warmups + runs):
+    start = default_timer()
+    try:
+      converter.convert(in_file, out_file)
+      seconds = default_timer() - start
+    finally:
+      if os.path.isfile(out_file):
+        os.remove(out_file)
+    if run >= warmups:
+      times.append(seconds)
+  return times
+
+def summarise(times, size):
+  """Summarise conversion times.
+
+  :param times: Times, in seconds
+  :type times: list of float
+  :param size: Input file size, in bytes
+  :type size: int
+  :return: ``median``, ``mad``, ``p95``, ``docs_per_sec`` and
+    ``mb_per_sec``, as described above
+  :rtype: dict
+  :raises ValueError: if `times` is empty
+  """
+  median = stats.median(times)
+  summary = {"median": median,
+             "mad": stats.mad(times),
+             "p95": stats.percentile(times, 95),
+             "docs_per_sec": None,
+             "mb_per_sec": None}
+  if median > 0:
+    summary["docs_per_sec"] = 1 / median
+    summary["mb_per_sec"] = size / median / MEGABYTE
+  return summary
+
+def benchmark_converter(name, converter, test_cases, work_dir, runs,
+                        warmups=0):
+  """Benchmark a converter on test cases. Test cases whose formats
+  the converter does not support, or whose index is in the
+  converter's ``skip-tests``, are not run. If a conversion fails,
+  its executable cannot be run, or, for a REST converter, its
+  request fails, then the error is recorded in the test case's
+  result.
+
+  :param name: Converter name
+  :type name: str or unicode
+  :param converter: Converter
+  :type converter: :class:`prov_interop.converter.Converter`
+  :param test_cases: Test cases, as provided by
+    :meth:`prov_interop.harness.HarnessResources.test_cases_generator`
+  :type test_cases: iterable of tuple of (int, str or unicode, str
+    or unicode, str or unicode, str or unicode)
+  :param work_dir: Directory for output files
+  :type work_dir: str or unicode
+  :param runs: Number of measured runs
+  :type runs: int
+  :param warmups: Number of warm-up runs
+  :type warmups: int
+  :return: results, one per test case run, as described above
+  :rtype: list of dict
+  """
+  skip_tests = converter.configuration.get(SKIP_TESTS, [])
+  results = []
+  for (index, ext_in, file_ext_in, ext_out, _) in test_cases:
+    if index in skip_tests or \
+       ext_in not in converter.input_formats or \
+       ext_out not in converter.output_formats:
+      continue
+    size = os.path.getsize(file_ext_in)
+    result = {"converter": name,
+              "index": index,
+              "ext_in": ext_in,
+              "ext_out": ext_out,
+              "bytes": size}
+    out_file = os.path.join(work_dir, "out." + ext_out)
+    try:
+      times = time_conversions(converter, file_ext_in, out_file, runs,
+                               warmups)
+      result.update(summarise(times, size))
+    except (ConversionError, OSError,
+            requests.exceptions.RequestException) as e:
+      result["error"] = str(e)
+    results.append(result)
+  return results
+
+def head_to_head(results):
+  """Aggregate results for each pair of formats and converter. The
+  median times of the test cases converted without error are summed
+  to give the time to convert all those test cases.
+
+  :param results: Results from :func:`benchmark_converter`
+  :type results: list of dict
+  :return: ``ext_in``, ``ext_out``, ``converter``, ``docs``,
+    ``bytes``, ``seconds``, ``docs_per_sec`` and ``mb_per_sec``,
+    sorted by format pair then converter
+  :rtype: list of dict
+  """
+  totals = {}
+  for result in results:
+    if "error" in result:
+      continue
+    key = (result["ext_in"], result["ext_out"], result["converter"])
+    (docs, size, seconds) = totals.get(key, (0, 0, 0))
+    totals[key] = (docs + 1,
+                   size + result["bytes"],
+                   seconds + result["median"])
+  table = []
+  for key in sorted(totals):
+    (docs, size, seconds) = totals[key]
+    row = {"ext_in": key[0],
+           "ext_out": key[1],
+           "converter": key[2],
+           "docs": docs,
+           "bytes": size,
+           "seconds": seconds,
+           "docs_per_sec": None,
+           "mb_per_sec": None}
+    if seconds > 0:
+      row["docs_per_sec"] = docs / seconds
+      row["mb_per_sec"] = size / seconds / MEGABYTE
+    table.append(row)
+  return table
+
+def format_table(table):
+  """Format head-to-head results as a text table, with the
+  converters for each pair of formats listed from fastest to
+  slowest.
+
+  :param table: Results from :func:`head_to_head`
+  :type table: list of dict
+  :return: table
+  :rtype: str or unicode
+  """
+  def value(number, format):
+    return "-" if number is None else format % number
+  lines = ["%-14s %-16s %6s %10s %10s %10s" %
+           ("formats", "converter", "docs", "seconds", "docs/sec",
+            "MB/sec")]
+  rows = sorted(table,
+                key=lambda row: (row["ext_in"], row["ext_out"],
+                                 -(row["docs_per_sec"] or 0)))
+  for row in rows:
+    lines.append("%-14s %-16s %6d %10.4f %10s %10s" %
+                 (row["ext_in"] + "->" + row["ext_out"],
+                  row["converter"],
+                  row["docs"],
+                  row["seconds"],
+                  value(row["docs_per_sec"], "%.2f"),
+                  value(row["mb_per_sec"], "%.4f")))
+  return "\n".join(lines)
+
+def run_benchmarks(names, runs=5, warmups=1, file_name=None):
+  """Run benchmarks for converters. The interoperability test
+  harness is initialised, using
+  :func:`prov_interop.interop_tests.harness.initialise_harness_from_file`,
+  and each converter is created and configured using
+  :func:`prov_interop.interop_tests.harness.get_converter`. Output
+  files are created in, and removed from, a temporary directory.
+  Converters whose configuration is missing, or cannot be
+  configured, are skipped, and recorded in ``skipped``.
+
+  :param names: Converter names, as in
+    :data:`prov_interop.interop_tests.harness.CONVERTERS`
+  :type names: list of str or unicode
+  :param runs: Number of measured runs
+  :type runs: int
+  :param warmups: Number of warm-up runs
+  :type warmups: int
+  :param file_name: Harness configuration file (optional)
+  :type file_name: str or unicode
+  :return: results, as described above
+  :rtype: dict
+  :raises ConfigError: if there are any problems configuring the
+    harness
+  :raises IOError: if the harness configuration file is not found
+  """
+  harness.initialise_harness_from_file(file_name)
+  test_cases = list(harness.harness_resources.test_cases_generator())
+  work_dir = tempfile.mkdtemp()
+  results = []
+  skipped = []
+  try:
+    for name in names:
+      try:
+        converter = harness.get_converter(name)
+      except (ConfigError, IOError) as e:
+        skipped.append({"converter": name, "error": str(e)})
+        continue
+      results.extend(benchmark_converter(name, converter, test_cases,
+                                         work_dir, runs, warmups))
+  finally:
+    shutil.rmtree(work_dir)
+  return {"python": platform.python_version(),
+          "platform": platform.platform(),
+          "warmups": warmups,
+          "runs": runs,
+          "results": results,
+          "skipped": skipped,
+          "head_to_head": head_to_head(results)}
+
+def positive_int(value):
+  """Parse a positive integer command-line argument.
+
+  :param value: Argument
+  :type value: str or unicode
+  :return: integer
+  :rtype: int
+  :raises argparse.ArgumentTypeError: if `value` is not a positive
+    integer
+  """
+  try:
+    number = int(value)
+  except ValueError:
+    number = 0
+  if number < 1:
+    raise argparse.ArgumentTypeError(value + " is not a positive integer")
+  return number
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Benchmark converter throughput.")
+  parser.add_argument("-f", "--file",
+                      help="Harness configuration file (default " +
+                      harness.CONFIGURATION_FILE_ENV + " or " +
+                      harness.DEFAULT_CONFIGURATION_FILE + ")")
+  parser.add_argument("-c", "--converters",
+                      help="Comma-separated converter names (default " +
+                      ",".join(sorted(harness.CONVERTERS)) + ")",
+                      default=",".join(sorted(harness.CONVERTERS)))
+  parser.add_argument("-w", "--warmups",
+                      help="Number of warm-up runs (default 1)",
+                      type=int,
+                      default=1)
+  parser.add_argument("-k", "--runs",
+                      help="Number of measured runs (default 5)",
+                      type=positive_int,
+                      default=5)
+  parser.add_argument("-o", "--output",
+                      help="JSON output file (default none)")
+  args = parser.parse_args()
+  results = run_benchmarks(args.converters.split(","), args.runs,
+                           args.warmups, args.file)
+  for skip in results["skipped"]:
+    print("Skipping " + skip["converter"] + ": " + skip["error"],
+          file=sys.stderr)
+  print(format_table(results["head_to_head"]))
+  if args.output is not None:
+    with open(args.output, "w") as f:
+      f.write(json.dumps(results, indent=2, sort_keys=True) + "\n")
+  sys.exit(0)
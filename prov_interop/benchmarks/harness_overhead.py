@@ -0,0 +1,362 @@
+"""Benchmarks of test harness overhead, independent of converter and
+comparator speed.
+
+The benchmarks use the dummy ProvToolbox ``provconvert`` and ProvPy
+``prov-compare`` scripts used by the unit tests and synthetic test
+case corpora of increasing size. For each corpus size they time:
+
+- ``config-loading``: loading the harness configuration from YAML and
+  configuring :class:`prov_interop.harness.HarnessResources`, a
+  converter and a comparator.
+- ``enumeration``: enumerating all the test cases via
+  :meth:`prov_interop.harness.HarnessResources.test_cases_generator`.
+- ``command-lines``: building the converter and comparator
+  command-line invocations for every test case.
+- ``skips``: running a :mod:`unittest` test, which raises
+  :class:`nose.plugins.skip.SkipTest`, for every test case.
+- ``temp-files``: creating, hashing and removing an output file for
+  every test case.
+- ``dummy-runs``: converting and comparing, using the dummy scripts,
+  up to a maximum number of test cases.
+
+Results are written as JSON, for example::
+
+    {
+      "python": "2.7.6",
+      "platform": "Linux-3.13.0-x86_64",
+      "repeat": 3,
+      "results": [
+        {"benchmark": "enumeration", "size": 1000, "items": 4000,
+         "seconds": 0.0312, "per_item": 0.0000078},
+        ...
+      ]
+    }
+
+where ``size`` is the number of test cases directories, ``items`` is
+the number of operations timed, and ``seconds`` is the best time over
+``repeat`` runs.
+
+Usage::
+
+    usage: harness_overhead.py [-h] [-s SIZES] [-r REPEAT]
+                               [-d MAX_DUMMY_RUNS] [-o OUTPUT]
+
+    Benchmark test harness overhead.
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -s SIZES, --sizes SIZES
+                            Comma-separated corpus sizes (default
+                            10,100,1000,10000,100000)
+      -r REPEAT, --repeat REPEAT
+                            Number of runs of each benchmark (default 3)
+      -d MAX_DUMMY_RUNS, --max-dummy-runs MAX_DUMMY_RUNS
+                            Maximum number of test cases for which dummy
+                            scripts are run (default 100)
+      -o OUTPUT, --output OUTPUT
+                            Output file (default standard output)
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import unittest
+from timeit import default_timer
+
+import yaml
+
+from nose.plugins.skip import SkipTest
+
+from prov_interop import standards
+from prov_interop.comparator import Comparator
+from prov_interop.converter import Converter
+from prov_interop.files import hash_file
+from prov_interop.files import load_yaml
+from prov_interop.harness import HarnessResources
+from prov_interop.provpy.comparator import ProvPyComparator
+from prov_interop.provtoolbox.converter import ProvToolboxConverter
+
+SIZES = [10, 100, 1000, 10000, 100000]
+"""list of int: default corpus sizes"""
+
+FORMATS = [standards.JSON, standards.PROVX]
+"""list of str or unicode: formats of test case files, those
+supported by the dummy ``prov-compare``"""
+
+TESTS_DIR = os.path.join(
+  os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests")
+"""str or unicode: directory with dummy scripts"""
+
+CONVERTER = "ProvToolbox"
+"""str or unicode: configuration key for converter configuration"""
+
+def create_corpus(test_cases_dir, size, formats=FORMATS):
+  """Create test case directories and files. `size` directories,
+  named ``test-caseN``, are created, each with a file
+  ``testcaseN.FORMAT`` for each format in `formats`. All the files
+  have the same content.
+
+  :param test_cases_dir: Test cases directory
+  :type test_cases_dir: str or unicode
+  :param size: Number of test case directories
+  :type size: int
+  :param formats: Formats, each of which must be in
+    :mod:`prov_interop.standards`
+  :type formats: list of str or unicode
+  """
+  for index in range(size):
+    name = "case" + str(index)
+    test_case_dir = os.path.join(test_cases_dir,
+                                 HarnessResources.TEST_CASE_PREFIX + name)
+    os.mkdir(test_case_dir)
+    for format in formats:
+      with open(os.path.join(test_case_dir, "test" + name + "." + format),
+                "w") as f:
+        f.write("document")
+
+def create_configuration(config_file, test_cases_dir):
+  """Write a YAML configuration file for the harness, with a
+  comparator and converter that use the dummy scripts.
+
+  :param config_file: Configuration file name
+  :type config_file: str or unicode
+  :param test_cases_dir: Test cases directory
+  :type test_cases_dir: str or unicode
+  """
+  config = {
+    HarnessResources.TEST_CASES_DIR: test_cases_dir,
+    HarnessResources.COMPARATORS: {
+      "ProvPyComparator": {
+        HarnessResources.CLASS:
+          "prov_interop.provpy.comparator.ProvPyComparator",
+        ProvPyComparator.EXECUTABLE: sys.executable + " " +
+          os.path.join(TESTS_DIR, "provpy", "prov_compare_dummy.py"),
+        ProvPyComparator.ARGUMENTS: "-f FORMAT1 -F FORMAT2 FILE1 FILE2",
+        Comparator.FORMATS: FORMATS
+      }
+    },
+    CONVERTER: {
+      ProvToolboxConverter.EXECUTABLE: sys.executable + " " +
+        os.path.join(TESTS_DIR, "provtoolbox", "provconvert_dummy.py"),
+      ProvToolboxConverter.ARGUMENTS: "-infile INPUT -outfile OUTPUT",
+      Converter.INPUT_FORMATS: standards.FORMATS,
+      Converter.OUTPUT_FORMATS: standards.FORMATS
+    }
+  }
+  with open(config_file, "w") as f:
+    yaml.safe_dump(config, f, default_flow_style=False)
+
+def configure(config_file):
+  """Load configuration and create harness resources and converter.
+
+  :param config_file: Configuration file name
+  :type config_file: str or unicode
+  :return: harness resources and converter
+  :rtype: tuple of (:class:`prov_interop.harness.HarnessResources`,
+    :class:`prov_interop.provtoolbox.converter.ProvToolboxConverter`)
+  """
+  config = load_yaml(None, None, config_file)
+  harness_resources = HarnessResources()
+  harness_resources.configure(config)
+  converter = ProvToolboxConverter()
+  converter.configure(config[CONVERTER])
+  return (harness_resources, converter)
+
+def best_time(function, repeat):
+  """Run a function `repeat` times and get the best time.
+
+  :param function: Function, with no arguments, which returns the
+    number of operations done
+  :type function: function
+  :param repeat: Number of runs
+  :type repeat: int
+  :return: number of operations and best time, in seconds
+  :rtype: tuple of (int, float)
+  """
+  best = None
+  items = 0
+  for _ in range(repeat):
+    start = default_timer()
+    items = function()
+    seconds = default_timer() - start
+    if best is None or seconds < best:
+      best = seconds
+  return (items, best)
+
+
+class SkippedTestCase(unittest.TestCase):
+  """Test case which is always skipped."""
+
+  def test_skip(self):
+    """Raise :class:`nose.plugins.skip.SkipTest`.
+
+    :raises nose.plugins.skip.SkipTest: always
+    """
+    raise SkipTest("Format not supported")
+
+
+def benchmark_size(work_dir, size, repeat, max_dummy_runs):
+  """Run benchmarks for a corpus size.
+
+  :param work_dir: Directory for corpus, configuration and output
+    files
+  :type work_dir: str or unicode
+  :param size: Number of test case directories
+  :type size: int
+  :param repeat: Number of runs of each benchmark
+  :type repeat: int
+  :param max_dummy_runs: Maximum number of test cases for which dummy
+    scripts are run
+  :type max_dummy_runs: int
+  :return: results
+  :rtype: list of dict
+  """
+  test_cases_dir = os.path.join(work_dir, "test-cases-" + str(size))
+  os.mkdir(test_cases_dir)
+  create_corpus(test_cases_dir, size)
+  config_file = os.path.join(work_dir, "harness.yaml")
+  create_configuration(config_file, test_cases_dir)
+  (harness_resources, converter) = configure(config_file)
+  test_cases = list(harness_resources.test_cases_generator())
+  out_prefix = os.path.join(work_dir, "out." + str(os.getpid()) + ".")
+
+  def config_loading():
+    configure(config_file)
+    return 1
+
+  def enumeration():
+    return len(list(harness_resources.test_cases_generator()))
+
+  def command_lines():
+    for (_, _, file_ext_in, ext_out, file_ext_out) in test_cases:
+      out_file = out_prefix + ext_out
+      converter.command_line(file_ext_in, out_file)
+      harness_resources.format_comparators[ext_out].command_line(
+        file_ext_out, out_file)
+    return len(test_cases)
+
+  def skips():
+    suite = unittest.TestSuite(
+      [SkippedTestCase("test_skip") for _ in test_cases])
+    with open(os.devnull, "w") as devnull:
+      unittest.TextTestRunner(stream=devnull, verbosity=0).run(suite)
+    return len(test_cases)
+
+  def temp_files():
+    for (_, _, file_ext_in, ext_out, _) in test_cases:
+      out_file = out_prefix + ext_out
+      shutil.copyfile(file_ext_in, out_file)
+      hash_file(out_file)
+      os.remove(out_file)
+    return len(test_cases)
+
+  def dummy_runs():
+    for (_, _, file_ext_in, ext_out, file_ext_out) in \
+          test_cases[:max_dummy_runs]:
+      out_file = out_prefix + ext_out
+      converter.convert(file_ext_in, out_file)
+      harness_resources.format_comparators[ext_out].compare(
+        file_ext_out, out_file)
+      os.remove(out_file)
+    return min(len(test_cases), max_dummy_runs)
+
+  benchmarks = [("config-loading", config_loading),
+                ("enumeration", enumeration),
+                ("command-lines", command_lines),
+                ("skips", skips),
+                ("temp-files", temp_files),
+                ("dummy-runs", dummy_runs)]
+  results = []
+  try:
+    for (name, function) in benchmarks:
+      (items, seconds) = best_time(function, repeat)
+      results.append({"benchmark": name,
+                      "size": size,
+                      "items": items,
+                      "seconds": seconds,
+                      "per_item": seconds / items if items else None})
+  finally:
+    shutil.rmtree(test_cases_dir)
+  return results
+
+def run_benchmarks(sizes=SIZES, repeat=3, max_dummy_runs=100):
+  """Run benchmarks for each corpus size. Corpora are created in,
+  and removed from, a temporary directory.
+
+  :param sizes: Numbers of test case directories
+  :type sizes: list of int
+  :param repeat: Number of runs of each benchmark
+  :type repeat: int
+  :param max_dummy_runs: Maximum number of test cases for which dummy
+    scripts are run
+  :type max_dummy_runs: int
+  :return: results, as described above
+  :rtype: dict
+  """
+  work_dir = tempfile.mkdtemp()
+  results = []
+  try:
+    for size in sizes:
+      results.extend(benchmark_size(work_dir, size, repeat, max_dummy_runs))
+  finally:
+    shutil.rmtree(work_dir)
+  return {"python": platform.python_version(),
+          "platform": platform.platform(),
+          "repeat": repeat,
+          "results": results}
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Benchmark test harness overhead.")
+  parser.add_argument("-s", "--sizes",
+                      help="Comma-separated corpus sizes (default " +
+                      ",".join([str(size) for size in SIZES]) + ")",
+                      default=",".join([str(size) for size in SIZES]))
+  parser.add_argument("-r", "--repeat",
+                      help="Number of runs of each benchmark (default 3)",
+                      type=int,
+                      default=3)
+  parser.add_argument("-d", "--max-dummy-runs",
+                      help="Maximum number of test cases for which dummy scripts are run (default 100)",
+                      type=int,
+                      default=100)
+  parser.add_argument("-o", "--output",
+                      help="Output file (default standard output)")
+  args = parser.parse_args()
+  sizes = [int(size) for size in args.sizes.split(",")]
+  results = run_benchmarks(sizes, args.repeat, args.max_dummy_runs)
+  output = json.dumps(results, indent=2, sort_keys=True)
+  if args.output is None:
+    print(output)
+  else:
+    with open(args.output, "w") as f:
+      f.write(output + "\n")
+  sys.exit(0)
@@ -0,0 +1,463 @@
+"""Synthetic PROV corpus generator for size-scaling experiments.
+
+This script writes synthetic PROV documents of a given number of
+records, in each of the formats in :mod:`prov_interop.standards`, as
+test cases for the interoperability test harness. For each size, a
+directory ``test-synthetic-<size>`` is created, holding files
+``testsynthetic-<size>.<format>``, which is the layout expected by
+:meth:`prov_interop.harness.HarnessResources.test_cases_generator`.
+
+Each record is an element (``entity``, ``activity`` or ``agent``) or
+a relation between elements (``wasGeneratedBy``, ``used``,
+``wasAssociatedWith``, ``wasAttributedTo``, ``wasDerivedFrom``,
+``wasInformedBy`` or ``actedOnBehalfOf``). The mix of records is
+given by relative weights, for example
+``entity=4,activity=2,agent=1,used=2``. Records follow a repeating
+cycle, in which each kind appears as often as its weight, with
+elements before relations. Each record is determined by its index
+alone, so documents are written in a streaming way, without holding
+records in memory, and documents larger than memory can be
+generated. Every relation refers to elements in the same or an
+earlier cycle, so all elements referred to are declared. PROV-JSON
+groups records by kind, so it is written in one pass over the
+records for each kind.
+
+Usage::
+
+    usage: synthetic_corpus.py [-h] -d DIRECTORY [-s SIZES] [-m MIX]
+                               [-f FORMATS]
+
+    Generate synthetic PROV test cases.
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -d DIRECTORY, --directory DIRECTORY
+                            Test cases directory
+      -s SIZES, --sizes SIZES
+                            Comma-separated numbers of records (default
+                            100,1000,10000,100000)
+      -m MIX, --mix MIX     Comma-separated record kind weights (default
+                            entity=4,activity=2,agent=1,wasGeneratedBy=2,
+                            used=2,wasAssociatedWith=1,wasAttributedTo=1,
+                            wasDerivedFrom=1,wasInformedBy=1,
+                            actedOnBehalfOf=1)
+      -f FORMATS, --formats FORMATS
+                            Comma-separated formats (default
+                            provn,ttl,trig,provx,json)
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import io
+import json
+import os
+import sys
+
+from prov_interop import standards
+from prov_interop.harness import HarnessResources
+
+NAMESPACE = "http://example.org/synthetic#"
+"""str or unicode: namespace of synthetic record identifiers"""
+
+PREFIX = "ex"
+"""str or unicode: prefix for :data:`NAMESPACE`"""
+
+PROV_NAMESPACE = "http://www.w3.org/ns/prov#"
+"""str or unicode: PROV namespace"""
+
+ENTITY = "entity"
+"""str or unicode: entity record kind"""
+ACTIVITY = "activity"
+"""str or unicode: activity record kind"""
+AGENT = "agent"
+"""str or unicode: agent record kind"""
+
+ELEMENTS = {ENTITY: ("e", "Entity"),
+            ACTIVITY: ("a", "Activity"),
+            AGENT: ("g", "Agent")}
+"""dict: element kinds mapped to tuples of identifier prefix and
+PROV-O class"""
+
+RELATIONS = {
+  "wasGeneratedBy": (ENTITY, ACTIVITY, "entity", "activity", ", -"),
+  "used": (ACTIVITY, ENTITY, "activity", "entity", ", -"),
+  "wasAssociatedWith": (ACTIVITY, AGENT, "activity", "agent", ", -"),
+  "wasAttributedTo": (ENTITY, AGENT, "entity", "agent", ""),
+  "wasDerivedFrom": (ENTITY, ENTITY, "generatedEntity", "usedEntity", ""),
+  "wasInformedBy": (ACTIVITY, ACTIVITY, "informed", "informant", ""),
+  "actedOnBehalfOf": (AGENT, AGENT, "delegate", "responsible", ", -")
+}
+"""dict: relation kinds mapped to tuples of subject element kind,
+object element kind, PROV-JSON and PROV-XML subject and object
+names, and trailing PROV-N arguments"""
+
+KINDS = [ENTITY, ACTIVITY, AGENT, "wasGeneratedBy", "used",
+         "wasAssociatedWith", "wasAttributedTo", "wasDerivedFrom",
+         "wasInformedBy", "actedOnBehalfOf"]
+"""list of str or unicode: record kinds, elements first"""
+
+MIX = [(ENTITY, 4), (ACTIVITY, 2), (AGENT, 1), ("wasGeneratedBy", 2),
+       ("used", 2), ("wasAssociatedWith", 1), ("wasAttributedTo", 1),
+       ("wasDerivedFrom", 1), ("wasInformedBy", 1),
+       ("actedOnBehalfOf", 1)]
+"""list of tuple of (str or unicode, int): default record kind
+weights"""
+
+SIZES = [100, 1000, 10000, 100000]
+"""list of int: default numbers of records"""
+
+MULTIPLIER = 2654435761
+"""int: multiplier used to pick the element a relation refers to"""
+
+def parse_mix(value):
+  """Parse record kind weights of form ``entity=4,used=2``.
+
+  :param value: Weights
+  :type value: str or unicode
+  :return: record kinds and weights
+  :rtype: list of tuple of (str or unicode, int)
+  :raises ValueError: if `value` is not of the above form
+  """
+  mix = []
+  for item in value.split(","):
+    (kind, _, weight) = item.partition("=")
+    mix.append((kind.strip(), int(weight)))
+  return mix
+
+
+class SyntheticDocument(object):
+  """Synthetic PROV document, whose records are determined by their
+  index."""
+
+  def __init__(self, size, mix=MIX):
+    """Create document.
+
+    :param size: Number of records
+    :type size: int
+    :param mix: Record kinds and weights
+    :type mix: list of tuple of (str or unicode, int)
+    :raises ValueError: if a record kind is not recognised, a weight
+      is negative, there are no records with non-zero weight, or
+      there is a relation whose elements have zero weight
+    """
+    weights = dict(mix)
+    for (kind, weight) in mix:
+      if kind not in KINDS:
+        raise ValueError("Unrecognised record kind: " + kind)
+      if weight < 0:
+        raise ValueError("Negative weight for " + kind)
+    self._size = size
+    self._cycle = []
+    for kind in KINDS:
+      self._cycle.extend([kind] * weights.get(kind, 0))
+    if not self._cycle:
+      raise ValueError("No records in mix")
+    for kind in set(self._cycle) & set(RELATIONS):
+      for element in RELATIONS[kind][:2]:
+        if weights.get(element, 0) == 0:
+          raise ValueError(kind + " requires " + element + " records")
+    self._per_cycle = dict([(kind, self._cycle.count(kind))
+                            for kind in KINDS])
+    self._rank = []
+    seen = {}
+    for kind in self._cycle:
+      self._rank.append(seen.get(kind, 0))
+      seen[kind] = seen.get(kind, 0) + 1
+
+  @property
+  def size(self):
+    """Get number of records.
+
+    :return: number of records
+    :rtype: int
+    """
+    return self._size
+
+  def count(self, kind):
+    """Get the number of records of a kind.
+
+    :param kind: Record kind
+    :type kind: str or unicode
+    :return: number of records
+    :rtype: int
+    """
+    (cycles, remainder) = divmod(self._size, len(self._cycle))
+    return cycles * self._per_cycle[kind] + \
+        self._cycle[:remainder].count(kind)
+
+  def element_id(self, kind, number):
+    """Get the identifier of an element.
+
+    :param kind: Element kind
+    :type kind: str or unicode
+    :param number: Element number, counting elements of that kind
+    :type number: int
+    :return: qualified identifier e.g. ``ex:e5``
+    :rtype: str or unicode
+    """
+    return PREFIX + ":" + ELEMENTS[kind][0] + str(number)
+
+  def record(self, index):
+    """Get a record. For an element, the record's identifier is
+    returned. For a relation, the identifiers of its subject and
+    object are returned. The subject is an element in the same cycle
+    and the object is an element in the same, or an earlier, cycle,
+    other than the subject where possible.
+
+    :param index: Record index, from 0
+    :type index: int
+    :return: record kind, and identifier or subject and object
+    :rtype: tuple of (str or unicode, str or unicode) or tuple of
+      (str or unicode, str or unicode, str or unicode)
+    """
+    (cycle, position) = divmod(index, len(self._cycle))
+    kind = self._cycle[position]
+    if kind in ELEMENTS:
+      number = cycle * self._per_cycle[kind] + self._rank[position]
+      return (kind, self.element_id(kind, number))
+    (subject_kind, object_kind) = RELATIONS[kind][:2]
+    subject_count = self._per_cycle[subject_kind]
+    subject = cycle * subject_count + index % subject_count
+    object_count = self._per_cycle[object_kind]
+    candidates = (cycle + 1) * object_count
+    related = (index * MULTIPLIER) % candidates
+    if subject_kind == object_kind and related == subject:
+      related = (related + 1) % candidates
+    return (kind,
+            self.element_id(subject_kind, subject),
+            self.element_id(object_kind, related))
+
+  def records(self, kind=None):
+    """Get the records, in index order.
+
+    :param kind: Only get records of this kind (optional)
+    :type kind: str or unicode
+    :return: records, as returned by :meth:`record`
+    :rtype: generator
+    """
+    if kind is None:
+      positions = list(range(len(self._cycle)))
+    else:
+      positions = [position for (position, cycle_kind)
+                   in enumerate(self._cycle) if cycle_kind == kind]
+    if not positions:
+      return
+    start = 0
+    while start < self._size:
+      for position in positions:
+        index = start + position
+        if index >= self._size:
+          return
+        yield self.record(index)
+      start += len(self._cycle)
+
+  def write_provn(self, f):
+    """Write document as PROV-N.
+
+    :param f: File
+    :type f: file opened for writing text
+    """
+    f.write("document\n")
+    f.write("  prefix " + PREFIX + " <" + NAMESPACE + ">\n")
+    for record in self.records():
+      if len(record) == 2:
+        f.write("  " + record[0] + "(" + record[1] + ")\n")
+      else:
+        f.write("  " + record[0] + "(" + record[1] + ", " + record[2] +
+                RELATIONS[record[0]][4] + ")\n")
+    f.write("endDocument\n")
+
+  def write_json(self, f):
+    """Write document as PROV-JSON. Relations are given blank node
+    identifiers ``_:r<N>`` numbered in order of their kind.
+
+    :param f: File
+    :type f: file opened for writing text
+    """
+    f.write("{\n  \"prefix\": " + json.dumps({PREFIX: NAMESPACE}))
+    for kind in KINDS:
+      if self.count(kind) == 0:
+        continue
+      f.write(",\n  \"" + kind + "\": {")
+      separator = "\n"
+      for (number, record) in enumerate(self.records(kind)):
+        f.write(separator)
+        separator = ",\n"
+        if len(record) == 2:
+          f.write("    \"" + record[1] + "\": {}")
+        else:
+          (_, _, subject_name, object_name, _) = RELATIONS[kind]
+          f.write("    \"_:r" + str(number) + "\": " + json.dumps(
+            {"prov:" + subject_name: record[1],
+             "prov:" + object_name: record[2]}, sort_keys=True))
+      f.write("\n  }")
+    f.write("\n}\n")
+
+  def write_provx(self, f):
+    """Write document as PROV-XML.
+
+    :param f: File
+    :type f: file opened for writing text
+    """
+    f.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+    f.write("<prov:document xmlns:prov=\"" + PROV_NAMESPACE + "\" " +
+            "xmlns:" + PREFIX + "=\"" + NAMESPACE + "\">\n")
+    for record in self.records():
+      kind = record[0]
+      if len(record) == 2:
+        f.write("  <prov:" + kind + " prov:id=\"" + record[1] + "\"/>\n")
+      else:
+        (_, _, subject_name, object_name, _) = RELATIONS[kind]
+        f.write("  <prov:" + kind + ">" +
+                "<prov:" + subject_name + " prov:ref=\"" + record[1] +
+                "\"/>" +
+                "<prov:" + object_name + " prov:ref=\"" + record[2] +
+                "\"/>" +
+                "</prov:" + kind + ">\n")
+    f.write("</prov:document>\n")
+
+  def write_triples(self, f, indent=""):
+    """Write document as PROV-O triples, in Turtle syntax.
+
+    :param f: File
+    :type f: file opened for writing text
+    :param indent: Indent for each triple
+    :type indent: str or unicode
+    """
+    for record in self.records():
+      if len(record) == 2:
+        f.write(indent + record[1] + " a prov:" +
+                ELEMENTS[record[0]][1] + " .\n")
+      else:
+        f.write(indent + record[1] + " prov:" + record[0] + " " +
+                record[2] + " .\n")
+
+  def write_prefixes(self, f):
+    """Write Turtle and TriG prefixes.
+
+    :param f: File
+    :type f: file opened for writing text
+    """
+    f.write("@prefix prov: <" + PROV_NAMESPACE + "> .\n")
+    f.write("@prefix " + PREFIX + ": <" + NAMESPACE + "> .\n\n")
+
+  def write_ttl(self, f):
+    """Write document as PROV-O (Turtle).
+
+    :param f: File
+    :type f: file opened for writing text
+    """
+    self.write_prefixes(f)
+    self.write_triples(f)
+
+  def write_trig(self, f):
+    """Write document as PROV-O (TriG), with all triples in the
+    default graph.
+
+    :param f: File
+    :type f: file opened for writing text
+    """
+    self.write_prefixes(f)
+    f.write("{\n")
+    self.write_triples(f, "  ")
+    f.write("}\n")
+
+  def write(self, file_name, format):
+    """Write document in a format.
+
+    :param file_name: File name
+    :type file_name: str or unicode
+    :param format: Format, one of those in :mod:`prov_interop.standards`
+    :type format: str or unicode
+    :raises ValueError: if the format is not recognised
+    """
+    if format not in standards.FORMATS:
+      raise ValueError("Unrecognised format: " + format)
+    writer = getattr(self, "write_" + format)
+    with io.open(file_name, "w", encoding="utf-8") as f:
+      writer(f)
+
+
+def create_test_case(test_cases_dir, size, mix=MIX,
+                     formats=standards.FORMATS):
+  """Create a synthetic test case directory,
+  ``test-synthetic-<size>``, holding a file
+  ``testsynthetic-<size>.<format>`` for each format. An existing
+  directory is reused and its files overwritten.
+
+  :param test_cases_dir: Test cases directory
+  :type test_cases_dir: str or unicode
+  :param size: Number of records
+  :type size: int
+  :param mix: Record kinds and weights
+  :type mix: list of tuple of (str or unicode, int)
+  :param formats: Formats, each of which must be in
+    :mod:`prov_interop.standards`
+  :type formats: list of str or unicode
+  :return: test case directory
+  :rtype: str or unicode
+  :raises ValueError: if `mix` or a format is invalid
+  """
+  document = SyntheticDocument(size, mix)
+  name = "synthetic-" + str(size)
+  test_case_dir = os.path.join(test_cases_dir,
+                               HarnessResources.TEST_CASE_PREFIX + name)
+  if not os.path.isdir(test_case_dir):
+    os.makedirs(test_case_dir)
+  for format in formats:
+    document.write(os.path.join(test_case_dir,
+                                "test" + name + "." + format),
+                   format)
+  return test_case_dir
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Generate synthetic PROV test cases.")
+  parser.add_argument("-d", "--directory",
+                      help="Test cases directory",
+                      required=True)
+  parser.add_argument("-s", "--sizes",
+                      help="Comma-separated numbers of records (default " +
+                      ",".join([str(size) for size in SIZES]) + ")",
+                      default=",".join([str(size) for size in SIZES]))
+  default_mix = ",".join([kind + "=" + str(weight) for (kind, weight) in MIX])
+  parser.add_argument("-m", "--mix",
+                      help="Comma-separated record kind weights (default " +
+                      default_mix + ")",
+                      default=default_mix)
+  parser.add_argument("-f", "--formats",
+                      help="Comma-separated formats (default " +
+                      ",".join(standards.FORMATS) + ")",
+                      default=",".join(standards.FORMATS))
+  args = parser.parse_args()
+  try:
+    mix = parse_mix(args.mix)
+    for size in [int(size) for size in args.sizes.split(",")]:
+      print(create_test_case(args.directory, size, mix,
+                             args.formats.split(",")))
+  except ValueError as e:
+    parser.error(str(e))
+  sys.exit(0)
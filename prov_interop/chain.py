@@ -0,0 +1,351 @@
+"""Round-trip conversion chains, with conversions shared across chains
+with common prefixes.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.component import ConfigError
+from prov_interop.converter import ConversionError
+
+CONVERTER = "converter"
+"""str or unicode: chain step configuration key for converter name"""
+
+FORMAT = "format"
+"""str or unicode: chain step configuration key for output format"""
+
+PASS = "pass"
+"""str or unicode: status of a step whose output is equivalent to the
+expected test case file"""
+
+FAIL = "fail"
+"""str or unicode: status of a step whose output is not equivalent to
+the expected test case file"""
+
+NOT_COMPARED = "not-compared"
+"""str or unicode: status of a step whose output was not compared, as
+there is no expected test case file or comparator for its format"""
+
+ERROR = "error"
+"""str or unicode: status of a step whose conversion, or comparison,
+failed"""
+
+UNSUPPORTED = "unsupported"
+"""str or unicode: status of a step whose converter does not support
+its input or output format"""
+
+SKIPPED = "skipped"
+"""str or unicode: status of a step whose converter is configured to
+skip the test case"""
+
+class ChainNode(object):
+  """Node in a :class:`ChainTree`. Each node represents a conversion
+  step, the conversion of the output of its parent node into a format
+  using a converter. The root node represents the input test case
+  file.
+  """
+
+  def __init__(self, step=None, parent=None):
+    """Create node.
+
+    :param step: Tuple of converter name and output format
+    :type step: tuple of (str or unicode, str or unicode)
+    :param parent: Parent node
+    :type parent: :class:`ChainNode`
+    """
+    self._step = step
+    self._parent = parent
+    self._children = []
+    self._chains = []
+
+  @property
+  def step(self):
+    """Get step.
+
+    :return: converter name and output format, or ``None`` for the
+      root node
+    :rtype: tuple of (str or unicode, str or unicode)
+    """
+    return self._step
+
+  @property
+  def children(self):
+    """Get child nodes, in the order they were added.
+
+    :return: nodes
+    :rtype: list of :class:`ChainNode`
+    """
+    return self._children
+
+  @property
+  def chains(self):
+    """Get names of chains that end at this node.
+
+    :return: chain names
+    :rtype: list of str or unicode
+    """
+    return self._chains
+
+  @property
+  def path(self):
+    """Get steps from the root node to this node.
+
+    :return: steps
+    :rtype: list of tuple of (str or unicode, str or unicode)
+    """
+    if self._parent is None:
+      return []
+    return self._parent.path + [self._step]
+
+  def child(self, step):
+    """Get child node for a step, creating it if it does not exist.
+
+    :param step: Tuple of converter name and output format
+    :type step: tuple of (str or unicode, str or unicode)
+    :return: node
+    :rtype: :class:`ChainNode`
+    """
+    for node in self._children:
+      if node.step == step:
+        return node
+    node = ChainNode(step, self)
+    self._children.append(node)
+    return node
+
+
+class ChainTree(object):
+  """Prefix tree of conversion chains. A chain is a sequence of steps,
+  each of which is a converter name and an output format. Chains with
+  a common prefix share the nodes for that prefix so that, when run,
+  each distinct prefix is converted only once.
+  """
+
+  def __init__(self):
+    """Create empty tree.
+    """
+    self._root = ChainNode()
+    self._converters = []
+
+  @property
+  def root(self):
+    """Get root node.
+
+    :return: node
+    :rtype: :class:`ChainNode`
+    """
+    return self._root
+
+  @property
+  def converters(self):
+    """Get names of converters used by chains in the tree.
+
+    :return: converter names
+    :rtype: list of str or unicode
+    """
+    return self._converters
+
+  def add(self, name, steps):
+    """Add a chain.
+
+    :param name: Chain name
+    :type name: str or unicode
+    :param steps: Steps, each of which is a tuple of converter name
+      and output format
+    :type steps: list of tuple of (str or unicode, str or unicode)
+    """
+    node = self._root
+    for step in steps:
+      node = node.child(step)
+      if step[0] not in self._converters:
+        self._converters.append(step[0])
+    node.chains.append(name)
+
+  def nodes(self):
+    """Get the number of nodes, excluding the root. This is the
+    maximum number of conversions done when the tree is run for an
+    input file.
+
+    :return: number of nodes
+    :rtype: int
+    """
+    count = 0
+    pending = list(self._root.children)
+    while pending:
+      node = pending.pop()
+      count += 1
+      pending.extend(node.children)
+    return count
+
+  def configure(self, chains):
+    """Add chains from a configuration. `chains` must hold lists of
+    steps keyed by chain name. Each step consists of:
+
+    - ``converter``: converter name.
+    - ``format``: output format, one of those in
+      :mod:`prov_interop.standards`.
+
+    A valid value for `chains` is::
+
+      {
+        "ProvPyProvToolbox":
+        [
+          {"converter": "ProvPy", "format": "provx"},
+          {"converter": "ProvToolbox", "format": "json"}
+        ]
+      }
+
+    :param chains: Mapping of chain names to steps
+    :type chains: dict
+    :raises ConfigError: if a step does not have a converter or a
+      format, or the format is not in :mod:`prov_interop.standards`
+    """
+    for name in sorted(chains):
+      steps = []
+      for step in chains[name]:
+        for key in [CONVERTER, FORMAT]:
+          if key not in step:
+            raise ConfigError("Missing " + key + " in chain " + name)
+        if step[FORMAT] not in standards.FORMATS:
+          raise ConfigError("Unrecognised format in chain " + name +
+                            ":" + step[FORMAT])
+        steps.append((step[CONVERTER], step[FORMAT]))
+      self.add(name, steps)
+
+
+class ChainResult(object):
+  """Result of running a single chain step."""
+
+  def __init__(self, node, status, out_file=None, message=None):
+    """Create result.
+
+    :param node: Node for step
+    :type node: :class:`ChainNode`
+    :param status: Status, one of ``pass``, ``fail``,
+      ``not-compared``, ``error`` or ``unsupported``
+    :type status: str or unicode
+    :param out_file: Output file, if any
+    :type out_file: str or unicode
+    :param message: Information about the status
+    :type message: str or unicode
+    """
+    self.node = node
+    self.status = status
+    self.out_file = out_file
+    self.message = message
+
+  def __str__(self):
+    """Get result as formatted string.
+
+    :return: formatted string
+    :rtype: str or unicode
+    """
+    steps = " -> ".join([converter + ":" + format
+                         for (converter, format) in self.node.path])
+    result = steps + " " + self.status
+    if self.message is not None:
+      result += " (" + self.message + ")"
+    return result
+
+
+def run_chains(tree, converters, comparators, in_file, expected_files,
+               work_dir, skipped=()):
+  """Run all the chains in a tree on an input file. Each node of the
+  tree is converted at most once. The output of each node is
+  compared to the expected test case file in the node's format, if
+  there is such a file and there is a comparator for that
+  format. Conversions continue down a chain even if a comparison
+  fails, or raises an error, so one invalid intermediate document does
+  not stop other chains being run. If a conversion fails, a
+  converter does not support its input or output format, or a
+  converter is one that skips the test case, then the steps below it
+  are not run.
+
+  :param tree: Chains
+  :type tree: :class:`ChainTree`
+  :param converters: Converters keyed by converter name
+  :type converters: dict from str or unicode to
+    :class:`prov_interop.converter.Converter`
+  :param comparators: Comparators keyed by format
+  :type comparators: dict from str or unicode to
+    :class:`prov_interop.comparator.Comparator`
+  :param in_file: Input test case file
+  :type in_file: str or unicode
+  :param expected_files: Test case files keyed by format
+  :type expected_files: dict from str or unicode to str or unicode
+  :param work_dir: Directory for intermediate output files
+  :type work_dir: str or unicode
+  :param skipped: Names of converters which skip the test case
+    (optional)
+  :type skipped: list of str or unicode
+  :return: results, one for each node that was run
+  :rtype: list of :class:`ChainResult`
+  """
+  results = []
+  in_format = os.path.splitext(in_file)[1][1:]
+  pending = [(node, in_file, in_format)
+             for node in reversed(tree.root.children)]
+  while pending:
+    (node, node_in_file, node_in_format) = pending.pop()
+    (converter_name, out_format) = node.step
+    converter = converters[converter_name]
+    if converter_name in skipped:
+      results.append(ChainResult(
+        node, SKIPPED,
+        message="test case in " + converter_name + " skip-tests"))
+      continue
+    if node_in_format not in converter.input_formats or \
+          out_format not in converter.output_formats:
+      results.append(ChainResult(
+        node, UNSUPPORTED,
+        message=node_in_format + "->" + out_format +
+          " not supported by " + converter_name))
+      continue
+    out_file = os.path.join(work_dir,
+                            "chain" + str(len(results)) + "." + out_format)
+    try:
+      converter.convert(node_in_file, out_file)
+    except ConversionError as e:
+      results.append(ChainResult(node, ERROR, message=str(e)))
+      continue
+    if out_format in expected_files and out_format in comparators:
+      expected_file = expected_files[out_format]
+      try:
+        if comparators[out_format].compare(expected_file, out_file):
+          result = ChainResult(node, PASS, out_file)
+        else:
+          result = ChainResult(node, FAIL, out_file,
+                               expected_file + " does not match " +
+                               out_file)
+      except ComparisonError as e:
+        result = ChainResult(node, ERROR, out_file, str(e))
+    else:
+      result = ChainResult(node, NOT_COMPARED, out_file)
+    results.append(result)
+    pending.extend([(child, out_file, out_format)
+                    for child in reversed(node.children)])
+  return results
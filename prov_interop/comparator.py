@@ -25,12 +25,18 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import json
+import logging
 import os
+import tempfile
 
 from prov_interop import standards
+from prov_interop.component import CommandLineComponent
 from prov_interop.component import ConfigError
 from prov_interop.component import ConfigurableComponent
 
+logger = logging.getLogger(__name__)
+
 class Comparator(ConfigurableComponent):
   """Base class for comparators. Comparators compare PROV documents to
   see if they are semantically equivalent. Comparators, in conjunction
@@ -41,11 +47,16 @@ class Comparator(ConfigurableComponent):
   """str or unicode: configuration key for supported formats
   """
 
+  TIER = "tier"
+  """str or unicode: configuration key for tier
+  """
+
   def __init__(self):
     """Create comparator.
     """
     super(Comparator, self).__init__()
     self._formats = []
+    self._tier = 0
 
   @property
   def formats(self):
@@ -57,12 +68,39 @@ class Comparator(ConfigurableComponent):
     """
     return self._formats
 
+  @property
+  def tier(self):
+    """Get tier of the comparator. If more than one comparator
+    supports a format then they are tried in order of tier, lowest
+    first (see :class:`TieredComparator`).
+
+    :return: tier
+    :rtype: int
+    """
+    return self._tier
+
+  @property
+  def supports_compare_many(self):
+    """Get whether :meth:`compare_many` compares many pairs of files
+    more efficiently than calling :meth:`compare` for each pair, for
+    example by starting only one process. Comparators which override
+    :meth:`compare_many` should override this too.
+
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    return False
+
   def configure(self, config):
     """Configure comparator. The configuration must hold:
 
     - ``formats``: formats supported by the comparator, each of which
       must be one of those in :mod:`prov_interop.standards`. 
 
+    The configuration may also hold:
+
+    - ``tier``: an integer tier (default 0).
+
     A valid configuration is::
 
       {
@@ -72,6 +110,7 @@ class Comparator(ConfigurableComponent):
     :param config: Configuration
     :type config: dict
     :raises ConfigError: if `config` does not hold the above entries
+      or ``tier`` is not an integer
     """
     super(Comparator, self).configure(config)
     self.check_configuration([Comparator.FORMATS])
@@ -80,6 +119,7 @@ class Comparator(ConfigurableComponent):
         raise ConfigError("Unrecognised format in " + Comparator.FORMATS +
                           ":" + format)
     self._formats = config[Comparator.FORMATS]
+    self._tier = get_tier(config)
 
   def check_format(self, format):
     """Check given format is supported.
@@ -110,6 +150,370 @@ class Comparator(ConfigurableComponent):
       if not os.path.isfile(f):
         raise ComparisonError("File not found: " + f)
 
+  def verify(self, file1, file2):
+    """Compare files, as for :meth:`compare`, but allowing for the
+    comparator being unable to decide whether the documents are
+    equivalent. This is used when a comparator is one tier of a
+    :class:`TieredComparator`. 
+
+    Cheap comparators, which can only decide some comparisons (e.g.
+    whether the files are identical), should override this method.
+    This implementation returns the result of :meth:`compare`.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` if the documents are equivalent, ``False`` if
+      they are not, or ``None`` if the comparator cannot decide
+    :rtype: bool
+    :raises ComparisonError: if either of the files cannot be found
+    """
+    return self.compare(file1, file2)
+
+  def compare_many(self, pairs):
+    """Compare many pairs of files, as for :meth:`compare`. A pair
+    which cannot be compared does not stop the others being compared.
+    This implementation calls :meth:`compare` for each pair, in order.
+
+    :param pairs: Pairs of files
+    :type pairs: list of tuple of (str or unicode, str or unicode)
+    :return: ``True`` or ``False`` for each pair, in the same order,
+      or ``None`` for a pair which could not be compared, e.g. as
+      either file cannot be found
+    :rtype: list of bool
+    """
+    verdicts = []
+    for (file1, file2) in pairs:
+      try:
+        verdicts.append(self.compare(file1, file2))
+      except ComparisonError as e:
+        logger.warning("Comparing %s and %s failed: %s", file1, file2, e)
+        verdicts.append(None)
+    return verdicts
+
+
+class TieredComparator(Comparator):
+  """Comparator which tries a sequence of comparators, in order of
+  tier, until one decides whether the documents are equivalent. Cheap
+  comparators, in lower tiers, decide the comparisons they can and
+  return ``None`` (unknown) for the others (see
+  :meth:`Comparator.verify`), so that expensive, authoritative,
+  comparators, in higher tiers, are only run on the comparisons that
+  the cheap ones could not decide.
+  """
+
+  def __init__(self, comparators):
+    """Create comparator.
+
+    :param comparators: Comparators, which are sorted by tier. The
+      order of comparators in the same tier is preserved
+    :type comparators: list of :class:`Comparator`
+    """
+    super(TieredComparator, self).__init__()
+    self._comparators = sorted(comparators, 
+                               key=lambda comparator: comparator.tier)
+    formats = [format for format in self._comparators[0].formats
+               if all([format in comparator.formats 
+                       for comparator in self._comparators])]
+    self._formats = formats
+    self._decisions = [0] * len(self._comparators)
+
+  @property
+  def comparators(self):
+    """Get comparators, in the order they are tried.
+
+    :return: comparators
+    :rtype: list of :class:`Comparator`
+    """
+    return self._comparators
+
+  @property
+  def decisions(self):
+    """Get the number of comparisons decided by each comparator.
+
+    :return: counts, in the same order as :attr:`comparators`
+    :rtype: list of int
+    """
+    return self._decisions
+
+  def fingerprint_values(self):
+    """Get the values from which :meth:`fingerprint` is computed.
+    These are the class name and the fingerprints of the comparators.
+
+    :return: values
+    :rtype: list
+    """
+    return [self.__class__.__module__ + "." + self.__class__.__name__] + \
+        [comparator.fingerprint() for comparator in self._comparators]
+
+  def verify(self, file1, file2):
+    """Compare files using each comparator's
+    :meth:`Comparator.verify` in turn until one decides.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` if the documents are equivalent, ``False`` if
+      they are not, or ``None`` if no comparator could decide
+    :rtype: bool
+    :raises ComparisonError: if either of the files cannot be found
+    """
+    for (index, comparator) in enumerate(self._comparators):
+      verdict = comparator.verify(file1, file2)
+      if verdict is not None:
+        self._decisions[index] += 1
+        logger.debug("%s decided %s", 
+                     comparator.__class__.__name__, verdict)
+        return verdict
+    return None
+
+  def compare(self, file1, file2):
+    """Compare files using each comparator's
+    :meth:`Comparator.verify` in turn until one decides.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` or ``False``
+    :rtype: bool
+    :raises ComparisonError: if either of the files cannot be found,
+      or no comparator could decide
+    """
+    super(TieredComparator, self).compare(file1, file2)
+    verdict = self.verify(file1, file2)
+    if verdict is None:
+      raise ComparisonError("No comparator could compare " + file1 + 
+                            " and " + file2)
+    return verdict
+
+
+class CommandLineComparator(Comparator, CommandLineComponent):
+  """Base class for comparators which invoke a command-line tool for
+  each pair of files. These may also be configured with a batch
+  driver, which compares many pairs of files in one process, so that
+  the cost of starting a process, and of the tool's own start-up, is
+  paid once for each call to :meth:`compare_many` rather than once
+  for each pair.
+
+  A batch driver is invoked with a manifest file and a results
+  file. The manifest holds a JSON list of pairs of files, each a list
+  of two file names. The driver must write into the results file a
+  JSON list with an exit code for each pair, in the same order, using
+  the same exit codes as the comparator's command-line tool: 0 if the
+  documents are equivalent, 1 if they are not, and any other value if
+  they could not be compared. The driver itself must exit with 0 if
+  it wrote the results file.
+
+  :mod:`prov_interop.provpy.compare_many` is a batch driver that
+  compares documents as ProvPy ``prov-compare`` does.
+  """
+
+  BATCH_EXECUTABLE = "batch-executable"
+  """str or unicode: configuration key for batch driver executable"""
+
+  BATCH_ARGUMENTS = "batch-arguments"
+  """str or unicode: configuration key for batch driver arguments"""
+
+  MANIFEST = "MANIFEST"
+  """str or unicode: token for manifest file in batch driver
+  command-line specification"""
+
+  RESULTS = "RESULTS"
+  """str or unicode: token for results file in batch driver
+  command-line specification"""
+
+  def __init__(self):
+    """Create comparator.
+    """
+    super(CommandLineComparator, self).__init__()
+    self._batch_executable = []
+    self._batch_arguments = []
+
+  @property
+  def batch_executable(self):
+    """Get the batch driver executable as a list of strings.
+
+    :return: executable, or an empty list if there is none
+    :rtype: list of str or unicode
+    """
+    return self._batch_executable
+
+  @property
+  def batch_arguments(self):
+    """Get the batch driver arguments as a list of strings.
+
+    :return: arguments
+    :rtype: list of str or unicode
+    """
+    return self._batch_arguments
+
+  @property
+  def supports_compare_many(self):
+    """Get whether :meth:`compare_many` invokes a batch driver. This
+    is the case if ``batch-executable`` is configured.
+
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    return len(self._batch_executable) > 0
+
+  def configure(self, config):
+    """Configure comparator. The configuration must hold:
+
+    - :class:`Comparator` configuration
+    - :class:`prov_interop.component.CommandLineComponent` configuration
+
+    The configuration may also hold:
+
+    - ``batch-executable``: the batch driver executable, which may be
+      an executable name and a script name, as for ``executable``.
+    - ``batch-arguments``: arguments for the batch driver, which must
+      be present if ``batch-executable`` is, and must have tokens
+      ``MANIFEST`` and ``RESULTS``, which are place-holders for the
+      manifest and results files.
+
+    A valid configuration is::
+
+      {
+        "executable": "prov-compare",
+        "arguments": "-f FORMAT1 -F FORMAT2 FILE1 FILE2",
+        "batch-executable": "python -m prov_interop.provpy.compare_many",
+        "batch-arguments": "MANIFEST RESULTS",
+        "formats": ["provx", "json"]
+      }
+
+    :param config: Configuration
+    :type config: dict
+    :raises ConfigError: if `config` does not hold the above entries
+    """
+    super(CommandLineComparator, self).configure(config)
+    self._batch_executable = []
+    self._batch_arguments = []
+    if CommandLineComparator.BATCH_EXECUTABLE not in config:
+      return
+    if CommandLineComparator.BATCH_ARGUMENTS not in config:
+      raise ConfigError("Missing " + CommandLineComparator.BATCH_ARGUMENTS)
+    self._batch_executable = \
+        config[CommandLineComparator.BATCH_EXECUTABLE].split()
+    self._batch_arguments = \
+        config[CommandLineComparator.BATCH_ARGUMENTS].split()
+    for token in [CommandLineComparator.MANIFEST,
+                  CommandLineComparator.RESULTS]:
+      if token not in self._batch_arguments:
+        raise ConfigError("Missing token " + token + " in " +
+                          CommandLineComparator.BATCH_ARGUMENTS)
+
+  def batch_command_line(self, manifest, results):
+    """Get command-line invocation of the batch driver.
+    ``batch-executable`` and ``batch-arguments`` are used to create
+    the invocation, with ``MANIFEST`` and ``RESULTS`` being replaced
+    with `manifest` and `results`.
+
+    :param manifest: Manifest file
+    :type manifest: str or unicode
+    :param results: Results file
+    :type results: str or unicode
+    :return: command-line invocation
+    :rtype: list of str or unicode
+    """
+    command_line = list(self._batch_executable)
+    command_line.extend(self._batch_arguments)
+    command_line = [manifest if x == CommandLineComparator.MANIFEST else x
+                    for x in command_line]
+    command_line = [results if x == CommandLineComparator.RESULTS else x
+                    for x in command_line]
+    return command_line
+
+  def compare_many(self, pairs):
+    """Compare many pairs of files.
+
+    If ``batch-executable`` is not configured then :meth:`compare` is
+    called for each pair. Otherwise:
+
+    - A check is done to see that the files of each pair exist and
+      that their formats are in ``formats``. Pairs which fail this
+      check are not compared.
+    - The other pairs are written into a temporary manifest file, and
+      the batch driver is invoked once (see :meth:`batch_command_line`).
+    - The exit code for each pair is read from the results file, and
+      converted into a verdict as for :meth:`compare`, or ``None`` if
+      it is neither 0 nor 1.
+
+    :param pairs: Pairs of files
+    :type pairs: list of tuple of (str or unicode, str or unicode)
+    :return: ``True`` or ``False`` for each pair, in the same order,
+      or ``None`` for a pair which could not be compared
+    :rtype: list of bool
+    :raises ComparisonError: if the exit code of the batch driver is
+      non-zero or its results are not valid
+    :raises OSError: if there are problems invoking the batch driver
+      e.g. the script is not found
+    """
+    if not self.supports_compare_many:
+      return super(CommandLineComparator, self).compare_many(pairs)
+    verdicts = [None] * len(pairs)
+    indices = []
+    for (index, (file1, file2)) in enumerate(pairs):
+      try:
+        Comparator.compare(self, file1, file2)
+        for file_name in [file1, file2]:
+          self.check_format(os.path.splitext(file_name)[1][1:])
+      except ComparisonError as e:
+        logger.warning("Comparing %s and %s failed: %s", file1, file2, e)
+        continue
+      indices.append(index)
+    if len(indices) == 0:
+      return verdicts
+    (manifest_fd, manifest) = tempfile.mkstemp(suffix=".json")
+    (results_fd, results) = tempfile.mkstemp(suffix=".json")
+    os.close(results_fd)
+    try:
+      with os.fdopen(manifest_fd, "w") as manifest_file:
+        json.dump([list(pairs[index]) for index in indices], manifest_file)
+      command_line = self.batch_command_line(manifest, results)
+      return_code = self.run(command_line)
+      if return_code != 0:
+        raise ComparisonError(" ".join(command_line) +
+                              " returned " + str(return_code))
+      try:
+        with open(results, "r") as results_file:
+          return_codes = json.load(results_file)
+      except ValueError as e:
+        raise ComparisonError("Invalid results from " +
+                              " ".join(command_line) + ": " + str(e))
+    finally:
+      for tmp in [manifest, results]:
+        os.remove(tmp)
+    if type(return_codes) is not list or len(return_codes) != len(indices):
+      raise ComparisonError("Expected " + str(len(indices)) +
+                            " results from " + " ".join(command_line))
+    for (index, return_code) in zip(indices, return_codes):
+      if return_code in [0, 1]:
+        verdicts[index] = return_code == 0
+      else:
+        (file1, file2) = pairs[index]
+        logger.warning("Comparing %s and %s returned %s", file1, file2,
+                       return_code)
+    return verdicts
+
+
+def get_tier(config):
+  """Get the tier from a comparator configuration.
+
+  :param config: Configuration
+  :type config: dict
+  :return: value of ``tier``, or 0 if there is none
+  :rtype: int
+  :raises ConfigError: if ``tier`` is not an integer
+  """
+  tier = config.get(Comparator.TIER, 0)
+  if type(tier) is not int:
+    raise ConfigError("tier must be an integer: " + str(tier))
+  return tier
+
 
 class ComparisonError(Exception):
   """Comparison error."""
@@ -25,11 +25,24 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import hashlib
+import json
+import logging
 import os
+import subprocess
+
+from prov_interop import timing
+from prov_interop import usage
+
+logger = logging.getLogger(__name__)
 
 class ConfigurableComponent(object):
   """Base class for configurable components."""
 
+  UNFINGERPRINTED_KEYS = ["skip-tests"]
+  """list of str or unicode: configuration keys which do not affect
+  the component's behaviour, so are not included in its fingerprint"""
+
   def __init__(self):
     """Create component.
     """
@@ -68,6 +81,34 @@ class ConfigurableComponent(object):
       raise ConfigError("config must be a dictionary")
     self._config = config
 
+  def fingerprint(self):
+    """Get a fingerprint of the component. This is a digest of the
+    component's class name and configuration, excluding keys in
+    :attr:`UNFINGERPRINTED_KEYS`. It changes if the component is
+    reconfigured in a way that could change its behaviour. Sub-classes
+    may extend this to include other information about the component
+    e.g. its version.
+
+    :return: hexadecimal digest
+    :rtype: str or unicode
+    """
+    digest = hashlib.sha1()
+    for value in self.fingerprint_values():
+      digest.update(("%s" % value).encode("utf-8"))
+      digest.update(b"\0")
+    return digest.hexdigest()
+
+  def fingerprint_values(self):
+    """Get the values from which :meth:`fingerprint` is computed.
+
+    :return: values
+    :rtype: list
+    """
+    config = dict([(key, value) for (key, value) in self._config.items()
+                   if key not in self.UNFINGERPRINTED_KEYS])
+    return [self.__class__.__module__ + "." + self.__class__.__name__,
+            json.dumps(config, sort_keys=True, default=str)]
+
 
 class ConfigError(Exception):
   """Configuration error."""
@@ -164,6 +205,51 @@ class CommandLineComponent(ConfigurableComponent):
     self._executable = config[CommandLineComponent.EXECUTABLE].split()
     self._arguments = config[CommandLineComponent.ARGUMENTS].split()
 
+  def fingerprint_values(self):
+    """Get the values from which :meth:`fingerprint` is
+    computed. In addition to those of
+    :meth:`ConfigurableComponent.fingerprint_values`, for each token of
+    ``executable`` that names a file, either directly or via the
+    system path, the file's absolute path, modification time and size
+    are included. So, the fingerprint changes if the executable, or
+    its script, is rebuilt or updated.
+
+    :return: values
+    :rtype: list
+    """
+    values = super(CommandLineComponent, self).fingerprint_values()
+    for token in self._executable:
+      file_name = find_executable(token)
+      if file_name is not None:
+        stat = os.stat(file_name)
+        values.extend([file_name, stat.st_mtime, stat.st_size])
+    return values
+
+  def run(self, command_line):
+    """Run a command-line invocation and wait for it to exit.
+    Starting the process and waiting for it to exit are timed as
+    ``spawn`` and ``wait`` spans (see
+    :func:`prov_interop.timing.span`). The process's resource usage
+    is recorded against the enclosing span (see
+    :func:`prov_interop.usage.record`). The command line is logged at
+    ``DEBUG`` level.
+
+    :param command_line: Executable and arguments
+    :type command_line: list of str or unicode
+    :return: exit code
+    :rtype: int
+    :raises OSError: if there are problems invoking the executable
+      e.g. it is not found
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+      logger.debug(" ".join(command_line))
+    with timing.span("spawn"):
+      process = subprocess.Popen(command_line)
+    with timing.span("wait"):
+      (return_code, values) = usage.wait(process)
+    usage.record(values)
+    return return_code
+
 
 class RestComponent(ConfigurableComponent):
   """Base class for REST-ful components."""
@@ -191,6 +277,12 @@ class RestComponent(ConfigurableComponent):
 
     - ``url``: REST endpoint for POST requests.
 
+    The configuration may also hold:
+
+    - ``version``: version of the service. This is not used by the
+      component but, as part of its configuration, is included in its
+      :meth:`ConfigurableComponent.fingerprint`. 
+
     A valid configuration is::
 
       {
@@ -204,3 +296,21 @@ class RestComponent(ConfigurableComponent):
     super(RestComponent, self).configure(config)
     self.check_configuration([RestComponent.URL])
     self._url = config[RestComponent.URL]
+
+
+def find_executable(name):
+  """Find a file given its name or the name of an executable on the
+  system path.
+
+  :param name: File or executable name
+  :type name: str or unicode
+  :return: absolute file name or ``None`` if no such file exists
+  :rtype: str or unicode
+  """
+  if os.path.isfile(name):
+    return os.path.abspath(name)
+  for path in os.environ.get("PATH", "").split(os.pathsep):
+    file_name = os.path.join(path, name)
+    if os.path.isfile(file_name) and os.access(file_name, os.X_OK):
+      return os.path.abspath(file_name)
+  return None
@@ -71,6 +71,19 @@ class Converter(ConfigurableComponent):
     """
     return self._output_formats
 
+  @property
+  def supports_convert_many(self):
+    """Get whether :meth:`convert_many` converts an input file into
+    multiple output formats more efficiently than calling
+    :meth:`convert` for each output format, for example by parsing
+    the input file only once. Converters which override
+    :meth:`convert_many` should override this too.
+
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    return False
+
   def configure(self, config):
     """Configure converter. The configuration must hold:
 
@@ -132,6 +145,31 @@ class Converter(ConfigurableComponent):
     if not os.path.isfile(in_file):
       raise ConversionError("Input file not found: " + in_file)
 
+  def convert_many(self, in_file, out_files):
+    """Convert input file into multiple output files. `in_file` holds
+    the document to be converted. `out_files` holds output files keyed
+    by output format. If the conversion is successful then each
+    output file holds the converted document in its format. For
+    example::
+
+      {
+        "provx": "/tmp/testcase1.provx",
+        "provn": "/tmp/testcase1.provn"
+      }
+
+    This implementation calls :meth:`convert` for each output file,
+    in order of output format. 
+
+    :param in_file: Input file
+    :type in_file: str or unicode
+    :param out_files: Output files keyed by output format
+    :type out_files: dict from str or unicode to str or unicode
+    :raises ConversionError: if the input file cannot be found, or
+      any conversion fails
+    """
+    for format in sorted(out_files):
+      self.convert(in_file, out_files[format])
+
 
 class ConversionError(Exception):
   """Conversion error."""
@@ -29,6 +29,16 @@ import os
 import importlib
 import yaml
 
+COMPARATORS_GROUP = "prov_interop.comparators"
+"""str or unicode: entry point group for comparator classes"""
+
+CONVERTERS_GROUP = "prov_interop.converters"
+"""str or unicode: entry point group for converter classes"""
+
+_entry_points = {}
+"""dict: class names of entry points, keyed by entry point name,
+keyed by group"""
+
 def get_class(name):
   """Load a class given a module-prefixed class name. A valid
   module-prefixed class name is, for example,
@@ -69,3 +79,83 @@ def get_instance(name):
     if class constructor does not have a zero-arity constructor
   """
   return get_class(name)()
+
+def check_class(name):
+  """Check that the module of a module-prefixed class name can be
+  found, without importing it.
+
+  :param name: Module-prefixed class name
+  :type name: str or unicode
+  :raises ValueError: if `name` is not module-prefixed
+  :raises ImportError: if module cannot be found
+  """
+  module_class = name.rsplit(".",1)
+  if len(module_class) != 2:
+    raise ValueError(("Class name " + name + " must be module-prefixed"))
+  try:
+    from importlib.util import find_spec
+  except ImportError:
+    from pkgutil import find_loader as find_spec
+  if find_spec(module_class[0]) is None:
+    raise ImportError("No module named " + module_class[0])
+
+def get_entry_points(group):
+  """Get the classes registered as setuptools entry points in a
+  group by installed distributions. For example, a distribution
+  providing a comparator could declare, in its ``setup.py``::
+
+    entry_points={
+      "prov_interop.comparators": [
+        "MyComparator = mypackage.comparator:MyComparator"
+      ]
+    }
+
+  Entry points are looked up using :mod:`importlib.metadata` or, if
+  that is not available, ``pkg_resources``. If neither is available
+  then there are no entry points. The entry points of each group are
+  looked up once per process.
+
+  :param group: Entry point group e.g. ``prov_interop.comparators``
+  :type group: str or unicode
+  :return: module-prefixed class names keyed by entry point name
+  :rtype: dict from str or unicode to str or unicode
+  """
+  if group not in _entry_points:
+    entry_points = {}
+    try:
+      from importlib import metadata
+      all_entry_points = metadata.entry_points()
+      if hasattr(all_entry_points, "select"):
+        group_entry_points = all_entry_points.select(group=group)
+      else:
+        group_entry_points = all_entry_points.get(group, [])
+      for entry_point in group_entry_points:
+        entry_points[entry_point.name] = entry_point.value.replace(":", ".")
+    except ImportError:
+      try:
+        import pkg_resources
+      except ImportError:
+        pkg_resources = None
+      if pkg_resources is not None:
+        for entry_point in pkg_resources.iter_entry_points(group):
+          entry_points[entry_point.name] = ".".join(
+            [entry_point.module_name] + list(entry_point.attrs))
+    _entry_points[group] = entry_points
+  return _entry_points[group]
+
+def get_class_name(name, group):
+  """Get a module-prefixed class name given either a module-prefixed
+  class name or the name of an entry point (see
+  :func:`get_entry_points`).
+
+  :param name: Module-prefixed class name or entry point name
+  :type name: str or unicode
+  :param group: Entry point group e.g. ``prov_interop.comparators``
+  :type group: str or unicode
+  :return: module-prefixed class name, or `name` if it is neither
+    module-prefixed nor an entry point name
+  :rtype: str or unicode
+  """
+  if "." in name:
+    return name
+  return get_entry_points(group).get(name, name)
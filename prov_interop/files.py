@@ -1,4 +1,5 @@
-"""Functions to load `YAML <http://yaml.org/>`_ files.
+"""Functions to load `YAML <http://yaml.org/>`_ files and to compute
+file digests.
 """
 # Copyright (c) 2015 University of Southampton
 #
@@ -25,10 +26,30 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import hashlib
+import json
 import os
+import tempfile
 import yaml
 
-def load_yaml(env_var, default_file_name, file_name = None):
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+"""class: YAML loader, the libyaml-based ``CSafeLoader`` if PyYAML was
+built with libyaml, else the pure-Python ``SafeLoader``"""
+
+SNAPSHOT_DIR_ENV = "PROV_HARNESS_SNAPSHOTS"
+"""str or unicode: environment variable holding directory for
+snapshots of loaded YAML files"""
+
+SNAPSHOT_SUFFIX = ".json"
+"""str or unicode: suffix of snapshot files"""
+
+try:
+  STRING_TYPES = (str, unicode)
+  """tuple of type: string types"""
+except NameError:
+  STRING_TYPES = (str,)
+
+def load_yaml(env_var, default_file_name, file_name = None, schema = None):
   """Load the contents of a YAML file.
 
   - If `file_name` is provided then the contents of the file are
@@ -37,6 +58,22 @@ def load_yaml(env_var, default_file_name, file_name = None):
     then the contents of the file named in that variable are loaded.
   - Else, the contents of the default file, `default_file_name`, are
     loaded and returned.
+
+  The file is parsed using :data:`YAML_LOADER`. If the environment
+  variable ``PROV_HARNESS_SNAPSHOTS`` names a directory then the
+  contents are also saved there as a JSON snapshot, named after the
+  SHA-1 digest of the file. If a snapshot exists for the file's
+  current digest then it is loaded instead of parsing the file, so
+  later processes and runs avoid parsing YAML. Contents that cannot
+  be represented exactly as JSON (e.g. dates or non-string keys) are
+  not snapshotted.
+
+  If `schema` is provided then the contents are checked against it
+  (see :func:`check_schema`) when the file is parsed, before a
+  snapshot is saved. Snapshots are only saved for contents which
+  passed this check, and their names also include a digest of
+  `schema`, so contents loaded from a snapshot are not checked
+  again.
   
   :param env_var: Environment variable with file name
   :type env_var: str or unicode
@@ -44,33 +81,146 @@ def load_yaml(env_var, default_file_name, file_name = None):
   :type file_name: str or unicode
   :param file_name: File name (optional)
   :type file_name: str or unicode
+  :param schema: Expected types of values keyed by key (optional)
+  :type schema: dict from str or unicode to type or tuple of type
   :return: content
   :rtype: dict
   :raises IOError: if the file is not found
-  :raises YamlError: if the file does not contain a valid YAML document
+  :raises YamlError: if the file does not contain a valid YAML
+    document or its contents do not match `schema`
   """
   if (file_name is None):
     try:
       file_name = os.environ[env_var]
     except KeyError:
       file_name = default_file_name
-  with open(file_name, 'r') as f:
-    content = yaml.load(f)
+  with open(file_name, "rb") as f:
+    data = f.read()
+  snapshot_file = None
+  content = None
+  snapshot_dir = os.environ.get(SNAPSHOT_DIR_ENV)
+  if snapshot_dir:
+    digest = hashlib.sha1(data)
+    if schema is not None:
+      digest.update(repr([(key, schema[key]) 
+                          for key in sorted(schema)]).encode("utf-8"))
+    snapshot_file = os.path.join(snapshot_dir, 
+      digest.hexdigest() + SNAPSHOT_SUFFIX)
+    content = load_snapshot(snapshot_file)
+  if content is None:
+    content = yaml.load(data, Loader=YAML_LOADER)
     if type(content) is not dict:
       raise YamlError(file_name)
-    return content
+    if schema is not None:
+      check_schema(file_name, content, schema)
+    if snapshot_file is not None:
+      save_snapshot(snapshot_file, content)
+  return content
+
+def check_schema(file_name, content, schema):
+  """Check that the values in the contents of a YAML file have the
+  types expected by a schema. A schema maps keys to the expected type,
+  or tuple of types, of their values, for example::
+
+    {"test-cases": STRING_TYPES, "comparators": dict, "resume": bool}
+
+  Keys that are not in the contents, or not in the schema, are not
+  checked. 
+
+  :param file_name: File name
+  :type file_name: str or unicode
+  :param content: Contents of the file
+  :type content: dict
+  :param schema: Expected types of values keyed by key
+  :type schema: dict from str or unicode to type or tuple of type
+  :raises YamlError: if a value is not of the expected type
+  """
+  for key in sorted(schema):
+    if key in content and not isinstance(content[key], schema[key]):
+      raise YamlError(file_name, "unexpected type " + 
+                      type(content[key]).__name__ + " for " + key)
+
+def load_snapshot(file_name):
+  """Load a snapshot of the contents of a YAML file.
+
+  :param file_name: Snapshot file name
+  :type file_name: str or unicode
+  :return: content or ``None`` if there is no valid snapshot
+  :rtype: dict
+  """
+  try:
+    with open(file_name, "r") as f:
+      content = json.load(f)
+  except (IOError, OSError, ValueError):
+    return None
+  if type(content) is not dict:
+    return None
+  return content
+
+def save_snapshot(file_name, content):
+  """Save a snapshot of the contents of a YAML file, as JSON. The
+  snapshot is written to a temporary file which is then renamed, so
+  other processes never see a partially-written snapshot. If the
+  contents cannot be represented exactly as JSON, or the snapshot
+  cannot be written, then no snapshot is saved.
+
+  :param file_name: Snapshot file name
+  :type file_name: str or unicode
+  :param content: Contents of the file
+  :type content: dict
+  """
+  try:
+    data = json.dumps(content, sort_keys=True)
+    if json.loads(data) != content:
+      return
+  except (TypeError, ValueError):
+    return
+  directory = os.path.dirname(file_name)
+  try:
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    (handle, temp_file) = tempfile.mkstemp(dir=directory, 
+                                           suffix=SNAPSHOT_SUFFIX)
+    with os.fdopen(handle, "w") as f:
+      f.write(data)
+    os.rename(temp_file, file_name)
+  except (IOError, OSError):
+    return
+
+def hash_file(file_name, block_size=65536):
+  """Compute the SHA-1 digest of the contents of a file. The file is
+  read in blocks so its contents need not fit into memory.
+
+  :param file_name: File name
+  :type file_name: str or unicode
+  :param block_size: Number of bytes to read at a time
+  :type block_size: int
+  :return: hexadecimal digest
+  :rtype: str or unicode
+  :raises IOError: if the file is not found
+  """
+  digest = hashlib.sha1()
+  with open(file_name, "rb") as f:
+    block = f.read(block_size)
+    while block:
+      digest.update(block)
+      block = f.read(block_size)
+  return digest.hexdigest()
 
 
 class YamlError(Exception):
   """File does not contain a valid YAML document."""
 
-  def __init__(self, filename):
+  def __init__(self, filename, reason=None):
     """Create error.
 
     :param filename: File name
     :type value: str or unicode
+    :param reason: Why the document is not valid (optional)
+    :type reason: str or unicode
     """
     self._filename = filename
+    self._reason = reason
 
   def __str__(self):
     """Get error as a formatted string.
@@ -78,7 +228,10 @@ class YamlError(Exception):
     :return: formatted string
     :rtype: str or unicode
     """
-    return repr(self._filename + " does not contain a valid YAML document")
+    message = self._filename + " does not contain a valid YAML document"
+    if self._reason is not None:
+      message += ": " + self._reason
+    return repr(message)
 
   @property
   def filename(self):
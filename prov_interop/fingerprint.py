@@ -0,0 +1,92 @@
+"""Fingerprints of test case files and test jobs, used to detect which
+test jobs are affected by changes since they were last run.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+
+from prov_interop.files import hash_file
+
+CONVERTER = "converter"
+"""str or unicode: job fingerprint key for converter"""
+COMPARATOR = "comparator"
+"""str or unicode: job fingerprint key for comparator"""
+INPUT = "input"
+"""str or unicode: job fingerprint key for input test case file"""
+EXPECTED = "expected"
+"""str or unicode: job fingerprint key for expected test case file"""
+
+_file_fingerprints = {}
+"""dict: cache of file fingerprints keyed by (file name,
+modification time, size)"""
+
+def file_fingerprint(file_name):
+  """Get a fingerprint of a file. This is a digest of its contents
+  (see :func:`prov_interop.files.hash_file`). Fingerprints are cached
+  and only recomputed if the file's modification time or size
+  change.
+
+  :param file_name: File name
+  :type file_name: str or unicode
+  :return: hexadecimal digest
+  :rtype: str or unicode
+  :raises OSError: if the file is not found
+  """
+  stat = os.stat(file_name)
+  key = (os.path.abspath(file_name), stat.st_mtime, stat.st_size)
+  if key not in _file_fingerprints:
+    _file_fingerprints[key] = hash_file(file_name)
+  return _file_fingerprints[key]
+
+def job_fingerprints(converter, comparator, file_in, file_expected):
+  """Get the fingerprints of everything that determines the verdict
+  of a test job: the converter, the comparator, the input test case
+  file and the expected test case file. If none of these change then
+  rerunning the job can be expected to give the same verdict. For
+  example::
+
+    {
+      "converter": "3f1c...",
+      "comparator": "9b0e...",
+      "input": "79171e...",
+      "expected": "d41d8c..."
+    }
+
+  :param converter: Converter
+  :type converter: :class:`prov_interop.converter.Converter`
+  :param comparator: Comparator
+  :type comparator: :class:`prov_interop.comparator.Comparator`
+  :param file_in: Input test case file
+  :type file_in: str or unicode
+  :param file_expected: Expected test case file
+  :type file_expected: str or unicode
+  :return: fingerprints
+  :rtype: dict from str or unicode to str or unicode
+  """
+  return {CONVERTER: converter.fingerprint(),
+          COMPARATOR: comparator.fingerprint(),
+          INPUT: file_fingerprint(file_in),
+          EXPECTED: file_fingerprint(file_expected)}
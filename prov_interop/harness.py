@@ -25,15 +25,28 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import functools
 import os
 import re
 import yaml
 
 from prov_interop import factory
+from prov_interop import log
 from prov_interop import standards
+from prov_interop import trace
+from prov_interop.chain import ChainTree
 from prov_interop.comparator import Comparator
+from prov_interop.comparator import get_tier
+from prov_interop.comparator import TieredComparator
 from prov_interop.component import ConfigError
 from prov_interop.component import ConfigurableComponent
+from prov_interop.files import STRING_TYPES
+from prov_interop.journal import Journal
+from prov_interop.progress import PROGRESS_ENV
+from prov_interop.progress import ProgressLog
+from prov_interop.registry import create_component
+from prov_interop.registry import LazyRegistry
+from prov_interop.results import ResultsStore
 
 class HarnessResources(ConfigurableComponent):
   """Manages test harness configuration including the test cases."""
@@ -47,6 +60,56 @@ class HarnessResources(ConfigurableComponent):
   CLASS = "class"
   """str or unicode: configuration key for comparator class names"""
 
+  JOURNAL = "journal"
+  """str or unicode: configuration key for journal file name"""
+
+  RESUME = "resume"
+  """str or unicode: configuration key for resume flag"""
+
+  INCREMENTAL = "incremental"
+  """str or unicode: configuration key for incremental flag"""
+
+  BASELINE = "baseline"
+  """str or unicode: configuration key for baseline journal file name"""
+
+  CHAINS = "chains"
+  """str or unicode: configuration key for round-trip conversion chains"""
+
+  RESULTS = "results"
+  """str or unicode: configuration key for results file name"""
+
+  RUN_ID = "run-id"
+  """str or unicode: configuration key for run identifier"""
+
+  TRACE = "trace"
+  """str or unicode: configuration key for trace directory"""
+
+  PROGRESS = "progress"
+  """str or unicode: configuration key for progress directory"""
+
+  LOG = "log"
+  """str or unicode: configuration key for log directory"""
+
+  LOG_LEVEL = "log-level"
+  """str or unicode: configuration key for logging level"""
+
+  SCHEMA = {
+    TEST_CASES_DIR: STRING_TYPES,
+    COMPARATORS: dict,
+    JOURNAL: STRING_TYPES,
+    RESUME: bool,
+    INCREMENTAL: bool,
+    BASELINE: STRING_TYPES,
+    CHAINS: dict,
+    RESULTS: STRING_TYPES,
+    TRACE: STRING_TYPES,
+    PROGRESS: STRING_TYPES,
+    LOG: STRING_TYPES,
+    LOG_LEVEL: STRING_TYPES
+  }
+  """dict: expected types of configuration values, for
+  :func:`prov_interop.files.load_yaml`"""
+
   TEST_CASE_PREFIX="test-"
   """str or unicode: assumed prefix for individual test case
   directories and files
@@ -57,8 +120,20 @@ class HarnessResources(ConfigurableComponent):
     """
     super(HarnessResources, self).__init__()
     self._test_cases_dir = ""
-    self._comparators = {}
-    self._format_comparators = {}
+    self._comparators = LazyRegistry()
+    self._format_comparators = LazyRegistry()
+    self._journal = None
+    self._resume = False
+    self._incremental = False
+    self._baseline = None
+    self._chains = ChainTree()
+    self._results = None
+    self._trace = None
+    self._progress = None
+    self._log = None
+    self._log_level = log.LEVEL
+    self._test_case_files = None
+    self._test_cases = None
 
   @property
   def test_cases_dir(self):
@@ -75,8 +150,8 @@ class HarnessResources(ConfigurableComponent):
     are those provided in the comparator configuration.
 
     :return: comparators
-    :rtype: dict from str or unicode to 
-      :class:`prov_interop.comparator.Comparator`
+    :rtype: :class:`prov_interop.registry.LazyRegistry` from str or
+      unicode to :class:`prov_interop.comparator.Comparator`
     """
     return self._comparators
 
@@ -86,11 +161,107 @@ class HarnessResources(ConfigurableComponent):
     Formats are in :mod:`prov_interop.standards`.
 
     :return: comparators
-    :rtype: dict from str or unicode to 
-      :class:`prov_interop.comparator.Comparator`
+    :rtype: :class:`prov_interop.registry.LazyRegistry` from str or
+      unicode to :class:`prov_interop.comparator.Comparator`
     """
     return self._format_comparators
 
+  @property
+  def journal(self):
+    """Get journal of completed test jobs.
+
+    :return: journal or ``None`` if no ``journal`` is configured
+    :rtype: :class:`prov_interop.journal.Journal`
+    """
+    return self._journal
+
+  @property
+  def resume(self):
+    """Get whether jobs already recorded in the journal are to be
+    skipped.
+
+    :return: resume flag
+    :rtype: bool
+    """
+    return self._resume
+
+  @property
+  def incremental(self):
+    """Get whether jobs already recorded in the journal are to be
+    skipped if nothing they depend upon has changed since they were
+    recorded.
+
+    :return: incremental flag
+    :rtype: bool
+    """
+    return self._incremental
+
+  @property
+  def baseline(self):
+    """Get baseline journal of test jobs from a previous run.
+
+    :return: journal or ``None`` if no ``baseline`` is configured
+    :rtype: :class:`prov_interop.journal.Journal`
+    """
+    return self._baseline
+
+  @property
+  def chains(self):
+    """Get round-trip conversion chains.
+
+    :return: chains
+    :rtype: :class:`prov_interop.chain.ChainTree`
+    """
+    return self._chains
+
+  @property
+  def results(self):
+    """Get store for test job results, including timings.
+
+    :return: store or ``None`` if no ``results`` is configured
+    :rtype: :class:`prov_interop.results.ResultsStore`
+    """
+    return self._results
+
+  @property
+  def trace(self):
+    """Get directory for timeline traces.
+
+    :return: directory or ``None`` if no ``trace`` is configured and
+      the ``PROV_HARNESS_TRACE`` environment variable is not defined
+    :rtype: str or unicode
+    """
+    return self._trace
+
+  @property
+  def progress(self):
+    """Get log of progress events.
+
+    :return: log or ``None`` if no ``progress`` is configured and the
+      ``PROV_HARNESS_PROGRESS`` environment variable is not defined
+    :rtype: :class:`prov_interop.progress.ProgressLog`
+    """
+    return self._progress
+
+  @property
+  def log(self):
+    """Get directory for log files.
+
+    :return: directory or ``None`` if no ``log`` is configured and the
+      ``PROV_HARNESS_LOG`` environment variable is not defined
+    :rtype: str or unicode
+    """
+    return self._log
+
+  @property
+  def log_level(self):
+    """Get logging level.
+
+    :return: level name e.g. ``WARNING``
+    :rtype: str or unicode
+    """
+    return self._log_level
+
   def register_comparators(self, comparators):
     """Populate a dictionary of comparators, keyed by comparator name,
     and a dictionary of comparators, keyed by format. `comparators`
@@ -128,23 +299,100 @@ class HarnessResources(ConfigurableComponent):
     ``json`` to an instance of
     :class:`prov_interop.provpy.comparator.ProvPyComparator`.  
 
+    If more than one comparator supports a format, then the format is
+    mapped to a :class:`prov_interop.comparator.TieredComparator`,
+    which tries the comparators in order of their ``tier``, lowest
+    first, until one decides whether documents are equivalent. Cheap
+    comparators (e.g. in-process structural comparators) can be put
+    in lower tiers and expensive authoritative ones (e.g.
+    ``provconvert -compare``) in higher tiers, so the latter are only
+    run when the former cannot decide. For example::
+
+      {
+        "ProvToolboxComparator": 
+        {
+          "class": "prov_interop.provtoolbox.comparator.ProvToolboxComparator",
+          "executable": "provconvert",
+          "arguments": "-infile FILE1 -compare FILE2",
+          "formats": ["provx", "json"],
+          "tier": 1
+        },
+        "MyComparator": 
+        {
+          "class": "mypackage.comparator.MyComparator",
+          "formats": ["json"],
+          "tier": 0
+        }
+      }
+
+    maps ``json`` to a tiered comparator which tries ``MyComparator``
+    then ``ProvToolboxComparator``, and ``provx`` to
+    ``ProvToolboxComparator``.
+
+    Both dictionaries are :class:`prov_interop.registry.LazyRegistry`
+    objects, so each comparator is only imported, created and
+    configured the first time it is looked up, for example when a
+    test first compares files in one of its formats. The comparator
+    is then shared by the entries for its name and its formats. The
+    comparator module must exist, and ``formats`` must be valid, when
+    this method is called but other problems with the configuration
+    are only reported when the comparator is created.
+
+    The value of ``class`` may also be the name of a setuptools entry
+    point in the group ``prov_interop.comparators`` (see
+    :func:`prov_interop.factory.get_entry_points`), so comparators
+    in other distributions can be used without giving their module.
+
     :param comparators: Mapping of comparator names to 
       class names and comparator-specific configuration
     :type config: dict
+    :raises ConfigError: if a configuration has no ``class`` or
+      ``formats``, a format is not in :mod:`prov_interop.standards`,
+      or ``tier`` is not an integer
+    :raises ImportError: if a comparator module cannot be found
+    :raises ValueError: if a ``class`` is neither module-prefixed nor
+      an entry point name
     """
     if (comparators == None) or (len(comparators) == 0):
       return
-    for comparator_name in comparators:
+    format_names = {}
+    for comparator_name in sorted(comparators):
       config = comparators[comparator_name]
       if HarnessResources.CLASS not in config:
         raise ConfigError("Missing " + HarnessResources.CLASS + 
                           " for " + comparator_name)
-      class_name = config[HarnessResources.CLASS]
-      comparator = factory.get_instance(class_name)
-      comparator.configure(config)
-      self._comparators[comparator_name] = comparator
-      for format in comparator.formats:
-        self._format_comparators[format] = comparator
+      class_name = factory.get_class_name(config[HarnessResources.CLASS],
+                                          factory.COMPARATORS_GROUP)
+      factory.check_class(class_name)
+      if Comparator.FORMATS not in config:
+        raise ConfigError("Missing " + Comparator.FORMATS + 
+                          " for " + comparator_name)
+      for format in config[Comparator.FORMATS]:
+        if format not in standards.FORMATS:
+          raise ConfigError("Unrecognised format in " + Comparator.FORMATS +
+                            " for " + comparator_name + ":" + format)
+      get_tier(config)
+      self._comparators.register(comparator_name, functools.partial(
+        create_component, class_name, config))
+      for format in config[Comparator.FORMATS]:
+        format_names.setdefault(format, []).append(comparator_name)
+    for (format, names) in format_names.items():
+      if len(names) == 1:
+        loader = functools.partial(self._comparators.__getitem__, names[0])
+      else:
+        loader = functools.partial(self.create_tiered_comparator, names)
+      self._format_comparators.register(format, loader)
+
+  def create_tiered_comparator(self, names):
+    """Create a :class:`prov_interop.comparator.TieredComparator`
+    from comparators in `comparators`.
+
+    :param names: Comparator names
+    :type names: list of str or unicode
+    :return: comparator
+    :rtype: :class:`prov_interop.comparator.TieredComparator`
+    """
+    return TieredComparator([self._comparators[name] for name in names])
 
   def test_cases_generator(self):
     """Return a generator for test cases.
@@ -208,6 +456,85 @@ class HarnessResources(ConfigurableComponent):
       unicode, str or unicode) 
     :raises ConfigError: if the test cases directory is not found
     """
+    return self._test_case_pairs(self.test_case_files_generator())
+
+  def _test_case_pairs(self, test_case_files):
+    """Return a generator for test cases from the files of each test
+    case.
+
+    :param test_case_files: test case indices and files
+    :type test_case_files: iterable of tuple of (str or unicode, list
+      of tuple of (str or unicode, str or unicode))
+    :returns: test case tuple
+    :rtype: tuple of (int, str or unicode, str or unicode, str or
+      unicode, str or unicode) 
+    """
+    for (testcase_id, test_files) in test_case_files:
+      # Only consider files with formats for which a comparator
+      # is registered.
+      files = [(format, test_file) for (format, test_file) in test_files 
+               if format in self.format_comparators]
+      # Create all-pairs combination of the files.
+      for (format1, file1) in files:
+        for (format2, file2) in files:
+          yield (testcase_id, format1, file1, format2, file2)
+
+  def test_cases(self):
+    """Get the test cases, as given by :meth:`test_cases_generator`.
+
+    The test cases are enumerated the first time this method, or
+    :meth:`test_case_files`, is called and are then cached, so the
+    test cases directory is traversed at most once, however many test
+    classes use the test cases.
+
+    :returns: test case tuples
+    :rtype: list of tuple of (int, str or unicode, str or unicode, str
+      or unicode, str or unicode) 
+    :raises ConfigError: if the test cases directory is not found
+    """
+    if self._test_cases is None:
+      self._test_cases = list(self._test_case_pairs(self.test_case_files()))
+    return self._test_cases
+
+  def test_case_files(self):
+    """Get the files of each test case, as given by
+    :meth:`test_case_files_generator`.
+
+    The test cases directory is traversed, within an ``enumerate``
+    span (see :func:`prov_interop.trace.span`), the first time this
+    method is called and the files are then cached.
+
+    :returns: test case indices and files
+    :rtype: list of tuple of (str or unicode, list of tuple of (str or
+      unicode, str or unicode))
+    :raises ConfigError: if the test cases directory is not found
+    """
+    if self._test_case_files is None:
+      with trace.span("enumerate"):
+        self._test_case_files = list(self.test_case_files_generator())
+    return self._test_case_files
+
+  def test_case_files_generator(self):
+    """Return a generator for the files of each test case.
+
+    The method traverses `test_cases_dir`, looking for
+    sub-directories whose name matches the pattern
+    ``test-([-\w]+)``. For each directory, it yields a tuple of
+    form::
+
+      (test case index, [(format, file), ...])
+
+    listing the files in the directory which have an extension in
+    :mod:`prov_interop.standards`, sorted by file name. For example::
+
+      (case1, [("json", "/home/user/test-cases/test-case1/testcase1.json"),
+               ("provx", "/home/user/test-cases/test-case1/testcase1.provx")])
+
+    :returns: test case index and files
+    :rtype: tuple of (str or unicode, list of tuple of (str or
+      unicode, str or unicode))
+    :raises ConfigError: if the test cases directory is not found
+    """
     if not os.path.isdir(self._test_cases_dir):
       raise ConfigError("Directory not found: " + self._test_cases_dir)
     pattern = re.compile("^" + HarnessResources.TEST_CASE_PREFIX + "([-\w]+)$")
@@ -222,15 +549,10 @@ class HarnessResources(ConfigurableComponent):
         files = []
         for test_file in sorted(os.listdir(test_case_dir)):
           format = os.path.splitext(test_file)[1][1:]
-          # Only consider files with the supported extensions and which
-          # are in format_filter.
-          if format in standards.FORMATS and \
-                format in list(self.format_comparators.keys()):
+          # Only consider files with the supported extensions.
+          if format in standards.FORMATS:
             files.append((format, os.path.join(test_case_dir, test_file)))
-        # Create all-pairs combination of the files.
-        for (format1, file1) in files:
-          for (format2, file2) in files:
-            yield (testcase_id, format1, file1, format2, file2)
+        yield (testcase_id, files)
 
   def configure(self, config):
     """Configure harness. The configuration must hold:
@@ -258,6 +580,47 @@ class HarnessResources(ConfigurableComponent):
         }
       }
 
+    The configuration may also hold:
+
+    - ``journal``: name of a file in which each completed test job is
+      recorded (see :class:`prov_interop.journal.Journal`). 
+    - ``resume``: if ``True`` then test jobs already recorded in the
+      journal are not rerun, but report their recorded verdict. This
+      allows an interrupted run to pick up where it stopped. 
+    - ``incremental``: if ``True`` then test jobs already recorded in
+      the journal are not rerun if their converter, comparator and
+      test case files have the same fingerprints as when they were
+      recorded (see :mod:`prov_interop.fingerprint`), but report
+      their recorded verdict. 
+    - ``baseline``: name of a journal file from a previous run. If a
+      converted document has the same digest as that recorded in the
+      baseline for the same job, and the recorded verdict is ``pass``,
+      then the comparator is not invoked and the verdict is reused. 
+    - ``chains``: round-trip conversion chains (see
+      :meth:`prov_interop.chain.ChainTree.configure`). 
+    - ``results``: name of a file in which the result of each test
+      job, including timings of its steps, is recorded (see
+      :class:`prov_interop.results.ResultsStore`).
+    - ``run-id``: identifier of the run, recorded with each result. If
+      omitted then the value of the environment variable
+      ``PROV_HARNESS_RUN_ID``, if defined, is used.
+    - ``trace``: name of a directory into which timeline traces of the
+      run are written (see :mod:`prov_interop.trace`). If omitted then
+      the value of the environment variable ``PROV_HARNESS_TRACE``, if
+      defined, is used.
+    - ``progress``: name of a directory into which progress events
+      are written (see :mod:`prov_interop.progress`). If omitted then
+      the value of the environment variable
+      ``PROV_HARNESS_PROGRESS``, if defined, is used.
+    - ``log``: name of a directory into which log records are written
+      (see :mod:`prov_interop.log`). If omitted then the value of the
+      environment variable ``PROV_HARNESS_LOG``, if defined, is used.
+      If neither is defined then log records are written to standard
+      error.
+    - ``log-level``: logging level, one of ``DEBUG``, ``INFO``,
+      ``WARNING``, ``ERROR`` or ``CRITICAL``. If omitted then
+      ``WARNING`` is used. ``DEBUG`` includes the command lines run.
+
     This method invokes :func:`register_comparators` to
     create the comparators.
 
@@ -271,4 +634,30 @@ class HarnessResources(ConfigurableComponent):
     self.check_configuration(
       [HarnessResources.TEST_CASES_DIR, HarnessResources.COMPARATORS])
     self._test_cases_dir = config[HarnessResources.TEST_CASES_DIR]
+    self._test_case_files = None
+    self._test_cases = None
     self.register_comparators(config[HarnessResources.COMPARATORS])  
+    if HarnessResources.JOURNAL in config:
+      self._journal = Journal(config[HarnessResources.JOURNAL])
+    self._resume = config.get(HarnessResources.RESUME, False) is True
+    self._incremental = \
+        config.get(HarnessResources.INCREMENTAL, False) is True
+    if HarnessResources.BASELINE in config:
+      self._baseline = Journal(config[HarnessResources.BASELINE])
+    if HarnessResources.CHAINS in config:
+      self._chains.configure(config[HarnessResources.CHAINS])
+    if HarnessResources.RESULTS in config:
+      self._results = ResultsStore(config[HarnessResources.RESULTS],
+                                   config.get(HarnessResources.RUN_ID))
+    self._trace = config.get(HarnessResources.TRACE,
+                             os.environ.get(trace.TRACE_ENV))
+    progress_dir = config.get(HarnessResources.PROGRESS,
+                              os.environ.get(PROGRESS_ENV))
+    if progress_dir is not None:
+      self._progress = ProgressLog(progress_dir)
+    self._log = config.get(HarnessResources.LOG,
+                           os.environ.get(log.LOG_ENV))
+    self._log_level = str(config.get(HarnessResources.LOG_LEVEL,
+                                     log.LEVEL)).upper()
+    if self._log_level not in log.LEVELS:
+      raise ConfigError("Unrecognised logging level: " + self._log_level)
@@ -0,0 +1,112 @@
+"""Print the catalogue of an interoperability test harness: its
+comparators and the test cases that would be run.
+
+Enumerating and printing the test cases is not done when the test
+harness is initialised, so that collecting tests is fast and quiet.
+
+Usage::
+
+    usage: catalogue.py [-h] [-f FILE] [-s]
+
+    Print comparators and test cases of the interoperability test harness.
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -f FILE, --file FILE  Harness configuration file (default
+                            PROV_HARNESS_CONFIGURATION environment
+                            variable or localconfig/harness.yaml)
+      -s, --summary         Print only the number of test cases
+
+For example::
+
+    $ python -m prov_interop.interop_tests.catalogue -f harness.yaml
+    Comparators available:
+     json:ProvPyComparator
+     provx:ProvPyComparator
+    Test cases directory:
+    /home/user/test-cases
+    Test cases available:
+    case1:json->json
+    case1:json->provx
+    ...
+    Total: 8
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import sys
+
+from prov_interop.comparator import TieredComparator
+from prov_interop.interop_tests import harness
+
+def format_catalogue(harness_resources, summary=False):
+  """Format the comparators and test cases of a harness. If a format
+  has more than one comparator then they are listed in the order they
+  are tried.
+
+  :param harness_resources: Harness
+  :type harness_resources: :class:`prov_interop.harness.HarnessResources`
+  :param summary: If ``True`` then the test cases are not listed,
+    only their number
+  :type summary: bool
+  :return: formatted catalogue
+  :rtype: str or unicode
+  :raises ConfigError: if the test cases directory is not found
+  """
+  lines = ["Comparators available:"]
+  for format in sorted(harness_resources.format_comparators):
+    comparator = harness_resources.format_comparators[format]
+    if isinstance(comparator, TieredComparator):
+      comparators = comparator.comparators
+    else:
+      comparators = [comparator]
+    lines.append(" " + format + ":" + ",".join(
+      [comparator.__class__.__name__ for comparator in comparators]))
+  lines.append("Test cases directory:")
+  lines.append(harness_resources.test_cases_dir)
+  test_cases = harness_resources.test_cases()
+  if not summary:
+    lines.append("Test cases available:")
+    for (index, format1, _, format2, _) in test_cases:
+      lines.append(str(index) + ":" + format1 + "->" + format2)
+  lines.append("Total: " + str(len(test_cases)))
+  return "\n".join(lines)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Print comparators and test cases of the interoperability test harness.")
+  parser.add_argument("-f", "--file",
+                      help="Harness configuration file (default " +
+                      harness.CONFIGURATION_FILE_ENV + 
+                      " environment variable or " +
+                      harness.DEFAULT_CONFIGURATION_FILE + ")")
+  parser.add_argument("-s", "--summary", action="store_true",
+                      help="Print only the number of test cases")
+  args = parser.parse_args()
+  harness.initialise_harness_from_file(args.file)
+  print(format_catalogue(harness.harness_resources, args.summary))
+  sys.exit(0)
@@ -26,10 +26,14 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import os
+from timeit import default_timer
 
 from prov_interop.harness import HarnessResources
 from prov_interop import component
+from prov_interop import factory
+from prov_interop import log
 from prov_interop import standards
+from prov_interop import trace
 from prov_interop.component import ConfigError
 from prov_interop.files import load_yaml
 
@@ -48,6 +52,33 @@ harness_resources = None
 interoperability test harness resources
 """
 
+_converters = {}
+"""dict: configured converters, keyed by tuple of converter class and
+configuration key, each a tuple of the configuration file's state, a
+tuple of name, modification time and size, and the converter"""
+
+CONVERTERS = {
+  "ProvPy": ("prov_interop.provpy.converter.ProvPyConverter",
+             "PROVPY_TEST_CONFIGURATION",
+             "localconfig/provpy.yaml"),
+  "ProvToolbox": ("prov_interop.provtoolbox.converter.ProvToolboxConverter",
+                  "PROVTOOLBOX_TEST_CONFIGURATION",
+                  "localconfig/provtoolbox.yaml"),
+  "ProvStore": ("prov_interop.provstore.converter.ProvStoreConverter",
+                "PROVSTORE_TEST_CONFIGURATION",
+                "localconfig/provstore.yaml"),
+  "ProvTranslator": ("prov_interop.provtranslator.converter.ProvTranslatorConverter",
+                     "PROVTRANSLATOR_TEST_CONFIGURATION",
+                     "localconfig/provtranslator.yaml")
+}
+"""dict: converter names, as used in converter configuration files,
+mapped to tuples of converter class name, environment variable
+holding configuration file name and default configuration file name.
+These are the same as those used by the converter-specific test
+classes (e.g.
+:class:`prov_interop.interop_tests.test_provpy.ProvPyTestCase`).
+"""
+
 def initialise_harness_from_file(file_name = None):
   """Initialise interoperability test harness.
 
@@ -67,6 +98,23 @@ def initialise_harness_from_file(file_name = None):
   :class:`prov_interop.harness.HarnessResources` instance once it has 
   been created and initialised. 
 
+  If a trace directory is configured (see
+  :attr:`prov_interop.harness.HarnessResources.trace`) then tracing is
+  started (see :mod:`prov_interop.trace`), and configuration is
+  recorded as a ``configure`` event.
+
+  Logging is configured (see :func:`prov_interop.log.configure`) with
+  the log directory and level of the
+  :class:`prov_interop.harness.HarnessResources`. 
+
+  The test cases are not enumerated, unless a progress directory is
+  configured, in which case their number is written as the progress
+  total. Otherwise, they are enumerated when first requested via
+  :meth:`prov_interop.harness.HarnessResources.test_cases` and the
+  result shared by all test classes in the process. The catalogue of
+  comparators and test cases can be printed using
+  :mod:`prov_interop.interop_tests.catalogue`.
+
   A valid YAML configuration file, which, when loaded, yields a Python
   dictionary holding the configuration required by
   :class:`prov_interop.harness.HarnessResources` is::
@@ -86,26 +134,172 @@ def initialise_harness_from_file(file_name = None):
   :raises ConfigError: if the configuration in the file does not
     contain the configuration properties expected by
     :class:`prov_interop.harness.HarnessResources`
-  :raises YamlError: if the file is an invalid YAML file
+  :raises YamlError: if the file is an invalid YAML file, or its
+    values do not have the types in
+    :data:`prov_interop.harness.HarnessResources.SCHEMA`
   """
   global harness_resources
   global CONFIGURATION_FILE_ENV
   global DEFAULT_CONFIGURATION_FILE
   if harness_resources is None:
+    configure_start = default_timer()
     harness_resources = HarnessResources()
     config = load_yaml(CONFIGURATION_FILE_ENV,
                        DEFAULT_CONFIGURATION_FILE, 
-                       file_name)
+                       file_name,
+                       HarnessResources.SCHEMA)
     harness_resources.configure(config)
-    print("Comparators available:")
-    for format in harness_resources.format_comparators:
-      print((" " + format + ":" + 
-            harness_resources.format_comparators[format].__class__.__name__))
-    print("Test cases directory:")
-    print((harness_resources.test_cases_dir))
-    print("Test cases available:")
-    num_test_cases = 0
-    for (index, format1, _, format2, _) in harness_resources.test_cases_generator():
-      num_test_cases += 1
-      print((str(index) + ":" + format1 + "->" + format2))
-    print("Total: " + str(num_test_cases))
+    if harness_resources.trace is not None:
+      trace.start(harness_resources.trace)
+      trace.event("configure", configure_start, 
+                  default_timer() - configure_start)
+    log.configure(harness_resources.log_level, harness_resources.log)
+    if harness_resources.progress is not None:
+      harness_resources.progress.total(len(harness_resources.test_cases()))
+
+def get_converter_configuration_file(config_key, env_var, 
+                                    default_file_name):
+  """Get the name of the configuration file for a converter. This is:
+
+  - The value of an entry in
+    :class:`prov_interop.harness.HarnessResources` configuration with
+    name `config_key`, if any. 
+  - Else, the file named in the environment variable named in
+    `env_var`, if such an environment variable has been defined. 
+  - Else, `default_file_name`.
+
+  :param config_key: Key to access converter-specific configuration
+  :type config_key: str or unicode
+  :param env_var: Environment variable with configuration file name
+  :type env_var: str or unicode
+  :param default_file_name: Default configuration file name
+  :type file_name: str or unicode
+  :return: file name
+  :rtype: str or unicode
+  """
+  if config_key in harness_resources.configuration:
+    return harness_resources.configuration[config_key]
+  return os.environ.get(env_var, default_file_name)
+
+def load_converter_configuration(config_key, env_var, default_file_name):
+  """Load the configuration for a converter. 
+
+  This function loads the contents of a YAML file (using
+  :func:`prov_interop.files.load_yaml`) into a Python dictionary. The
+  file loaded is that given by
+  :func:`get_converter_configuration_file`.
+
+  Once loaded, the dictionary entry whose key is the value of
+  `config_key` is returned.
+
+  :param config_key: Key to access converter-specific configuration
+  :type config_key: str or unicode
+  :param env_var: Environment variable with configuration file name
+  :type env_var: str or unicode
+  :param default_file_name: Default configuration file name
+  :type file_name: str or unicode
+  :return: converter-specific configuration
+  :rtype: dict
+  :raises IOError: if the file is not found
+  :raises ConfigError: if there is no entry with value `config_key`
+    within the configuration
+  :raises YamlError: if the file is an invalid YAML file
+  """
+  config = load_yaml(env_var,
+                     default_file_name,
+                     get_converter_configuration_file(
+                       config_key, env_var, default_file_name),
+                     {config_key: dict})
+  if config_key not in config:
+    raise ConfigError("Missing configuration for " + config_key)
+  return config[config_key]
+
+def get_configured_converter(converter_class, config_key, env_var,
+                             default_file_name):
+  """Get a converter configured using
+  :func:`load_converter_configuration`.
+
+  Configured converters are cached in this process, keyed by class
+  and `config_key`, along with the name, modification time and size
+  of their configuration file. A cached converter is returned if the
+  file is unchanged, so the file is parsed, and the converter created
+  and configured, only once per process rather than once per test
+  job. If the file has changed then a new converter is created and
+  configured, and replaces the cached converter.
+
+  :param converter_class: Converter class
+  :type converter_class: class
+  :param config_key: Key to access converter-specific configuration
+  :type config_key: str or unicode
+  :param env_var: Environment variable with configuration file name
+  :type env_var: str or unicode
+  :param default_file_name: Default configuration file name
+  :type file_name: str or unicode
+  :return: converter
+  :rtype: :class:`prov_interop.converter.Converter`
+  :raises IOError: if the file is not found
+  :raises ConfigError: if there is no entry with value `config_key`
+    within the configuration, or if converter-specific configuration
+    information is missing
+  :raises YamlError: if the file is an invalid YAML file
+  """
+  file_name = get_converter_configuration_file(config_key, env_var, 
+                                               default_file_name)
+  stat = os.stat(file_name)
+  file_state = (file_name, stat.st_mtime, stat.st_size)
+  key = (converter_class, config_key)
+  if key in _converters:
+    (cached_state, converter) = _converters[key]
+    if cached_state == file_state:
+      return converter
+  converter = converter_class()
+  converter.configure(
+    load_converter_configuration(config_key, env_var, default_file_name))
+  _converters[key] = (file_state, converter)
+  return converter
+
+def get_converter_entry(name):
+  """Get the class name, environment variable holding configuration
+  file name and default configuration file name of a converter given
+  its name. This is its entry in :data:`CONVERTERS` or, if it is not
+  there, the class registered as a setuptools entry point with that
+  name in the group ``prov_interop.converters`` (see
+  :func:`prov_interop.factory.get_entry_points`). For example, for an
+  entry point ``MyConverter`` the environment variable is
+  ``MYCONVERTER_TEST_CONFIGURATION`` and the default file
+  ``localconfig/myconverter.yaml``.
+
+  :param name: Converter name e.g. ``ProvPy``
+  :type name: str or unicode
+  :return: class name, environment variable and default file name
+  :rtype: tuple of (str or unicode, str or unicode, str or unicode)
+  :raises ConfigError: if `name` is not in :data:`CONVERTERS` and is
+    not an entry point name
+  """
+  if name in CONVERTERS:
+    return CONVERTERS[name]
+  entry_points = factory.get_entry_points(factory.CONVERTERS_GROUP)
+  if name not in entry_points:
+    raise ConfigError("Unknown converter " + name)
+  return (entry_points[name],
+          name.upper() + "_TEST_CONFIGURATION",
+          "localconfig/" + name.lower() + ".yaml")
+
+def get_converter(name):
+  """Get a configured converter given its name in
+  :data:`CONVERTERS`, or of a converter entry point (see
+  :func:`get_converter_entry`), using :func:`get_configured_converter`.
+
+  :param name: Converter name e.g. ``ProvPy``
+  :type name: str or unicode
+  :return: converter
+  :rtype: :class:`prov_interop.converter.Converter`
+  :raises ConfigError: if `name` is not in :data:`CONVERTERS` and is
+    not an entry point name, or there are any problems loading the
+    converter's configuration or configuring it
+  :raises IOError: if the configuration file is not found
+  :raises YamlError: if the configuration file is an invalid YAML file
+  """
+  (class_name, env_var, default_file_name) = get_converter_entry(name)
+  return get_configured_converter(factory.get_class(class_name), name,
+                                  env_var, default_file_name)
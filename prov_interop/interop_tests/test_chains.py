@@ -0,0 +1,187 @@
+"""Round-trip interoperability tests across chains of converters.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import logging
+import shutil
+import sys
+import tempfile
+import unittest
+
+from nose_parameterized import parameterized
+from nose.plugins.skip import SkipTest
+from nose.tools import istest
+from nose.tools import nottest
+
+from prov_interop import chain
+from prov_interop.interop_tests import harness
+
+logger = logging.getLogger(__name__)
+
+SKIP_TESTS = "skip-tests"
+"""str or unicode: converter configuration key for tests to skip, as
+used by
+:class:`prov_interop.interop_tests.test_converter.ConverterTestCase`"""
+
+@nottest
+def test_chain_name(testcase_func, param_num, param):
+  """:mod:`nose_parameterized` callback function to create custom
+  test function names.
+
+  :param testcase_func: test function
+  :type testcase_func: function
+  :param param_num: number of parameters in `param`
+  :type param_num: int
+  :param param: tuple of arguments to test function
+  :type param: tuple of form (int, str or unicode, _, _)
+  :return: test function name of form ``N_EXTIN`` (e.g.
+    ``test_chain_1_json``)
+  :rtype: str or unicode
+  """
+  (index, ext_in, _, _) =  param.args
+  return str("%s_%s" %(
+    testcase_func.__name__,
+    parameterized.to_safe_name(str(index) + "_" + ext_in)))
+
+@istest
+class ChainTestCase(unittest.TestCase):
+  """Round-trip interoperability tests across chains of converters.
+
+  Chains are configured via a ``chains`` entry in the
+  :class:`prov_interop.harness.HarnessResources` configuration (see
+  :meth:`prov_interop.chain.ChainTree.configure`). For example::
+
+    chains:
+      ProvPyProvToolbox:
+        - {converter: ProvPy, format: provx}
+        - {converter: ProvToolbox, format: json}
+      ProvPyProvToolboxProvPy:
+        - {converter: ProvPy, format: provx}
+        - {converter: ProvToolbox, format: json}
+        - {converter: ProvPy, format: provn}
+
+  Converters are named as in
+  :data:`prov_interop.interop_tests.harness.CONVERTERS` and their
+  configuration is loaded in the same way as for the
+  converter-specific test classes.
+
+  There is one test for each test case file. It runs every chain on
+  that file using :func:`prov_interop.chain.run_chains`, so that
+  each chain prefix common to multiple chains is converted only once,
+  and the output of each step is compared to the test case file for
+  its format. Steps whose converter has the test case in its
+  ``skip-tests`` configuration are skipped, with the steps below
+  them, as in the converter-specific test classes.
+  """
+
+  _multiprocess_can_split_ = True
+
+  def setUp(self):
+    super(ChainTestCase, self).setUp()
+    self.work_dir = tempfile.mkdtemp()
+    self.converters = {}
+    for name in harness.harness_resources.chains.converters:
+      self.converters[name] = harness.get_converter(name)
+
+  def tearDown(self):
+    super(ChainTestCase, self).tearDown()
+    shutil.rmtree(self.work_dir, ignore_errors=True)
+
+  def shortDescription(self):
+    """Suppress use of docstring by nose when printing tests being run"""
+    return None
+
+  @nottest
+  def initialise_chain_harness():
+    """Initialises the test harness and provide the test case files
+    as a generator.
+
+    If running Sphinx to create API documentation, or no chains are
+    configured, then a generator that contains zero test cases is
+    returned.
+
+    :returns: tuple of test case index, format, file, and the
+      formats and files of all files in that test case
+    :rtype: tuple of (str or unicode, str or unicode, str or unicode,
+      list of tuple of (str or unicode, str or unicode))
+    :raises ConfigError: if the test cases directory is not found
+    """
+    if "sphinx-build" in sys.argv[0]:
+      return
+    harness.initialise_harness_from_file()
+    if harness.harness_resources.chains.nodes() == 0:
+      return
+    for (index, files) in harness.harness_resources.test_case_files():
+      for (format, test_file) in files:
+        yield (index, format, test_file, files)
+
+  @parameterized.expand(initialise_chain_harness(),
+                        testcase_func_name=test_chain_name)
+  def test_chain(self, index, ext_in, file_ext_in, files):
+    """Test chains of converters starting from a test case file.
+
+    - Every chain is run on `file_ext_in` (see
+      :func:`prov_interop.chain.run_chains`), skipping steps whose
+      converter has `index` in its ``skip-tests``.
+    - If no step could be run, as no chain starts with a converter
+      that supports `ext_in` and does not skip the test case, then
+      the test is skipped.
+    - If any step's conversion failed, or its output is not
+      equivalent to the test case file in its format, then the test
+      fails.
+
+    :param index: Test case index
+    :type index: str or unicode
+    :param ext_in: input format, one of the formats in
+      :mod:`prov_interop.standards`
+    :type ext_in: str or unicode
+    :param file_ext_in: input file, assumed to have extension `ext_in`
+    :type file_ext_in: str or unicode
+    :param files: formats and files of all files in the test case
+    :type files: list of tuple of (str or unicode, str or unicode)
+    :raises nose.plugins.skip.SkipTest: if no chain could be run
+    """
+    logger.info("Test case: %s chains from %s", index, ext_in)
+    skipped = [name for (name, converter) in self.converters.items()
+               if index in converter.configuration.get(SKIP_TESTS, [])]
+    results = chain.run_chains(harness.harness_resources.chains,
+                               self.converters,
+                               harness.harness_resources.format_comparators,
+                               file_ext_in,
+                               dict(files),
+                               self.work_dir,
+                               skipped)
+    for result in results:
+      logger.info("%s", result)
+    if all([result.status in [chain.UNSUPPORTED, chain.SKIPPED]
+            for result in results]):
+      raise SkipTest("No chain can be run on test case " + str(index) +
+                     " from input format " + ext_in)
+    failures = [str(result) for result in results
+                if result.status in [chain.FAIL, chain.ERROR]]
+    self.assertEqual([], failures,
+                     msg="Test failed: chains from " + file_ext_in +
+                     " failed: " + "; ".join(failures))
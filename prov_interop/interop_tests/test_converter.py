@@ -33,24 +33,65 @@ dynamically creates the test methods (see
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import atexit
 import inspect
+import logging
 import os
 import re
 import sys
 import tempfile
 import unittest
+from timeit import default_timer
 
 from nose_parameterized import parameterized
 from nose.plugins.skip import SkipTest
 from nose.tools import istest
 from nose.tools import nottest
 
+from prov_interop import fingerprint
+from prov_interop import log
+from prov_interop import progress
 from prov_interop import standards
+from prov_interop import timing
+from prov_interop import trace
+from prov_interop import usage
+from prov_interop.comparator import ComparisonError
 from prov_interop.component import ConfigError
+from prov_interop.converter import ConversionError
 from prov_interop.converter import Converter
-from prov_interop.files import load_yaml
+from prov_interop.files import hash_file
 from prov_interop.harness import HarnessResources
 from prov_interop.interop_tests import harness
+from prov_interop.journal import Journal
+from prov_interop.results import ResultsStore
+
+logger = logging.getLogger(__name__)
+
+_converted_outputs = {}
+"""dict: output files from the most recent call to
+:meth:`prov_interop.converter.Converter.convert_many` in this
+process, keyed by converter name and input file, each a dict of
+output files keyed by format, not yet used by a test"""
+
+_compared_outputs = {}
+"""dict: verdicts from comparing the output files in
+:data:`_converted_outputs` with their test case files, using
+:meth:`prov_interop.comparator.Comparator.compare_many`, keyed by
+converter name and input file, each a dict keyed by format of tuples
+of test case file, output file and verdict, not yet used by a test"""
+
+def remove_converted_outputs():
+  """Remove output files in :data:`_converted_outputs` not yet used
+  by a test, and clear it and :data:`_compared_outputs`.
+  """
+  for out_files in _converted_outputs.values():
+    for out_file in out_files.values():
+      if os.path.isfile(out_file):
+        os.remove(out_file)
+  _converted_outputs.clear()
+  _compared_outputs.clear()
+
+atexit.register(remove_converted_outputs)
 
 @nottest
 def test_case_name(testcase_func, param_num, param):
@@ -102,12 +143,21 @@ class ConverterTestCase(unittest.TestCase):
     self.converter = None
     self.skip_tests = []
     self.converter_ext_out = None
+    self.job_start = default_timer()
+    self.job_verdict = ResultsStore.ERROR
 
   def tearDown(self):
     super(ConverterTestCase, self).tearDown()
-    if self.converter_ext_out != None and \
-          os.path.isfile(self.converter_ext_out):
-      os.remove(self.converter_ext_out)
+    with trace.span("cleanup"):
+      if self.converter_ext_out != None and \
+            os.path.isfile(self.converter_ext_out):
+        os.remove(self.converter_ext_out)
+    trace.event("job", self.job_start, default_timer() - self.job_start,
+                {"test": self.id()})
+    trace.flush()
+    log.flush()
+    if harness.harness_resources.progress is not None:
+      harness.harness_resources.progress.end(self.job_verdict)
 
   def shortDescription(self):
     """Suppress use of docstring by nose when printing tests being run"""
@@ -118,9 +168,12 @@ class ConverterTestCase(unittest.TestCase):
     sub-class. 
 
     The method assumes the converter has been created and stored in an
-    instance variable. It loads the contents of a YAML file (using
-    :func:`prov_interop.files.load_yaml`) into a Python
-    dictionary. The file loaded is: 
+    instance variable. It replaces it with a converter of the same
+    class configured using
+    :func:`prov_interop.interop_tests.harness.get_configured_converter`,
+    which loads the contents of a YAML file into a Python dictionary
+    only once per process, unless the file changes. The file loaded
+    is: 
 
     - The value of an entry in
       :class:`prov_interop.harness.HarnessResources` configuration with
@@ -131,7 +184,9 @@ class ConverterTestCase(unittest.TestCase):
 
     Once loaded, a dictionary entry with whose key is the value of
     `config_key` is extracted and used to configure the converter via
-    its :meth:`prov_interop.converter.Converter.configure` method. 
+    its :meth:`prov_interop.converter.Converter.configure` method. The
+    configured converter is shared by all test jobs in the process
+    that use the same class and `config_key`.
 
     In addition to converter-specific configuration, this
     configuration can also hold:
@@ -176,15 +231,9 @@ class ConverterTestCase(unittest.TestCase):
       configuration information is missing
     :raises YamlError: if the file is an invalid YAML file
     """
-    config_file_name = None
-    if config_key in harness.harness_resources.configuration:
-      config_file_name = harness.harness_resources.configuration[config_key]
-    config = load_yaml(env_var,
-                       default_file_name,
-                       config_file_name)
-    if config_key not in config:
-      raise ConfigError("Missing configuration for " + config_key)
-    self.converter.configure(config[config_key])
+    with trace.span("configure"):
+      self.converter = harness.get_configured_converter(
+        self.converter.__class__, config_key, env_var, default_file_name)
     if ConverterTestCase.SKIP_TESTS in self.converter.configuration:
       self.skip_tests = self.converter.configuration[
         ConverterTestCase.SKIP_TESTS]
@@ -199,7 +248,8 @@ class ConverterTestCase(unittest.TestCase):
     :type index: int
     :raises nose.plugins.skip.SkipTest: always
     """
-    print(("Skipping as " + str(index) + " in skip-tests"))
+    logger.info("Skipping as %s in skip-tests", index)
+    self.job_verdict = progress.SKIP
     raise SkipTest(("Test case " + str(index) +
                     " in " + self.converter.__class__.__name__ + 
                     " skip-tests"))
@@ -219,12 +269,307 @@ class ConverterTestCase(unittest.TestCase):
     :type format_type: str or unicode
     :raises nose.plugins.skip.SkipTest: always
     """
-    print(("Skipping as " + str(index) + " in skip-tests"))
-    print(("Skipping as " + format + " not in converter's " + format_type))
+    logger.info("Skipping as %s not in converter's %s", format, format_type)
+    self.job_verdict = progress.SKIP
     raise SkipTest(("Format " + format +
                     " not in " + self.converter.__class__.__name__ + 
                     " " + format_type))
 
+  def expected_files(self, file_ext_in):
+    """Get the test case files in the same directory as an input
+    file.
+
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :return: test case files keyed by format
+    :rtype: dict from str or unicode to str or unicode
+    """
+    test_case_dir = os.path.dirname(file_ext_in)
+    test_case_files = {}
+    for test_file in sorted(os.listdir(test_case_dir)):
+      format = os.path.splitext(test_file)[1][1:]
+      test_case_files.setdefault(format,
+                                 os.path.join(test_case_dir, test_file))
+    return test_case_files
+
+  def in_journal(self, index, ext_in, file_ext_in, ext_out, file_ext_out):
+    """Check whether the verdict of a test job will be reported from
+    the journal, without converting or comparing, by
+    :meth:`test_case`. This is the case if the journal holds a verdict
+    for the job and either ``resume`` is configured or ``incremental``
+    is configured and the recorded fingerprints are the same as the
+    job's current fingerprints.
+
+    :param index: Test case index
+    :type index: int
+    :param ext_in: input format
+    :type ext_in: str or unicode
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :param ext_out: output format
+    :type ext_out: str or unicode
+    :param file_ext_out: test case file in the output format
+    :type file_ext_out: str or unicode
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    journal = harness.harness_resources.journal
+    if journal is None:
+      return False
+    entry = journal.get(self.converter.__class__.__name__, index, ext_in,
+                        ext_out)
+    if entry is None:
+      return False
+    if harness.harness_resources.resume:
+      return True
+    if not harness.harness_resources.incremental:
+      return False
+    comparator = harness.harness_resources.format_comparators[ext_out]
+    return entry.get(Journal.FINGERPRINTS) == fingerprint.job_fingerprints(
+      self.converter, comparator, file_ext_in, file_ext_out)
+
+  def convert_many(self, index, ext_in, file_ext_in):
+    """Convert an input file into every output format for which there
+    is a test case file, in the same directory as the input file, a
+    comparator, and support from the converter, using
+    :meth:`prov_interop.converter.Converter.convert_many`. Formats
+    whose test jobs will be reported from the journal (see
+    :meth:`in_journal`) are not converted.
+
+    :param index: Test case index
+    :type index: int
+    :param ext_in: input format
+    :type ext_in: str or unicode
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :return: output files keyed by format, or an empty dict if the
+      conversion failed
+    :rtype: dict from str or unicode to str or unicode
+    """
+    test_case_files = self.expected_files(file_ext_in)
+    out_files = {}
+    for format in self.converter.output_formats:
+      if format in test_case_files and \
+            format in harness.harness_resources.format_comparators and \
+            not self.in_journal(index, ext_in, file_ext_in, format,
+                                test_case_files[format]):
+        out_files[format] = "out." + str(os.getpid()) + ".many." + format
+    if not out_files:
+      return {}
+    try:
+      self.converter.convert_many(file_ext_in, out_files)
+    except ConversionError as exc:
+      logger.warning("Converting to all formats failed: %s", exc)
+      for out_file in out_files.values():
+        if os.path.isfile(out_file):
+          os.remove(out_file)
+      return {}
+    return out_files
+
+  def compare_many(self, index, ext_in, file_ext_in, out_files):
+    """Compare output files from :meth:`convert_many` with the test
+    case files, in the same directory as the input file, in the same
+    formats. For each comparator whose
+    :attr:`prov_interop.comparator.Comparator.supports_compare_many`
+    is ``True``, all its comparisons are done in one batch, using
+    :meth:`prov_interop.comparator.Comparator.compare_many`. Output
+    files whose comparators do not support this, or which could not
+    be compared, are left to be compared by their tests. Output
+    files which match a passing verdict in the baseline are not
+    compared, as their tests reuse that verdict.
+
+    :param index: Test case index
+    :type index: int
+    :param ext_in: input format
+    :type ext_in: str or unicode
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :param out_files: output files keyed by format
+    :type out_files: dict from str or unicode to str or unicode
+    :return: tuples of test case file, output file and verdict keyed
+      by format
+    :rtype: dict from str or unicode to tuple of (str or unicode, str
+      or unicode, bool)
+    """
+    test_case_files = self.expected_files(file_ext_in)
+    baseline = harness.harness_resources.baseline
+    batches = []
+    for format in sorted(out_files):
+      comparator = harness.harness_resources.format_comparators[format]
+      if not comparator.supports_compare_many or \
+            format not in test_case_files:
+        continue
+      if baseline is not None and baseline.matches_baseline(
+          self.converter.__class__.__name__, index, ext_in, format,
+          hash_file(out_files[format]),
+          fingerprint.job_fingerprints(self.converter, comparator,
+                                       file_ext_in,
+                                       test_case_files[format])):
+        continue
+      for (batch_comparator, formats) in batches:
+        if batch_comparator is comparator:
+          formats.append(format)
+          break
+      else:
+        batches.append((comparator, [format]))
+    compared = {}
+    for (comparator, formats) in batches:
+      pairs = [(test_case_files[format], out_files[format])
+               for format in formats]
+      try:
+        verdicts = comparator.compare_many(pairs)
+      except (ComparisonError, OSError) as exc:
+        logger.warning("Comparing all formats failed: %s", exc)
+        continue
+      for (format, (file_ext_out, out_file), verdict) in \
+            zip(formats, pairs, verdicts):
+        if verdict is not None:
+          compared[format] = (file_ext_out, out_file, verdict)
+    return compared
+
+  def compare(self, comparator, file_ext_in, file_ext_out):
+    """Compare a test case file with the output file,
+    ``converter_ext_out``. If they were compared along with the other
+    output files for the input file (see :meth:`compare_many`) then
+    that verdict is used, else they are compared using the
+    comparator's :meth:`prov_interop.comparator.Comparator.compare`.
+
+    A comparison of one pair of files is timed as a ``compare`` span,
+    and a comparison of the output files for an input file in one
+    batch as a ``compare_many`` span, by the test which converted
+    them. Tests which use verdicts from a batch record no comparison
+    span.
+
+    :param comparator: Comparator for the output format
+    :type comparator: :class:`prov_interop.comparator.Comparator`
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :param file_ext_out: test case file in the output format
+    :type file_ext_out: str or unicode
+    :return: ``True`` or ``False``
+    :rtype: bool
+    :raises ComparisonError: if the comparison fails
+    """
+    key = (self.converter.__class__.__name__, file_ext_in)
+    ext_out = os.path.splitext(self.converter_ext_out)[1][1:]
+    compared = _compared_outputs.get(key, {}).pop(ext_out, None)
+    if compared is not None and \
+          compared[:2] == (file_ext_out, self.converter_ext_out):
+      return compared[2]
+    with timing.span("compare"):
+      return comparator.compare(file_ext_out, self.converter_ext_out)
+
+  def convert(self, index, ext_in, file_ext_in, ext_out):
+    """Convert an input file into an output format, setting
+    ``converter_ext_out`` to the output file.
+
+    If the converter's
+    :attr:`prov_interop.converter.Converter.supports_convert_many` is
+    ``True`` then the first test for an input file converts it into
+    all the output formats at once (see :meth:`convert_many`), and
+    tests for the same input file then use the cached output
+    files. The output files are also compared, in batches, with their
+    test case files (see :meth:`compare_many`). Test cases are
+    provided grouped by input file (see
+    :meth:`prov_interop.harness.HarnessResources.test_cases_generator`),
+    so only the output files for one input file are cached at any
+    time. Output files are not created, or compared, for tests whose
+    verdicts are reported from the journal (see :meth:`in_journal`),
+    and are not compared for tests whose verdicts are reused from the
+    baseline. If converting into all the output formats at once fails
+    then each test converts its input file itself, so conversion
+    errors are reported against individual tests.
+
+    A conversion of the input file into one output format is timed
+    as a ``convert`` span, and a conversion into all the output
+    formats at once as a ``convert_many`` span (see
+    :func:`prov_interop.timing.span`). Tests which use cached output
+    files record no conversion span, so the ``convert`` durations of
+    a converter, input format and output format are only ever those
+    of a single conversion.
+
+    :param index: Test case index
+    :type index: int
+    :param ext_in: input format
+    :type ext_in: str or unicode
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :param ext_out: output format, one of the formats in
+      :mod:`prov_interop.standards`
+    :type ext_out: str or unicode
+    :raises ConversionError: if the conversion fails
+    """
+    if self.converter.supports_convert_many:
+      key = (self.converter.__class__.__name__, file_ext_in)
+      if key not in _converted_outputs:
+        remove_converted_outputs()
+        with timing.span("convert_many"):
+          _converted_outputs[key] = self.convert_many(index, ext_in,
+                                                      file_ext_in)
+        with timing.span("compare_many"):
+          _compared_outputs[key] = self.compare_many(
+            index, ext_in, file_ext_in, _converted_outputs[key])
+      if ext_out in _converted_outputs[key]:
+        self.converter_ext_out = _converted_outputs[key].pop(ext_out)
+        return
+    self.converter_ext_out = "out." + str(os.getpid()) + "." + ext_out
+    with timing.span("convert"):
+      self.converter.convert(file_ext_in, self.converter_ext_out)
+
+  def record_result(self, index, ext_in, file_ext_in, ext_out, 
+                    file_ext_out, verdict):
+    """Stop timing and record the result of a test job in the results
+    store configured in :class:`prov_interop.harness.HarnessResources`,
+    with the spans timed during the job, the resource usage of child
+    processes, the sizes of the input, output and expected files, and
+    the converter's fingerprint. 
+
+    :param index: Test case index
+    :type index: str or unicode
+    :param ext_in: input format
+    :type ext_in: str or unicode
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :param ext_out: output format
+    :type ext_out: str or unicode
+    :param file_ext_out: expected output file
+    :type file_ext_out: str or unicode
+    :param verdict: ``pass``, ``fail`` or ``error``
+    :type verdict: str or unicode
+    """
+    spans = timing.stop()
+    resources = usage.stop()
+    sizes = {}
+    for (key, file_name) in [("input", file_ext_in),
+                             ("output", self.converter_ext_out),
+                             ("expected", file_ext_out)]:
+      if file_name is not None and os.path.isfile(file_name):
+        sizes[key] = os.path.getsize(file_name)
+    harness.harness_resources.results.record(
+      self.converter.__class__.__name__, index, ext_in, ext_out, verdict,
+      sizes=sizes, durations=timing.durations(spans), spans=spans,
+      usage=resources, fingerprint=self.converter.fingerprint())
+
+  def assert_journal_verdict(self, entry, file_ext_in, file_ext_out):
+    """Report the verdict of a test job recorded in the journal
+    rather than rerunning it. 
+
+    :param entry: Journal entry
+    :type entry: dict
+    :param file_ext_in: input file
+    :type file_ext_in: str or unicode
+    :param file_ext_out: output file
+    :type file_ext_out: str or unicode
+    :raises AssertionError: if the recorded verdict is not ``pass``
+    """
+    logger.info("Verdict recorded in journal: %s", entry[Journal.VERDICT])
+    self.job_verdict = entry[Journal.VERDICT]
+    self.assertEqual(Journal.PASS, entry[Journal.VERDICT], \
+      msg="Test failed: " + file_ext_out + 
+          " does not match output converted from " + file_ext_in + 
+          " (recorded in " + harness.harness_resources.journal.file_name + 
+          ")")
+
   @nottest
   def initialise_test_harness():
     """Initialises the test harness and provide the test cases as a
@@ -232,10 +577,11 @@ class ConverterTestCase(unittest.TestCase):
 
     The test harness is bootstrapped by a call to
     :func:`prov_interop.interop_tests.harness.initialise_harness_from_file`. 
-    This method provides test case tuples by returning the generator,
-    :meth:`prov_interop.harness.HarnessResources.test_cases_generator`,
-    so that :mod:`nose_parameterized` can dynamically creates the test
-    methods (see
+    This method provides test case tuples by returning the list,
+    :meth:`prov_interop.harness.HarnessResources.test_cases`, which is
+    enumerated once per process and shared by every converter test
+    class, so that :mod:`nose_parameterized` can dynamically creates
+    the test methods (see
     :meth:`prov_interop.interop_tests.test_converter.ConverterTestCase.test_case`).
 
     If running Sphinx to create API documentation then the test
@@ -252,7 +598,7 @@ class ConverterTestCase(unittest.TestCase):
       return (nothing for nothing in ())
     else:
       harness.initialise_harness_from_file()
-      return harness.harness_resources.test_cases_generator()
+      return harness.harness_resources.test_cases()
 
   @parameterized.expand(initialise_test_harness(), 
                         testcase_func_name=test_case_name)
@@ -269,13 +615,41 @@ class ConverterTestCase(unittest.TestCase):
       ``output-formats`` for the converter then the test is skipped,
       again by raising :class:`nose.plugins.skip.SkipTest`. 
     - The converter translates ``testcaseNNNN/file_ext_in`` to 
-      ``out.ext_out``.
+      ``out.ext_out`` (see :meth:`convert`).
     - The comparator for `ext_out` registered with
       :class:`prov_interop.harness.HarnessResources` is retrieved. 
     - The comparator compares ``testcaseNNNN/file.ext_out`` to 
       ``out.ext_out`` for equivalence, which results in either success
       or failure. 
 
+    If a journal is configured in
+    :class:`prov_interop.harness.HarnessResources` then the verdict,
+    a digest of ``out.ext_out`` and the job's fingerprints (see
+    :func:`prov_interop.fingerprint.job_fingerprints`) are recorded
+    in it. If the journal already holds a verdict for this converter
+    and test case tuple then that verdict is reported, and the
+    conversion and comparison are not done, if either:
+
+    - ``resume`` is configured.
+    - ``incremental`` is configured and the recorded fingerprints are
+      the same as the job's current fingerprints.
+
+    If a baseline is configured in
+    :class:`prov_interop.harness.HarnessResources`, and it records a
+    ``pass`` verdict for this converter and test case tuple for a
+    converted document with the same digest as ``out.ext_out``, then
+    the comparator is not invoked and the verdict is reused. 
+
+    If a results store is configured in
+    :class:`prov_interop.harness.HarnessResources` then the verdict,
+    file sizes and timings of the conversion, comparison and other
+    steps are recorded in it (see :meth:`record_result`).
+
+    If a progress directory is configured in
+    :class:`prov_interop.harness.HarnessResources` then the start and
+    end, with its verdict, of the job are recorded as progress events
+    (see :class:`prov_interop.progress.ProgressLog`).
+
     :mod:`nose_parameterized`, in conjunction with the test case
     tuples provided via the generator,
     :meth:`prov_interop.harness.HarnessResources.test_cases_generator`,
@@ -310,19 +684,69 @@ class ConverterTestCase(unittest.TestCase):
       skipped, or the input format or output format are not supported
       by the converter
     """
-    print(("Test case: " + str(index) + 
-          " from " + ext_in + 
-          " to " + ext_out + " Process: " + str(os.getpid())))
+    logger.info("Test case: %s from %s to %s", index, ext_in, ext_out)
+    if harness.harness_resources.progress is not None:
+      harness.harness_resources.progress.start(progress.job_name(
+        self.converter.__class__.__name__, index, ext_in, ext_out))
     if index in self.skip_tests:
       self.skip_member_of_skip_set(index)
     if (not ext_in in self.converter.input_formats):
       self.skip_unsupported_format(index, ext_in, Converter.INPUT_FORMATS)
     if (not ext_out in self.converter.output_formats):
       self.skip_unsupported_format(index, ext_out, Converter.OUTPUT_FORMATS)
-    self.converter_ext_out = "out." + str(os.getpid()) + "." + ext_out
-    self.converter.convert(file_ext_in, self.converter_ext_out)
     comparator = harness.harness_resources.format_comparators[ext_out]
-    are_equivalent = comparator.compare(file_ext_out, self.converter_ext_out)
+    journal = harness.harness_resources.journal
+    baseline = harness.harness_resources.baseline
+    converter_name = self.converter.__class__.__name__
+    fingerprints = None
+    if journal is not None:
+      entry = journal.get(converter_name, index, ext_in, ext_out)
+      if entry is not None and harness.harness_resources.resume:
+        self.assert_journal_verdict(entry, file_ext_in, file_ext_out)
+        return
+    results = harness.harness_resources.results
+    if results is not None:
+      timing.start()
+      usage.start()
+    if journal is not None or baseline is not None:
+      with timing.span("fingerprint"):
+        fingerprints = fingerprint.job_fingerprints(
+          self.converter, comparator, file_ext_in, file_ext_out)
+    if journal is not None:
+      if entry is not None and harness.harness_resources.incremental and \
+            entry.get(Journal.FINGERPRINTS) == fingerprints:
+        timing.stop()
+        usage.stop()
+        self.assert_journal_verdict(entry, file_ext_in, file_ext_out)
+        return
+    verdict = ResultsStore.ERROR
+    try:
+      self.convert(index, ext_in, file_ext_in, ext_out)
+      output_hash = None
+      if journal is not None or baseline is not None:
+        with timing.span("hash"):
+          output_hash = hash_file(self.converter_ext_out)
+      from_baseline = baseline is not None and baseline.matches_baseline(
+        converter_name, index, ext_in, ext_out, output_hash, fingerprints)
+      if from_baseline:
+        logger.info("Output unchanged from passing baseline: %s",
+                    baseline.file_name)
+        are_equivalent = True
+      else:
+        are_equivalent = self.compare(comparator, file_ext_in,
+                                      file_ext_out)
+      verdict = ResultsStore.PASS if are_equivalent else ResultsStore.FAIL
+      self.job_verdict = verdict
+    finally:
+      if results is not None:
+        self.record_result(index, ext_in, file_ext_in, ext_out, 
+                           file_ext_out, verdict)
+    if journal is not None:
+      journal.record(converter_name, index, ext_in, ext_out, 
+                     Journal.PASS if are_equivalent else Journal.FAIL,
+                     output_hash,
+                     fingerprints=fingerprints,
+                     from_baseline=from_baseline)
     self.assertTrue(are_equivalent, \
       msg="Test failed: " + file_ext_out + 
           " does not match " + self.converter_ext_out + 
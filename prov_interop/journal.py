@@ -0,0 +1,231 @@
+"""Append-only journal of completed interoperability test jobs.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import os
+
+from prov_interop import fingerprint
+
+class Journal(object):
+  """Append-only journal of completed test jobs.
+
+  A job is the conversion of one test case file into one output
+  format by one converter, followed by the comparison of the
+  converted document with the test case file in that output format.
+  Each completed job is recorded as a single line of JSON, appended
+  to the journal file and flushed to disk (via ``fsync``) before
+  :meth:`record` returns, so that the journal survives a run being
+  killed. For example::
+
+    {"converter": "ProvPyConverter", "ext_in": "json", "ext_out": "provx",
+     "index": "case1", "output_hash": "6e1b...", "verdict": "pass"}
+
+  Each line is written using a single ``write`` to a file opened in
+  append mode, so multiple processes can safely share a journal.
+
+  If a job is recorded more than once then the most recent entry
+  wins.
+  """
+
+  CONVERTER = "converter"
+  """str or unicode: entry key for converter name"""
+  INDEX = "index"
+  """str or unicode: entry key for test case index"""
+  EXT_IN = "ext_in"
+  """str or unicode: entry key for input format"""
+  EXT_OUT = "ext_out"
+  """str or unicode: entry key for output format"""
+  VERDICT = "verdict"
+  """str or unicode: entry key for verdict"""
+  OUTPUT_HASH = "output_hash"
+  """str or unicode: entry key for digest of converted document"""
+  FINGERPRINTS = "fingerprints"
+  """str or unicode: entry key for job fingerprints (see
+  :func:`prov_interop.fingerprint.job_fingerprints`)"""
+  FROM_BASELINE = "from_baseline"
+  """str or unicode: entry key for flag indicating the verdict was
+  reused from a baseline rather than computed by a comparator"""
+
+  PASS = "pass"
+  """str or unicode: verdict for equivalent documents"""
+  FAIL = "fail"
+  """str or unicode: verdict for non-equivalent documents"""
+
+  def __init__(self, file_name):
+    """Create journal and load any entries already in `file_name`.
+
+    :param file_name: Journal file name
+    :type file_name: str or unicode
+    """
+    self._file_name = file_name
+    self._entries = {}
+    self.load()
+
+  @property
+  def file_name(self):
+    """Get journal file name.
+
+    :return: file name
+    :rtype: str or unicode
+    """
+    return self._file_name
+
+  @property
+  def entries(self):
+    """Get journal entries, keyed by job (see :meth:`key`).
+
+    :return: entries
+    :rtype: dict from tuple to dict
+    """
+    return self._entries
+
+  @staticmethod
+  def key(converter, index, ext_in, ext_out):
+    """Get key identifying a job.
+
+    :param converter: Converter name
+    :type converter: str or unicode
+    :param index: Test case index
+    :type index: str or unicode
+    :param ext_in: Input format
+    :type ext_in: str or unicode
+    :param ext_out: Output format
+    :type ext_out: str or unicode
+    :return: key
+    :rtype: tuple
+    """
+    return (converter, str(index), ext_in, ext_out)
+
+  def load(self):
+    """Load entries from the journal file, if it exists. A
+    truncated final line, left by a process killed while writing,
+    is ignored.
+    """
+    if not os.path.isfile(self._file_name):
+      return
+    with open(self._file_name, "r") as f:
+      for line in f:
+        try:
+          entry = json.loads(line)
+        except ValueError:
+          continue
+        self._entries[Journal.key(entry[Journal.CONVERTER],
+                                  entry[Journal.INDEX],
+                                  entry[Journal.EXT_IN],
+                                  entry[Journal.EXT_OUT])] = entry
+
+  def get(self, converter, index, ext_in, ext_out):
+    """Get the entry for a job.
+
+    :param converter: Converter name
+    :type converter: str or unicode
+    :param index: Test case index
+    :type index: str or unicode
+    :param ext_in: Input format
+    :type ext_in: str or unicode
+    :param ext_out: Output format
+    :type ext_out: str or unicode
+    :return: entry or ``None`` if the job has not been recorded
+    :rtype: dict
+    """
+    return self._entries.get(Journal.key(converter, index, ext_in, ext_out))
+
+  def matches_baseline(self, converter, index, ext_in, ext_out,
+                       output_hash, fingerprints=None):
+    """Check whether a job has a passing verdict for the same
+    converted document. This is the case if an entry for the job
+    exists, its verdict is ``pass`` and its output hash is
+    `output_hash`. If `fingerprints` are provided, and the entry
+    holds fingerprints, then the comparator and expected test case
+    file fingerprints must also be the same, as changes to either
+    could change the verdict.
+
+    :param converter: Converter name
+    :type converter: str or unicode
+    :param index: Test case index
+    :type index: str or unicode
+    :param ext_in: Input format
+    :type ext_in: str or unicode
+    :param ext_out: Output format
+    :type ext_out: str or unicode
+    :param output_hash: Digest of converted document
+    :type output_hash: str or unicode
+    :param fingerprints: Job fingerprints (optional)
+    :type fingerprints: dict
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    entry = self.get(converter, index, ext_in, ext_out)
+    if entry is None or entry[Journal.VERDICT] != Journal.PASS or \
+          entry[Journal.OUTPUT_HASH] != output_hash:
+      return False
+    recorded = entry.get(Journal.FINGERPRINTS)
+    if fingerprints is not None and recorded is not None:
+      for key in [fingerprint.COMPARATOR, fingerprint.EXPECTED]:
+        if recorded.get(key) != fingerprints.get(key):
+          return False
+    return True
+
+  def record(self, converter, index, ext_in, ext_out, verdict,
+             output_hash, **values):
+    """Record a completed job. The entry is appended to the journal
+    file and flushed to disk.
+
+    :param converter: Converter name
+    :type converter: str or unicode
+    :param index: Test case index
+    :type index: str or unicode
+    :param ext_in: Input format
+    :type ext_in: str or unicode
+    :param ext_out: Output format
+    :type ext_out: str or unicode
+    :param verdict: ``pass`` or ``fail``
+    :type verdict: str or unicode
+    :param output_hash: Digest of converted document
+    :type output_hash: str or unicode
+    :param values: Additional values to record
+    :type values: dict
+    :return: entry
+    :rtype: dict
+    """
+    entry = dict(values)
+    entry[Journal.CONVERTER] = converter
+    entry[Journal.INDEX] = str(index)
+    entry[Journal.EXT_IN] = ext_in
+    entry[Journal.EXT_OUT] = ext_out
+    entry[Journal.VERDICT] = verdict
+    entry[Journal.OUTPUT_HASH] = output_hash
+    line = json.dumps(entry, sort_keys=True) + "\n"
+    fd = os.open(self._file_name,
+                 os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+      os.write(fd, line.encode("utf-8"))
+      os.fsync(fd)
+    finally:
+      os.close(fd)
+    self._entries[Journal.key(converter, index, ext_in, ext_out)] = entry
+    return entry
@@ -0,0 +1,209 @@
+"""Logging for the test harness, with buffered per-process JSON-lines
+files.
+
+Modules log via loggers that are children of the ``prov_interop``
+logger, for example::
+
+  logger = logging.getLogger(__name__)
+  logger.info("Test case: %s", index)
+
+Levels are used as follows:
+
+- ``DEBUG``: command lines run by components.
+- ``INFO``: test job headers, skips, and verdicts reused from a
+  journal or baseline.
+- ``WARNING`` and above: problems that do not stop the run.
+
+By default, only ``WARNING`` and above are logged, so the harness is
+quiet. :func:`configure` sets the level and where records go: either
+to standard error or, if a log directory is given, to a
+:class:`JsonLinesHandler`, which buffers records and writes each
+process's records to its own file.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import logging
+import os
+import sys
+
+LOGGER_NAME = "prov_interop"
+"""str or unicode: name of the logger of which all harness loggers
+are children"""
+
+LOG_ENV = "PROV_HARNESS_LOG"
+"""str or unicode: environment variable holding log directory"""
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+"""list of str or unicode: logging level names"""
+
+LEVEL = "WARNING"
+"""str or unicode: default logging level"""
+
+FILE_PREFIX = "log."
+"""str or unicode: prefix of per-process log files"""
+
+FILE_SUFFIX = ".jsonl"
+"""str or unicode: suffix of per-process log files"""
+
+CAPACITY = 100
+"""int: number of records buffered before they are written"""
+
+class JsonLinesHandler(logging.Handler):
+  """Logging handler which buffers records and writes them as lines
+  of JSON to a per-process file, ``log.<pid>.jsonl``, in a
+  directory::
+
+    {"time": 1444743600.123, "level": "INFO", "pid": 1234,
+     "logger": "prov_interop.interop_tests.test_converter",
+     "message": "Test case: case1 from json to provx"}
+
+  Buffered records are written, using a single ``write`` to a file
+  opened in append mode, when the buffer is full, when a record at
+  ``WARNING`` or above is logged, when :meth:`flush` is called (e.g.
+  at the end of each test job) and when the handler is closed. If the
+  process has been forked since records were buffered, then they are
+  discarded, as they belong to the parent process.
+  """
+
+  def __init__(self, directory, capacity=CAPACITY):
+    """Create handler. `directory` is created if it does not exist.
+
+    :param directory: Log directory
+    :type directory: str or unicode
+    :param capacity: Number of records buffered
+    :type capacity: int
+    """
+    super(JsonLinesHandler, self).__init__()
+    if not os.path.isdir(directory):
+      try:
+        os.makedirs(directory)
+      except OSError:
+        if not os.path.isdir(directory):
+          raise
+    self._directory = directory
+    self._capacity = capacity
+    self._pid = os.getpid()
+    self._lines = []
+
+  @property
+  def directory(self):
+    """Get log directory.
+
+    :return: directory
+    :rtype: str or unicode
+    """
+    return self._directory
+
+  def emit(self, record):
+    """Buffer a record.
+
+    :param record: Record
+    :type record: :class:`logging.LogRecord`
+    """
+    try:
+      line = json.dumps({"time": record.created,
+                         "level": record.levelname,
+                         "pid": record.process,
+                         "logger": record.name,
+                         "message": record.getMessage()},
+                        sort_keys=True)
+    except Exception:
+      self.handleError(record)
+      return
+    self.acquire()
+    try:
+      pid = os.getpid()
+      if pid != self._pid:
+        self._pid = pid
+        self._lines = []
+      self._lines.append(line + "\n")
+    finally:
+      self.release()
+    if len(self._lines) >= self._capacity or \
+       record.levelno >= logging.WARNING:
+      self.flush()
+
+  def flush(self):
+    """Write buffered records.
+    """
+    self.acquire()
+    try:
+      if not self._lines or self._pid != os.getpid():
+        return
+      data = "".join(self._lines).encode("utf-8")
+      self._lines = []
+      file_name = os.path.join(self._directory, 
+                               FILE_PREFIX + str(self._pid) + FILE_SUFFIX)
+      fd = os.open(file_name, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 
+                   0o644)
+      try:
+        os.write(fd, data)
+      finally:
+        os.close(fd)
+    finally:
+      self.release()
+
+  def close(self):
+    """Write buffered records and close handler.
+    """
+    self.flush()
+    super(JsonLinesHandler, self).close()
+
+
+def configure(level=LEVEL, directory=None):
+  """Configure the ``prov_interop`` logger. Any handler added by a
+  previous call is removed and closed.
+
+  :param level: Level name e.g. ``DEBUG``, ``INFO`` or ``WARNING``
+  :type level: str or unicode
+  :param directory: Log directory. If provided then records are
+    written by a :class:`JsonLinesHandler`, else they are written to
+    standard error
+  :type directory: str or unicode
+  :raises ValueError: if `level` is not a valid level name
+  """
+  level = str(level).upper()
+  if level not in LEVELS:
+    raise ValueError("Unrecognised logging level: " + level)
+  logger = logging.getLogger(LOGGER_NAME)
+  logger.setLevel(getattr(logging, level))
+  for handler in list(logger.handlers):
+    logger.removeHandler(handler)
+    handler.close()
+  if directory is not None:
+    handler = JsonLinesHandler(directory)
+  else:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(
+      "%(process)d %(levelname)s %(name)s: %(message)s"))
+  logger.addHandler(handler)
+
+def flush():
+  """Flush the handlers of the ``prov_interop`` logger.
+  """
+  for handler in logging.getLogger(LOGGER_NAME).handlers:
+    handler.flush()
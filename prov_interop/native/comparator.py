@@ -0,0 +1,303 @@
+"""Base class for native comparators, which compare PROV documents in
+process by reducing each document to a multiset of hashed records.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import collections
+import hashlib
+import json
+import logging
+import os.path
+
+from prov_interop.comparator import ComparisonError
+from prov_interop.comparator import Comparator
+from prov_interop.component import ConfigError
+from prov_interop.files import hash_file
+from prov_interop.native import multiset
+
+logger = logging.getLogger(__name__)
+
+CACHE_SIZE = 256
+"""int: maximum number of documents whose records are cached by each
+comparator"""
+
+def record_hash(record):
+  """Get a 64-bit hash of a normalised record. The hash is computed
+  from a SHA-1 digest of the record's JSON encoding so it is the same
+  across processes and Python versions.
+
+  :param record: Record, a tuple whose members are str or unicode,
+    ``None`` or tuples of these
+  :type record: tuple
+  :return: hash
+  :rtype: int
+  """
+  encoded = json.dumps(record, ensure_ascii=True, separators=(",", ":"))
+  digest = hashlib.sha1(encoded.encode("ascii")).hexdigest()
+  return int(digest[:16], 16)
+
+
+class NativeComparator(Comparator):
+  """Base class for native comparators. A document is parsed and
+  reduced to a multiset of hashed records, where each record is
+  normalised so that it does not depend on how it was serialised
+  (e.g. the order of records and attributes, namespace prefixes,
+  literal representations). Two documents are equivalent if their
+  multisets are equal.
+
+  Multisets are held as sorted NumPy arrays (see
+  :mod:`prov_interop.native.multiset`), so documents with millions of
+  records are compared by vectorised operations. The multisets of the
+  most recently compared documents are cached, keyed by file
+  contents, so test case files that are compared to the output of
+  many converters are only parsed once.
+
+  This class parses no formats itself, so is not used directly.
+  Sub-classes define :data:`SUPPORTED_FORMATS` and override
+  :meth:`iterate_records` to parse them.
+  """
+
+  AUTHORITATIVE = "authoritative"
+  """str or unicode: configuration key for whether the comparator's
+  ``False`` verdicts are authoritative"""
+
+  SUPPORTED_FORMATS = []
+  """list of str or unicode: formats that the comparator can parse"""
+
+  def __init__(self):
+    """Create comparator.
+    """
+    super(NativeComparator, self).__init__()
+    self._authoritative = False
+    self._records = collections.OrderedDict()
+
+  @property
+  def authoritative(self):
+    """Get whether ``False`` verdicts are authoritative.
+
+    :return: ``True`` if they are
+    :rtype: bool
+    """
+    return self._authoritative
+
+  def configure(self, config):
+    """Configure comparator. The configuration must hold:
+
+    - :class:`prov_interop.comparator.Comparator` configuration, whose
+      ``formats`` must each be one of :data:`SUPPORTED_FORMATS`.
+
+    The configuration may also hold:
+
+    - ``authoritative``: if ``True`` then :meth:`verify` decides
+      documents are not equivalent if their records differ. If
+      ``False`` (the default), it returns ``None`` (unknown) instead,
+      so that an authoritative comparator in a higher tier can check
+      differences that might be due to representations this
+      comparator does not normalise.
+
+    A valid configuration is::
+
+      {
+        "formats": ["json"],
+        "authoritative": False
+      }
+
+    :param config: Configuration
+    :type config: dict
+    :raises ConfigError: if `config` does not hold the above entries
+    """
+    super(NativeComparator, self).configure(config)
+    for format in self.formats:
+      if format not in self.SUPPORTED_FORMATS:
+        raise ConfigError("Unsupported format in " + Comparator.FORMATS +
+                          ":" + format)
+    authoritative = config.get(NativeComparator.AUTHORITATIVE, False)
+    if type(authoritative) is not bool:
+      raise ConfigError(NativeComparator.AUTHORITATIVE +
+                        " must be true or false: " + str(authoritative))
+    self._authoritative = authoritative
+    self._records.clear()
+
+  def iterate_records(self, file_name, format):
+    """Parse a document and normalise its records. This
+    implementation parses no formats, so always raises a
+    :class:`prov_interop.comparator.ComparisonError`. Sub-classes
+    override it for the formats in :data:`SUPPORTED_FORMATS`.
+
+    :param file_name: File
+    :type file_name: str or unicode
+    :param format: Format, one of :data:`SUPPORTED_FORMATS`
+    :type format: str or unicode
+    :return: records, each a tuple whose members are str or unicode,
+      ``None`` or tuples of these
+    :rtype: iterable of tuple
+    :raises ComparisonError: if the document cannot be parsed
+    """
+    raise ComparisonError(self.__class__.__name__ + " cannot parse " +
+                          format + ": " + file_name)
+
+  def hash_record(self, record):
+    """Get a 64-bit hash of a normalised record. This implementation
+    returns :func:`record_hash`.
+
+    :param record: Record
+    :type record: tuple
+    :return: hash
+    :rtype: int
+    """
+    return record_hash(record)
+
+  def load_records(self, file_name, format):
+    """Parse a document and reduce it to a multiset of hashed
+    records (see :meth:`iterate_records` and :meth:`hash_record`).
+    Records are hashed as they are parsed, so only the hashes are held
+    in memory.
+
+    :param file_name: File
+    :type file_name: str or unicode
+    :param format: Format, one of :data:`SUPPORTED_FORMATS`
+    :type format: str or unicode
+    :return: multiset of record hashes (see
+      :mod:`prov_interop.native.multiset`)
+    :rtype: :class:`numpy.ndarray` of :data:`numpy.uint64`
+    :raises ComparisonError: if the document cannot be parsed
+    """
+    return multiset.from_hashes(self.hash_record(record) for record in
+                                self.iterate_records(file_name, format))
+
+  def records(self, file_name):
+    """Get the multiset of hashed records of a document, from the
+    cache if its contents have been seen before. The cache is keyed by
+    a digest of the file's contents (see
+    :func:`prov_interop.files.hash_file`), not its modification time,
+    so a converted file that is rewritten, under the same name, with
+    different contents of the same size is always parsed again.
+
+    :param file_name: File, whose extension must be one of
+      ``formats``
+    :type file_name: str or unicode
+    :return: multiset of record hashes (see
+      :mod:`prov_interop.native.multiset`)
+    :rtype: :class:`numpy.ndarray` of :data:`numpy.uint64`
+    :raises ComparisonError: if the format is not supported or the
+      document cannot be parsed
+    """
+    format = os.path.splitext(file_name)[1][1:]
+    self.check_format(format)
+    key = (format, hash_file(file_name))
+    if key in self._records:
+      records = self._records.pop(key)
+    else:
+      records = self.load_records(file_name, format)
+      if len(self._records) >= CACHE_SIZE:
+        self._records.popitem(last=False)
+    self._records[key] = records
+    return records
+
+  def differences(self, file1, file2):
+    """Get the hashes of the records of each document that are not
+    in the other. These can be mapped back to records using
+    :meth:`find_records`.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: multisets of hashes of records only in `file1` and only
+      in `file2`
+    :rtype: tuple of (:class:`numpy.ndarray` of :data:`numpy.uint64`,
+      :class:`numpy.ndarray` of :data:`numpy.uint64`)
+    :raises ComparisonError: if the formats are not supported or the
+      documents cannot be parsed
+    """
+    return multiset.difference(self.records(file1), self.records(file2))
+
+  def find_records(self, file_name, hashes):
+    """Find the records of a document with the given hashes. The
+    document is parsed again.
+
+    :param file_name: File
+    :type file_name: str or unicode
+    :param hashes: Hashes
+    :type hashes: iterable of int
+    :return: records
+    :rtype: list of tuple
+    :raises ComparisonError: if the format is not supported or the
+      document cannot be parsed
+    """
+    format = os.path.splitext(file_name)[1][1:]
+    self.check_format(format)
+    hashes = set([int(value) for value in hashes])
+    return [record for record in self.iterate_records(file_name, format)
+            if self.hash_record(record) in hashes]
+
+  def compare(self, file1, file2):
+    """Compare files. The documents are equivalent if their
+    multisets of hashed records are equal.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` or ``False``
+    :rtype: bool
+    :raises ComparisonError: if either of the files cannot be found,
+      their formats are not supported or they cannot be parsed
+    """
+    super(NativeComparator, self).compare(file1, file2)
+    if multiset.equal(self.records(file1), self.records(file2)):
+      return True
+    if logger.isEnabledFor(logging.DEBUG):
+      (only1, only2) = self.differences(file1, file2)
+      logger.debug("%s and %s differ in %d records", file1, file2,
+                   len(only1) + len(only2))
+    return False
+
+  def verify(self, file1, file2):
+    """Compare files, as for :meth:`compare`. If the comparator is
+    not ``authoritative`` then ``None`` is returned if the documents'
+    records differ or either document cannot be parsed.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` if the documents are equivalent, ``False`` if
+      they are not, or ``None`` if the comparator cannot decide
+    :rtype: bool
+    :raises ComparisonError: if either of the files cannot be found,
+      or if the comparator is ``authoritative`` and their formats are
+      not supported or they cannot be parsed
+    """
+    if self._authoritative:
+      return self.compare(file1, file2)
+    Comparator.compare(self, file1, file2)
+    try:
+      if self.compare(file1, file2):
+        return True
+    except ComparisonError as e:
+      logger.debug("%s", e)
+    return None
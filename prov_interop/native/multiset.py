@@ -0,0 +1,83 @@
+"""Multisets of 64-bit record hashes, held as sorted NumPy ``uint64``
+arrays, so that comparing documents with millions of records is done
+by vectorised operations rather than in Python.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import numpy
+
+def from_hashes(hashes):
+  """Create a multiset from record hashes.
+
+  :param hashes: Hashes, each an integer in [0, 2^64)
+  :type hashes: iterable of int
+  :return: multiset, a sorted array
+  :rtype: :class:`numpy.ndarray` of :data:`numpy.uint64`
+  """
+  multiset = numpy.fromiter(hashes, dtype=numpy.uint64)
+  multiset.sort()
+  return multiset
+
+
+def equal(multiset1, multiset2):
+  """Check whether multisets are equal.
+
+  :param multiset1: Multiset
+  :type multiset1: :class:`numpy.ndarray` of :data:`numpy.uint64`
+  :param multiset2: Multiset
+  :type multiset2: :class:`numpy.ndarray` of :data:`numpy.uint64`
+  :return: ``True`` if they hold the same hashes, the same number of
+    times
+  :rtype: bool
+  """
+  return multiset1.shape == multiset2.shape and \
+      bool(numpy.array_equal(multiset1, multiset2))
+
+
+def difference(multiset1, multiset2):
+  """Get the hashes that are in one multiset more times than in the
+  other. For example, the difference of ``[1, 2, 2, 3]`` and ``[2, 3,
+  4]`` is ``([1, 2], [4])``.
+
+  :param multiset1: Multiset
+  :type multiset1: :class:`numpy.ndarray` of :data:`numpy.uint64`
+  :param multiset2: Multiset
+  :type multiset2: :class:`numpy.ndarray` of :data:`numpy.uint64`
+  :return: multisets of hashes only in `multiset1` and only in
+    `multiset2`
+  :rtype: tuple of (:class:`numpy.ndarray` of :data:`numpy.uint64`,
+    :class:`numpy.ndarray` of :data:`numpy.uint64`)
+  """
+  (values1, counts1) = numpy.unique(multiset1, return_counts=True)
+  (values2, counts2) = numpy.unique(multiset2, return_counts=True)
+  values = numpy.union1d(values1, values2)
+  counts = numpy.zeros(len(values), dtype=numpy.int64)
+  counts[numpy.searchsorted(values, values1)] += counts1
+  counts[numpy.searchsorted(values, values2)] -= counts2
+  extra1 = counts > 0
+  extra2 = counts < 0
+  return (numpy.repeat(values[extra1], counts[extra1]),
+          numpy.repeat(values[extra2], -counts[extra2]))
@@ -0,0 +1,434 @@
+"""Native PROV-JSON comparator.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import io
+import json
+import re
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.files import STRING_TYPES
+from prov_interop.native.comparator import NativeComparator
+
+PROV_NS = "http://www.w3.org/ns/prov#"
+"""str or unicode: PROV namespace"""
+
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+"""str or unicode: XML Schema datatypes namespace"""
+
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+"""str or unicode: XML Schema instance namespace"""
+
+PREFIXES = {"prov": PROV_NS, "xsd": XSD_NS, "xsi": XSI_NS}
+"""dict: prefixes predefined in every PROV document"""
+
+DEFAULT_PREFIX = "default"
+"""str or unicode: PROV-JSON prefix for the default namespace"""
+
+PREFIX = "prefix"
+"""str or unicode: PROV-JSON key for namespace prefixes"""
+
+BUNDLE = "bundle"
+"""str or unicode: PROV-JSON key for bundles"""
+
+MEMBERSHIP = "hadMember"
+"""str or unicode: PROV-JSON record type for membership relations"""
+
+MEMBER_ENTITY = "prov:entity"
+"""str or unicode: PROV-JSON attribute for the member of a collection"""
+
+IDENTIFIER_ATTRIBUTES = [
+  "activity", "agent", "alternate1", "alternate2", "bundle",
+  "collection", "delegate", "ender", "entity", "generalEntity",
+  "generatedEntity", "generation", "influencee", "influencer",
+  "informant", "informed", "plan", "responsible", "specificEntity",
+  "starter", "trigger", "usage", "usedEntity"]
+"""list of str or unicode: local names of PROV attributes whose values
+are identifiers"""
+
+TIME_ATTRIBUTES = ["time", "startTime", "endTime"]
+"""list of str or unicode: local names of PROV attributes whose values
+are times"""
+
+QNAME_TYPES = [XSD_NS + "QName", PROV_NS + "QUALIFIED_NAME"]
+"""list of str or unicode: datatypes of literals which are qualified
+names"""
+
+INTEGER_TYPES = [XSD_NS + "int", XSD_NS + "long", XSD_NS + "integer"]
+"""list of str or unicode: datatypes of literals which are equivalent
+to JSON integers"""
+
+DOUBLE_TYPES = [XSD_NS + "double", XSD_NS + "float"]
+"""list of str or unicode: datatypes of literals which are equivalent
+to JSON numbers with fractional parts"""
+
+DATETIME_PATTERN = re.compile(
+  r"^(-?\d{4,})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(\.\d+)?"
+  r"(Z|[+-]\d\d:\d\d)?$")
+"""re.RegexObject: pattern for xsd:dateTime values"""
+
+LITERAL = "literal"
+"""str or unicode: tag of normalised literal values"""
+
+LANG = "lang"
+"""str or unicode: tag of normalised language-tagged string values"""
+
+IDENTIFIER = "id"
+"""str or unicode: tag of normalised identifier values"""
+
+def normalise_datetime(value):
+  """Normalise an xsd:dateTime value. Fractional seconds lose trailing
+  zeros and times with time zones are converted to UTC, so that, for
+  example, ``2011-11-16T16:05:00.000+01:00`` and
+  ``2011-11-16T15:05:00Z`` are normalised to the same value.
+
+  :param value: Value
+  :type value: str or unicode
+  :return: normalised value, or `value` if it is not an xsd:dateTime
+  :rtype: str or unicode
+  """
+  match = DATETIME_PATTERN.match(value)
+  if match is None:
+    return value
+  (year, month, day, hour, minute, second, fraction, zone) = match.groups()
+  fraction = (fraction or "").rstrip("0").rstrip(".")
+  if zone is None:
+    return "%s-%s-%sT%s:%s:%s%s" % (year, month, day, hour, minute,
+                                    second, fraction)
+  try:
+    time = datetime.datetime(int(year), int(month), int(day),
+                             int(hour), int(minute), int(second))
+    if zone != "Z":
+      offset = datetime.timedelta(hours=int(zone[1:3]),
+                                  minutes=int(zone[4:6]))
+      time = time - offset if zone[0] == "+" else time + offset
+  except (ValueError, OverflowError):
+    return value
+  return time.strftime("%Y-%m-%dT%H:%M:%S") + fraction + "Z"
+
+
+def normalise_literal(datatype, value):
+  """Normalise a typed literal, so that equivalent representations of
+  the same value (e.g. ``1``, ``"1"`` as an ``xsd:int`` and ``"01"``
+  as an ``xsd:integer``) are normalised to the same value.
+
+  :param datatype: Datatype URI
+  :type datatype: str or unicode
+  :param value: Value
+  :type value: str or unicode
+  :return: tagged value
+  :rtype: tuple of (str or unicode, str or unicode, str or unicode)
+  """
+  try:
+    if datatype in INTEGER_TYPES:
+      return (LITERAL, XSD_NS + "int", str(int(value)))
+    if datatype in DOUBLE_TYPES:
+      return (LITERAL, XSD_NS + "double", repr(float(value)))
+  except ValueError:
+    pass
+  if datatype == XSD_NS + "boolean":
+    value = value.strip().lower()
+    value = {"1": "true", "0": "false"}.get(value, value)
+  elif datatype == XSD_NS + "dateTime":
+    value = normalise_datetime(value)
+  return (LITERAL, datatype, value)
+
+
+def text(value):
+  """Get the text of a value held in a PROV-JSON ``$`` entry, which
+  is usually, but not always, a string.
+
+  :param value: Value
+  :type value: str or unicode, int, float or bool
+  :return: text
+  :rtype: str or unicode
+  :raises ComparisonError: if `value` is not a string, number or
+    boolean
+  """
+  if isinstance(value, STRING_TYPES):
+    return value
+  if isinstance(value, bool):
+    return "true" if value else "false"
+  if isinstance(value, (int, float)):
+    return json.dumps(value)
+  raise ComparisonError("Unexpected value: " + repr(value))
+
+
+class Namespaces(object):
+  """Expands qualified names to URIs using the namespace prefixes of
+  a document or bundle."""
+
+  def __init__(self, prefixes, parent=None):
+    """Create namespaces.
+
+    :param prefixes: Namespace URIs keyed by prefix, including
+      ``default`` for the default namespace, if any
+    :type prefixes: dict
+    :param parent: Namespaces of enclosing document, if any
+    :type parent: :class:`Namespaces`
+    :raises ComparisonError: if `prefixes` is not a dict
+    """
+    if not isinstance(prefixes, dict):
+      raise ComparisonError("Expected prefixes: " + repr(prefixes))
+    if parent is None:
+      self._prefixes = dict(PREFIXES)
+    else:
+      self._prefixes = dict(parent._prefixes)
+    self._prefixes.update(prefixes)
+
+  def expand(self, qname):
+    """Expand a qualified name. Names without a prefix are in the
+    default namespace. Names whose prefix is not declared are
+    returned unchanged.
+
+    :param qname: Qualified name
+    :type qname: str or unicode
+    :return: URI
+    :rtype: str or unicode
+    :raises ComparisonError: if `qname` is not a string
+    """
+    if not isinstance(qname, STRING_TYPES):
+      raise ComparisonError("Expected a qualified name: " + repr(qname))
+    (prefix, separator, local_name) = qname.partition(":")
+    if not separator:
+      (prefix, local_name) = (DEFAULT_PREFIX, qname)
+    if prefix in self._prefixes:
+      return self._prefixes[prefix] + local_name
+    return qname
+
+
+def normalise_value(attribute, value, namespaces):
+  """Normalise an attribute value. Values of PROV attributes which
+  refer to other records (e.g. ``prov:entity``) are expanded
+  identifiers, values of PROV time attributes are xsd:dateTime
+  literals. Otherwise, values are typed literals: JSON strings,
+  numbers and booleans are xsd:string, xsd:int, xsd:double and
+  xsd:boolean literals respectively and qualified names and URIs are
+  expanded identifiers.
+
+  :param attribute: Attribute URI
+  :type attribute: str or unicode
+  :param value: Value
+  :type value: str or unicode, int, float, bool or dict
+  :param namespaces: Namespaces for expanding qualified names
+  :type namespaces: :class:`Namespaces`
+  :return: tagged value
+  :rtype: tuple of str or unicode
+  :raises ComparisonError: if `value` is not a valid PROV-JSON value
+  """
+  local_name = attribute[len(PROV_NS):] \
+      if attribute.startswith(PROV_NS) else None
+  if isinstance(value, dict):
+    if "$" not in value:
+      raise ComparisonError("Missing $ in value of " + attribute)
+    (content, datatype, lang) = (text(value["$"]), value.get("type"),
+                                 value.get("lang"))
+  else:
+    (content, datatype, lang) = (value, None, None)
+  if local_name in IDENTIFIER_ATTRIBUTES:
+    return (IDENTIFIER, namespaces.expand(content))
+  if lang is not None:
+    return (LANG, content, text(lang).lower())
+  if datatype is not None:
+    datatype = namespaces.expand(datatype)
+    if datatype in QNAME_TYPES:
+      return (IDENTIFIER, namespaces.expand(content))
+    if datatype == XSD_NS + "anyURI":
+      return (IDENTIFIER, content)
+    return normalise_literal(datatype, content)
+  if local_name in TIME_ATTRIBUTES:
+    return normalise_literal(XSD_NS + "dateTime", text(content))
+  if isinstance(content, bool):
+    return (LITERAL, XSD_NS + "boolean", text(content))
+  if isinstance(content, int):
+    return normalise_literal(XSD_NS + "int", text(content))
+  if isinstance(content, float):
+    return (LITERAL, XSD_NS + "double", repr(content))
+  return (LITERAL, XSD_NS + "string", text(content))
+
+
+def normalise_record(bundle, record_type, identifier, attributes,
+                     namespaces):
+  """Normalise a record. Attributes are expanded and sorted, along
+  with their values. An attribute's values are a set, so duplicate
+  values are ignored. Identifiers of the form ``_:ID``, which
+  PROV-JSON serialisers create for relations that have no
+  identifiers, are ignored.
+
+  :param bundle: Expanded identifier of enclosing bundle, or
+    ``None`` if the record is not in a bundle
+  :type bundle: str or unicode
+  :param record_type: Record type e.g. ``entity``, ``used``
+  :type record_type: str or unicode
+  :param identifier: Identifier
+  :type identifier: str or unicode
+  :param attributes: Attribute values, or lists of values, keyed by
+    attribute
+  :type attributes: dict
+  :param namespaces: Namespaces for expanding qualified names
+  :type namespaces: :class:`Namespaces`
+  :return: record
+  :rtype: tuple
+  :raises ComparisonError: if the record is not valid PROV-JSON
+  """
+  if not isinstance(attributes, dict):
+    raise ComparisonError("Expected attributes of " + identifier)
+  if identifier.startswith("_:"):
+    identifier = None
+  else:
+    identifier = namespaces.expand(identifier)
+  pairs = []
+  for (name, values) in attributes.items():
+    attribute = namespaces.expand(name)
+    if not isinstance(values, list):
+      values = [values]
+    for value in values:
+      pairs.append((attribute,
+                    normalise_value(attribute, value, namespaces)))
+  return (bundle, record_type, identifier, tuple(sorted(set(pairs))))
+
+
+def split_membership(record_type, attributes):
+  """Split a ``hadMember`` record with a list of entities into one
+  record for each entity, as a membership relation can only have one
+  entity but PROV-JSON serialisers may combine them.
+
+  :param record_type: Record type e.g. ``entity``, ``hadMember``
+  :type record_type: str or unicode
+  :param attributes: Attribute values, or lists of values, keyed by
+    attribute
+  :type attributes: dict
+  :return: attributes of each record
+  :rtype: list of dict
+  """
+  entities = attributes.get(MEMBER_ENTITY) \
+      if record_type == MEMBERSHIP and isinstance(attributes, dict) else None
+  if not isinstance(entities, list) or len(entities) < 2:
+    return [attributes]
+  members = []
+  for entity in entities:
+    member = dict(attributes)
+    member[MEMBER_ENTITY] = entity
+    members.append(member)
+  return members
+
+
+def normalise_records(content, namespaces, bundle=None):
+  """Normalise the records of a document or bundle.
+
+  :param content: Document or bundle
+  :type content: dict
+  :param namespaces: Namespaces of the document or bundle
+  :type namespaces: :class:`Namespaces`
+  :param bundle: Expanded bundle identifier, or ``None`` for a
+    document
+  :type bundle: str or unicode
+  :return: records
+  :rtype: list of tuple
+  :raises ComparisonError: if a record is not valid PROV-JSON
+  """
+  records = []
+  for (record_type, instances) in content.items():
+    if record_type in [PREFIX, BUNDLE]:
+      continue
+    if not isinstance(instances, dict):
+      raise ComparisonError("Expected records of type " + record_type)
+    for (identifier, attributes) in instances.items():
+      # Records with the same identifier are held in a list.
+      if not isinstance(attributes, list):
+        attributes = [attributes]
+      for record_attributes in attributes:
+        for member_attributes in split_membership(record_type,
+                                                  record_attributes):
+          records.append(normalise_record(bundle, record_type, identifier,
+                                          member_attributes, namespaces))
+  return records
+
+
+def normalise_document(content):
+  """Normalise the records of a PROV-JSON document and its bundles.
+
+  :param content: Document
+  :type content: dict
+  :return: records
+  :rtype: list of tuple
+  :raises ComparisonError: if the document is not valid PROV-JSON
+  """
+  if not isinstance(content, dict):
+    raise ComparisonError("Expected a PROV-JSON document")
+  namespaces = Namespaces(content.get(PREFIX, {}))
+  records = normalise_records(content, namespaces)
+  bundles = content.get(BUNDLE, {})
+  if not isinstance(bundles, dict):
+    raise ComparisonError("Expected bundles")
+  for (identifier, bundle) in bundles.items():
+    if not isinstance(bundle, dict):
+      raise ComparisonError("Expected bundle " + identifier)
+    records.extend(normalise_records(
+      bundle, Namespaces(bundle.get(PREFIX, {}), namespaces),
+      namespaces.expand(identifier)))
+  return records
+
+
+class ProvJsonComparator(NativeComparator):
+  """Native comparator for PROV-JSON documents. Documents are
+  equivalent if they have the same bundles, holding the same records.
+  Records are the same if they have the same type, identifier and
+  attribute values, regardless of the order of records, attributes and
+  values, the namespace prefixes used and how literals are
+  represented (see :func:`normalise_value`). Identifiers of the form
+  ``_:ID`` are ignored.
+  """
+
+  SUPPORTED_FORMATS = [standards.JSON]
+  """list of str or unicode: formats that the comparator can parse"""
+
+  def __init__(self):
+    """Create comparator.
+    """
+    super(ProvJsonComparator, self).__init__()
+
+  def iterate_records(self, file_name, format):
+    """Parse a PROV-JSON document and normalise its records (see
+    :func:`normalise_document`).
+
+    :param file_name: File
+    :type file_name: str or unicode
+    :param format: Format, ``json``
+    :type format: str or unicode
+    :return: records
+    :rtype: list of tuple
+    :raises ComparisonError: if the document cannot be parsed
+    """
+    try:
+      with io.open(file_name, encoding="utf-8") as f:
+        content = json.load(f)
+    except ValueError as e:
+      raise ComparisonError("Invalid PROV-JSON in " + file_name + ": " +
+                            str(e))
+    return normalise_document(content)
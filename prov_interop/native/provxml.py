@@ -0,0 +1,238 @@
+"""Native, streaming, PROV-XML comparator.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import xml.etree.ElementTree as ElementTree
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.native.comparator import NativeComparator
+from prov_interop.native.provjson import DEFAULT_PREFIX
+from prov_interop.native.provjson import IDENTIFIER
+from prov_interop.native.provjson import MEMBERSHIP
+from prov_interop.native.provjson import Namespaces
+from prov_interop.native.provjson import PROV_NS
+from prov_interop.native.provjson import XSD_NS
+from prov_interop.native.provjson import XSI_NS
+from prov_interop.native.provjson import normalise_value
+
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+"""str or unicode: XML namespace"""
+
+PROV_ID = "{" + PROV_NS + "}id"
+"""str or unicode: PROV-XML attribute for record identifiers"""
+
+PROV_REF = "{" + PROV_NS + "}ref"
+"""str or unicode: PROV-XML attribute for references to records"""
+
+XSI_TYPE = "{" + XSI_NS + "}type"
+"""str or unicode: XML attribute for datatypes"""
+
+XML_LANG = "{" + XML_NS + "}lang"
+"""str or unicode: XML attribute for languages"""
+
+BUNDLE_CONTENT = "{" + PROV_NS + "}bundleContent"
+"""str or unicode: PROV-XML element for bundles"""
+
+MEMBER_ENTITY = PROV_NS + "entity"
+"""str or unicode: PROV attribute for the member of a collection"""
+
+def expand_tag(tag):
+  """Expand an ElementTree tag, of form ``{URI}NAME``, to a URI.
+
+  :param tag: Tag
+  :type tag: str or unicode
+  :return: URI
+  :rtype: str or unicode
+  """
+  return tag[1:].replace("}", "", 1) if tag.startswith("{") else tag
+
+
+def local_name(tag):
+  """Get the local name of an ElementTree tag, of form ``{URI}NAME``.
+
+  :param tag: Tag
+  :type tag: str or unicode
+  :return: local name
+  :rtype: str or unicode
+  """
+  return tag.rsplit("}", 1)[-1]
+
+
+def normalise_attribute(element, namespaces):
+  """Normalise a PROV-XML attribute element e.g. ``<ex:value
+  xsi:type="xsd:int">1</ex:value>``, ``<prov:entity
+  prov:ref="ex:e1"/>``. Values are normalised as for PROV-JSON (see
+  :func:`prov_interop.native.provjson.normalise_value`).
+
+  :param element: Element
+  :type element: :class:`xml.etree.ElementTree.Element`
+  :param namespaces: Namespaces in scope at the element
+  :type namespaces: :class:`prov_interop.native.provjson.Namespaces`
+  :return: attribute URI and tagged value
+  :rtype: tuple of (str or unicode, tuple of str or unicode)
+  :raises ComparisonError: if the value is not valid
+  """
+  attribute = expand_tag(element.tag)
+  reference = element.get(PROV_REF)
+  if reference is not None:
+    return (attribute, (IDENTIFIER, namespaces.expand(reference)))
+  value = {"$": element.text or ""}
+  if element.get(XSI_TYPE) is not None:
+    value["type"] = element.get(XSI_TYPE)
+  if element.get(XML_LANG) is not None:
+    value["lang"] = element.get(XML_LANG)
+  return (attribute, normalise_value(attribute, value, namespaces))
+
+
+def normalise_element(bundle, element, namespaces, pairs):
+  """Normalise a PROV-XML record element into records of the same form
+  as PROV-JSON records (see
+  :func:`prov_interop.native.provjson.normalise_record`). A
+  ``hadMember`` record with more than one entity is split into one
+  record for each entity.
+
+  :param bundle: Expanded identifier of enclosing bundle, or
+    ``None`` if the record is not in a bundle
+  :type bundle: str or unicode
+  :param element: Element
+  :type element: :class:`xml.etree.ElementTree.Element`
+  :param namespaces: Namespaces in scope at the element
+  :type namespaces: :class:`prov_interop.native.provjson.Namespaces`
+  :param pairs: Normalised attributes (see
+    :func:`normalise_attribute`)
+  :type pairs: list of tuple
+  :return: records
+  :rtype: list of tuple
+  :raises ComparisonError: if the record is not valid
+  """
+  record_type = local_name(element.tag)
+  identifier = element.get(PROV_ID)
+  if identifier is not None:
+    identifier = namespaces.expand(identifier)
+  members = [pair for pair in pairs if pair[0] == MEMBER_ENTITY]
+  if record_type == MEMBERSHIP and len(set(members)) > 1:
+    others = [pair for pair in pairs if pair[0] != MEMBER_ENTITY]
+    attributes = [others + [member] for member in set(members)]
+  else:
+    attributes = [pairs]
+  return [(bundle, record_type, identifier, tuple(sorted(set(pairs))))
+          for pairs in attributes]
+
+
+def iterate_records(source):
+  """Parse a PROV-XML document incrementally, and normalise its
+  records (see :func:`normalise_element`). Each element is discarded
+  once it has been normalised, so memory use does not depend on the
+  size of the document.
+
+  :param source: File name or file object
+  :type source: str or unicode or file
+  :return: records
+  :rtype: generator of tuple
+  :raises ComparisonError: if the document is not valid
+  :raises xml.etree.ElementTree.ParseError: if the document is not
+    valid XML
+  """
+  elements = []
+  namespaces = [Namespaces({})]
+  prefixes = {}
+  bundle = None
+  pairs = []
+  for (event, item) in ElementTree.iterparse(
+      source, events=("start-ns", "start", "end")):
+    if event == "start-ns":
+      (prefix, uri) = item
+      # Some serialisers bind xsd to the XML Schema namespace without #.
+      if uri + "#" == XSD_NS:
+        uri = XSD_NS
+      prefixes[prefix or DEFAULT_PREFIX] = uri
+    elif event == "start":
+      if prefixes:
+        namespaces.append(Namespaces(prefixes, namespaces[-1]))
+        prefixes = {}
+      else:
+        namespaces.append(namespaces[-1])
+      elements.append(item)
+      if len(elements) == 2 and item.tag == BUNDLE_CONTENT:
+        bundle = namespaces[-1].expand(item.get(PROV_ID, ""))
+    else:
+      elements.pop()
+      element_namespaces = namespaces.pop()
+      depth = len(elements)
+      record_depth = 1 if bundle is None else 2
+      if depth == 1 and item.tag == BUNDLE_CONTENT:
+        bundle = None
+      elif depth == record_depth + 1:
+        pairs.append(normalise_attribute(item, element_namespaces))
+      elif depth == record_depth:
+        for record in normalise_element(bundle, item, element_namespaces,
+                                        pairs):
+          yield record
+        pairs = []
+      else:
+        continue
+      item.clear()
+      elements[-1].remove(item)
+
+
+class ProvXmlComparator(NativeComparator):
+  """Native comparator for PROV-XML documents. Documents are parsed
+  incrementally, and each record is normalised and hashed as soon as
+  it has been parsed, then discarded, so memory use depends on the
+  number of records, 8 bytes for each hash, not the size of the
+  documents.
+
+  Records are normalised as for PROV-JSON (see
+  :class:`prov_interop.native.provjson.ProvJsonComparator`).
+  """
+
+  SUPPORTED_FORMATS = [standards.PROVX]
+  """list of str or unicode: formats that the comparator can parse"""
+
+  def __init__(self):
+    """Create comparator.
+    """
+    super(ProvXmlComparator, self).__init__()
+
+  def iterate_records(self, file_name, format):
+    """Parse a PROV-XML document incrementally and normalise its
+    records (see :func:`iterate_records`).
+
+    :param file_name: File
+    :type file_name: str or unicode
+    :param format: Format, ``provx``
+    :type format: str or unicode
+    :return: records
+    :rtype: generator of tuple
+    :raises ComparisonError: if the document cannot be parsed
+    """
+    try:
+      for record in iterate_records(file_name):
+        yield record
+    except ElementTree.ParseError as e:
+      raise ComparisonError("Invalid PROV-XML in " + file_name + ": " +
+                            str(e))
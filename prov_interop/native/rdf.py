@@ -0,0 +1,285 @@
+"""Native PROV-O (Turtle and TriG) comparator.
+
+This module requires `rdflib <https://github.com/RDFLib/rdflib>`_.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import hashlib
+import json
+import logging
+import os.path
+
+import numpy
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.component import ConfigError
+from prov_interop.native.comparator import NativeComparator
+from prov_interop.native.comparator import record_hash
+from prov_interop.native import multiset
+
+try:
+  import rdflib
+  import rdflib.compare
+  import rdflib.graph
+  import rdflib.exceptions
+except ImportError:
+  rdflib = None
+
+logger = logging.getLogger(__name__)
+
+class RdfComparator(NativeComparator):
+  """Native comparator for PROV-O documents in Turtle and TriG. Each
+  document is relabelled canonically, so that the labels of its blank
+  nodes depend only on the document's structure, and each of its
+  triples, qualified by the name of its graph, is a record. Documents
+  whose records are the same are isomorphic, so are equivalent.
+
+  The graphs of a document are lifted into one graph (see
+  :func:`lift_graphs`), which is relabelled canonically, so blank
+  nodes shared between the named graphs of a TriG document are
+  distinguished from ones which are not shared. Canonical labelling
+  can give isomorphic graphs different labels, so if their records
+  differ documents are checked for isomorphism, which is much more
+  expensive. Graphs named by blank nodes are compared by label, so
+  documents which differ only in these labels are not equivalent.
+
+  Literals are compared as normalised by rdflib, so, for example,
+  ``"01"^^xsd:integer`` and ``"1"^^xsd:integer`` are the same.
+  """
+
+  SUPPORTED_FORMATS = [standards.TTL, standards.TRIG]
+  """list of str or unicode: formats that the comparator can parse"""
+
+  LOCAL_FORMATS = {
+    standards.TTL: "turtle",
+    standards.TRIG: "trig"
+  }
+  """dict: mapping from formats in :mod:`prov_interop.standards` to
+  formats understood by rdflib
+  """
+
+  def __init__(self):
+    """Create comparator.
+    """
+    super(RdfComparator, self).__init__()
+
+  def configure(self, config):
+    """Configure comparator. The configuration must hold:
+
+    - :class:`prov_interop.native.comparator.NativeComparator`
+      configuration.
+
+    A valid configuration is::
+
+      {
+        "formats": ["ttl", "trig"]
+      }
+
+    :param config: Configuration
+    :type config: dict
+    :raises ConfigError: if `config` does not hold the above entries,
+      or rdflib is not installed
+    """
+    if rdflib is None:
+      raise ConfigError("rdflib must be installed to use " +
+                        self.__class__.__name__)
+    super(RdfComparator, self).configure(config)
+
+  def load_graphs(self, file_name, format):
+    """Parse a document into its graphs.
+
+    :param file_name: File
+    :type file_name: str or unicode
+    :param format: Format, one of :data:`SUPPORTED_FORMATS`
+    :type format: str or unicode
+    :return: graphs, keyed by name, or ``None`` for the default
+      graph. Empty graphs are omitted
+    :rtype: dict from :class:`rdflib.term.Identifier` to
+      :class:`rdflib.Graph`
+    :raises ComparisonError: if the document cannot be parsed
+    """
+    dataset = rdflib.Dataset()
+    try:
+      dataset.parse(file_name, format=RdfComparator.LOCAL_FORMATS[format])
+    except (SyntaxError, ValueError, rdflib.exceptions.Error) as e:
+      raise ComparisonError("Invalid " + format + " in " + file_name +
+                            ": " + str(e))
+    graphs = {}
+    for graph in dataset.graphs():
+      if len(graph) == 0:
+        continue
+      name = graph.identifier
+      if name == rdflib.graph.DATASET_DEFAULT_GRAPH_ID:
+        name = None
+      graphs[name] = graph
+    return graphs
+
+  def iterate_records(self, file_name, format):
+    """Parse a document, lift its graphs into one graph (see
+    :func:`lift_graphs`), relabel this canonically, and get the
+    document's records, one for each triple, qualified by the name of
+    its graph.
+
+    :param file_name: File
+    :type file_name: str or unicode
+    :param format: Format, one of :data:`SUPPORTED_FORMATS`
+    :type format: str or unicode
+    :return: records, each of which is the N3 representations of
+      the graph name, or ``None`` for the default graph, and of the
+      triple's subject, predicate and object
+    :rtype: generator of tuple of str or unicode
+    :raises ComparisonError: if the document cannot be parsed
+    """
+    (graph, predicates) = lift_graphs(self.load_graphs(file_name, format))
+    for (subject, predicate, value) in \
+          rdflib.compare.to_canonical_graph(graph):
+      (graph_name, local_predicate) = predicates[predicate]
+      yield (graph_name, subject.n3(), local_predicate, value.n3())
+
+  def hash_record(self, record):
+    """Get a 64-bit hash of a record (see :func:`triple_hash`).
+
+    :param record: Record
+    :type record: tuple of str or unicode
+    :return: hash
+    :rtype: int
+    """
+    return triple_hash(record)
+
+  def isomorphic(self, file1, file2):
+    """Check whether documents are isomorphic, i.e. their graphs,
+    lifted into one graph (see :func:`lift_graphs`), are isomorphic,
+    so blank nodes shared between graphs must correspond.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` or ``False``
+    :rtype: bool
+    :raises ComparisonError: if either document cannot be parsed
+    """
+    (graph1, _) = lift_graphs(
+      self.load_graphs(file1, os.path.splitext(file1)[1][1:]))
+    (graph2, _) = lift_graphs(
+      self.load_graphs(file2, os.path.splitext(file2)[1][1:]))
+    return rdflib.compare.isomorphic(graph1, graph2)
+
+  def compare(self, file1, file2):
+    """Compare files. The documents are equivalent if their multisets
+    of hashed records are equal or, if they are not but they have the
+    same number of triples and the same triples without blank nodes,
+    the documents are isomorphic.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` or ``False``
+    :rtype: bool
+    :raises ComparisonError: if either of the files cannot be found,
+      their formats are not supported or they cannot be parsed
+    """
+    if super(RdfComparator, self).compare(file1, file2):
+      return True
+    records1 = self.records(file1)
+    records2 = self.records(file2)
+    if len(records1) != len(records2) or \
+          not multiset.equal(ground_records(records1),
+                             ground_records(records2)):
+      return False
+    equivalent = self.isomorphic(file1, file2)
+    logger.debug("%s and %s isomorphic: %s", file1, file2, equivalent)
+    return equivalent
+
+
+LIFTED_PREDICATE_NS = "urn:x-prov-interop:lifted:"
+"""str or unicode: namespace of the predicates of lifted graphs (see
+:func:`lift_graphs`)"""
+
+def lift_graphs(graphs):
+  """Lift the graphs of a document into one graph, so that the whole
+  document can be relabelled canonically, or checked for isomorphism,
+  at once. Each triple's predicate is replaced by one that identifies
+  both the predicate and the name of the triple's graph, so blank
+  nodes shared between graphs remain shared. The replacement is
+  computed from the N3 representations of the graph name and
+  predicate, so it is the same across documents.
+
+  :param graphs: Graphs, keyed by name, or ``None`` for the default
+    graph (see :meth:`RdfComparator.load_graphs`)
+  :type graphs: dict from :class:`rdflib.term.Identifier` to
+    :class:`rdflib.Graph`
+  :return: lifted graph, and mapping from its predicates to the N3
+    representations of graph name, or ``None``, and predicate
+  :rtype: tuple of (:class:`rdflib.Graph`, dict from
+    :class:`rdflib.URIRef` to tuple of (str or unicode, str or
+    unicode))
+  """
+  lifted = rdflib.Graph()
+  predicates = {}
+  for (name, graph) in graphs.items():
+    graph_name = None if name is None else name.n3()
+    for (subject, predicate, value) in graph:
+      key = (graph_name, predicate.n3())
+      digest = hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+      lifted_predicate = rdflib.URIRef(LIFTED_PREDICATE_NS + digest)
+      predicates[lifted_predicate] = key
+      lifted.add((subject, lifted_predicate, value))
+  return (lifted, predicates)
+
+
+def triple_hash(record):
+  """Get a 64-bit hash of a triple (see
+  :func:`prov_interop.native.comparator.record_hash`). The hashes of
+  triples with blank nodes are odd and those of triples without are
+  even, so the triples without blank nodes, which isomorphic
+  documents must share, can be compared without parsing the documents
+  again.
+
+  :param record: Triple, as the N3 representations of its graph
+    name, subject, predicate and object
+  :type record: tuple of str or unicode
+  :return: hash
+  :rtype: int
+  """
+  value = record_hash(record)
+  if any([term.startswith("_:") for term in record[1:]]):
+    return value | 1
+  return value & ~1
+
+
+def ground_records(records):
+  """Get the hashes of triples without blank nodes from a multiset of
+  hashed triples (see :func:`triple_hash`).
+
+  :param records: Multiset of hashed triples
+  :type records: :class:`numpy.ndarray` of :data:`numpy.uint64`
+  :return: multiset of hashed triples without blank nodes
+  :rtype: :class:`numpy.ndarray` of :data:`numpy.uint64`
+  """
+  return records[(records & numpy.uint64(1)) == 0]
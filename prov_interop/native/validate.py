@@ -0,0 +1,228 @@
+"""Validate a native comparator against an authoritative comparator.
+
+Both comparators are run on every pair of test case files in a
+format, including each file paired with itself, and the pairs for
+which their verdicts disagree are listed. Test case files in different
+test cases are usually not equivalent, so the corpus provides both
+equivalent and non-equivalent pairs. Comparators are named and
+configured as in the harness configuration (see
+:class:`prov_interop.harness.HarnessResources`).
+
+Usage::
+
+    usage: validate.py [-h] [-f FILE] -n NATIVE -r REFERENCE [-e FORMAT]
+                       [-l LIMIT] [-d]
+
+    Validate a native comparator against a reference comparator.
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -f FILE, --file FILE  Harness configuration file (default
+                            PROV_HARNESS_CONFIGURATION environment
+                            variable or localconfig/harness.yaml)
+      -n NATIVE, --native NATIVE
+                            Native comparator name
+      -r REFERENCE, --reference REFERENCE
+                            Reference comparator name
+      -e FORMAT, --format FORMAT
+                            Format of test case files (default json)
+      -l LIMIT, --limit LIMIT
+                            Maximum number of test case files
+      -d, --disagree        Exit with non-zero status if the comparators
+                            disagree
+
+For example::
+
+    $ python -m prov_interop.native.validate -n ProvJsonComparator \\
+        -r ProvToolboxComparator
+    Pairs compared: 3
+    Disagreements: 1
+    test-case1/doc.json test-case2/doc.json native:True reference:False
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import os.path
+import sys
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.interop_tests import harness
+
+def get_verdict(comparator, file1, file2):
+  """Compare files, treating errors as a verdict.
+
+  :param comparator: Comparator
+  :type comparator: :class:`prov_interop.comparator.Comparator`
+  :param file1: File
+  :type file1: str or unicode
+  :param file2: File
+  :type file2: str or unicode
+  :return: ``True``, ``False`` or ``None`` if the comparator raised
+    a :class:`prov_interop.comparator.ComparisonError`
+  :rtype: bool
+  """
+  try:
+    return comparator.compare(file1, file2)
+  except ComparisonError:
+    return None
+
+
+def get_verdicts(comparator, pairs):
+  """Compare pairs of files, treating errors as verdicts. If the
+  comparator supports :meth:`prov_interop.comparator.Comparator.compare_many`
+  then the pairs are compared in one batch, unless this fails, in
+  which case they are compared one at a time (see
+  :func:`get_verdict`).
+
+  :param comparator: Comparator
+  :type comparator: :class:`prov_interop.comparator.Comparator`
+  :param pairs: Pairs of files
+  :type pairs: list of tuple of (str or unicode, str or unicode)
+  :return: verdict for each pair, in the same order
+  :rtype: list of bool
+  """
+  if comparator.supports_compare_many:
+    try:
+      return comparator.compare_many(pairs)
+    except ComparisonError:
+      pass
+  return [get_verdict(comparator, file1, file2) for (file1, file2) in pairs]
+
+
+def validate(native, reference, files):
+  """Compare every pair of files, including each file with itself,
+  using both comparators. If the reference comparator supports
+  :meth:`prov_interop.comparator.Comparator.compare_many` then it
+  compares all the pairs in one batch.
+
+  :param native: Comparator being validated
+  :type native: :class:`prov_interop.comparator.Comparator`
+  :param reference: Authoritative comparator
+  :type reference: :class:`prov_interop.comparator.Comparator`
+  :param files: Files
+  :type files: list of str or unicode
+  :return: number of pairs compared, and the pairs whose verdicts
+    disagree, with the verdicts of `native` and `reference`
+  :rtype: tuple of (int, list of tuple of (str or unicode, str or
+    unicode, bool, bool))
+  """
+  pairs = [(file1, file2)
+           for (index, file1) in enumerate(files)
+           for file2 in files[index:]]
+  verdicts = [get_verdict(native, file1, file2) for (file1, file2) in pairs]
+  reference_verdicts = get_verdicts(reference, pairs)
+  disagreements = [(file1, file2, verdict, reference_verdict)
+                   for ((file1, file2), verdict, reference_verdict)
+                   in zip(pairs, verdicts, reference_verdicts)
+                   if verdict != reference_verdict]
+  return (len(pairs), disagreements)
+
+
+def get_test_case_files(harness_resources, format):
+  """Get the test case files in a format.
+
+  :param harness_resources: Harness
+  :type harness_resources: :class:`prov_interop.harness.HarnessResources`
+  :param format: Format, one of those in :mod:`prov_interop.standards`
+  :type format: str or unicode
+  :return: files
+  :rtype: list of str or unicode
+  :raises ConfigError: if the test cases directory is not found
+  """
+  return [file_name
+          for (_, files) in harness_resources.test_case_files()
+          for (file_format, file_name) in files
+          if file_format == format]
+
+
+def format_validation(pairs, disagreements, test_cases_dir):
+  """Format the results of :func:`validate`. Files are shown relative
+  to the test cases directory.
+
+  :param pairs: Number of pairs compared
+  :type pairs: int
+  :param disagreements: Pairs whose verdicts disagree
+  :type disagreements: list of tuple of (str or unicode, str or
+    unicode, bool, bool)
+  :param test_cases_dir: Test cases directory
+  :type test_cases_dir: str or unicode
+  :return: formatted results
+  :rtype: str or unicode
+  """
+  lines = ["Pairs compared: " + str(pairs),
+           "Disagreements: " + str(len(disagreements))]
+  for (file1, file2, verdict, reference_verdict) in disagreements:
+    lines.append(" ".join([os.path.relpath(file1, test_cases_dir),
+                           os.path.relpath(file2, test_cases_dir),
+                           "native:" + str(verdict),
+                           "reference:" + str(reference_verdict)]))
+  return "\n".join(lines)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Validate a native comparator against a reference comparator.")
+  parser.add_argument("-f", "--file",
+                      help="Harness configuration file (default " +
+                      harness.CONFIGURATION_FILE_ENV +
+                      " environment variable or " +
+                      harness.DEFAULT_CONFIGURATION_FILE + ")")
+  parser.add_argument("-n", "--native",
+                      help="Native comparator name",
+                      required=True)
+  parser.add_argument("-r", "--reference",
+                      help="Reference comparator name",
+                      required=True)
+  parser.add_argument("-e", "--format",
+                      help="Format of test case files (default " +
+                      standards.JSON + ")",
+                      choices=standards.FORMATS,
+                      default=standards.JSON)
+  parser.add_argument("-l", "--limit",
+                      help="Maximum number of test case files",
+                      type=int)
+  parser.add_argument("-d", "--disagree",
+                      help="Exit with non-zero status if the comparators disagree",
+                      action="store_true")
+  args = parser.parse_args()
+  harness.initialise_harness_from_file(args.file)
+  harness_resources = harness.harness_resources
+  comparators = harness_resources.comparators
+  for name in [args.native, args.reference]:
+    if name not in comparators:
+      print("No such comparator: " + name)
+      sys.exit(2)
+  files = get_test_case_files(harness_resources, args.format)
+  if args.limit is not None:
+    files = files[:args.limit]
+  (pairs, disagreements) = validate(comparators[args.native],
+                                    comparators[args.reference], files)
+  print(format_validation(pairs, disagreements,
+                          harness_resources.test_cases_dir))
+  if args.disagree and disagreements:
+    sys.exit(1)
+  sys.exit(0)
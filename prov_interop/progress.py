@@ -0,0 +1,413 @@
+"""Live progress reporting across test harness worker processes.
+
+Each worker process appends progress events to its own file,
+``progress.<pid>.jsonl``, in a progress directory, one event per
+line::
+
+  {"event": "total", "jobs": 400, "time": 1444743600.1}
+  {"event": "start", "job": "ProvPyConverter case1 json->provx",
+   "time": 1444743600.2}
+  {"event": "end", "job": "ProvPyConverter case1 json->provx",
+   "verdict": "pass", "time": 1444743600.9}
+
+A :class:`ProgressMonitor` reads new events from all the files and
+summarises the run's progress: jobs completed out of the total,
+verdicts, jobs per second, estimated time to completion and the
+slowest jobs in flight. Running this module renders the progress
+periodically and, optionally, writes it to a status file, as JSON, for
+dashboards.
+
+Usage::
+
+    usage: progress.py [-h] [-s STATUS] [-i INTERVAL] [-t TOTAL]
+                       [-n SLOWEST] [-1]
+                       DIRECTORY
+
+    Report progress of test harness workers.
+
+    positional arguments:
+      DIRECTORY             Progress directory
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -s STATUS, --status STATUS
+                            Status file (default none)
+      -i INTERVAL, --interval INTERVAL
+                            Seconds between updates (default 5)
+      -t TOTAL, --total TOTAL
+                            Total number of jobs (default estimated from
+                            events)
+      -n SLOWEST, --slowest SLOWEST
+                            Number of slowest in-flight jobs shown
+                            (default 5)
+      -1, --once            Report once then exit
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import json
+import os
+import sys
+import time
+
+PROGRESS_ENV = "PROV_HARNESS_PROGRESS"
+"""str or unicode: environment variable holding progress directory"""
+
+FILE_PREFIX = "progress."
+"""str or unicode: prefix of per-process progress files"""
+
+FILE_SUFFIX = ".jsonl"
+"""str or unicode: suffix of per-process progress files"""
+
+EVENT = "event"
+"""str or unicode: event key for event type"""
+JOB = "job"
+"""str or unicode: event key for job name"""
+JOBS = "jobs"
+"""str or unicode: event key for number of jobs"""
+VERDICT = "verdict"
+"""str or unicode: event key for verdict"""
+TIME = "time"
+"""str or unicode: event key for time, in seconds since the epoch"""
+
+TOTAL = "total"
+"""str or unicode: event type for the number of test cases"""
+START = "start"
+"""str or unicode: event type for a job starting"""
+END = "end"
+"""str or unicode: event type for a job ending"""
+
+SKIP = "skip"
+"""str or unicode: verdict for a skipped job"""
+
+def job_name(converter, index, ext_in, ext_out):
+  """Get the name of a test job.
+
+  :param converter: Converter name
+  :type converter: str or unicode
+  :param index: Test case index
+  :type index: str or unicode
+  :param ext_in: Input format
+  :type ext_in: str or unicode
+  :param ext_out: Output format
+  :type ext_out: str or unicode
+  :return: name e.g. ``ProvPyConverter case1 json->provx``
+  :rtype: str or unicode
+  """
+  return converter + " " + str(index) + " " + ext_in + "->" + ext_out
+
+
+class ProgressLog(object):
+  """Writer of the progress events of a worker process. Each event
+  is written using a single ``write`` to a file opened in append
+  mode, as soon as it happens, so it can be seen by a
+  :class:`ProgressMonitor` while the run is in progress. The file
+  name is based on the ID of the process writing the event, so each
+  worker has its own file even if forked after the log was created.
+  """
+
+  def __init__(self, directory):
+    """Create log. `directory` is created if it does not exist.
+
+    :param directory: Progress directory
+    :type directory: str or unicode
+    """
+    self._directory = directory
+    if not os.path.isdir(directory):
+      try:
+        os.makedirs(directory)
+      except OSError:
+        if not os.path.isdir(directory):
+          raise
+    self._job = None
+
+  @property
+  def directory(self):
+    """Get progress directory.
+
+    :return: directory
+    :rtype: str or unicode
+    """
+    return self._directory
+
+  def write(self, event):
+    """Write an event, adding the current time.
+
+    :param event: Event
+    :type event: dict
+    """
+    event[TIME] = time.time()
+    line = json.dumps(event, sort_keys=True) + "\n"
+    file_name = os.path.join(self._directory,
+                             FILE_PREFIX + str(os.getpid()) + FILE_SUFFIX)
+    fd = os.open(file_name, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+      os.write(fd, line.encode("utf-8"))
+    finally:
+      os.close(fd)
+
+  def total(self, jobs):
+    """Record the number of test cases enumerated.
+
+    :param jobs: Number of test cases
+    :type jobs: int
+    """
+    self.write({EVENT: TOTAL, JOBS: jobs})
+
+  def start(self, job):
+    """Record the start of a job.
+
+    :param job: Job name (see :func:`job_name`)
+    :type job: str or unicode
+    """
+    self._job = job
+    self.write({EVENT: START, JOB: job})
+
+  def end(self, verdict):
+    """Record the end of the job most recently started, if it has not
+    already ended.
+
+    :param verdict: Verdict e.g. ``pass``, ``fail``, ``error`` or
+      ``skip``
+    :type verdict: str or unicode
+    """
+    if self._job is None:
+      return
+    self.write({EVENT: END, JOB: self._job, VERDICT: verdict})
+    self._job = None
+
+
+class ProgressMonitor(object):
+  """Aggregator of the progress events of all worker processes.
+  Files are read incrementally, so each event is only read once,
+  and incomplete lines, still being written, are left until the next
+  update.
+  """
+
+  def __init__(self, directory):
+    """Create monitor.
+
+    :param directory: Progress directory
+    :type directory: str or unicode
+    """
+    self._directory = directory
+    self._offsets = {}
+    self._jobs = 0
+    self._converters = set()
+    self._first = None
+    self._completed = 0
+    self._verdicts = {}
+    self._in_flight = {}
+    self._last = None
+
+  def update(self):
+    """Read new events from the progress files.
+
+    :return: number of events read
+    :rtype: int
+    """
+    if not os.path.isdir(self._directory):
+      return 0
+    count = 0
+    for file_name in sorted(os.listdir(self._directory)):
+      if not (file_name.startswith(FILE_PREFIX) and
+              file_name.endswith(FILE_SUFFIX)):
+        continue
+      worker = file_name[len(FILE_PREFIX):-len(FILE_SUFFIX)]
+      with open(os.path.join(self._directory, file_name), "rb") as f:
+        f.seek(self._offsets.get(file_name, 0))
+        data = f.read()
+      end = data.rfind(b"\n") + 1
+      self._offsets[file_name] = self._offsets.get(file_name, 0) + end
+      for line in data[:end].decode("utf-8").splitlines():
+        try:
+          self.add(worker, json.loads(line))
+        except (ValueError, KeyError):
+          continue
+        count += 1
+    return count
+
+  def add(self, worker, event):
+    """Add an event.
+
+    :param worker: Worker identifier
+    :type worker: str or unicode
+    :param event: Event
+    :type event: dict
+    :raises KeyError: if the event is missing a required key
+    """
+    event_time = event[TIME]
+    self._last = max(self._last or event_time, event_time)
+    if event[EVENT] == TOTAL:
+      self._jobs = max(self._jobs, event[JOBS])
+    elif event[EVENT] == START:
+      if self._first is None or event_time < self._first:
+        self._first = event_time
+      self._converters.add(event[JOB].split(" ")[0])
+      self._in_flight[(worker, event[JOB])] = event_time
+    elif event[EVENT] == END:
+      self._in_flight.pop((worker, event[JOB]), None)
+      self._completed += 1
+      verdict = event[VERDICT]
+      self._verdicts[verdict] = self._verdicts.get(verdict, 0) + 1
+
+  def status(self, now=None, total=None, slowest=5):
+    """Get the progress of the run::
+
+      {"total": 400, "completed": 120, "in_flight": 4,
+       "verdicts": {"pass": 100, "fail": 2, "skip": 18},
+       "elapsed": 60.2, "jobs_per_sec": 1.99, "eta": 140.5,
+       "slowest": [{"worker": "1234", "job": "ProvToolboxConverter
+       case1 json->provx", "elapsed": 12.1}, ...],
+       "updated": 1444743660.3}
+
+    If `total` is not given then it is estimated as the number of
+    test cases enumerated multiplied by the number of converters that
+    have started jobs. The time to completion, ``eta``, is estimated
+    from the rate at which jobs have completed so far, and is
+    ``None`` if no jobs have completed.
+
+    :param now: Current time, in seconds since the epoch (optional)
+    :type now: float
+    :param total: Total number of jobs (optional)
+    :type total: int
+    :param slowest: Number of slowest in-flight jobs to include
+    :type slowest: int
+    :return: status
+    :rtype: dict
+    """
+    if now is None:
+      now = time.time()
+    if total is None:
+      total = self._jobs * max(len(self._converters), 1)
+    total = max(total, self._completed + len(self._in_flight))
+    elapsed = 0
+    if self._first is not None:
+      elapsed = max(now - self._first, 0)
+    rate = None
+    eta = None
+    if self._completed > 0 and elapsed > 0:
+      rate = self._completed / elapsed
+      eta = (total - self._completed) / rate
+    in_flight = sorted(self._in_flight.items(), key=lambda item: item[1])
+    return {"total": total,
+            "completed": self._completed,
+            "in_flight": len(self._in_flight),
+            "verdicts": dict(self._verdicts),
+            "elapsed": elapsed,
+            "jobs_per_sec": rate,
+            "eta": eta,
+            "slowest": [{"worker": worker, "job": job,
+                         "elapsed": now - start_time}
+                        for ((worker, job), start_time)
+                        in in_flight[:slowest]],
+            "updated": self._last}
+
+
+def format_status(status):
+  """Format progress as text.
+
+  :param status: Status, from :meth:`ProgressMonitor.status`
+  :type status: dict
+  :return: text
+  :rtype: str or unicode
+  """
+  percent = 0
+  if status["total"] > 0:
+    percent = 100 * status["completed"] / status["total"]
+  lines = ["Completed: %d/%d (%.1f%%) In flight: %d" %
+           (status["completed"], status["total"], percent,
+            status["in_flight"])]
+  lines.append("Verdicts: " + ", ".join(
+    [verdict + "=" + str(count)
+     for (verdict, count) in sorted(status["verdicts"].items())]))
+  rate = "-" if status["jobs_per_sec"] is None else \
+      "%.2f" % status["jobs_per_sec"]
+  eta = "-" if status["eta"] is None else \
+      time.strftime("%H:%M:%S", time.gmtime(status["eta"]))
+  lines.append("Pairs/sec: %s ETA: %s" % (rate, eta))
+  if status["slowest"]:
+    lines.append("Slowest in flight:")
+    for job in status["slowest"]:
+      lines.append("  %8.1fs %s (worker %s)" %
+                   (job["elapsed"], job["job"], job["worker"]))
+  return "\n".join(lines)
+
+def write_status(status, file_name):
+  """Write progress to a JSON file. The file is written to a
+  temporary file which is then renamed, so readers never see a
+  partially written file.
+
+  :param status: Status, from :meth:`ProgressMonitor.status`
+  :type status: dict
+  :param file_name: File name
+  :type file_name: str or unicode
+  """
+  temp_file_name = file_name + "." + str(os.getpid()) + ".tmp"
+  with open(temp_file_name, "w") as f:
+    f.write(json.dumps(status, indent=2, sort_keys=True) + "\n")
+  if os.path.exists(file_name) and sys.platform == "win32":
+    os.remove(file_name)
+  os.rename(temp_file_name, file_name)
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Report progress of test harness workers.")
+  parser.add_argument("directory", metavar="DIRECTORY",
+                      help="Progress directory")
+  parser.add_argument("-s", "--status",
+                      help="Status file (default none)")
+  parser.add_argument("-i", "--interval",
+                      help="Seconds between updates (default 5)",
+                      type=float,
+                      default=5)
+  parser.add_argument("-t", "--total",
+                      help="Total number of jobs (default estimated from events)",
+                      type=int)
+  parser.add_argument("-n", "--slowest",
+                      help="Number of slowest in-flight jobs shown (default 5)",
+                      type=int,
+                      default=5)
+  parser.add_argument("-1", "--once",
+                      help="Report once then exit",
+                      action="store_true")
+  args = parser.parse_args()
+  monitor = ProgressMonitor(args.directory)
+  try:
+    while True:
+      monitor.update()
+      status = monitor.status(total=args.total, slowest=args.slowest)
+      print(format_status(status))
+      print("")
+      sys.stdout.flush()
+      if args.status is not None:
+        write_status(status, args.status)
+      if args.once:
+        break
+      time.sleep(args.interval)
+  except KeyboardInterrupt:
+    pass
+  sys.exit(0)
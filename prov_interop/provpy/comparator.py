@@ -26,16 +26,17 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import os.path
-import subprocess
 
 from prov_interop import standards
-from prov_interop.component import CommandLineComponent
 from prov_interop.component import ConfigError
+from prov_interop.comparator import CommandLineComparator
 from prov_interop.comparator import ComparisonError
-from prov_interop.comparator import Comparator
 
-class ProvPyComparator(Comparator, CommandLineComponent):
-  """Manages invocation of ProvPy ``prov-compare`` script."""
+class ProvPyComparator(CommandLineComparator):
+  """Manages invocation of ProvPy ``prov-compare`` script, or of
+  :mod:`prov_interop.provpy.compare_many` to compare many pairs of
+  files in one process (see
+  :class:`prov_interop.comparator.CommandLineComparator`)."""
 
   FORMAT1 = "FORMAT1"
   """str or unicode: token for file1's format in command-line specification"""
@@ -64,20 +65,27 @@ class ProvPyComparator(Comparator, CommandLineComponent):
   def configure(self, config):
     """Configure comparator. The configuration must hold:
 
-    - :class:`prov_interop.comparator.Comparator` configuration
-    - :class:`prov_interop.component.CommandLineComponent` configuration
+    - :class:`prov_interop.comparator.CommandLineComparator`
+      configuration
 
     ``arguments`` must have tokens ``FORMAT1``, ``FORMAT2``,
     ``FILE1``, ``FILE2``, which are place-holders for the the files and
     their formats. 
 
-    A valid configuration is::
+    Valid configurations include::
 
       {
         "executable": "prov-compare"
         "arguments": "-f FORMAT1 -F FORMAT2 FILE1 FILE2"
         "formats": ["provx", "json"]
       }
+      {
+        "executable": "prov-compare"
+        "arguments": "-f FORMAT1 -F FORMAT2 FILE1 FILE2"
+        "batch-executable": "python -m prov_interop.provpy.compare_many"
+        "batch-arguments": "MANIFEST RESULTS"
+        "formats": ["provx", "json"]
+      }
 
     :param config: Configuration
     :type config: dict
@@ -91,6 +99,40 @@ class ProvPyComparator(Comparator, CommandLineComponent):
       if token not in self._arguments:
         raise ConfigError("Missing token " + token)
 
+  def command_line(self, file1, file2):
+    """Get command-line invocation to compare files. ``executable``
+    and ``arguments`` are used to create the invocation, with
+    ``FORMAT1``, ``FORMAT2``, ``FILE1`` and ``FILE2`` being replaced
+    with the file formats, `file1`, and `file2`. If either format is
+    ``provx`` then ``xml`` is used.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: command-line invocation
+    :rtype: list of str or unicode
+    """
+    format1 = os.path.splitext(file1)[1][1:]
+    format2 = os.path.splitext(file2)[1][1:]
+    local_format1 = format1
+    if (format1 in ProvPyComparator.LOCAL_FORMATS):
+      local_format1 = ProvPyComparator.LOCAL_FORMATS[format1]
+    local_format2 = format2
+    if (format2 in ProvPyComparator.LOCAL_FORMATS):
+      local_format2 = ProvPyComparator.LOCAL_FORMATS[format2]
+    command_line = list(self._executable)
+    command_line.extend(self._arguments)
+    command_line = [local_format1 if x==ProvPyComparator.FORMAT1 else x 
+                    for x in command_line]
+    command_line = [local_format2 if x==ProvPyComparator.FORMAT2 else x 
+                    for x in command_line]
+    command_line = [file1 if x==ProvPyComparator.FILE1 else x 
+                    for x in command_line]
+    command_line = [file2 if x==ProvPyComparator.FILE2 else x 
+                    for x in command_line]
+    return command_line
+
   def compare(self, file1, file2):
     """Compare files.
 
@@ -124,24 +166,8 @@ class ProvPyComparator(Comparator, CommandLineComponent):
     format2 = os.path.splitext(file2)[1][1:]
     for format in [format1, format2]:
       super(ProvPyComparator, self).check_format(format)
-    local_format1 = format1
-    if (format1 in ProvPyComparator.LOCAL_FORMATS):
-      local_format1 = ProvPyComparator.LOCAL_FORMATS[format1]
-    local_format2 = format2
-    if (format2 in ProvPyComparator.LOCAL_FORMATS):
-      local_format2 = ProvPyComparator.LOCAL_FORMATS[format2]
-    command_line = list(self._executable)
-    command_line.extend(self._arguments)
-    command_line = [local_format1 if x==ProvPyComparator.FORMAT1 else x 
-                    for x in command_line]
-    command_line = [local_format2 if x==ProvPyComparator.FORMAT2 else x 
-                    for x in command_line]
-    command_line = [file1 if x==ProvPyComparator.FILE1 else x 
-                    for x in command_line]
-    command_line = [file2 if x==ProvPyComparator.FILE2 else x 
-                    for x in command_line]
-    print((" ".join(command_line)))
-    return_code = subprocess.call(command_line)
+    command_line = self.command_line(file1, file2)
+    return_code = self.run(command_line)
     if return_code == 0:
       return True
     elif return_code == 1:
@@ -0,0 +1,152 @@
+"""Batch driver which compares many pairs of PROV documents in one
+process using the ProvPy ``prov`` package, as ``prov-compare`` does:
+each document is deserialized into a ``prov.model.ProvDocument`` and
+documents are equivalent if these are equal. Document formats are
+derived from file extensions. Each document is parsed once for as
+long as it stays in a small cache, so a test case file compared with
+the outputs of many converters is usually parsed only once.
+
+The manifest file holds a JSON list of pairs of files. A JSON list of
+exit codes, one for each pair, is written into the results file: 0 if
+the documents are equivalent, 1 if they are not, and 2 if either
+document could not be parsed (see
+:class:`prov_interop.comparator.CommandLineComparator`).
+
+Usage::
+
+    usage: compare_many.py [-h] manifest results
+
+    Compare many pairs of PROV documents using ProvPy.
+
+    positional arguments:
+      manifest    Manifest file
+      results     Results file
+
+    optional arguments:
+      -h, --help  show this help message and exit
+
+For example::
+
+    $ python -m prov_interop.provpy.compare_many manifest.json results.json
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import collections
+import json
+import os.path
+import sys
+
+from prov.model import ProvDocument
+
+from prov_interop.provpy.converter import ProvPyConverter
+
+CACHE_SIZE = 16
+"""int: maximum number of parsed documents held in the cache"""
+
+EQUIVALENT = 0
+"""int: exit code for documents which are equivalent"""
+
+NOT_EQUIVALENT = 1
+"""int: exit code for documents which are not equivalent"""
+
+ERROR = 2
+"""int: exit code for documents which could not be compared"""
+
+def load_document(file_name):
+  """Deserialize a document, deriving its format from its file
+  extension.
+
+  :param file_name: File
+  :type file_name: str or unicode
+  :return: document
+  :rtype: :class:`prov.model.ProvDocument`
+  :raises Exception: if the format is not supported or the document
+    cannot be parsed
+  """
+  format = os.path.splitext(file_name)[1][1:]
+  (prov_format, args) = ProvPyConverter.PROV_FORMATS[format]
+  return ProvDocument.deserialize(file_name, format=prov_format, **args)
+
+
+def get_document(documents, file_name):
+  """Get a document from a cache, parsing it, and adding it to the
+  cache, if it is not there. If the cache is full, the least
+  recently used document is removed from it.
+
+  :param documents: Cache of documents keyed by file name
+  :type documents: :class:`collections.OrderedDict`
+  :param file_name: File
+  :type file_name: str or unicode
+  :return: document
+  :rtype: :class:`prov.model.ProvDocument`
+  :raises Exception: if the document cannot be parsed
+  """
+  if file_name in documents:
+    document = documents.pop(file_name)
+  else:
+    document = load_document(file_name)
+    if len(documents) >= CACHE_SIZE:
+      documents.popitem(last=False)
+  documents[file_name] = document
+  return document
+
+
+def compare_pairs(pairs):
+  """Compare pairs of files.
+
+  :param pairs: Pairs of files
+  :type pairs: list of list of str or unicode
+  :return: exit code for each pair, in the same order
+  :rtype: list of int
+  """
+  documents = collections.OrderedDict()
+  return_codes = []
+  for (file1, file2) in pairs:
+    try:
+      equivalent = (get_document(documents, file1) ==
+                    get_document(documents, file2))
+    except Exception as e:
+      print("Comparing " + file1 + " and " + file2 + " failed: " + str(e),
+            file=sys.stderr)
+      return_codes.append(ERROR)
+      continue
+    return_codes.append(EQUIVALENT if equivalent else NOT_EQUIVALENT)
+  return return_codes
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Compare many pairs of PROV documents using ProvPy.")
+  parser.add_argument("manifest", help="Manifest file")
+  parser.add_argument("results", help="Results file")
+  args = parser.parse_args()
+  with open(args.manifest, "r") as manifest_file:
+    pairs = json.load(manifest_file)
+  return_codes = compare_pairs(pairs)
+  with open(args.results, "w") as results_file:
+    json.dump(return_codes, results_file)
+  sys.exit(0)
@@ -25,15 +25,18 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import logging
 import os.path
-import subprocess
 
 from prov_interop import standards
+from prov_interop import timing
 from prov_interop.component import CommandLineComponent
 from prov_interop.component import ConfigError
 from prov_interop.converter import ConversionError
 from prov_interop.converter import Converter
 
+logger = logging.getLogger(__name__)
+
 class ProvPyConverter(Converter, CommandLineComponent):
   """Manages invocation of ProvPy ``prov-convert`` script."""
 
@@ -53,10 +56,46 @@ class ProvPyConverter(Converter, CommandLineComponent):
   formats understood by ``prov-convert``
   """
 
+  IN_PROCESS = "in-process"
+  """str or unicode: configuration key for flag indicating that
+  :meth:`convert_many` uses the ProvPy ``prov`` package in-process"""
+
+  PROV_FORMATS = {
+    standards.PROVN: ("provn", {}),
+    standards.PROVX: ("xml", {}),
+    standards.JSON: ("json", {}),
+    standards.TTL: ("rdf", {"rdf_format": "turtle"}),
+    standards.TRIG: ("rdf", {"rdf_format": "trig"})
+  }
+  """dict: mapping from formats in :mod:`prov_interop.standards` to
+  ``prov`` package serializer names and serializer arguments
+  """
+
   def __init__(self):
     """Create converter.
     """
     super(ProvPyConverter, self).__init__()
+    self._in_process = False
+
+  @property
+  def in_process(self):
+    """Get whether :meth:`convert_many` uses the ProvPy ``prov``
+    package in-process.
+
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    return self._in_process
+
+  @property
+  def supports_convert_many(self):
+    """Get whether :meth:`convert_many` parses the input file only
+    once. This is the case if ``in-process`` is ``True``.
+
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    return self._in_process
 
   def configure(self, config):
     """Configure converter. The configuration must hold:
@@ -68,6 +107,15 @@ class ProvPyConverter(Converter, CommandLineComponent):
     which are place-holders for the output format, input file and
     output file. 
 
+    The configuration may also hold:
+
+    - ``in-process``: if ``True`` then :meth:`convert_many` parses the
+      input file once, and serializes it into each output format,
+      using the ProvPy ``prov`` package within the current process,
+      rather than invoking ``prov-convert`` for each output
+      format. The ``prov`` package must be importable and should be
+      the same version as that used by ``prov-convert``.
+
     A valid configuration is::
 
       {
@@ -79,7 +127,9 @@ class ProvPyConverter(Converter, CommandLineComponent):
 
     :param config: Configuration
     :type config: dict
-    :raises ConfigError: if `config` does not hold the above entries
+    :raises ConfigError: if `config` does not hold the above entries,
+      or ``in-process`` is ``True`` and the ``prov`` package cannot be
+      imported
     """
     super(ProvPyConverter, self).configure(config)
     for token in [ProvPyConverter.FORMAT,
@@ -87,6 +137,55 @@ class ProvPyConverter(Converter, CommandLineComponent):
                   ProvPyConverter.OUTPUT]:
       if token not in self._arguments:
         raise ConfigError("Missing token " + token)
+    self._in_process = config.get(ProvPyConverter.IN_PROCESS, False) is True
+    if self._in_process:
+      try:
+        import prov.model
+      except ImportError:
+        raise ConfigError(ProvPyConverter.IN_PROCESS +
+                          " requires the prov package")
+
+  def fingerprint_values(self):
+    """Get the values from which :meth:`fingerprint` is
+    computed. If ``in-process`` is ``True`` then the ``prov`` package
+    version is included.
+
+    :return: values
+    :rtype: list
+    """
+    values = super(ProvPyConverter, self).fingerprint_values()
+    if self._in_process:
+      import prov
+      values.append("prov " + prov.__version__)
+    return values
+
+  def command_line(self, in_file, out_file):
+    """Get command-line invocation to convert input file into output
+    file. ``executable`` and ``arguments`` are used to create the
+    invocation, with ``FORMAT``, ``INPUT`` and ``OUTPUT`` being
+    replaced with the output format, `in_file`, and `out_file`. If the
+    output format is ``provx`` then ``xml`` is used as ``FORMAT``.
+
+    :param in_file: Input file
+    :type in_file: str or unicode
+    :param out_file: Output file
+    :type out_file: str or unicode
+    :return: command-line invocation
+    :rtype: list of str or unicode
+    """
+    out_format = os.path.splitext(out_file)[1][1:]
+    local_format = out_format
+    if (out_format in ProvPyConverter.LOCAL_FORMATS):
+      local_format = ProvPyConverter.LOCAL_FORMATS[out_format]
+    command_line = list(self._executable)
+    command_line.extend(self._arguments)
+    command_line = [local_format if x==ProvPyConverter.FORMAT else x 
+                    for x in command_line]
+    command_line = [in_file if x==ProvPyConverter.INPUT else x 
+                    for x in command_line]
+    command_line = [out_file if x==ProvPyConverter.OUTPUT else x 
+                    for x in command_line]
+    return command_line
 
   def convert(self, in_file, out_file):
     """Convert input file into output file. 
@@ -99,7 +198,7 @@ class ProvPyConverter(Converter, CommandLineComponent):
     - ``executable`` and ``arguments`` are used to create a
       command-line invocation, with ``FORMAT``, ``INPUT`` and
       ``OUTPUT`` being replaced with the output format, `in_file`, and
-      `out_file`  
+      `out_file` (see :meth:`command_line`).
     - If the output format is ``provx`` then ``xml`` is used as
       ``FORMAT`` (as ``prov-convert`` does not recognise ``provx``).
     - A check is done to see that `out_file` exists.
@@ -121,21 +220,64 @@ class ProvPyConverter(Converter, CommandLineComponent):
     in_format = os.path.splitext(in_file)[1][1:]
     out_format = os.path.splitext(out_file)[1][1:]
     super(ProvPyConverter, self).check_formats(in_format, out_format)
-    local_format = out_format
-    if (out_format in ProvPyConverter.LOCAL_FORMATS):
-      local_format = ProvPyConverter.LOCAL_FORMATS[out_format]
-    command_line = list(self._executable)
-    command_line.extend(self._arguments)
-    command_line = [local_format if x==ProvPyConverter.FORMAT else x 
-                    for x in command_line]
-    command_line = [in_file if x==ProvPyConverter.INPUT else x 
-                    for x in command_line]
-    command_line = [out_file if x==ProvPyConverter.OUTPUT else x 
-                    for x in command_line]
-    print((" ".join(command_line)))
-    return_code = subprocess.call(command_line)
+    command_line = self.command_line(in_file, out_file)
+    return_code = self.run(command_line)
     if return_code != 0:
       raise ConversionError(" ".join(command_line) + \
                               " returned " + str(return_code))
     if not os.path.isfile(out_file):
       raise ConversionError("Output file not found: " + out_file)
+
+  def convert_many(self, in_file, out_files):
+    """Convert input file into multiple output files.
+
+    If ``in-process`` is ``False`` then :meth:`convert` is called for
+    each output file. Otherwise:
+
+    - Input and output formats are derived from `in_file` and
+      `out_files` file extensions.
+    - A check is done to see that `in_file` exists and that the input
+      and output formats are in ``input-formats`` and
+      ``output-formats`` respectively.
+    - `in_file` is parsed once, using ``prov.model.ProvDocument``,
+      and the document is then serialized into each output file. These
+      are timed as ``parse`` and ``serialize`` spans (see
+      :func:`prov_interop.timing.span`).
+
+    :param in_file: Input file
+    :type in_file: str or unicode
+    :param out_files: Output files keyed by output format
+    :type out_files: dict from str or unicode to str or unicode
+    :raises ConversionError: if the input file cannot be found, or
+      cannot be parsed, or the document cannot be serialized
+    """
+    if not self._in_process:
+      super(ProvPyConverter, self).convert_many(in_file, out_files)
+      return
+    from prov.model import ProvDocument
+    super(ProvPyConverter, self).convert(in_file, None)
+    in_format = os.path.splitext(in_file)[1][1:]
+    for out_file in out_files.values():
+      out_format = os.path.splitext(out_file)[1][1:]
+      super(ProvPyConverter, self).check_formats(in_format, out_format)
+    (prov_format, args) = ProvPyConverter.PROV_FORMATS[in_format]
+    logger.debug("prov.model.ProvDocument.deserialize %s", in_file)
+    try:
+      with timing.span("parse"):
+        document = ProvDocument.deserialize(in_file, format=prov_format,
+                                            **args)
+    except Exception as exc:
+      raise ConversionError("Parsing " + in_file + " failed: " + str(exc))
+    for format in sorted(out_files):
+      out_file = out_files[format]
+      out_format = os.path.splitext(out_file)[1][1:]
+      (prov_format, args) = ProvPyConverter.PROV_FORMATS[out_format]
+      logger.debug("prov.model.ProvDocument.serialize %s", out_file)
+      try:
+        with timing.span("serialize"):
+          document.serialize(out_file, format=prov_format, **args)
+      except Exception as exc:
+        raise ConversionError("Serializing " + out_file + " failed: " +
+                              str(exc))
+      if not os.path.isfile(out_file):
+        raise ConversionError("Output file not found: " + out_file)
@@ -32,6 +32,7 @@ import requests
 
 from prov_interop import http
 from prov_interop import standards
+from prov_interop import timing
 from prov_interop.component import ConfigError
 from prov_interop.component import RestComponent
 from prov_interop.converter import ConversionError
@@ -65,6 +66,13 @@ class ProvStoreConverter(Converter, RestComponent):
   HTTP header value
   """
 
+  UNFINGERPRINTED_KEYS = RestComponent.UNFINGERPRINTED_KEYS + \
+                         [AUTHORIZATION]
+  """list of str or unicode: configuration keys which do not affect
+  conversions, so are not included in the fingerprint, including
+  the authorization key, so rotating it does not change the
+  fingerprint"""
+
   def __init__(self):
     """Create converter.
     """
@@ -135,6 +143,8 @@ class ProvStoreConverter(Converter, RestComponent):
       newly-stored document to remove it. 
     - The HTTP status is checked to to be 204 NO CONTENT.
 
+    The POST, GET and DELETE requests are timed as ``post``, ``get``
+    and ``delete`` spans (see :func:`prov_interop.timing.span`).
 
     :param in_file: Input file
     :type in_file: str or unicode
@@ -160,9 +170,10 @@ class ProvStoreConverter(Converter, RestComponent):
     store_request = {ProvStoreConverter.CONTENT: doc, 
                      ProvStoreConverter.PUBLIC: True, 
                      ProvStoreConverter.REC_ID: str(os.getpid()) + "." + in_format}
-    response = requests.post(self._url, 
-                             headers=headers, 
-                             data=json.dumps(store_request))
+    with timing.span("post"):
+      response = requests.post(self._url, 
+                               headers=headers, 
+                               data=json.dumps(store_request))
     if (response.status_code != requests.codes.created): # 201 CREATED
       raise ConversionError(self._url + " POST returned " + 
                             str(response.status_code))
@@ -172,9 +183,10 @@ class ProvStoreConverter(Converter, RestComponent):
     doc_url = self._url + str(document_id)
     accept_type = ProvStoreConverter.CONTENT_TYPES[out_format]
     headers = {http.ACCEPT: accept_type}
-    response = requests.get(doc_url + "." + out_format, 
-                            headers=headers, 
-                            allow_redirects=True)
+    with timing.span("get"):
+      response = requests.get(doc_url + "." + out_format, 
+                              headers=headers, 
+                              allow_redirects=True)
     if (response.status_code != requests.codes.ok): # 200 OK
       raise ConversionError(doc_url + " GET returned " + 
                             str(response.status_code))
@@ -182,7 +194,8 @@ class ProvStoreConverter(Converter, RestComponent):
       f.write(response.text)
     # Delete document
     headers = {http.AUTHORIZATION: self._authorization}
-    response = requests.delete(doc_url, headers=headers)
+    with timing.span("delete"):
+      response = requests.delete(doc_url, headers=headers)
     if (response.status_code != requests.codes.no_content): # 204 NO CONTENT
       raise ConversionError(doc_url + " DELETE returned " + 
                             str(response.status_code))
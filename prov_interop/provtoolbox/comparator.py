@@ -27,16 +27,16 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import os.path
-import subprocess
 
-from prov_interop.component import CommandLineComponent
 from prov_interop.component import ConfigError
+from prov_interop.comparator import CommandLineComparator
 from prov_interop.comparator import ComparisonError
-from prov_interop.comparator import Comparator
 
 
-class ProvToolboxComparator(Comparator, CommandLineComponent):
-    """Manages invocation of ProvToolbox `provconvert` script for comparison of two PROV documents."""
+class ProvToolboxComparator(CommandLineComparator):
+    """Manages invocation of ProvToolbox `provconvert` script for comparison of two PROV documents.
+    A batch driver may be configured to compare many pairs of files in one process
+    (see :class:`prov_interop.comparator.CommandLineComparator`)."""
 
     FORMAT1 = "FORMAT1"
     """str or unicode: token for file1's format in command-line specification"""
@@ -58,8 +58,8 @@ class ProvToolboxComparator(Comparator, CommandLineComponent):
     def configure(self, config):
         """Configure comparator. The configuration must hold:
 
-        - :class:`prov_interop.comparator.Comparator` configuration
-        - :class:`prov_interop.component.CommandLineComponent` configuration
+        - :class:`prov_interop.comparator.CommandLineComparator`
+          configuration
 
         ``arguments`` must have tokens ``FORMAT1``, ``FORMAT2``,
         ``FILE1``, ``FILE2``, which are place-holders for the the files and
@@ -85,6 +85,33 @@ class ProvToolboxComparator(Comparator, CommandLineComponent):
             if token not in self._arguments:
                 raise ConfigError("Missing token " + token)
 
+    def command_line(self, file1, file2):
+        """Get command-line invocation to compare files. ``executable``
+        and ``arguments`` are used to create the invocation, with
+        ``FORMAT1``, ``FORMAT2``, ``FILE1`` and ``FILE2`` being replaced
+        with the file formats, `file1`, and `file2`.
+
+        :param file1: File
+        :type file1: str or unicode
+        :param file2: File
+        :type file2: str or unicode
+        :return: command-line invocation
+        :rtype: list of str or unicode
+        """
+        format1 = os.path.splitext(file1)[1][1:]
+        format2 = os.path.splitext(file2)[1][1:]
+        command_line = list(self._executable)
+        command_line.extend(self._arguments)
+        command_line = [format1 if x == ProvToolboxComparator.FORMAT1 else x
+                        for x in command_line]
+        command_line = [format2 if x == ProvToolboxComparator.FORMAT2 else x
+                        for x in command_line]
+        command_line = [file1 if x == ProvToolboxComparator.FILE1 else x
+                        for x in command_line]
+        command_line = [file2 if x == ProvToolboxComparator.FILE2 else x
+                        for x in command_line]
+        return command_line
+
     def compare(self, file1, file2):
         """Compare files.
 
@@ -119,18 +146,8 @@ class ProvToolboxComparator(Comparator, CommandLineComponent):
         self.check_format(format1)
         self.check_format(format2)
 
-        command_line = list(self._executable)
-        command_line.extend(self._arguments)
-        command_line = [format1 if x == ProvToolboxComparator.FORMAT1 else x
-                        for x in command_line]
-        command_line = [format2 if x == ProvToolboxComparator.FORMAT2 else x
-                        for x in command_line]
-        command_line = [file1 if x == ProvToolboxComparator.FILE1 else x
-                        for x in command_line]
-        command_line = [file2 if x == ProvToolboxComparator.FILE2 else x
-                        for x in command_line]
-        print((" ".join(command_line)))
-        return_code = subprocess.call(command_line)
+        command_line = self.command_line(file1, file2)
+        return_code = self.run(command_line)
         if return_code == 0:
             return True
         elif return_code == 1:
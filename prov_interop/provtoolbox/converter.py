@@ -26,7 +26,6 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import os.path
-import subprocess
 
 from prov_interop.component import CommandLineComponent
 from prov_interop.component import ConfigError
@@ -40,11 +39,35 @@ class ProvToolboxConverter(Converter, CommandLineComponent):
   """str or unicode: token for input file in command-line specification"""
   OUTPUT = "OUTPUT"
   """str or unicode: token for output file in command-line specification"""
+  MULTIPLE_OUTPUTS = "multiple-outputs"
+  """str or unicode: configuration key for flag indicating that
+  ``provconvert`` accepts multiple output files in one invocation"""
 
   def __init__(self):
     """Create converter.
     """
     super(ProvToolboxConverter, self).__init__()
+    self._multiple_outputs = False
+
+  @property
+  def multiple_outputs(self):
+    """Get whether ``provconvert`` accepts multiple output files in one
+    invocation.
+
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    return self._multiple_outputs
+
+  @property
+  def supports_convert_many(self):
+    """Get whether :meth:`convert_many` parses the input file only
+    once. This is the case if ``multiple-outputs`` is ``True``.
+
+    :return: ``True`` or ``False``
+    :rtype: bool
+    """
+    return self._multiple_outputs
 
   def configure(self, config):
     """Configure converter. The configuration must hold:
@@ -55,6 +78,13 @@ class ProvToolboxConverter(Converter, CommandLineComponent):
     ``arguments`` must have tokens ``INPUT``, ``OUTPUT`` which are
     place-holders for the input file and output file. 
 
+    The configuration may also hold:
+
+    - ``multiple-outputs``: if ``True`` then ``provconvert`` accepts
+      multiple output files in one invocation, by repeating the
+      argument preceding ``OUTPUT``, and :meth:`convert_many` invokes
+      it once for all output files.
+
     A valid configuration is::
 
       {
@@ -72,6 +102,29 @@ class ProvToolboxConverter(Converter, CommandLineComponent):
     for token in [ProvToolboxConverter.INPUT, ProvToolboxConverter.OUTPUT]:
       if token not in self._arguments:
         raise ConfigError("Missing token " + token)
+    self._multiple_outputs = \
+        config.get(ProvToolboxConverter.MULTIPLE_OUTPUTS, False) is True
+
+  def command_line(self, in_file, out_file):
+    """Get command-line invocation to convert input file into output
+    file. ``executable`` and ``arguments`` are used to create the
+    invocation, with ``INPUT`` and ``OUTPUT`` being replaced with
+    `in_file`, and `out_file`.
+
+    :param in_file: Input file
+    :type in_file: str or unicode
+    :param out_file: Output file
+    :type out_file: str or unicode
+    :return: command-line invocation
+    :rtype: list of str or unicode
+    """
+    command_line = list(self._executable)
+    command_line.extend(self._arguments)
+    command_line = [in_file if x==ProvToolboxConverter.INPUT else x 
+                    for x in command_line]
+    command_line = [out_file if x==ProvToolboxConverter.OUTPUT else x 
+                    for x in command_line]
+    return command_line
 
   def convert(self, in_file, out_file):
     """Convert input file into output file. 
@@ -102,16 +155,64 @@ class ProvToolboxConverter(Converter, CommandLineComponent):
     in_format = os.path.splitext(in_file)[1][1:]
     out_format = os.path.splitext(out_file)[1][1:]
     super(ProvToolboxConverter, self).check_formats(in_format, out_format)
-    command_line = list(self._executable)
-    command_line.extend(self._arguments)
-    command_line = [in_file if x==ProvToolboxConverter.INPUT else x 
-                    for x in command_line]
-    command_line = [out_file if x==ProvToolboxConverter.OUTPUT else x 
-                    for x in command_line]
-    print((" ".join(command_line)))
-    return_code = subprocess.call(command_line)
+    command_line = self.command_line(in_file, out_file)
+    return_code = self.run(command_line)
     if return_code != 0:
       raise ConversionError(" ".join(command_line) + \
                               " returned " + str(return_code))
     if not os.path.isfile(out_file):
       raise ConversionError("Output file not found: " + out_file)
+
+  def convert_many(self, in_file, out_files):
+    """Convert input file into multiple output files.
+
+    If ``multiple-outputs`` is ``False`` then :meth:`convert` is
+    called for each output file. Otherwise:
+
+    - Input and output formats are derived from `in_file` and
+      `out_files` file extensions.  
+    - A check is done to see that `in_file` exists and that the input
+      and output formats are in ``input-formats`` and
+      ``output-formats`` respectively. 
+    - ``executable`` and ``arguments`` are used to create a
+      command-line invocation, with ``INPUT`` and ``OUTPUT`` being
+      replaced with `in_file`, and the first output file. For each
+      other output file, the argument preceding ``OUTPUT`` and the
+      output file are appended.
+
+    An example command-line invocation is::
+
+      /home/user/ProvToolbox/bin/provconvert -infile testcase1.json -outfile testcase1.provn -outfile testcase1.provx
+
+    :param in_file: Input file
+    :type in_file: str or unicode
+    :param out_files: Output files keyed by output format
+    :type out_files: dict from str or unicode to str or unicode
+    :raises ConversionError: if the input file cannot be found, or
+      the exit code of ``provconvert`` is non-zero
+    :raises OSError: if there are problems invoking the converter
+      e.g. the script is not found
+    """
+    if not self._multiple_outputs or not out_files:
+      super(ProvToolboxConverter, self).convert_many(in_file, out_files)
+      return
+    super(ProvToolboxConverter, self).convert(in_file, None)
+    in_format = os.path.splitext(in_file)[1][1:]
+    files = [out_files[format] for format in sorted(out_files)]
+    for out_file in files:
+      out_format = os.path.splitext(out_file)[1][1:]
+      super(ProvToolboxConverter, self).check_formats(in_format, out_format)
+    command_line = self.command_line(in_file, files[0])
+    output_index = len(self._executable) + \
+        self._arguments.index(ProvToolboxConverter.OUTPUT)
+    for out_file in files[1:]:
+      if output_index > 0:
+        command_line.append(command_line[output_index - 1])
+      command_line.append(out_file)
+    return_code = self.run(command_line)
+    if return_code != 0:
+      raise ConversionError(" ".join(command_line) + \
+                              " returned " + str(return_code))
+    for out_file in files:
+      if not os.path.isfile(out_file):
+        raise ConversionError("Output file not found: " + out_file)
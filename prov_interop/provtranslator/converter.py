@@ -30,6 +30,7 @@ import requests
 
 from prov_interop import http
 from prov_interop import standards
+from prov_interop import timing
 from prov_interop.component import ConfigError
 from prov_interop.component import RestComponent
 from prov_interop.converter import ConversionError
@@ -91,6 +92,9 @@ class ProvTranslatorConverter(Converter, RestComponent):
     - The HTTP response is parsed to get the converted document, and
       this is saved to `out_file`.
 
+    The POST request is timed as a ``post`` span (see
+    :func:`prov_interop.timing.span`).
+
     :param in_file: Input file
     :type in_file: str or unicode
     :param out_file: Output file
@@ -110,9 +114,10 @@ class ProvTranslatorConverter(Converter, RestComponent):
     accept_type = ProvTranslatorConverter.CONTENT_TYPES[out_format]
     headers = {http.CONTENT_TYPE: content_type, 
                http.ACCEPT: accept_type}
-    response = requests.post(self._url, 
-                             headers=headers, 
-                             data=doc_str)
+    with timing.span("post"):
+      response = requests.post(self._url, 
+                               headers=headers, 
+                               data=doc_str)
     if (response.status_code != requests.codes.ok): # 200 OK
       raise ConversionError(self._url + " POST returned " + 
                             str(response.status_code))
@@ -0,0 +1,136 @@
+"""Registries of components that are created when first needed.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+try:
+  from collections.abc import Mapping
+except ImportError:
+  from collections import Mapping
+
+from prov_interop import factory
+
+def create_component(class_name, config):
+  """Create and configure a component.
+
+  :param class_name: Module-prefixed class name
+  :type class_name: str or unicode
+  :param config: Configuration
+  :type config: dict
+  :return: component
+  :rtype: :class:`prov_interop.component.ConfigurableComponent`
+  :raises ImportError: if module cannot be loaded
+  :raises ConfigError: if there are problems configuring the component
+  """
+  component = factory.get_instance(class_name)
+  component.configure(config)
+  return component
+
+
+class LazyRegistry(Mapping):
+  """Read-only dictionary of components whose values are created,
+  by a loader function, the first time they are looked up, and then
+  cached. Checking whether a key is registered, iterating over keys
+  and getting the number of keys do not create components. For
+  example::
+
+    registry = LazyRegistry()
+    registry.register("ProvPyComparator", functools.partial(
+      create_component, 
+      "prov_interop.provpy.comparator.ProvPyComparator",
+      {"executable": "prov-compare", ...}))
+    "ProvPyComparator" in registry   # No comparator created
+    registry["ProvPyComparator"]     # Comparator created and cached
+    registry["ProvPyComparator"]     # Cached comparator returned
+  """
+
+  def __init__(self):
+    """Create empty registry.
+    """
+    self._loaders = {}
+    self._components = {}
+
+  def register(self, key, loader):
+    """Register a loader for a key, replacing any component already
+    created for that key.
+
+    :param key: Key
+    :type key: str or unicode
+    :param loader: Zero-arity function that creates the component
+    :type loader: function
+    """
+    self._loaders[key] = loader
+    self._components.pop(key, None)
+
+  def is_loaded(self, key):
+    """Check whether the component for a key has been created.
+
+    :param key: Key
+    :type key: str or unicode
+    :return: ``True`` if the component has been created
+    :rtype: bool
+    """
+    return key in self._components
+
+  def __getitem__(self, key):
+    """Get the component for a key, creating it if this is the first
+    time it has been looked up.
+
+    :param key: Key
+    :type key: str or unicode
+    :return: component
+    :rtype: object
+    :raises KeyError: if `key` is not registered
+    """
+    if key not in self._components:
+      self._components[key] = self._loaders[key]()
+    return self._components[key]
+
+  def __contains__(self, key):
+    """Check whether a key is registered, without creating its
+    component.
+
+    :param key: Key
+    :type key: str or unicode
+    :return: ``True`` if `key` is registered
+    :rtype: bool
+    """
+    return key in self._loaders
+
+  def __iter__(self):
+    """Get an iterator over the registered keys.
+
+    :return: iterator
+    :rtype: iterator
+    """
+    return iter(self._loaders)
+
+  def __len__(self):
+    """Get the number of registered keys.
+
+    :return: number of keys
+    :rtype: int
+    """
+    return len(self._loaders)
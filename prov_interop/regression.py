@@ -0,0 +1,301 @@
+"""Performance regression tracking across runs.
+
+This module compares the results of two runs recorded in results
+files (see :class:`prov_interop.results.ResultsStore`), for example a
+baseline run with one converter release and a candidate run with the
+next, identified by their run identifiers. For each converter and
+pair of formats it compares:
+
+- ``latency``: time, in seconds, to convert each test case.
+- ``memory``: peak resident set size, in kilobytes, of the
+  conversion, if recorded.
+
+Only test cases which have results, whose verdict is not ``error``,
+in both runs are compared. For each metric, the median over these
+test cases is computed for each run. If the candidate's median
+exceeds the baseline's by more than a threshold (by default 0.3, or
+30%) then the metric has regressed.
+
+Usage::
+
+    usage: regression.py [-h] -b BASELINE [-c CANDIDATE] [-t THRESHOLD]
+                         [-f] FILE [FILE ...]
+
+    Compare performance of two runs.
+
+    positional arguments:
+      FILE                  Results files
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -b BASELINE, --baseline BASELINE
+                            Baseline run identifier
+      -c CANDIDATE, --candidate CANDIDATE
+                            Candidate run identifier (default most recent
+                            run)
+      -t THRESHOLD, --threshold THRESHOLD
+                            Fractional increase over baseline treated as a
+                            regression (default 0.3)
+      -f, --fail            Exit with non-zero status if any metric
+                            regressed
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import sys
+
+from prov_interop import stats
+from prov_interop.results import ResultsStore
+
+LATENCY = "latency"
+"""str or unicode: metric for conversion time"""
+
+MEMORY = "memory"
+"""str or unicode: metric for conversion peak resident set size"""
+
+METRICS = [LATENCY, MEMORY]
+"""list of str or unicode: metrics compared"""
+
+CONVERT = "convert"
+"""str or unicode: name of span timing conversions"""
+
+MAX_RSS = "max_rss"
+"""str or unicode: resource usage key for peak resident set size"""
+
+THRESHOLD = 0.3
+"""float: default fractional increase over baseline treated as a
+regression"""
+
+def get_metrics(result):
+  """Get the metrics of a result. These are taken from the
+  ``convert`` span only, so results whose output was converted along
+  with other outputs, timed as a ``convert_many`` span, or taken from
+  such a conversion, have no metrics.
+
+  :param result: Result (see :class:`prov_interop.results.ResultsStore`)
+  :type result: dict
+  :return: metric values keyed by metric, omitting any not recorded
+  :rtype: dict
+  """
+  metrics = {}
+  durations = result.get(ResultsStore.DURATIONS, {})
+  if CONVERT in durations:
+    metrics[LATENCY] = durations[CONVERT]
+  usage = result.get(ResultsStore.USAGE, {}).get(CONVERT, {})
+  if usage.get(MAX_RSS) is not None:
+    metrics[MEMORY] = usage[MAX_RSS]
+  return metrics
+
+def get_runs(results):
+  """Get the identifiers of the runs with results, ordered by the
+  time of their first result.
+
+  :param results: Results
+  :type results: list of dict
+  :return: run identifiers
+  :rtype: list of str or unicode
+  """
+  first = {}
+  for result in results:
+    run_id = result.get(ResultsStore.RUN)
+    if run_id is None:
+      continue
+    timestamp = result.get(ResultsStore.TIMESTAMP, 0)
+    if run_id not in first or timestamp < first[run_id]:
+      first[run_id] = timestamp
+  return sorted(first, key=lambda run_id: first[run_id])
+
+def get_jobs(results, run_id):
+  """Get the results of a run, excluding those whose verdict is
+  ``error``. If a job has more than one result, for example from
+  rerunning an interrupted run, then the most recent is used.
+
+  :param results: Results, in the order recorded
+  :type results: list of dict
+  :param run_id: Run identifier
+  :type run_id: str or unicode
+  :return: results keyed by converter, input format and output
+    format, then by test case index
+  :rtype: dict from tuple of (str or unicode, str or unicode, str or
+    unicode) to dict from str or unicode to dict
+  """
+  jobs = {}
+  for result in results:
+    if result.get(ResultsStore.RUN) != run_id or \
+       result.get(ResultsStore.VERDICT) == ResultsStore.ERROR:
+      continue
+    key = (result[ResultsStore.CONVERTER],
+           result[ResultsStore.EXT_IN],
+           result[ResultsStore.EXT_OUT])
+    jobs.setdefault(key, {})[result[ResultsStore.INDEX]] = result
+  return jobs
+
+def compare_runs(results, baseline, candidate, threshold=THRESHOLD):
+  """Compare the metrics of a candidate run to those of a baseline
+  run. A comparison is returned for each converter, pair of formats
+  and metric recorded for test cases in both runs::
+
+    {"converter": "ProvToolboxConverter",
+     "ext_in": "json", "ext_out": "provx", "metric": "latency",
+     "jobs": 12, "baseline": 0.61, "candidate": 0.82,
+     "ratio": 1.34, "regressed": True,
+     "baseline_fingerprints": ["3f1c..."],
+     "candidate_fingerprints": ["9b0e..."]}
+
+  where ``baseline`` and ``candidate`` are the medians of the metric
+  over the ``jobs`` test cases and the fingerprints are those of the
+  converter (see :class:`prov_interop.results.ResultsStore`).
+
+  :param results: Results, in the order recorded
+  :type results: list of dict
+  :param baseline: Baseline run identifier
+  :type baseline: str or unicode
+  :param candidate: Candidate run identifier
+  :type candidate: str or unicode
+  :param threshold: Fractional increase over baseline treated as a
+    regression
+  :type threshold: float
+  :return: comparisons, sorted by converter, formats and metric
+  :rtype: list of dict
+  """
+  baseline_jobs = get_jobs(results, baseline)
+  candidate_jobs = get_jobs(results, candidate)
+  comparisons = []
+  for key in sorted(set(baseline_jobs) & set(candidate_jobs)):
+    indices = set(baseline_jobs[key]) & set(candidate_jobs[key])
+    for metric in METRICS:
+      baseline_values = []
+      candidate_values = []
+      for index in indices:
+        baseline_metrics = get_metrics(baseline_jobs[key][index])
+        candidate_metrics = get_metrics(candidate_jobs[key][index])
+        if metric in baseline_metrics and metric in candidate_metrics:
+          baseline_values.append(baseline_metrics[metric])
+          candidate_values.append(candidate_metrics[metric])
+      if not baseline_values:
+        continue
+      baseline_median = stats.median(baseline_values)
+      candidate_median = stats.median(candidate_values)
+      ratio = None
+      if baseline_median > 0:
+        ratio = candidate_median / baseline_median
+      comparisons.append({
+        "converter": key[0],
+        "ext_in": key[1],
+        "ext_out": key[2],
+        "metric": metric,
+        "jobs": len(baseline_values),
+        "baseline": baseline_median,
+        "candidate": candidate_median,
+        "ratio": ratio,
+        "regressed": ratio is not None and ratio > 1 + threshold,
+        "baseline_fingerprints": get_fingerprints(
+          baseline_jobs[key].values()),
+        "candidate_fingerprints": get_fingerprints(
+          candidate_jobs[key].values())})
+  return comparisons
+
+def get_fingerprints(results):
+  """Get the distinct converter fingerprints of results.
+
+  :param results: Results
+  :type results: iterable of dict
+  :return: fingerprints
+  :rtype: list of str or unicode
+  """
+  return sorted(set([result[ResultsStore.FINGERPRINT] for result in results
+                     if ResultsStore.FINGERPRINT in result]))
+
+def format_comparisons(comparisons):
+  """Format comparisons as a text table. Regressions are marked with
+  ``REGRESSED`` and changed converter fingerprints with ``*``.
+
+  :param comparisons: Comparisons from :func:`compare_runs`
+  :type comparisons: list of dict
+  :return: table
+  :rtype: str or unicode
+  """
+  lines = ["%-22s %-14s %-8s %5s %12s %12s %7s" %
+           ("converter", "formats", "metric", "jobs", "baseline",
+            "candidate", "ratio")]
+  for comparison in comparisons:
+    line = "%-22s %-14s %-8s %5d %12.4f %12.4f %7s" % (
+      comparison["converter"],
+      comparison["ext_in"] + "->" + comparison["ext_out"],
+      comparison["metric"],
+      comparison["jobs"],
+      comparison["baseline"],
+      comparison["candidate"],
+      "-" if comparison["ratio"] is None else "%.2f" % comparison["ratio"])
+    if comparison["baseline_fingerprints"] != \
+       comparison["candidate_fingerprints"]:
+      line += " *"
+    if comparison["regressed"]:
+      line += " REGRESSED"
+    lines.append(line)
+  return "\n".join(lines)
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Compare performance of two runs.")
+  parser.add_argument("files", metavar="FILE", nargs="+",
+                      help="Results files")
+  parser.add_argument("-b", "--baseline",
+                      help="Baseline run identifier",
+                      required=True)
+  parser.add_argument("-c", "--candidate",
+                      help="Candidate run identifier (default most recent run)")
+  parser.add_argument("-t", "--threshold",
+                      help="Fractional increase over baseline treated as a regression (default " + str(THRESHOLD) + ")",
+                      type=float,
+                      default=THRESHOLD)
+  parser.add_argument("-f", "--fail",
+                      help="Exit with non-zero status if any metric regressed",
+                      action="store_true")
+  args = parser.parse_args()
+  results = []
+  for file_name in args.files:
+    results.extend(ResultsStore(file_name).load())
+  results.sort(key=lambda result: result.get(ResultsStore.TIMESTAMP, 0))
+  candidate = args.candidate
+  if candidate is None:
+    runs = [run_id for run_id in get_runs(results) 
+            if run_id != args.baseline]
+    if not runs:
+      print("No candidate run found")
+      sys.exit(2)
+    candidate = runs[-1]
+  print("Baseline: " + args.baseline)
+  print("Candidate: " + candidate)
+  comparisons = compare_runs(results, args.baseline, candidate,
+                             args.threshold)
+  print(format_comparisons(comparisons))
+  regressions = [comparison for comparison in comparisons
+                 if comparison["regressed"]]
+  print("Regressions: " + str(len(regressions)))
+  if args.fail and regressions:
+    sys.exit(1)
+  sys.exit(0)
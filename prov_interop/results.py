@@ -0,0 +1,189 @@
+"""Append-only store of interoperability test job results.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import os
+import time
+
+RUN_ID_ENV = "PROV_HARNESS_RUN_ID"
+"""str or unicode: environment variable holding the identifier of the
+current run, recorded with each result"""
+
+class ResultsStore(object):
+  """Append-only store of test job results, including timings.
+
+  Each result is recorded as a single line of JSON, appended to the
+  results file. For example::
+
+    {"converter": "ProvPyConverter", "index": "case1", 
+     "ext_in": "json", "ext_out": "provx", "verdict": "pass",
+     "pid": 1234, "timestamp": 1444743600.123,
+     "run": "provtoolbox-0.7.2", "fingerprint": "3f1c...",
+     "sizes": {"input": 1024, "output": 2048, "expected": 2040},
+     "durations": {"convert": 0.61, "convert.spawn": 0.004, 
+                   "convert.wait": 0.60, "hash": 0.0001, 
+                   "compare": 0.52, ...},
+     "spans": [{"name": "convert.spawn", "start": 0.0001, 
+                "duration": 0.004}, ...],
+     "usage": {"convert": {"processes": 1, "utime": 0.52, 
+                           "stime": 0.04, "max_rss": 98304, ...},
+               ...}}
+
+  Each line is written using a single ``write`` to a file opened in
+  append mode, so multiple processes can safely share a store.
+  """
+
+  CONVERTER = "converter"
+  """str or unicode: result key for converter name"""
+  INDEX = "index"
+  """str or unicode: result key for test case index"""
+  EXT_IN = "ext_in"
+  """str or unicode: result key for input format"""
+  EXT_OUT = "ext_out"
+  """str or unicode: result key for output format"""
+  VERDICT = "verdict"
+  """str or unicode: result key for verdict"""
+  PID = "pid"
+  """str or unicode: result key for process ID"""
+  TIMESTAMP = "timestamp"
+  """str or unicode: result key for time, in seconds since the epoch,
+  at which the result was recorded"""
+  SIZES = "sizes"
+  """str or unicode: result key for file sizes, in bytes"""
+  DURATIONS = "durations"
+  """str or unicode: result key for total durations of spans, in
+  seconds, keyed by span name"""
+  SPANS = "spans"
+  """str or unicode: result key for spans (see
+  :func:`prov_interop.timing.span`)"""
+  RUN = "run"
+  """str or unicode: result key for run identifier"""
+  FINGERPRINT = "fingerprint"
+  """str or unicode: result key for converter fingerprint (see
+  :meth:`prov_interop.component.ConfigurableComponent.fingerprint`)"""
+  USAGE = "usage"
+  """str or unicode: result key for resource usage of child
+  processes, keyed by span name (see :mod:`prov_interop.usage`)"""
+
+  PASS = "pass"
+  """str or unicode: verdict for equivalent documents"""
+  FAIL = "fail"
+  """str or unicode: verdict for non-equivalent documents"""
+  ERROR = "error"
+  """str or unicode: verdict for a job which raised an exception"""
+
+  def __init__(self, file_name, run_id=None):
+    """Create store. If `run_id` is not provided then the value of
+    the environment variable ``PROV_HARNESS_RUN_ID``, if defined, is
+    used. If there is a run identifier then it is recorded with each
+    result, so results from different runs, for example with
+    different converter versions, can be compared (see
+    :mod:`prov_interop.regression`).
+
+    :param file_name: Results file name
+    :type file_name: str or unicode
+    :param run_id: Run identifier (optional)
+    :type run_id: str or unicode
+    """
+    self._file_name = file_name
+    if run_id is None:
+      run_id = os.environ.get(RUN_ID_ENV)
+    self._run_id = run_id
+
+  @property
+  def file_name(self):
+    """Get results file name.
+
+    :return: file name
+    :rtype: str or unicode
+    """
+    return self._file_name
+
+  @property
+  def run_id(self):
+    """Get run identifier.
+
+    :return: identifier or ``None`` if none
+    :rtype: str or unicode
+    """
+    return self._run_id
+
+  def record(self, converter, index, ext_in, ext_out, verdict, **values):
+    """Record the result of a test job. The result is appended to the
+    results file.
+
+    :param converter: Converter name
+    :type converter: str or unicode
+    :param index: Test case index
+    :type index: str or unicode
+    :param ext_in: Input format
+    :type ext_in: str or unicode
+    :param ext_out: Output format
+    :type ext_out: str or unicode
+    :param verdict: ``pass``, ``fail`` or ``error``
+    :type verdict: str or unicode
+    :param values: Additional values to record
+    :type values: dict
+    :return: result
+    :rtype: dict
+    """
+    result = dict(values)
+    result[ResultsStore.CONVERTER] = converter
+    result[ResultsStore.INDEX] = str(index)
+    result[ResultsStore.EXT_IN] = ext_in
+    result[ResultsStore.EXT_OUT] = ext_out
+    result[ResultsStore.VERDICT] = verdict
+    result[ResultsStore.PID] = os.getpid()
+    result[ResultsStore.TIMESTAMP] = time.time()
+    if self._run_id is not None:
+      result[ResultsStore.RUN] = self._run_id
+    line = json.dumps(result, sort_keys=True) + "\n"
+    fd = os.open(self._file_name,
+                 os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+      os.write(fd, line.encode("utf-8"))
+    finally:
+      os.close(fd)
+    return result
+
+  def load(self):
+    """Load results from the results file, if it exists, ignoring any
+    lines that are not valid JSON.
+
+    :return: results, in the order recorded
+    :rtype: list of dict
+    """
+    results = []
+    if not os.path.isfile(self._file_name):
+      return results
+    with open(self._file_name, "r") as f:
+      for line in f:
+        try:
+          results.append(json.loads(line))
+        except ValueError:
+          continue
+    return results
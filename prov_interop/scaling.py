@@ -0,0 +1,303 @@
+"""Latency and memory scaling-curve analysis by document size.
+
+This module fits scaling curves to the results of test jobs recorded
+in results files (see :class:`prov_interop.results.ResultsStore`),
+for documents of varying size, for example the synthetic test cases
+created by :mod:`prov_interop.benchmarks.synthetic_corpus`. For each
+converter, pair of formats and metric (see
+:func:`prov_interop.regression.get_metrics`), a power law::
+
+  metric = coefficient * size ^ exponent
+
+is fitted, by least squares on the logarithms of the medians of the
+metric at each size, using NumPy. Size is either the input file size
+in bytes or, for synthetic test cases, the number of records. An
+exponent greater than 1 plus a tolerance (by default 0.15) marks the
+pair as superlinear. If a budget is given for a metric, then the size
+at which the fitted curve exceeds the budget is estimated.
+
+Usage::
+
+    usage: scaling.py [-h] [-x {bytes,records}] [-r RUN] [-l TOLERANCE]
+                      [-t TIME_BUDGET] [-m MEMORY_BUDGET] [-o OUTPUT]
+                      FILE [FILE ...]
+
+    Fit scaling curves to test job results.
+
+    positional arguments:
+      FILE                  Results files
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -x {bytes,records}, --size {bytes,records}
+                            Document size measure (default bytes)
+      -r RUN, --run RUN     Only use results from this run
+      -l TOLERANCE, --tolerance TOLERANCE
+                            Exponent above 1 treated as superlinear
+                            (default 0.15)
+      -t TIME_BUDGET, --time-budget TIME_BUDGET
+                            Conversion time budget, in seconds
+      -m MEMORY_BUDGET, --memory-budget MEMORY_BUDGET
+                            Conversion peak memory budget, in kilobytes
+      -o OUTPUT, --output OUTPUT
+                            JSON output file (default none)
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import json
+import re
+import sys
+
+import numpy
+
+from prov_interop import stats
+from prov_interop.regression import LATENCY
+from prov_interop.regression import MEMORY
+from prov_interop.regression import METRICS
+from prov_interop.regression import get_metrics
+from prov_interop.results import ResultsStore
+
+BYTES = "bytes"
+"""str or unicode: size measure for input file size in bytes"""
+
+RECORDS = "records"
+"""str or unicode: size measure for number of records"""
+
+RECORDS_PATTERN = re.compile(r"^synthetic-(\d+)$")
+"""regular expression: test case index from which the number of
+records can be got"""
+
+TOLERANCE = 0.15
+"""float: default exponent above 1 treated as superlinear"""
+
+def get_size(result, measure=BYTES):
+  """Get the size of the input document of a result.
+
+  :param result: Result (see :class:`prov_interop.results.ResultsStore`)
+  :type result: dict
+  :param measure: ``bytes`` for the input file size, or ``records``
+    for the number of records in a synthetic test case, whose index
+    is of form ``synthetic-<records>``
+  :type measure: str or unicode
+  :return: size or ``None`` if not known
+  :rtype: int
+  """
+  if measure == RECORDS:
+    match = RECORDS_PATTERN.match(result.get(ResultsStore.INDEX, ""))
+    return int(match.group(1)) if match else None
+  return result.get(ResultsStore.SIZES, {}).get("input")
+
+def get_points(results, measure=BYTES, run_id=None):
+  """Get the metric values of each converter and pair of formats at
+  each size. Results whose verdict is ``error``, or whose size is not
+  known or is zero, are ignored.
+
+  :param results: Results
+  :type results: list of dict
+  :param measure: Size measure (see :func:`get_size`)
+  :type measure: str or unicode
+  :param run_id: Only use results from this run (optional)
+  :type run_id: str or unicode
+  :return: metric values keyed by converter, input format and output
+    format, then by metric, then by size
+  :rtype: dict from tuple of (str or unicode, str or unicode, str or
+    unicode) to dict from str or unicode to dict from int to list of
+    float
+  """
+  points = {}
+  for result in results:
+    if result.get(ResultsStore.VERDICT) == ResultsStore.ERROR or \
+       (run_id is not None and result.get(ResultsStore.RUN) != run_id):
+      continue
+    size = get_size(result, measure)
+    if not size:
+      continue
+    key = (result[ResultsStore.CONVERTER],
+           result[ResultsStore.EXT_IN],
+           result[ResultsStore.EXT_OUT])
+    for (metric, value) in get_metrics(result).items():
+      points.setdefault(key, {}).setdefault(
+        metric, {}).setdefault(size, []).append(value)
+  return points
+
+def fit_curve(sizes, values):
+  """Fit a power law, ``value = coefficient * size ^ exponent``, by
+  least squares on the base-10 logarithms of sizes and values.
+
+  :param sizes: Sizes, all positive
+  :type sizes: list of int or float
+  :param values: Values, all positive
+  :type values: list of int or float
+  :return: exponent, coefficient, and coefficient of determination
+    (R^2) of the fit on the logarithms
+  :rtype: tuple of (float, float, float)
+  :raises ValueError: if there are fewer than two distinct sizes
+  """
+  x = numpy.log10(numpy.asarray(sizes, dtype=float))
+  y = numpy.log10(numpy.asarray(values, dtype=float))
+  if len(numpy.unique(x)) < 2:
+    raise ValueError("At least two distinct sizes are required")
+  (exponent, intercept) = numpy.polyfit(x, y, 1)
+  residual = numpy.sum((y - (exponent * x + intercept)) ** 2)
+  total = numpy.sum((y - numpy.mean(y)) ** 2)
+  r_squared = 1.0 if total == 0 else 1 - residual / total
+  return (float(exponent), float(10 ** intercept), float(r_squared))
+
+def budget_size(exponent, coefficient, budget):
+  """Estimate the size at which a fitted curve reaches a budget.
+
+  :param exponent: Exponent
+  :type exponent: float
+  :param coefficient: Coefficient
+  :type coefficient: float
+  :param budget: Budget
+  :type budget: float
+  :return: size, or ``None`` if the curve does not increase
+  :rtype: float
+  """
+  if exponent <= 0:
+    return None
+  return (budget / coefficient) ** (1 / exponent)
+
+def analyse(results, measure=BYTES, run_id=None, tolerance=TOLERANCE,
+            budgets=None):
+  """Fit scaling curves for each converter, pair of formats and
+  metric with values at two or more sizes. For each, the metric is
+  summarised by its median at each size, and a curve is fitted to
+  these medians::
+
+    {"converter": "ProvToolboxConverter",
+     "ext_in": "json", "ext_out": "provx", "metric": "latency",
+     "sizes": [1000, 10000, 100000], "medians": [0.5, 0.9, 6.1],
+     "exponent": 1.18, "coefficient": 0.00021, "r_squared": 0.97,
+     "superlinear": True, "budget": 60, "budget_size": 1240000.0}
+
+  where ``budget`` and ``budget_size`` are present only if there is a
+  budget for the metric.
+
+  :param results: Results
+  :type results: list of dict
+  :param measure: Size measure (see :func:`get_size`)
+  :type measure: str or unicode
+  :param run_id: Only use results from this run (optional)
+  :type run_id: str or unicode
+  :param tolerance: Exponent above 1 treated as superlinear
+  :type tolerance: float
+  :param budgets: Budgets keyed by metric (optional)
+  :type budgets: dict from str or unicode to float
+  :return: curves, sorted by converter, formats and metric
+  :rtype: list of dict
+  """
+  budgets = budgets or {}
+  curves = []
+  points = get_points(results, measure, run_id)
+  for key in sorted(points):
+    for metric in METRICS:
+      values = points[key].get(metric, {})
+      sizes = sorted(values)
+      medians = [stats.median(values[size]) for size in sizes]
+      if len(sizes) < 2 or min(medians) <= 0:
+        continue
+      (exponent, coefficient, r_squared) = fit_curve(sizes, medians)
+      curve = {"converter": key[0],
+               "ext_in": key[1],
+               "ext_out": key[2],
+               "metric": metric,
+               "sizes": sizes,
+               "medians": medians,
+               "exponent": exponent,
+               "coefficient": coefficient,
+               "r_squared": r_squared,
+               "superlinear": exponent > 1 + tolerance}
+      if budgets.get(metric) is not None:
+        curve["budget"] = budgets[metric]
+        curve["budget_size"] = budget_size(exponent, coefficient,
+                                           budgets[metric])
+      curves.append(curve)
+  return curves
+
+def format_curves(curves):
+  """Format curves as a text table. Superlinear curves are marked
+  with ``SUPERLINEAR``.
+
+  :param curves: Curves from :func:`analyse`
+  :type curves: list of dict
+  :return: table
+  :rtype: str or unicode
+  """
+  lines = ["%-22s %-14s %-8s %5s %8s %6s %14s" %
+           ("converter", "formats", "metric", "sizes", "exponent", "R^2",
+            "budget size")]
+  for curve in curves:
+    size = curve.get("budget_size")
+    line = "%-22s %-14s %-8s %5d %8.3f %6.3f %14s" % (
+      curve["converter"],
+      curve["ext_in"] + "->" + curve["ext_out"],
+      curve["metric"],
+      len(curve["sizes"]),
+      curve["exponent"],
+      curve["r_squared"],
+      "-" if size is None else "%.0f" % size)
+    if curve["superlinear"]:
+      line += " SUPERLINEAR"
+    lines.append(line)
+  return "\n".join(lines)
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Fit scaling curves to test job results.")
+  parser.add_argument("files", metavar="FILE", nargs="+",
+                      help="Results files")
+  parser.add_argument("-x", "--size",
+                      help="Document size measure (default " + BYTES + ")",
+                      choices=[BYTES, RECORDS],
+                      default=BYTES)
+  parser.add_argument("-r", "--run",
+                      help="Only use results from this run")
+  parser.add_argument("-l", "--tolerance",
+                      help="Exponent above 1 treated as superlinear (default " + str(TOLERANCE) + ")",
+                      type=float,
+                      default=TOLERANCE)
+  parser.add_argument("-t", "--time-budget",
+                      help="Conversion time budget, in seconds",
+                      type=float)
+  parser.add_argument("-m", "--memory-budget",
+                      help="Conversion peak memory budget, in kilobytes",
+                      type=float)
+  parser.add_argument("-o", "--output",
+                      help="JSON output file (default none)")
+  args = parser.parse_args()
+  results = []
+  for file_name in args.files:
+    results.extend(ResultsStore(file_name).load())
+  curves = analyse(results, args.size, args.run, args.tolerance,
+                   {LATENCY: args.time_budget, MEMORY: args.memory_budget})
+  print(format_curves(curves))
+  if args.output is not None:
+    with open(args.output, "w") as f:
+      f.write(json.dumps(curves, indent=2, sort_keys=True) + "\n")
+  sys.exit(0)
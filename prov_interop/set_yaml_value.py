@@ -44,6 +44,8 @@ import argparse
 import os
 import yaml
 
+from prov_interop.files import YAML_LOADER
+
 def replace_value(key, value, content):
   """
   Replace value in a multi-dimensional dict given a fully-qualified
@@ -91,7 +93,7 @@ def set_yaml_value(file_name, replacements):
   :type replacements: list of str or unicode
   """
   with open(file_name, 'r') as f:
-    content = yaml.load(f)
+    content = yaml.load(f, Loader=YAML_LOADER)
 
   for replacement in replacements:
     [key,value] = replacement.split("=", 1)
@@ -0,0 +1,77 @@
+"""Summary statistics for timing measurements.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+def median(values):
+  """Get the median of values.
+
+  :param values: Values
+  :type values: list of int or float
+  :return: median
+  :rtype: float
+  :raises ValueError: if `values` is empty
+  """
+  return percentile(values, 50)
+
+def mad(values):
+  """Get the median absolute deviation of values, the median of the
+  absolute deviations of the values from their median. Unlike the
+  standard deviation, this is robust to occasional outliers, for
+  example a measurement delayed by garbage collection.
+
+  :param values: Values
+  :type values: list of int or float
+  :return: median absolute deviation
+  :rtype: float
+  :raises ValueError: if `values` is empty
+  """
+  centre = median(values)
+  return median([abs(value - centre) for value in values])
+
+def percentile(values, percent):
+  """Get a percentile of values. This is computed by linear
+  interpolation between the two closest ranks, so the 0th, 50th and
+  100th percentiles are the minimum, median and maximum.
+
+  :param values: Values
+  :type values: list of int or float
+  :param percent: Percentile, from 0 to 100
+  :type percent: int or float
+  :return: percentile
+  :rtype: float
+  :raises ValueError: if `values` is empty or `percent` is not from
+    0 to 100
+  """
+  if not values:
+    raise ValueError("No values")
+  if percent < 0 or percent > 100:
+    raise ValueError("Percentile must be from 0 to 100: " + str(percent))
+  ordered = sorted(values)
+  rank = (len(ordered) - 1) * percent / 100
+  lower = int(rank)
+  upper = min(lower + 1, len(ordered) - 1)
+  fraction = rank - lower
+  return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
@@ -0,0 +1,143 @@
+"""Unit tests for :mod:`prov_interop.benchmarks.harness_overhead`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop import standards
+from prov_interop.benchmarks import converter_throughput
+from prov_interop.converter import Converter
+from prov_interop.provtoolbox.converter import ProvToolboxConverter
+from prov_interop.tests.test_chain import CountingConverter
+
+class ConverterThroughputTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(ConverterThroughputTestCase, self).setUp()
+    self.work_dir = tempfile.mkdtemp()
+    self.in_file = os.path.join(self.work_dir, "test.json")
+    with open(self.in_file, "w") as f:
+      f.write("document")
+    self.converter = CountingConverter()
+    self.converter.configure(
+      {Converter.INPUT_FORMATS: [standards.JSON],
+       Converter.OUTPUT_FORMATS: [standards.PROVX, standards.JSON]})
+    self.test_cases = [
+      (1, standards.JSON, self.in_file, standards.PROVX, "expected"),
+      (1, standards.PROVX, "in.provx", standards.JSON, "expected"),
+      (2, standards.JSON, self.in_file, standards.PROVN, "expected"),
+      (3, standards.JSON, self.in_file, standards.JSON, "expected")]
+
+  def tearDown(self):
+    super(ConverterThroughputTestCase, self).tearDown()
+    shutil.rmtree(self.work_dir)
+
+  def test_time_conversions(self):
+    out_file = os.path.join(self.work_dir, "out.provx")
+    times = converter_throughput.time_conversions(
+      self.converter, self.in_file, out_file, 3, 2)
+    self.assertEqual(3, len(times))
+    self.assertEqual(5, len(self.converter.conversions))
+    self.assertFalse(os.path.exists(out_file))
+
+  def test_summarise(self):
+    summary = converter_throughput.summarise([0.5, 0.25, 1.0], 2000000)
+    self.assertEqual(0.5, summary["median"])
+    self.assertEqual(0.25, summary["mad"])
+    self.assertAlmostEqual(0.95, summary["p95"])
+    self.assertEqual(2, summary["docs_per_sec"])
+    self.assertEqual(4, summary["mb_per_sec"])
+
+  def test_summarise_zero(self):
+    summary = converter_throughput.summarise([0, 0], 10)
+    self.assertIsNone(summary["docs_per_sec"])
+    self.assertIsNone(summary["mb_per_sec"])
+
+  def test_benchmark_converter(self):
+    self.converter.configuration[converter_throughput.SKIP_TESTS] = [3]
+    results = converter_throughput.benchmark_converter(
+      "A", self.converter, self.test_cases, self.work_dir, 2, 1)
+    self.assertEqual(1, len(results))
+    result = results[0]
+    self.assertEqual(("A", 1, standards.JSON, standards.PROVX, 8),
+                     (result["converter"], result["index"],
+                      result["ext_in"], result["ext_out"],
+                      result["bytes"]))
+    self.assertTrue(result["median"] >= 0)
+    self.assertNotIn("error", result)
+    self.assertEqual(3, len(self.converter.conversions))
+    self.assertEqual(["test.json"], os.listdir(self.work_dir))
+
+  def test_benchmark_converter_error(self):
+    self.converter.fail = True
+    results = converter_throughput.benchmark_converter(
+      "A", self.converter, self.test_cases, self.work_dir, 2, 1)
+    self.assertEqual(2, len(results))
+    for result in results:
+      self.assertIn("Conversion failed", result["error"])
+      self.assertNotIn("median", result)
+
+  def test_benchmark_converter_no_executable(self):
+    converter = ProvToolboxConverter()
+    converter.configure(
+      {ProvToolboxConverter.EXECUTABLE: "/nonexistent/provconvert",
+       ProvToolboxConverter.ARGUMENTS: "-infile INPUT -outfile OUTPUT",
+       Converter.INPUT_FORMATS: [standards.JSON],
+       Converter.OUTPUT_FORMATS: [standards.PROVX]})
+    results = converter_throughput.benchmark_converter(
+      "ProvToolbox", converter, self.test_cases, self.work_dir, 1)
+    self.assertEqual(1, len(results))
+    self.assertIn("error", results[0])
+    self.assertNotIn("median", results[0])
+
+  def test_head_to_head(self):
+    results = [
+      {"converter": "B", "index": 1, "ext_in": "json", "ext_out": "provx",
+       "bytes": 1000000, "median": 0.5},
+      {"converter": "B", "index": 2, "ext_in": "json", "ext_out": "provx",
+       "bytes": 1000000, "median": 1.5},
+      {"converter": "A", "index": 1, "ext_in": "json", "ext_out": "provx",
+       "bytes": 1000000, "median": 1.0},
+      {"converter": "A", "index": 2, "ext_in": "json", "ext_out": "provx",
+       "bytes": 1000000, "error": "Conversion failed"}]
+    table = converter_throughput.head_to_head(results)
+    self.assertEqual([("A", 1, 1.0, 1.0), ("B", 2, 2.0, 1.0)],
+                     [(row["converter"], row["docs"], row["seconds"],
+                       row["docs_per_sec"]) for row in table])
+    self.assertEqual(1, table[1]["mb_per_sec"])
+    lines = converter_throughput.format_table(table).split("\n")
+    self.assertEqual(3, len(lines))
+    self.assertTrue(lines[1].startswith("json->provx    A"))
+
+  def test_positive_int(self):
+    self.assertEqual(3, converter_throughput.positive_int("3"))
+    for value in ["0", "-1", "x"]:
+      with self.assertRaises(argparse.ArgumentTypeError):
+        converter_throughput.positive_int(value)
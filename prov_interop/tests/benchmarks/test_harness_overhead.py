@@ -0,0 +1,76 @@
+"""Unit tests for :mod:`prov_interop.benchmarks.harness_overhead`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop.benchmarks import harness_overhead
+from prov_interop.harness import HarnessResources
+
+class HarnessOverheadTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(HarnessOverheadTestCase, self).setUp()
+    self.work_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    super(HarnessOverheadTestCase, self).tearDown()
+    shutil.rmtree(self.work_dir)
+
+  def test_create_corpus(self):
+    harness_overhead.create_corpus(self.work_dir, 3)
+    self.assertEqual(3, len(os.listdir(self.work_dir)))
+    test_case_dir = os.path.join(self.work_dir, 
+                                 HarnessResources.TEST_CASE_PREFIX + "case2")
+    self.assertEqual(sorted(["testcase2." + format for format 
+                             in harness_overhead.FORMATS]),
+                     sorted(os.listdir(test_case_dir)))
+
+  def test_configure(self):
+    config_file = os.path.join(self.work_dir, "harness.yaml")
+    harness_overhead.create_configuration(config_file, self.work_dir)
+    (harness_resources, converter) = harness_overhead.configure(config_file)
+    self.assertEqual(self.work_dir, harness_resources.test_cases_dir)
+    self.assertEqual(sorted(harness_overhead.FORMATS),
+                     sorted(harness_resources.format_comparators.keys()))
+    self.assertTrue(converter.executable[-1].endswith("provconvert_dummy.py"))
+
+  def test_benchmark_size(self):
+    results = harness_overhead.benchmark_size(self.work_dir, 2, 1, 1)
+    self.assertEqual(["config-loading", "enumeration", "command-lines",
+                      "skips", "temp-files", "dummy-runs"],
+                     [result["benchmark"] for result in results])
+    # 2 formats => 4 test cases per test case directory
+    pairs = 2 * (len(harness_overhead.FORMATS) ** 2)
+    self.assertEqual([1, pairs, pairs, pairs, pairs, 1],
+                     [result["items"] for result in results])
+    for result in results:
+      self.assertEqual(2, result["size"])
+      self.assertTrue(result["seconds"] >= 0)
+    self.assertEqual(["harness.yaml"], os.listdir(self.work_dir))
@@ -0,0 +1,156 @@
+"""Unit tests for :mod:`prov_interop.benchmarks.harness_overhead`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from prov_interop import standards
+from prov_interop.benchmarks import synthetic_corpus
+from prov_interop.benchmarks.synthetic_corpus import SyntheticDocument
+from prov_interop.harness import HarnessResources
+
+class SyntheticDocumentTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(SyntheticDocumentTestCase, self).setUp()
+    self.work_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    super(SyntheticDocumentTestCase, self).tearDown()
+    shutil.rmtree(self.work_dir)
+
+  def write(self, document, format):
+    file_name = os.path.join(self.work_dir, "doc." + format)
+    document.write(file_name, format)
+    return file_name
+
+  def test_parse_mix(self):
+    self.assertEqual([("entity", 4), ("used", 2)],
+                     synthetic_corpus.parse_mix("entity=4, used=2"))
+    with self.assertRaises(ValueError):
+      synthetic_corpus.parse_mix("entity")
+
+  def test_invalid_mix(self):
+    for mix in [[("bundle", 1)],
+                [("entity", -1)],
+                [("entity", 0)],
+                [("entity", 1), ("used", 1)]]:
+      with self.assertRaises(ValueError):
+        SyntheticDocument(10, mix)
+
+  def test_records(self):
+    document = SyntheticDocument(20)
+    records = list(document.records())
+    self.assertEqual(20, len(records))
+    self.assertEqual(records, [document.record(index) for index in range(20)])
+    self.assertEqual(records, list(SyntheticDocument(20).records()))
+    self.assertEqual(("entity", "ex:e4"), records[16])
+    for kind in synthetic_corpus.KINDS:
+      self.assertEqual(document.count(kind), len(list(document.records(kind))))
+    # Cycle of 16 records, starting with 4 entities
+    self.assertEqual(8, document.count("entity"))
+    self.assertEqual(1, document.count("actedOnBehalfOf"))
+
+  def test_relations_refer_to_declared_elements(self):
+    document = SyntheticDocument(1000)
+    declared = set()
+    for record in document.records():
+      if len(record) == 2:
+        declared.add(record[1])
+      else:
+        self.assertIn(record[1], declared)
+        self.assertIn(record[2], declared)
+
+  def test_write_provn(self):
+    file_name = self.write(SyntheticDocument(17), standards.PROVN)
+    with io.open(file_name, encoding="utf-8") as f:
+      lines = f.read().splitlines()
+    self.assertEqual(17 + 3, len(lines))
+    self.assertEqual("document", lines[0])
+    self.assertEqual("  entity(ex:e0)", lines[2])
+    self.assertEqual("endDocument", lines[-1])
+
+  def test_write_json(self):
+    document = SyntheticDocument(100)
+    with io.open(self.write(document, standards.JSON), encoding="utf-8") as f:
+      content = json.load(f)
+    self.assertEqual({"ex": synthetic_corpus.NAMESPACE}, content["prefix"])
+    for kind in synthetic_corpus.KINDS:
+      self.assertEqual(document.count(kind), len(content[kind]))
+    self.assertEqual({"prov:activity": "ex:a1", "prov:entity": "ex:e3"},
+                     content["wasGeneratedBy"]["_:r0"])
+
+  def test_write_json_mix(self):
+    document = SyntheticDocument(10, [("entity", 1), ("wasDerivedFrom", 1)])
+    with io.open(self.write(document, standards.JSON), encoding="utf-8") as f:
+      content = json.load(f)
+    self.assertEqual(["entity", "prefix", "wasDerivedFrom"], sorted(content))
+
+  def test_write_provx(self):
+    document = SyntheticDocument(100)
+    root = ElementTree.parse(self.write(document, standards.PROVX)).getroot()
+    self.assertEqual(100, len(root))
+    prov = "{" + synthetic_corpus.PROV_NAMESPACE + "}"
+    self.assertEqual(prov + "document", root.tag)
+    self.assertEqual(prov + "entity", root[0].tag)
+    self.assertEqual(document.count("used"),
+                     len(root.findall(prov + "used")))
+
+  def test_write_ttl_trig(self):
+    document = SyntheticDocument(50)
+    with io.open(self.write(document, standards.TTL), encoding="utf-8") as f:
+      ttl = f.read().splitlines()
+    with io.open(self.write(document, standards.TRIG), encoding="utf-8") as f:
+      trig = f.read().splitlines()
+    self.assertEqual(50 + 3, len(ttl))
+    self.assertEqual("ex:e0 a prov:Entity .", ttl[3])
+    self.assertEqual(ttl[:3] + ["{"] + ["  " + line for line in ttl[3:]] + 
+                     ["}"], trig)
+
+  def test_write_unknown_format(self):
+    with self.assertRaises(ValueError):
+      SyntheticDocument(10).write(os.path.join(self.work_dir, "doc.x"), "x")
+
+  def test_create_test_case(self):
+    synthetic_corpus.create_test_case(self.work_dir, 10)
+    synthetic_corpus.create_test_case(self.work_dir, 20,
+                                      formats=[standards.JSON])
+    harness = HarnessResources()
+    harness.configure({HarnessResources.TEST_CASES_DIR: self.work_dir,
+                       HarnessResources.COMPARATORS: {}})
+    test_cases = list(harness.test_case_files_generator())
+    self.assertEqual(["synthetic-10", "synthetic-20"],
+                     [index for (index, _) in test_cases])
+    self.assertEqual(sorted(standards.FORMATS),
+                     [format for (format, _) in test_cases[0][1]])
+    self.assertEqual([standards.JSON],
+                     [format for (format, _) in test_cases[1][1]])
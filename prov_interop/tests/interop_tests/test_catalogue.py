@@ -0,0 +1,81 @@
+"""Unit tests for :mod:`prov_interop.interop_tests.catalogue`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop import standards
+from prov_interop.harness import HarnessResources
+from prov_interop.interop_tests.catalogue import format_catalogue
+
+class CatalogueTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(CatalogueTestCase, self).setUp()
+    self.test_cases_dir = tempfile.mkdtemp()
+    test_case_dir = os.path.join(self.test_cases_dir, 
+                                 HarnessResources.TEST_CASE_PREFIX + "1")
+    os.mkdir(test_case_dir)
+    for format in [standards.JSON, standards.PROVX]:
+      open(os.path.join(test_case_dir, "file." + format), "a").close()
+    self.harness = HarnessResources()
+    self.harness.configure({
+      HarnessResources.TEST_CASES_DIR: self.test_cases_dir,
+      HarnessResources.COMPARATORS: {
+        "ProvPyComparator": {
+          HarnessResources.CLASS: 
+            "prov_interop.provpy.comparator.ProvPyComparator",
+          "executable": "prov-compare",
+          "arguments": "-f FORMAT1 -F FORMAT2 FILE1 FILE2",
+          "formats": [standards.PROVX, standards.JSON]}}})
+
+  def tearDown(self):
+    super(CatalogueTestCase, self).tearDown()
+    shutil.rmtree(self.test_cases_dir)
+
+  def test_format_catalogue(self):
+    lines = format_catalogue(self.harness).split("\n")
+    self.assertEqual(["Comparators available:",
+                      " json:ProvPyComparator",
+                      " provx:ProvPyComparator",
+                      "Test cases directory:",
+                      self.test_cases_dir,
+                      "Test cases available:",
+                      "1:json->json",
+                      "1:json->provx",
+                      "1:provx->json",
+                      "1:provx->provx",
+                      "Total: 4"], lines)
+
+  def test_format_catalogue_summary(self):
+    lines = format_catalogue(self.harness, summary=True).split("\n")
+    self.assertEqual("Total: 4", lines[-1])
+    self.assertNotIn("Test cases available:", lines)
@@ -0,0 +1,110 @@
+"""Unit tests for :mod:`prov_interop.interop_tests.harness`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import tempfile
+import unittest
+import yaml
+
+from prov_interop import factory
+from prov_interop.component import ConfigError
+from prov_interop.harness import HarnessResources
+from prov_interop.interop_tests import harness
+from prov_interop.provpy.converter import ProvPyConverter
+
+class ConfiguredConverterTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(ConfiguredConverterTestCase, self).setUp()
+    self.harness_resources = harness.harness_resources
+    self.converters = dict(harness._converters)
+    harness._converters.clear()
+    (_, self.config_file) = tempfile.mkstemp(suffix=".yaml")
+    harness.harness_resources = HarnessResources()
+    harness.harness_resources._config = {"ProvPy": self.config_file}
+    self.write_config(["json"])
+
+  def tearDown(self):
+    super(ConfiguredConverterTestCase, self).tearDown()
+    harness.harness_resources = self.harness_resources
+    harness._converters.clear()
+    harness._converters.update(self.converters)
+    os.remove(self.config_file)
+
+  def write_config(self, output_formats):
+    config = {"ProvPy": {"executable": "prov-convert",
+                         "arguments": "-f FORMAT INPUT OUTPUT",
+                         "input-formats": ["json"],
+                         "output-formats": output_formats}}
+    with open(self.config_file, "w") as f:
+      yaml.dump(config, f)
+
+  def get_converter(self):
+    return harness.get_configured_converter(
+      ProvPyConverter, "ProvPy", "PROVPY_TEST_CONFIGURATION",
+      "localconfig/provpy.yaml")
+
+  def test_get_configured_converter(self):
+    converter = self.get_converter()
+    self.assertIsInstance(converter, ProvPyConverter)
+    self.assertEqual(["json"], converter.output_formats)
+
+  def test_get_configured_converter_cached(self):
+    converter = self.get_converter()
+    self.assertIs(converter, self.get_converter())
+
+  def test_get_configured_converter_reloaded(self):
+    converter = self.get_converter()
+    self.write_config(["json", "provx"])
+    mtime = os.stat(self.config_file).st_mtime + 1
+    os.utime(self.config_file, (mtime, mtime))
+    reloaded = self.get_converter()
+    self.assertIsNot(converter, reloaded)
+    self.assertEqual(["json", "provx"], reloaded.output_formats)
+    self.assertIs(reloaded, self.get_converter())
+
+  def test_get_converter(self):
+    converter = harness.get_converter("ProvPy")
+    self.assertIsInstance(converter, ProvPyConverter)
+    self.assertIs(converter, self.get_converter())
+
+  def test_get_converter_entry(self):
+    self.assertEqual(harness.CONVERTERS["ProvPy"],
+                     harness.get_converter_entry("ProvPy"))
+    factory._entry_points[factory.CONVERTERS_GROUP] = {
+      "MyConverter": "mypackage.converter.MyConverter"}
+    try:
+      self.assertEqual(("mypackage.converter.MyConverter",
+                        "MYCONVERTER_TEST_CONFIGURATION",
+                        "localconfig/myconverter.yaml"),
+                       harness.get_converter_entry("MyConverter"))
+      with self.assertRaises(ConfigError):
+        harness.get_converter_entry("NoSuchConverter")
+    finally:
+      del factory._entry_points[factory.CONVERTERS_GROUP]
@@ -0,0 +1,181 @@
+"""Unit tests for :mod:`prov_interop.native.comparator`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import json
+import os
+import tempfile
+import unittest
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.component import ConfigError
+from prov_interop.native import comparator
+from prov_interop.native.comparator import NativeComparator
+from prov_interop.native.provjson import ProvJsonComparator
+
+class RecordHashTestCase(unittest.TestCase):
+
+  def test_record_hash(self):
+    record = (None, "entity", "http://example.org/e1", ())
+    self.assertEqual(comparator.record_hash(record),
+                     comparator.record_hash(record))
+    self.assertTrue(0 <= comparator.record_hash(record) < 2 ** 64)
+    self.assertNotEqual(comparator.record_hash(record),
+                        comparator.record_hash(
+                          (None, "entity", "http://example.org/e2", ())))
+
+
+class BaseNativeComparatorTestCase(unittest.TestCase):
+
+  def test_iterate_records(self):
+    with self.assertRaises(ComparisonError):
+      list(NativeComparator().iterate_records("file.json", standards.JSON))
+
+
+class NativeComparatorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(NativeComparatorTestCase, self).setUp()
+    self.comparator = ProvJsonComparator()
+    self.config = {NativeComparator.FORMATS: [standards.JSON]}
+    self.files = []
+
+  def tearDown(self):
+    super(NativeComparatorTestCase, self).tearDown()
+    for tmp in self.files:
+      if os.path.isfile(tmp):
+        os.remove(tmp)
+
+  def write(self, content, format=standards.JSON):
+    (_, tmp) = tempfile.mkstemp(suffix="." + format)
+    self.files.append(tmp)
+    with open(tmp, "w") as f:
+      f.write(content)
+    return tmp
+
+  def test_init(self):
+    self.assertEqual([], self.comparator.formats)
+    self.assertFalse(self.comparator.authoritative)
+
+  def test_configure(self):
+    self.config[NativeComparator.AUTHORITATIVE] = True
+    self.comparator.configure(self.config)
+    self.assertEqual([standards.JSON], self.comparator.formats)
+    self.assertTrue(self.comparator.authoritative)
+
+  def test_configure_unsupported_format(self):
+    self.config[NativeComparator.FORMATS] = [standards.JSON, 
+                                             standards.PROVN]
+    with self.assertRaises(ConfigError):
+      self.comparator.configure(self.config)
+
+  def test_configure_authoritative_error(self):
+    self.config[NativeComparator.AUTHORITATIVE] = "yes"
+    with self.assertRaises(ConfigError):
+      self.comparator.configure(self.config)
+
+  def test_records_cached(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    file2 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    records = self.comparator.records(file1)
+    self.assertIs(records, self.comparator.records(file2))
+
+  def test_records_rewritten(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    records = self.comparator.records(file1)
+    stat = os.stat(file1)
+    with open(file1, "w") as f:
+      f.write(json.dumps({"entity": {"ex:e2": {}}}))
+    os.utime(file1, (stat.st_atime, stat.st_mtime))
+    self.assertEqual(stat.st_size, os.path.getsize(file1))
+    self.assertNotEqual(records.tolist(),
+                        self.comparator.records(file1).tolist())
+
+  def test_differences(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}, "ex:e2": {}}}))
+    file2 = self.write(json.dumps({"entity": {"ex:e1": {}, "ex:e3": {}}}))
+    (only1, only2) = self.comparator.differences(file1, file2)
+    self.assertEqual(1, len(only1))
+    self.assertEqual(1, len(only2))
+    self.assertEqual([(None, "entity", "ex:e2", ())],
+                     self.comparator.find_records(file1, only1))
+    self.assertEqual([(None, "entity", "ex:e3", ())],
+                     self.comparator.find_records(file2, only2))
+
+  def test_differences_equal(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    (only1, only2) = self.comparator.differences(file1, file1)
+    self.assertEqual(0, len(only1))
+    self.assertEqual(0, len(only2))
+
+  def test_records_unsupported_format(self):
+    self.comparator.configure(self.config)
+    file1 = self.write("document", standards.PROVN)
+    with self.assertRaises(ComparisonError):
+      self.comparator.records(file1)
+
+  def test_verify(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    file2 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    self.assertTrue(self.comparator.verify(file1, file2))
+
+  def test_verify_different(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    file2 = self.write(json.dumps({"entity": {"ex:e2": {}}}))
+    self.assertIsNone(self.comparator.verify(file1, file2))
+
+  def test_verify_different_authoritative(self):
+    self.config[NativeComparator.AUTHORITATIVE] = True
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    file2 = self.write(json.dumps({"entity": {"ex:e2": {}}}))
+    self.assertFalse(self.comparator.verify(file1, file2))
+
+  def test_verify_invalid(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    file2 = self.write("{")
+    self.assertIsNone(self.comparator.verify(file1, file2))
+
+  def test_verify_invalid_authoritative(self):
+    self.config[NativeComparator.AUTHORITATIVE] = True
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    file2 = self.write("{")
+    with self.assertRaises(ComparisonError):
+      self.comparator.verify(file1, file2)
+
+  def test_verify_missing_file(self):
+    self.comparator.configure(self.config)
+    file1 = self.write(json.dumps({"entity": {"ex:e1": {}}}))
+    with self.assertRaises(ComparisonError):
+      self.comparator.verify(file1, "nosuchfile.json")
@@ -0,0 +1,75 @@
+"""Unit tests for :mod:`prov_interop.native.multiset`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import unittest
+
+import numpy
+
+from prov_interop.native import multiset
+
+class MultisetTestCase(unittest.TestCase):
+
+  def test_from_hashes(self):
+    records = multiset.from_hashes(iter([3, 1, 2 ** 64 - 1, 1]))
+    self.assertEqual(numpy.uint64, records.dtype)
+    self.assertEqual([1, 1, 3, 2 ** 64 - 1], records.tolist())
+
+  def test_from_hashes_empty(self):
+    self.assertEqual(0, len(multiset.from_hashes([])))
+
+  def test_equal(self):
+    self.assertTrue(multiset.equal(multiset.from_hashes([1, 2, 2]),
+                                   multiset.from_hashes([2, 1, 2])))
+
+  def test_equal_empty(self):
+    self.assertTrue(multiset.equal(multiset.from_hashes([]),
+                                   multiset.from_hashes([])))
+
+  def test_equal_counts(self):
+    self.assertFalse(multiset.equal(multiset.from_hashes([1, 2, 2]),
+                                    multiset.from_hashes([1, 1, 2])))
+
+  def test_equal_lengths(self):
+    self.assertFalse(multiset.equal(multiset.from_hashes([1, 2]),
+                                    multiset.from_hashes([1, 2, 2])))
+
+  def test_difference(self):
+    (only1, only2) = multiset.difference(
+      multiset.from_hashes([1, 2, 2, 3]), multiset.from_hashes([2, 3, 4]))
+    self.assertEqual([1, 2], only1.tolist())
+    self.assertEqual([4], only2.tolist())
+
+  def test_difference_equal(self):
+    (only1, only2) = multiset.difference(
+      multiset.from_hashes([1, 2, 2]), multiset.from_hashes([2, 1, 2]))
+    self.assertEqual(0, len(only1))
+    self.assertEqual(0, len(only2))
+
+  def test_difference_empty(self):
+    (only1, only2) = multiset.difference(
+      multiset.from_hashes([]), multiset.from_hashes([2 ** 64 - 1]))
+    self.assertEqual([], only1.tolist())
+    self.assertEqual([2 ** 64 - 1], only2.tolist())
@@ -0,0 +1,253 @@
+"""Unit tests for :mod:`prov_interop.native.provjson`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import json
+import os
+import tempfile
+import unittest
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.native import provjson
+from prov_interop.native.provjson import ProvJsonComparator
+
+class NormaliseTestCase(unittest.TestCase):
+
+  def test_normalise_datetime(self):
+    self.assertEqual("2011-11-16T15:05:00Z",
+                     provjson.normalise_datetime("2011-11-16T16:05:00+01:00"))
+    self.assertEqual("2011-11-16T15:05:00Z",
+                     provjson.normalise_datetime("2011-11-16T15:05:00.000Z"))
+    self.assertEqual("2011-11-16T15:05:00.5Z",
+                     provjson.normalise_datetime("2011-11-16T12:35:00.50-02:30"))
+
+  def test_normalise_datetime_no_zone(self):
+    self.assertEqual("2011-11-16T16:05:00",
+                     provjson.normalise_datetime("2011-11-16T16:05:00.0"))
+
+  def test_normalise_datetime_invalid(self):
+    self.assertEqual("16/11/2011",
+                     provjson.normalise_datetime("16/11/2011"))
+
+  def test_normalise_literal(self):
+    self.assertEqual(
+      provjson.normalise_literal(provjson.XSD_NS + "int", "1"),
+      provjson.normalise_literal(provjson.XSD_NS + "integer", "01"))
+    self.assertEqual(
+      provjson.normalise_literal(provjson.XSD_NS + "double", "1.50"),
+      provjson.normalise_literal(provjson.XSD_NS + "float", "1.5"))
+    self.assertEqual(
+      provjson.normalise_literal(provjson.XSD_NS + "boolean", "1"),
+      provjson.normalise_literal(provjson.XSD_NS + "boolean", "true"))
+
+  def test_normalise_literal_other(self):
+    self.assertEqual(
+      (provjson.LITERAL, provjson.XSD_NS + "gYear", "2002"),
+      provjson.normalise_literal(provjson.XSD_NS + "gYear", "2002"))
+
+  def test_expand(self):
+    namespaces = provjson.Namespaces({"ex": "http://example.org/",
+                                      "default": "http://default.org/"})
+    self.assertEqual("http://example.org/e1", namespaces.expand("ex:e1"))
+    self.assertEqual(provjson.PROV_NS + "entity",
+                     namespaces.expand("prov:entity"))
+    self.assertEqual("http://default.org/e1", namespaces.expand("e1"))
+    self.assertEqual("other:e1", namespaces.expand("other:e1"))
+
+  def test_expand_parent(self):
+    parent = provjson.Namespaces({"ex": "http://example.org/"})
+    namespaces = provjson.Namespaces({"ex2": "http://example2.org/"},
+                                     parent)
+    self.assertEqual("http://example.org/e1", namespaces.expand("ex:e1"))
+    self.assertEqual("http://example2.org/e1", namespaces.expand("ex2:e1"))
+    self.assertEqual("ex2:e1", parent.expand("ex2:e1"))
+
+  def test_normalise_value(self):
+    namespaces = provjson.Namespaces({"ex": "http://example.org/"})
+    attribute = "http://example.org/value"
+    for (value1, value2) in [
+        (1, {"$": "1", "type": "xsd:int"}),
+        (1.5, {"$": "1.5", "type": "xsd:double"}),
+        (True, {"$": "true", "type": "xsd:boolean"}),
+        ("a", {"$": "a", "type": "xsd:string"}),
+        ({"$": "ex:a", "type": "xsd:QName"},
+         {"$": "ex:a", "type": "prov:QUALIFIED_NAME"}),
+        ({"$": "http://example.org/a", "type": "xsd:anyURI"},
+         {"$": "ex:a", "type": "xsd:QName"}),
+        ({"$": "a", "lang": "EN"},
+         {"$": "a", "lang": "en", "type": "prov:InternationalizedString"})]:
+      self.assertEqual(
+        provjson.normalise_value(attribute, value1, namespaces),
+        provjson.normalise_value(attribute, value2, namespaces))
+
+  def test_normalise_value_string_not_identifier(self):
+    namespaces = provjson.Namespaces({"ex": "http://example.org/"})
+    attribute = "http://example.org/value"
+    self.assertNotEqual(
+      provjson.normalise_value(attribute, "ex:a", namespaces),
+      provjson.normalise_value(attribute, 
+                               {"$": "ex:a", "type": "xsd:QName"},
+                               namespaces))
+
+  def test_normalise_value_identifier(self):
+    namespaces = provjson.Namespaces({"ex": "http://example.org/"})
+    self.assertEqual(
+      (provjson.IDENTIFIER, "http://example.org/e1"),
+      provjson.normalise_value(provjson.PROV_NS + "entity", "ex:e1",
+                               namespaces))
+
+  def test_normalise_value_time(self):
+    namespaces = provjson.Namespaces({})
+    self.assertEqual(
+      (provjson.LITERAL, provjson.XSD_NS + "dateTime", 
+       "2011-11-16T15:05:00Z"),
+      provjson.normalise_value(provjson.PROV_NS + "time",
+                               "2011-11-16T16:05:00+01:00", namespaces))
+
+  def test_normalise_value_missing_value(self):
+    namespaces = provjson.Namespaces({})
+    with self.assertRaises(ComparisonError):
+      provjson.normalise_value("http://example.org/value",
+                               {"type": "xsd:int"}, namespaces)
+
+  def test_normalise_record(self):
+    namespaces = provjson.Namespaces({"ex": "http://example.org/"})
+    record1 = provjson.normalise_record(
+      None, "used", "_:id1",
+      {"prov:activity": "ex:a1", "prov:entity": "ex:e1",
+       "ex:role": ["a", "b", "a"]},
+      namespaces)
+    record2 = provjson.normalise_record(
+      None, "used", "_:id2",
+      {"ex:role": ["b", "a"], "prov:entity": "ex:e1",
+       "prov:activity": "ex:a1"},
+      namespaces)
+    self.assertEqual(record1, record2)
+    self.assertEqual(None, record1[2])
+
+  def test_split_membership(self):
+    attributes = {"prov:collection": "ex:c", 
+                  "prov:entity": ["ex:e1", "ex:e2"]}
+    self.assertEqual(
+      [{"prov:collection": "ex:c", "prov:entity": "ex:e1"},
+       {"prov:collection": "ex:c", "prov:entity": "ex:e2"}],
+      provjson.split_membership(provjson.MEMBERSHIP, attributes))
+    self.assertEqual([attributes],
+                     provjson.split_membership("entity", attributes))
+
+
+class ProvJsonComparatorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(ProvJsonComparatorTestCase, self).setUp()
+    self.comparator = ProvJsonComparator()
+    self.comparator.configure({ProvJsonComparator.FORMATS: 
+                               [standards.JSON]})
+    self.files = []
+    self.document = {
+      "prefix": {"ex": "http://example.org/"},
+      "entity": {
+        "ex:e1": {"ex:value": 1, "prov:label": "e1"},
+        "ex:e2": {}},
+      "activity": {
+        "ex:a1": {"prov:startTime": "2011-11-16T16:05:00Z"}},
+      "wasGeneratedBy": {
+        "_:id1": {"prov:entity": "ex:e1", "prov:activity": "ex:a1"}},
+      "bundle": {
+        "ex:b1": {
+          "prefix": {"ex2": "http://example2.org/"},
+          "entity": {"ex2:e3": {}}}}}
+
+  def tearDown(self):
+    super(ProvJsonComparatorTestCase, self).tearDown()
+    for tmp in self.files:
+      if os.path.isfile(tmp):
+        os.remove(tmp)
+
+  def write(self, document):
+    (_, tmp) = tempfile.mkstemp(suffix="." + standards.JSON)
+    self.files.append(tmp)
+    with open(tmp, "w") as f:
+      f.write(json.dumps(document))
+    return tmp
+
+  def test_compare(self):
+    file1 = self.write(self.document)
+    file2 = self.write(self.document)
+    self.assertTrue(self.comparator.compare(file1, file2))
+
+  def test_compare_equivalent(self):
+    file1 = self.write(self.document)
+    document = json.loads(json.dumps(self.document).replace(
+        "ex:", "other:"))
+    document["prefix"] = {"other": "http://example.org/"}
+    document["entity"]["other:e1"]["other:value"] = {
+      "$": "1", "type": "xsd:int"}
+    document["activity"]["other:a1"]["prov:startTime"] = \
+        "2011-11-16T17:05:00.000+01:00"
+    document["wasGeneratedBy"] = {
+      "_:wGB9": document["wasGeneratedBy"]["_:id1"]}
+    file2 = self.write(document)
+    self.assertTrue(self.comparator.compare(file1, file2))
+
+  def test_compare_different_value(self):
+    file1 = self.write(self.document)
+    self.document["entity"]["ex:e1"]["ex:value"] = 2
+    file2 = self.write(self.document)
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_different_namespace(self):
+    file1 = self.write(self.document)
+    self.document["prefix"]["ex"] = "http://example.com/"
+    file2 = self.write(self.document)
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_different_bundle(self):
+    file1 = self.write(self.document)
+    self.document["bundle"]["ex:b2"] = self.document["bundle"].pop("ex:b1")
+    file2 = self.write(self.document)
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_missing_record(self):
+    file1 = self.write(self.document)
+    del self.document["entity"]["ex:e2"]
+    file2 = self.write(self.document)
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_invalid_json(self):
+    file1 = self.write(self.document)
+    (_, file2) = tempfile.mkstemp(suffix="." + standards.JSON)
+    self.files.append(file2)
+    with open(file2, "w") as f:
+      f.write("{")
+    with self.assertRaises(ComparisonError):
+      self.comparator.compare(file1, file2)
+
+  def test_compare_invalid_document(self):
+    file1 = self.write(self.document)
+    file2 = self.write({"entity": ["ex:e1"]})
+    with self.assertRaises(ComparisonError):
+      self.comparator.compare(file1, file2)
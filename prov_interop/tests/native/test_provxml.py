@@ -0,0 +1,188 @@
+"""Unit tests for :mod:`prov_interop.native.provxml`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import io
+import os
+import tempfile
+import unittest
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.native import provjson
+from prov_interop.native import provxml
+from prov_interop.native.provxml import ProvXmlComparator
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<prov:document xmlns:prov="http://www.w3.org/ns/prov#"
+  xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+  xmlns:ex="http://example.org/">
+  <prov:entity prov:id="ex:e1">
+    <prov:label xml:lang="en">e1</prov:label>
+    <prov:type xsi:type="xsd:QName">ex:Thing</prov:type>
+    <ex:value xsi:type="xsd:int">1</ex:value>
+  </prov:entity>
+  <prov:activity prov:id="ex:a1">
+    <prov:startTime>2011-11-16T16:05:00Z</prov:startTime>
+  </prov:activity>
+  <prov:wasGeneratedBy>
+    <prov:entity prov:ref="ex:e1"/>
+    <prov:activity prov:ref="ex:a1"/>
+  </prov:wasGeneratedBy>
+  <prov:bundleContent prov:id="ex:b1">
+    <prov:entity prov:id="ex:e2"/>
+  </prov:bundleContent>
+</prov:document>
+"""
+
+EQUIVALENT = """<?xml version="1.0" encoding="UTF-8"?>
+<prov:document xmlns:prov="http://www.w3.org/ns/prov#"
+  xmlns:xsd="http://www.w3.org/2001/XMLSchema#"
+  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+  xmlns:other="http://example.org/">
+  <prov:bundleContent prov:id="other:b1">
+    <prov:entity prov:id="other:e2"/>
+  </prov:bundleContent>
+  <prov:wasGeneratedBy>
+    <prov:activity prov:ref="other:a1"/>
+    <prov:entity prov:ref="other:e1"/>
+  </prov:wasGeneratedBy>
+  <prov:activity prov:id="other:a1">
+    <prov:startTime>2011-11-16T17:05:00.000+01:00</prov:startTime>
+  </prov:activity>
+  <prov:entity prov:id="other:e1">
+    <other:value xsi:type="xsd:integer">01</other:value>
+    <prov:type xmlns:t="http://example.org/" xsi:type="xsd:QName">t:Thing</prov:type>
+    <prov:label xml:lang="EN">e1</prov:label>
+  </prov:entity>
+</prov:document>
+"""
+
+class IterateRecordsTestCase(unittest.TestCase):
+
+  def test_iterate_records(self):
+    records = list(provxml.iterate_records(
+        io.BytesIO(DOCUMENT.encode("utf-8"))))
+    self.assertEqual(4, len(records))
+    (bundle, record_type, identifier, pairs) = records[0]
+    self.assertEqual(None, bundle)
+    self.assertEqual("entity", record_type)
+    self.assertEqual("http://example.org/e1", identifier)
+    self.assertIn(("http://example.org/value",
+                   (provjson.LITERAL, provjson.XSD_NS + "int", "1")), pairs)
+    (bundle, record_type, identifier, pairs) = records[2]
+    self.assertEqual(None, identifier)
+    self.assertIn((provjson.PROV_NS + "entity",
+                   (provjson.IDENTIFIER, "http://example.org/e1")), pairs)
+    (bundle, record_type, identifier, pairs) = records[3]
+    self.assertEqual("http://example.org/b1", bundle)
+    self.assertEqual("http://example.org/e2", identifier)
+
+  def test_iterate_records_same_as_provjson(self):
+    document = {
+      "prefix": {"ex": "http://example.org/"},
+      "entity": {"ex:e1": {"prov:label": {"$": "e1", "lang": "en"},
+                           "prov:type": {"$": "ex:Thing", 
+                                         "type": "xsd:QName"},
+                           "ex:value": 1}},
+      "activity": {"ex:a1": {"prov:startTime": "2011-11-16T16:05:00Z"}},
+      "wasGeneratedBy": {"_:id1": {"prov:entity": "ex:e1",
+                                   "prov:activity": "ex:a1"}},
+      "bundle": {"ex:b1": {"entity": {"ex:e2": {}}}}}
+    records = provxml.iterate_records(io.BytesIO(DOCUMENT.encode("utf-8")))
+    self.assertEqual(set(provjson.normalise_document(document)),
+                     set(records))
+
+  def test_iterate_records_membership(self):
+    document = """<prov:document xmlns:prov="http://www.w3.org/ns/prov#"
+  xmlns:ex="http://example.org/">
+  <prov:hadMember>
+    <prov:collection prov:ref="ex:c"/>
+    <prov:entity prov:ref="ex:e1"/>
+    <prov:entity prov:ref="ex:e2"/>
+  </prov:hadMember>
+</prov:document>
+"""
+    records = list(provxml.iterate_records(
+        io.BytesIO(document.encode("utf-8"))))
+    self.assertEqual(2, len(records))
+
+  def test_expand_tag(self):
+    self.assertEqual(provjson.PROV_NS + "entity",
+                     provxml.expand_tag("{" + provjson.PROV_NS + "}entity"))
+    self.assertEqual("entity", provxml.expand_tag("entity"))
+    self.assertEqual("entity", 
+                     provxml.local_name("{" + provjson.PROV_NS + "}entity"))
+
+
+class ProvXmlComparatorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(ProvXmlComparatorTestCase, self).setUp()
+    self.comparator = ProvXmlComparator()
+    self.comparator.configure({ProvXmlComparator.FORMATS: 
+                               [standards.PROVX]})
+    self.files = []
+
+  def tearDown(self):
+    super(ProvXmlComparatorTestCase, self).tearDown()
+    for tmp in self.files:
+      if os.path.isfile(tmp):
+        os.remove(tmp)
+
+  def write(self, content):
+    (_, tmp) = tempfile.mkstemp(suffix="." + standards.PROVX)
+    self.files.append(tmp)
+    with open(tmp, "w") as f:
+      f.write(content)
+    return tmp
+
+  def test_compare(self):
+    file1 = self.write(DOCUMENT)
+    file2 = self.write(DOCUMENT)
+    self.assertTrue(self.comparator.compare(file1, file2))
+
+  def test_compare_equivalent(self):
+    file1 = self.write(DOCUMENT)
+    file2 = self.write(EQUIVALENT)
+    self.assertTrue(self.comparator.compare(file1, file2))
+
+  def test_compare_different_value(self):
+    file1 = self.write(DOCUMENT)
+    file2 = self.write(DOCUMENT.replace(
+        '"xsd:int">1<', '"xsd:int">2<'))
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_different_bundle(self):
+    file1 = self.write(DOCUMENT)
+    file2 = self.write(DOCUMENT.replace("ex:b1", "ex:b2"))
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_invalid_xml(self):
+    file1 = self.write(DOCUMENT)
+    file2 = self.write(DOCUMENT[:-20])
+    with self.assertRaises(ComparisonError):
+      self.comparator.compare(file1, file2)
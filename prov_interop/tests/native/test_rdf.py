@@ -0,0 +1,166 @@
+"""Unit tests for :mod:`prov_interop.native.rdf`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from prov_interop import standards
+from prov_interop.comparator import ComparisonError
+from prov_interop.component import ConfigError
+from prov_interop.native import rdf
+from prov_interop.native.rdf import RdfComparator
+
+PREFIXES = """@prefix prov: <http://www.w3.org/ns/prov#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+@prefix ex: <http://example.org/> .
+"""
+
+TTL = PREFIXES + """
+ex:e1 a prov:Entity ; ex:value "1"^^xsd:integer .
+ex:a1 a prov:Activity .
+ex:a1 prov:qualifiedUsage [ a prov:Usage ; prov:entity ex:e1 ] .
+"""
+
+TRIG = PREFIXES + """
+ex:b1 { ex:e1 a prov:Entity . }
+ex:b2 { ex:e2 a prov:Entity . }
+"""
+
+class RdfComparatorUnavailableTestCase(unittest.TestCase):
+
+  @unittest.skipIf(rdf.rdflib is not None, "rdflib is installed")
+  def test_configure_no_rdflib(self):
+    with self.assertRaises(ConfigError):
+      RdfComparator().configure({RdfComparator.FORMATS: [standards.TTL]})
+
+
+@unittest.skipIf(rdf.rdflib is None, "rdflib is not installed")
+class RdfComparatorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(RdfComparatorTestCase, self).setUp()
+    self.comparator = RdfComparator()
+    self.comparator.configure({RdfComparator.FORMATS: 
+                               [standards.TTL, standards.TRIG]})
+    self.files = []
+
+  def tearDown(self):
+    super(RdfComparatorTestCase, self).tearDown()
+    for tmp in self.files:
+      if os.path.isfile(tmp):
+        os.remove(tmp)
+
+  def write(self, content, format):
+    (_, tmp) = tempfile.mkstemp(suffix="." + format)
+    self.files.append(tmp)
+    with open(tmp, "w") as f:
+      f.write(content)
+    return tmp
+
+  def test_compare(self):
+    file1 = self.write(TTL, standards.TTL)
+    file2 = self.write(TTL, standards.TTL)
+    self.assertTrue(self.comparator.compare(file1, file2))
+
+  def test_compare_equivalent(self):
+    file1 = self.write(TTL, standards.TTL)
+    ttl = """@prefix prov: <http://www.w3.org/ns/prov#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+@prefix other: <http://example.org/> .
+
+_:u9 prov:entity other:e1 ; a prov:Usage .
+other:a1 prov:qualifiedUsage _:u9 ; a prov:Activity .
+other:e1 other:value "01"^^xsd:integer ; a prov:Entity .
+"""
+    file2 = self.write(ttl, standards.TTL)
+    self.assertTrue(self.comparator.compare(file1, file2))
+
+  def test_compare_different(self):
+    file1 = self.write(TTL, standards.TTL)
+    file2 = self.write(TTL.replace("ex:a1 a", "ex:a2 a"), standards.TTL)
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_trig(self):
+    file1 = self.write(TRIG, standards.TRIG)
+    file2 = self.write(TRIG.replace("ex:b2", "ex:b3"), standards.TRIG)
+    self.assertTrue(self.comparator.compare(file1, file1))
+    self.assertFalse(self.comparator.compare(file1, file2))
+
+  def test_compare_trig_shared_blank_node(self):
+    file1 = self.write(PREFIXES + """
+ex:g1 { _:b ex:p ex:o . }
+ex:g2 { _:b ex:q ex:o . }
+""", standards.TRIG)
+    file2 = self.write(PREFIXES + """
+ex:g1 { _:b1 ex:p ex:o . }
+ex:g2 { _:b2 ex:q ex:o . }
+""", standards.TRIG)
+    self.assertFalse(self.comparator.compare(file1, file2))
+    self.assertIsNone(self.comparator.verify(file1, file2))
+    self.assertFalse(self.comparator.isomorphic(file1, file2))
+
+  def test_compare_trig_relabelled_blank_node(self):
+    file1 = self.write(PREFIXES + """
+ex:g1 { _:b ex:p ex:o . }
+ex:g2 { _:b ex:q ex:o . }
+""", standards.TRIG)
+    file2 = self.write(PREFIXES + """
+ex:g2 { _:x ex:q ex:o . }
+ex:g1 { _:x ex:p ex:o . }
+""", standards.TRIG)
+    self.assertTrue(self.comparator.compare(file1, file2))
+
+  def test_compare_invalid(self):
+    file1 = self.write(TTL, standards.TTL)
+    file2 = self.write("ex:e1 a", standards.TTL)
+    with self.assertRaises(ComparisonError):
+      self.comparator.compare(file1, file2)
+
+  def test_isomorphic(self):
+    file1 = self.write(TTL, standards.TTL)
+    file2 = self.write(TTL.replace("[ a prov:Usage ; prov:entity ex:e1 ]",
+                                   "_:u1 . _:u1 a prov:Usage ; prov:entity ex:e1"),
+                       standards.TTL)
+    self.assertTrue(self.comparator.isomorphic(file1, file2))
+
+  def test_triple_hash(self):
+    name = "<http://example.org/e1>"
+    value = '"1"'
+    self.assertEqual(0, rdf.triple_hash((None, name, name, value)) % 2)
+    self.assertEqual(1, rdf.triple_hash((None, "_:b0", name, value)) % 2)
+    self.assertNotEqual(rdf.triple_hash((None, name, name, value)),
+                        rdf.triple_hash((name, name, name, value)))
+
+  def test_ground_records(self):
+    records = numpy.array([2, 3, 3, 4, 4], dtype=numpy.uint64)
+    self.assertEqual([2, 4, 4], rdf.ground_records(records).tolist())
+
+  def test_ground_records_large(self):
+    records = numpy.array([2 ** 64 - 2, 2 ** 64 - 1], dtype=numpy.uint64)
+    self.assertEqual([2 ** 64 - 2], rdf.ground_records(records).tolist())
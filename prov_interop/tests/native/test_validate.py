@@ -0,0 +1,150 @@
+"""Unit tests for :mod:`prov_interop.native.validate`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop import standards
+from prov_interop.comparator import Comparator
+from prov_interop.harness import HarnessResources
+from prov_interop.native import validate
+
+class IdenticalComparator(Comparator):
+  """Comparator which decides documents are equivalent if their files
+  are identical."""
+
+  def compare(self, file1, file2):
+    super(IdenticalComparator, self).compare(file1, file2)
+    with open(file1) as f1, open(file2) as f2:
+      return f1.read() == f2.read()
+
+
+class BatchComparator(IdenticalComparator):
+  """Comparator which counts calls to :meth:`compare_many`, failing
+  if any file is not found."""
+
+  def __init__(self):
+    super(BatchComparator, self).__init__()
+    self.batches = 0
+
+  @property
+  def supports_compare_many(self):
+    return True
+
+  def compare_many(self, pairs):
+    self.batches += 1
+    return super(BatchComparator, self).compare_many(pairs)
+
+
+class ValidateTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(ValidateTestCase, self).setUp()
+    self.test_cases_dir = tempfile.mkdtemp()
+    documents = [{"entity": {"ex:e1": {}}},
+                 {"entity": {"ex:e1": {"ex:value": 1}}},
+                 {"entity": {"ex:e1": {"ex:value": {"$": "1", 
+                                                    "type": "xsd:int"}}}}]
+    for (index, document) in enumerate(documents):
+      test_case_dir = os.path.join(self.test_cases_dir,
+                                   HarnessResources.TEST_CASE_PREFIX +
+                                   str(index + 1))
+      os.mkdir(test_case_dir)
+      with open(os.path.join(test_case_dir, "file.json"), "w") as f:
+        f.write(json.dumps(document))
+    self.harness = HarnessResources()
+    self.harness.configure({
+      HarnessResources.TEST_CASES_DIR: self.test_cases_dir,
+      HarnessResources.COMPARATORS: {
+        "ProvJsonComparator": {
+          HarnessResources.CLASS: 
+            "prov_interop.native.provjson.ProvJsonComparator",
+          "formats": [standards.JSON]}}})
+    self.native = self.harness.comparators["ProvJsonComparator"]
+    self.reference = IdenticalComparator()
+    self.reference.configure({Comparator.FORMATS: [standards.JSON]})
+
+  def tearDown(self):
+    super(ValidateTestCase, self).tearDown()
+    shutil.rmtree(self.test_cases_dir)
+
+  def test_get_test_case_files(self):
+    files = validate.get_test_case_files(self.harness, standards.JSON)
+    self.assertEqual(3, len(files))
+    self.assertEqual([], validate.get_test_case_files(self.harness,
+                                                      standards.PROVX))
+
+  def test_validate(self):
+    files = validate.get_test_case_files(self.harness, standards.JSON)
+    (pairs, disagreements) = validate.validate(self.native, 
+                                               self.reference, files)
+    self.assertEqual(6, pairs)
+    self.assertEqual(1, len(disagreements))
+    (file1, file2, verdict, reference_verdict) = disagreements[0]
+    self.assertEqual(sorted(files[1:]), sorted([file1, file2]))
+    self.assertTrue(verdict)
+    self.assertFalse(reference_verdict)
+
+  def test_validate_error(self):
+    files = validate.get_test_case_files(self.harness, standards.JSON)
+    files.append("nosuchfile.json")
+    (pairs, disagreements) = validate.validate(self.native, 
+                                               self.reference, files)
+    self.assertEqual(10, pairs)
+    self.assertEqual(1, len(disagreements))
+
+  def test_validate_batch(self):
+    files = validate.get_test_case_files(self.harness, standards.JSON)
+    reference = BatchComparator()
+    reference.configure({Comparator.FORMATS: [standards.JSON]})
+    (pairs, disagreements) = validate.validate(self.native, 
+                                               reference, files)
+    self.assertEqual(6, pairs)
+    self.assertEqual(1, len(disagreements))
+    self.assertEqual(1, reference.batches)
+
+  def test_get_verdicts_batch_error(self):
+    files = validate.get_test_case_files(self.harness, standards.JSON)
+    reference = BatchComparator()
+    reference.configure({Comparator.FORMATS: [standards.JSON]})
+    verdicts = validate.get_verdicts(
+      reference, [(files[0], files[0]), (files[0], "nosuchfile.json")])
+    self.assertEqual([True, None], verdicts)
+    self.assertEqual(1, reference.batches)
+
+  def test_format_validation(self):
+    file1 = os.path.join(self.test_cases_dir, "test-case1", "file.json")
+    file2 = os.path.join(self.test_cases_dir, "test-case2", "file.json")
+    lines = validate.format_validation(
+      6, [(file1, file2, True, False)], self.test_cases_dir).split("\n")
+    self.assertEqual(["Pairs compared: 6",
+                      "Disagreements: 1",
+                      os.path.join("test-case1", "file.json") + " " +
+                      os.path.join("test-case2", "file.json") +
+                      " native:True reference:False"], lines)
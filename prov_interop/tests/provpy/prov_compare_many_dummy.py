@@ -0,0 +1,83 @@
+"""Dummy batch driver which mimics the behaviour of
+:mod:`prov_interop.provpy.compare_many`.
+
+For each pair of files in the manifest it writes into the results
+file 2 if either file does not exist or is empty, 1 if the files'
+contents differ and 0 if they are the same (it does no PROV
+validation).
+
+Usage::
+
+    usage: prov_compare_many_dummy.py [-h] manifest results
+
+    Dummy batch driver.
+
+    positional arguments:
+      manifest    Manifest file
+      results     Results file
+
+    optional arguments:
+      -h, --help  show this help message and exit
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import filecmp
+import json
+import os
+import sys
+
+def compare_pairs(pairs):
+  """
+  Mimic :func:`prov_interop.provpy.compare_many.compare_pairs`.
+
+  :param pairs: Pairs of files
+  :type pairs: list of list of str or unicode
+  :return: exit code for each pair
+  :rtype: list of int
+  """
+  return_codes = []
+  for (file1, file2) in pairs:
+    if not (os.path.isfile(file1) and os.path.isfile(file2)) or \
+          os.path.getsize(file1) == 0 or os.path.getsize(file2) == 0:
+      return_codes.append(2)
+    elif not filecmp.cmp(file1, file2, shallow=False):
+      return_codes.append(1)
+    else:
+      return_codes.append(0)
+  return return_codes
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Dummy batch driver.")
+  parser.add_argument("manifest", help="Manifest file")
+  parser.add_argument("results", help="Results file")
+  args = parser.parse_args()
+  with open(args.manifest, "r") as manifest_file:
+    pairs = json.load(manifest_file)
+  return_codes = compare_pairs(pairs)
+  with open(args.results, "w") as results_file:
+    json.dump(return_codes, results_file)
+  sys.exit(0)
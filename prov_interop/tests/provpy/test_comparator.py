@@ -184,3 +184,104 @@ class ProvPyComparatorTestCase(unittest.TestCase):
     (_, self.file2) = tempfile.mkstemp(suffix=".nosuchformat")
     with self.assertRaises(ComparisonError):
       self.provpy.compare(self.file1, self.file2)
+
+  def configure_batch(self, script="prov_compare_many_dummy.py"):
+    self.config[ProvPyComparator.BATCH_EXECUTABLE] = "python"
+    self.config[ProvPyComparator.BATCH_ARGUMENTS] = " ".join(
+      [os.path.join(os.path.dirname(os.path.abspath(__file__)), script),
+       ProvPyComparator.MANIFEST,
+       ProvPyComparator.RESULTS])
+    self.provpy.configure(self.config)
+
+  def write_files(self, content1, content2):
+    (_, self.file1) = tempfile.mkstemp(suffix="." + standards.JSON)
+    (_, self.file2) = tempfile.mkstemp(suffix="." + standards.JSON)
+    with open(self.file1, 'a') as f1:
+      f1.write(content1)
+    with open(self.file2, 'a') as f2:
+      f2.write(content2)
+
+  def test_configure_batch(self):
+    self.assertFalse(self.provpy.supports_compare_many)
+    self.configure_batch()
+    self.assertEqual(["python"], self.provpy.batch_executable)
+    self.assertEqual(
+      self.config[ProvPyComparator.BATCH_ARGUMENTS].split(),
+      self.provpy.batch_arguments)
+    self.assertTrue(self.provpy.supports_compare_many)
+
+  def test_configure_batch_no_arguments(self):
+    self.config[ProvPyComparator.BATCH_EXECUTABLE] = "python"
+    with self.assertRaises(ConfigError):
+      self.provpy.configure(self.config)
+
+  def test_configure_batch_no_manifest(self):
+    self.config[ProvPyComparator.BATCH_EXECUTABLE] = "python"
+    self.config[ProvPyComparator.BATCH_ARGUMENTS] = ProvPyComparator.RESULTS
+    with self.assertRaises(ConfigError):
+      self.provpy.configure(self.config)
+
+  def test_configure_batch_no_results(self):
+    self.config[ProvPyComparator.BATCH_EXECUTABLE] = "python"
+    self.config[ProvPyComparator.BATCH_ARGUMENTS] = ProvPyComparator.MANIFEST
+    with self.assertRaises(ConfigError):
+      self.provpy.configure(self.config)
+
+  def test_batch_command_line(self):
+    self.configure_batch()
+    command_line = self.provpy.batch_command_line("m.json", "r.json")
+    self.assertEqual(["m.json", "r.json"], command_line[-2:])
+
+  def test_compare_many(self):
+    self.configure_batch()
+    self.write_files("FILE1", "FILE2")
+    self.assertEqual([True, False, True],
+                     self.provpy.compare_many([(self.file1, self.file1),
+                                               (self.file1, self.file2),
+                                               (self.file2, self.file2)]))
+
+  def test_compare_many_empty(self):
+    self.configure_batch()
+    self.assertEqual([], self.provpy.compare_many([]))
+
+  def test_compare_many_no_batch(self):
+    self.provpy.configure(self.config)
+    self.write_files("FILE1", "FILE2")
+    self.assertEqual([True, False],
+                     self.provpy.compare_many([(self.file1, self.file1),
+                                               (self.file1, self.file2)]))
+
+  def test_compare_many_missing_file(self):
+    self.configure_batch()
+    self.write_files("FILE1", "FILE2")
+    self.assertEqual([False, None], self.provpy.compare_many(
+      [(self.file1, self.file2),
+       (self.file1, "nosuchfile." + standards.JSON)]))
+
+  def test_compare_many_invalid_format(self):
+    self.configure_batch()
+    (_, self.file1) = tempfile.mkstemp(suffix="." + standards.JSON)
+    (_, self.file2) = tempfile.mkstemp(suffix=".nosuchformat")
+    self.assertEqual([None], self.provpy.compare_many(
+      [(self.file1, self.file2)]))
+
+  def test_compare_many_pair_error(self):
+    self.configure_batch()
+    self.write_files("FILE1", "")
+    self.assertEqual([True, None, True], self.provpy.compare_many(
+      [(self.file1, self.file1),
+       (self.file1, self.file2),
+       (self.file1, self.file1)]))
+
+  def test_compare_many_no_batch_missing_file(self):
+    self.provpy.configure(self.config)
+    self.write_files("FILE1", "FILE2")
+    self.assertEqual([None, True], self.provpy.compare_many(
+      [(self.file1, "nosuchfile." + standards.JSON),
+       (self.file1, self.file1)]))
+
+  def test_compare_many_driver_error(self):
+    self.configure_batch("nosuchscript.py")
+    self.write_files("FILE1", "FILE2")
+    with self.assertRaises(ComparisonError):
+      self.provpy.compare_many([(self.file1, self.file2)])
@@ -0,0 +1,98 @@
+"""Unit tests for :mod:`prov_interop.provpy.compare_many`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import collections
+import json
+import os
+import tempfile
+import unittest
+
+from prov_interop import standards
+
+try:
+  from prov_interop.provpy import compare_many
+  HAS_PROV = True
+except ImportError:
+  HAS_PROV = False
+
+@unittest.skipUnless(HAS_PROV, "prov package not available")
+class CompareManyTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(CompareManyTestCase, self).setUp()
+    self.files = []
+
+  def tearDown(self):
+    super(CompareManyTestCase, self).tearDown()
+    for tmp in self.files:
+      if os.path.isfile(tmp):
+        os.remove(tmp)
+
+  def write(self, content, format=standards.JSON):
+    (_, tmp) = tempfile.mkstemp(suffix="." + format)
+    self.files.append(tmp)
+    with open(tmp, "w") as f:
+      f.write(content)
+    return tmp
+
+  def write_entity(self, name):
+    return self.write(json.dumps({
+      "prefix": {"ex": "http://example.org/"},
+      "entity": {"ex:" + name: {}}}))
+
+  def test_compare_pairs(self):
+    file1 = self.write_entity("e1")
+    file2 = self.write_entity("e1")
+    file3 = self.write_entity("e2")
+    self.assertEqual([compare_many.EQUIVALENT,
+                      compare_many.NOT_EQUIVALENT],
+                     compare_many.compare_pairs([[file1, file2],
+                                                 [file1, file3]]))
+
+  def test_compare_pairs_invalid(self):
+    file1 = self.write_entity("e1")
+    file2 = self.write("{")
+    file3 = self.write("document", standards.PROVN + "x")
+    self.assertEqual([compare_many.ERROR, compare_many.ERROR,
+                      compare_many.EQUIVALENT],
+                     compare_many.compare_pairs([[file1, file2],
+                                                 [file3, file1],
+                                                 [file1, file1]]))
+
+  def test_get_document_cached(self):
+    file1 = self.write_entity("e1")
+    documents = collections.OrderedDict()
+    document = compare_many.get_document(documents, file1)
+    self.assertIs(document, compare_many.get_document(documents, file1))
+    self.assertEqual([file1], list(documents))
+
+  def test_get_document_evicted(self):
+    documents = collections.OrderedDict()
+    files = [self.write_entity("e" + str(index))
+             for index in range(compare_many.CACHE_SIZE + 1)]
+    for file_name in files:
+      compare_many.get_document(documents, file_name)
+    self.assertEqual(files[1:], list(documents))
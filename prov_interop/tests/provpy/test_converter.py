@@ -41,6 +41,12 @@ from prov_interop.component import ConfigError
 from prov_interop.converter import ConversionError
 from prov_interop.provpy.converter import ProvPyConverter
 
+try:
+  import prov.model
+  HAS_PROV = True
+except ImportError:
+  HAS_PROV = False
+
 class ProvPyConverterTestCase(unittest.TestCase):
 
   def setUp(self):
@@ -62,10 +68,11 @@ class ProvPyConverterTestCase(unittest.TestCase):
       standards.JSON]
     self.config[ProvPyConverter.OUTPUT_FORMATS] = [
       standards.PROVN, standards.PROVX, standards.JSON]
+    self.out_files = {}
 
   def tearDown(self):
     super(ProvPyConverterTestCase, self).tearDown()
-    for tmp in [self.in_file, self.out_file]:
+    for tmp in [self.in_file, self.out_file] + list(self.out_files.values()):
       if tmp != None and os.path.isfile(tmp):
         os.remove(tmp)
 
@@ -85,6 +92,15 @@ class ProvPyConverterTestCase(unittest.TestCase):
                      self.provpy.input_formats)
     self.assertEqual(self.config[ProvPyConverter.OUTPUT_FORMATS], 
                      self.provpy.output_formats)
+    self.assertFalse(self.provpy.in_process)
+    self.assertFalse(self.provpy.supports_convert_many)
+
+  @unittest.skipUnless(HAS_PROV, "prov package not available")
+  def test_configure_in_process(self):
+    self.config[ProvPyConverter.IN_PROCESS] = True
+    self.provpy.configure(self.config)
+    self.assertTrue(self.provpy.in_process)
+    self.assertTrue(self.provpy.supports_convert_many)
 
   def test_configure_no_format(self):
     self.config[ProvPyConverter.ARGUMENTS] = " ".join(
@@ -110,6 +126,12 @@ class ProvPyConverterTestCase(unittest.TestCase):
     with self.assertRaises(ConfigError):
       self.provpy.configure(self.config)
 
+  def test_command_line(self):
+    self.provpy.configure(self.config)
+    command_line = self.provpy.command_line("in.json", "out.provx")
+    self.assertEqual(["python", self.config[ProvPyConverter.ARGUMENTS].split()[0],
+                      "-f", "xml", "in.json", "out.provx"], command_line)
+
   def test_convert(self):
     self.provpy.configure(self.config)
     (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
@@ -150,3 +172,47 @@ class ProvPyConverterTestCase(unittest.TestCase):
     self.out_file = "convert_invalid_output_format.nosuchformat"
     with self.assertRaises(ConversionError):
       self.provpy.convert(self.in_file, self.out_file)
+
+  def test_convert_many(self):
+    self.provpy.configure(self.config)
+    (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
+    for format in [standards.PROVN, standards.PROVX]:
+      self.out_files[format] = "convert_many." + format
+    self.provpy.convert_many(self.in_file, self.out_files)
+    for out_file in self.out_files.values():
+      self.assertTrue(os.path.isfile(out_file))
+
+  @unittest.skipUnless(HAS_PROV, "prov package not available")
+  def test_convert_many_in_process(self):
+    self.config[ProvPyConverter.IN_PROCESS] = True
+    self.provpy.configure(self.config)
+    (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
+    with open(self.in_file, "w") as f:
+      f.write('{"prefix": {"ex": "http://example.org/"}, ' +
+              '"entity": {"ex:e1": {}}}')
+    for format in [standards.PROVN, standards.JSON]:
+      self.out_files[format] = "convert_many_in_process." + format
+    self.provpy.convert_many(self.in_file, self.out_files)
+    with open(self.out_files[standards.PROVN], "r") as f:
+      self.assertIn("entity(ex:e1)", f.read())
+    self.assertTrue(os.path.isfile(self.out_files[standards.JSON]))
+
+  @unittest.skipUnless(HAS_PROV, "prov package not available")
+  def test_convert_many_in_process_invalid_document(self):
+    self.config[ProvPyConverter.IN_PROCESS] = True
+    self.provpy.configure(self.config)
+    (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
+    with open(self.in_file, "w") as f:
+      f.write("not a document")
+    self.out_files[standards.PROVN] = "convert_many_invalid." + standards.PROVN
+    with self.assertRaises(ConversionError):
+      self.provpy.convert_many(self.in_file, self.out_files)
+
+  @unittest.skipUnless(HAS_PROV, "prov package not available")
+  def test_convert_many_in_process_invalid_output_format(self):
+    self.config[ProvPyConverter.IN_PROCESS] = True
+    self.provpy.configure(self.config)
+    (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
+    self.out_files[standards.TTL] = "convert_many_invalid." + standards.TTL
+    with self.assertRaises(ConversionError):
+      self.provpy.convert_many(self.in_file, self.out_files)
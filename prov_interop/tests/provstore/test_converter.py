@@ -76,6 +76,16 @@ class ProvStoreConverterTestCase(unittest.TestCase):
     self.assertEqual(self.config[ProvStoreConverter.OUTPUT_FORMATS],
                      self.provstore.output_formats)
 
+  def test_fingerprint_authorization(self):
+    self.provstore.configure(dict(self.config))
+    fingerprint = self.provstore.fingerprint()
+    self.config[ProvStoreConverter.AUTHORIZATION] = "ApiKey user:67890"
+    self.provstore.configure(dict(self.config))
+    self.assertEqual(fingerprint, self.provstore.fingerprint())
+    self.config[ProvStoreConverter.URL] = "https://other"
+    self.provstore.configure(dict(self.config))
+    self.assertNotEqual(fingerprint, self.provstore.fingerprint())
+
   def test_configure_no_authorization(self):
     del(self.config[ProvStoreConverter.AUTHORIZATION])
     with self.assertRaises(ConfigError):
@@ -23,11 +23,13 @@ no output files are created.
 
 This script behaves similarly (though it does no PROV validation). 
 
-If the inputs are valid it just copies the input file to the output file. 
+If the inputs are valid it just copies the input file to the output
+file. ``-outfile`` may be repeated, in which case the input file is
+copied to each output file.
 
 Usage::
 
-    usage: provconvert_dummy.py -infile infile -outfile outfile
+    usage: provconvert_dummy.py -infile infile -outfile outfile [-outfile outfile ...]
 
     Dummy ProvToolbox provconvert.
 
@@ -100,8 +102,9 @@ if __name__ == "__main__":
                       required=True)
   parser.add_argument('-outfile', metavar="file", 
                       help="Output file",
-                      nargs='?', 
+                      action='append',
                       required=True)
   args = parser.parse_args()
-  convert(args.infile, args.outfile)
+  for outfile in args.outfile:
+    convert(args.infile, outfile)
   sys.exit(0)
@@ -87,6 +87,23 @@ class ProvToolboxComparatorTestCase(unittest.TestCase):
         with self.assertRaises(ConfigError):
             self.comparator.configure(self.config)
 
+    def test_configure_batch(self):
+        self.config[ProvToolboxComparator.BATCH_EXECUTABLE] = "provcompare-many"
+        self.config[ProvToolboxComparator.BATCH_ARGUMENTS] = " ".join(
+            [ProvToolboxComparator.MANIFEST, ProvToolboxComparator.RESULTS]
+        )
+        self.comparator.configure(self.config)
+        self.assertEqual(["provcompare-many"],
+                         self.comparator.batch_executable)
+        self.assertTrue(self.comparator.supports_compare_many)
+
+    def test_configure_batch_no_manifest(self):
+        self.config[ProvToolboxComparator.BATCH_EXECUTABLE] = "provcompare-many"
+        self.config[ProvToolboxComparator.BATCH_ARGUMENTS] = \
+            ProvToolboxComparator.RESULTS
+        with self.assertRaises(ConfigError):
+            self.comparator.configure(self.config)
+
     def test_compare(self):
         self.comparator.configure(self.config)
         _, self.file1 = tempfile.mkstemp(suffix="." + standards.JSON)
@@ -59,10 +59,11 @@ class ProvToolboxConverterTestCase(unittest.TestCase):
        "-outfile", ProvToolboxConverter.OUTPUT])
     self.config[ProvToolboxConverter.INPUT_FORMATS] = standards.FORMATS
     self.config[ProvToolboxConverter.OUTPUT_FORMATS] = standards.FORMATS
+    self.out_files = {}
 
   def tearDown(self):
     super(ProvToolboxConverterTestCase, self).tearDown()
-    for tmp in [self.in_file, self.out_file]:
+    for tmp in [self.in_file, self.out_file] + list(self.out_files.values()):
       if tmp != None and os.path.isfile(tmp):
         os.remove(tmp)
 
@@ -82,6 +83,14 @@ class ProvToolboxConverterTestCase(unittest.TestCase):
                      self.provtoolbox.input_formats)
     self.assertEqual(self.config[ProvToolboxConverter.OUTPUT_FORMATS], 
                      self.provtoolbox.output_formats)
+    self.assertFalse(self.provtoolbox.multiple_outputs)
+    self.assertFalse(self.provtoolbox.supports_convert_many)
+
+  def test_configure_multiple_outputs(self):
+    self.config[ProvToolboxConverter.MULTIPLE_OUTPUTS] = True
+    self.provtoolbox.configure(self.config)
+    self.assertTrue(self.provtoolbox.multiple_outputs)
+    self.assertTrue(self.provtoolbox.supports_convert_many)
 
   def test_configure_no_input(self):
     self.config[ProvToolboxConverter.ARGUMENTS] = \
@@ -95,6 +104,12 @@ class ProvToolboxConverterTestCase(unittest.TestCase):
     with self.assertRaises(ConfigError):
       self.provtoolbox.configure(self.config)
 
+  def test_command_line(self):
+    self.provtoolbox.configure(self.config)
+    command_line = self.provtoolbox.command_line("in.json", "out.provx")
+    self.assertEqual(["-infile", "in.json", "-outfile", "out.provx"], 
+                     command_line[-4:])
+
   def test_convert(self):
     self.provtoolbox.configure(self.config)
     (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
@@ -129,3 +144,29 @@ class ProvToolboxConverterTestCase(unittest.TestCase):
     self.out_file = "convert_invalid_input_format.nosuchformat"
     with self.assertRaises(ConversionError):
       self.provtoolbox.convert(self.in_file, self.out_file)
+
+  def convert_many(self):
+    (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
+    for format in [standards.PROVX, standards.PROVN, standards.TTL]:
+      self.out_files[format] = "convert_many." + format
+    self.provtoolbox.convert_many(self.in_file, self.out_files)
+    for out_file in self.out_files.values():
+      self.assertTrue(os.path.isfile(out_file))
+
+  def test_convert_many(self):
+    self.provtoolbox.configure(self.config)
+    self.convert_many()
+
+  def test_convert_many_multiple_outputs(self):
+    self.config[ProvToolboxConverter.MULTIPLE_OUTPUTS] = True
+    self.provtoolbox.configure(self.config)
+    self.convert_many()
+
+  def test_convert_many_multiple_outputs_invalid_output_format(self):
+    self.config[ProvToolboxConverter.MULTIPLE_OUTPUTS] = True
+    self.provtoolbox.configure(self.config)
+    (_, self.in_file) = tempfile.mkstemp(suffix="." + standards.JSON)
+    self.out_files[standards.PROVX] = "convert_many." + standards.PROVX
+    self.out_files["nosuchformat"] = "convert_many.nosuchformat"
+    with self.assertRaises(ConversionError):
+      self.provtoolbox.convert_many(self.in_file, self.out_files)
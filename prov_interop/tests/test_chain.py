@@ -0,0 +1,259 @@
+"""Unit tests for :mod:`prov_interop.chain`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop import chain
+from prov_interop import standards
+from prov_interop.chain import ChainTree
+from prov_interop.comparator import Comparator
+from prov_interop.comparator import ComparisonError
+from prov_interop.component import ConfigError
+from prov_interop.converter import ConversionError
+from prov_interop.converter import Converter
+
+class CountingConverter(Converter):
+  """Converter that copies its input file to its output file and
+  records each conversion.
+  """
+
+  def __init__(self, fail=False):
+    """Create converter.
+
+    :param fail: If ``True`` then conversions raise an error
+    :type fail: bool
+    """
+    super(CountingConverter, self).__init__()
+    self.fail = fail
+    self.conversions = []
+
+  def convert(self, in_file, out_file):
+    """Copy `in_file` to `out_file` and record the conversion.
+
+    :param in_file: Input file name
+    :type in_file: str or unicode
+    :param out_file: Output file name
+    :type out_file: str or unicode
+    :raises ConversionError: if the converter is configured to fail
+    """
+    self.conversions.append((in_file, out_file))
+    if self.fail:
+      raise ConversionError("Conversion failed")
+    shutil.copyfile(in_file, out_file)
+
+
+class ContentComparator(Comparator):
+  """Comparator that compares file contents.
+  """
+
+  def compare(self, file1, file2):
+    """Compare file contents.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: ``True`` if the files have the same contents
+    :rtype: bool
+    """
+    with open(file1, "r") as f1:
+      with open(file2, "r") as f2:
+        return f1.read() == f2.read()
+
+
+class FailingComparator(Comparator):
+  """Comparator that always fails.
+  """
+
+  def compare(self, file1, file2):
+    """Fail.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :raises ComparisonError: always
+    """
+    raise ComparisonError("Comparison failed")
+
+
+class ChainTreeTestCase(unittest.TestCase):
+
+  def test_init(self):
+    tree = ChainTree()
+    self.assertEqual(0, tree.nodes())
+    self.assertEqual([], tree.converters)
+    self.assertIsNone(tree.root.step)
+    self.assertEqual([], tree.root.path)
+
+  def test_add_shared_prefix(self):
+    tree = ChainTree()
+    tree.add("ABA", [("A", standards.PROVX), ("B", standards.JSON),
+                     ("A", standards.PROVN)])
+    tree.add("AB", [("A", standards.PROVX), ("B", standards.JSON)])
+    tree.add("AC", [("A", standards.PROVX), ("C", standards.TTL)])
+    self.assertEqual(4, tree.nodes())
+    self.assertEqual(["A", "B", "C"], tree.converters)
+    self.assertEqual(1, len(tree.root.children))
+    node = tree.root.children[0]
+    self.assertEqual(("A", standards.PROVX), node.step)
+    self.assertEqual(2, len(node.children))
+    node = node.children[0]
+    self.assertEqual(["AB"], node.chains)
+    self.assertEqual([("A", standards.PROVX), ("B", standards.JSON)],
+                     node.path)
+    self.assertEqual(["ABA"], node.children[0].chains)
+
+  def test_configure(self):
+    tree = ChainTree()
+    tree.configure({"AB": [{chain.CONVERTER: "A", chain.FORMAT: standards.PROVX},
+                           {chain.CONVERTER: "B", chain.FORMAT: standards.JSON}]})
+    self.assertEqual(2, tree.nodes())
+    self.assertEqual(["A", "B"], tree.converters)
+
+  def test_configure_missing_converter(self):
+    tree = ChainTree()
+    with self.assertRaises(ConfigError):
+      tree.configure({"AB": [{chain.FORMAT: standards.PROVX}]})
+
+  def test_configure_missing_format(self):
+    tree = ChainTree()
+    with self.assertRaises(ConfigError):
+      tree.configure({"AB": [{chain.CONVERTER: "A"}]})
+
+  def test_configure_non_canonical_format(self):
+    tree = ChainTree()
+    with self.assertRaises(ConfigError):
+      tree.configure({"AB": [{chain.CONVERTER: "A", 
+                              chain.FORMAT: "invalidFormat"}]})
+
+
+class RunChainsTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(RunChainsTestCase, self).setUp()
+    self.work_dir = tempfile.mkdtemp()
+    self.files = {}
+    for format in standards.FORMATS:
+      self.files[format] = os.path.join(self.work_dir, "test." + format)
+      with open(self.files[format], "w") as f:
+        f.write("document")
+    self.converters = {}
+    for name in ["A", "B"]:
+      converter = CountingConverter()
+      converter.configure({Converter.INPUT_FORMATS: standards.FORMATS,
+                           Converter.OUTPUT_FORMATS: standards.FORMATS})
+      self.converters[name] = converter
+    comparator = ContentComparator()
+    comparator.configure({Comparator.FORMATS: standards.FORMATS})
+    self.comparators = dict([(format, comparator) 
+                             for format in standards.FORMATS])
+    self.tree = ChainTree()
+    self.tree.add("AB", [("A", standards.PROVX), ("B", standards.JSON)])
+    self.tree.add("ABA", [("A", standards.PROVX), ("B", standards.JSON),
+                          ("A", standards.PROVN)])
+    self.tree.add("AA", [("A", standards.PROVX), ("A", standards.TTL)])
+
+  def tearDown(self):
+    super(RunChainsTestCase, self).tearDown()
+    shutil.rmtree(self.work_dir)
+
+  def run_chains(self):
+    return chain.run_chains(self.tree, self.converters, self.comparators,
+                            self.files[standards.PROVN], self.files,
+                            self.work_dir)
+
+  def test_run_chains(self):
+    results = self.run_chains()
+    self.assertEqual(4, len(results))
+    for result in results:
+      self.assertEqual(chain.PASS, result.status, str(result))
+    # Shared prefix A:provx is converted once.
+    self.assertEqual(3, len(self.converters["A"].conversions))
+    self.assertEqual(1, len(self.converters["B"].conversions))
+    self.assertEqual([[("A", standards.PROVX)],
+                      [("A", standards.PROVX), ("B", standards.JSON)],
+                      [("A", standards.PROVX), ("B", standards.JSON),
+                       ("A", standards.PROVN)],
+                      [("A", standards.PROVX), ("A", standards.TTL)]],
+                     [result.node.path for result in results])
+    # Each step converts the output of the previous step.
+    (_, provx_file) = self.converters["A"].conversions[0]
+    self.assertEqual((provx_file, results[1].out_file),
+                     self.converters["B"].conversions[0])
+
+  def test_run_chains_fail(self):
+    with open(self.files[standards.JSON], "w") as f:
+      f.write("different")
+    results = self.run_chains()
+    self.assertEqual([chain.PASS, chain.FAIL, chain.PASS, chain.PASS],
+                     [result.status for result in results])
+
+  def test_run_chains_not_compared(self):
+    del self.comparators[standards.JSON]
+    del self.files[standards.TTL]
+    results = self.run_chains()
+    self.assertEqual([chain.PASS, chain.NOT_COMPARED, chain.PASS,
+                      chain.NOT_COMPARED],
+                     [result.status for result in results])
+
+  def test_run_chains_error(self):
+    self.converters["B"].fail = True
+    results = self.run_chains()
+    self.assertEqual([chain.PASS, chain.ERROR, chain.PASS],
+                     [result.status for result in results])
+    self.assertEqual(2, len(self.converters["A"].conversions))
+
+  def test_run_chains_comparison_error(self):
+    comparator = FailingComparator()
+    comparator.configure({Comparator.FORMATS: standards.FORMATS})
+    self.comparators[standards.JSON] = comparator
+    results = self.run_chains()
+    self.assertEqual([chain.PASS, chain.ERROR, chain.PASS, chain.PASS],
+                     [result.status for result in results])
+    self.assertIsNotNone(results[1].out_file)
+
+  def test_run_chains_skipped(self):
+    results = chain.run_chains(self.tree, self.converters, self.comparators,
+                               self.files[standards.PROVN], self.files,
+                               self.work_dir, ["B"])
+    self.assertEqual([chain.PASS, chain.SKIPPED, chain.PASS],
+                     [result.status for result in results])
+    self.assertEqual(0, len(self.converters["B"].conversions))
+
+  def test_run_chains_unsupported(self):
+    self.converters["B"].configure(
+      {Converter.INPUT_FORMATS: [standards.PROVN],
+       Converter.OUTPUT_FORMATS: standards.FORMATS})
+    results = self.run_chains()
+    self.assertEqual([chain.PASS, chain.UNSUPPORTED, chain.PASS],
+                     [result.status for result in results])
+    self.assertEqual(0, len(self.converters["B"].conversions))
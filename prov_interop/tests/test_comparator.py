@@ -33,6 +33,39 @@ from prov_interop import standards
 from prov_interop.component import ConfigError
 from prov_interop.comparator import Comparator
 from prov_interop.comparator import ComparisonError
+from prov_interop.comparator import TieredComparator
+
+class FixedComparator(Comparator):
+  """Comparator which returns a fixed verdict from
+  :meth:`prov_interop.comparator.Comparator.verify`.
+  """
+
+  def __init__(self, verdict, tier=0):
+    """Create comparator.
+
+    :param verdict: Verdict
+    :type verdict: bool
+    :param tier: Tier
+    :type tier: int
+    """
+    super(FixedComparator, self).__init__()
+    self.configure({Comparator.FORMATS: [standards.JSON, standards.PROVX],
+                    Comparator.TIER: tier})
+    self.verdict = verdict
+    self.calls = 0
+
+  def verify(self, file1, file2):
+    """Count call and return verdict.
+
+    :param file1: File
+    :type file1: str or unicode
+    :param file2: File
+    :type file2: str or unicode
+    :return: verdict
+    :rtype: bool
+    """
+    self.calls += 1
+    return self.verdict
 
 class ComparatorTestCase(unittest.TestCase):
 
@@ -86,3 +119,94 @@ class ComparatorTestCase(unittest.TestCase):
     self.comparator.configure(self.config)
     with self.assertRaises(ComparisonError):
       self.comparator.check_format("nosuchformat")
+
+  def test_configure_tier(self):
+    self.assertEqual(0, self.comparator.tier)
+    self.config[Comparator.TIER] = 2
+    self.comparator.configure(self.config)
+    self.assertEqual(2, self.comparator.tier)
+
+  def test_configure_tier_error(self):
+    self.config[Comparator.TIER] = "first"
+    with self.assertRaises(ConfigError):
+      self.comparator.configure(self.config)
+
+  def test_verify(self):
+    (_, self.file1) = tempfile.mkstemp(suffix="." + standards.JSON)
+    self.file2 = "nosuchfile." + standards.JSON
+    with self.assertRaises(ComparisonError):
+      self.comparator.verify(self.file1, self.file2)
+
+
+  def test_compare_many(self):
+    (_, self.file1) = tempfile.mkstemp(suffix="." + standards.JSON)
+    (_, self.file2) = tempfile.mkstemp(suffix="." + standards.JSON)
+    self.assertFalse(self.comparator.supports_compare_many)
+    self.assertEqual([None, None], self.comparator.compare_many(
+      [(self.file1, self.file2), (self.file2, self.file1)]))
+
+  def test_compare_many_missing_file(self):
+    (_, self.file1) = tempfile.mkstemp(suffix="." + standards.JSON)
+    self.file2 = "nosuchfile." + standards.JSON
+    self.assertEqual([None, None], self.comparator.compare_many(
+      [(self.file1, self.file1), (self.file1, self.file2)]))
+
+
+class TieredComparatorTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(TieredComparatorTestCase, self).setUp()
+    (_, self.file1) = tempfile.mkstemp(suffix="." + standards.JSON)
+    (_, self.file2) = tempfile.mkstemp(suffix="." + standards.JSON)
+
+  def tearDown(self):
+    super(TieredComparatorTestCase, self).tearDown()
+    for tmp in [self.file1, self.file2]:
+      os.remove(tmp)
+
+  def test_init(self):
+    authoritative = FixedComparator(True, tier=1)
+    cheap = FixedComparator(None)
+    comparator = TieredComparator([authoritative, cheap])
+    self.assertEqual([cheap, authoritative], comparator.comparators)
+    self.assertEqual([standards.JSON, standards.PROVX], comparator.formats)
+    self.assertEqual([0, 0], comparator.decisions)
+
+  def test_compare_decided_by_first_tier(self):
+    cheap = FixedComparator(False)
+    authoritative = FixedComparator(True, tier=1)
+    comparator = TieredComparator([cheap, authoritative])
+    self.assertFalse(comparator.compare(self.file1, self.file2))
+    self.assertEqual(1, cheap.calls)
+    self.assertEqual(0, authoritative.calls)
+    self.assertEqual([1, 0], comparator.decisions)
+
+  def test_compare_unknown(self):
+    cheap = FixedComparator(None)
+    authoritative = FixedComparator(True, tier=1)
+    comparator = TieredComparator([cheap, authoritative])
+    self.assertTrue(comparator.compare(self.file1, self.file2))
+    self.assertEqual(1, cheap.calls)
+    self.assertEqual(1, authoritative.calls)
+    self.assertEqual([0, 1], comparator.decisions)
+
+  def test_compare_undecided(self):
+    comparator = TieredComparator([FixedComparator(None), 
+                                   FixedComparator(None)])
+    self.assertIsNone(comparator.verify(self.file1, self.file2))
+    with self.assertRaises(ComparisonError):
+      comparator.compare(self.file1, self.file2)
+
+  def test_compare_missing_file(self):
+    comparator = TieredComparator([FixedComparator(True)])
+    with self.assertRaises(ComparisonError):
+      comparator.compare(self.file1, "nosuchfile." + standards.JSON)
+
+  def test_fingerprint(self):
+    cheap = FixedComparator(None)
+    authoritative = FixedComparator(True, tier=1)
+    comparator = TieredComparator([cheap, authoritative])
+    self.assertEqual(comparator.fingerprint(), 
+                     TieredComparator([cheap, authoritative]).fingerprint())
+    self.assertNotEqual(comparator.fingerprint(), 
+                        TieredComparator([cheap]).fingerprint())
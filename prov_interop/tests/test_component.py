@@ -25,12 +25,18 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import os
+import sys
+import tempfile
 import unittest
 
+from prov_interop import timing
+from prov_interop import usage
 from prov_interop.component import CommandLineComponent
 from prov_interop.component import ConfigurableComponent
 from prov_interop.component import ConfigError
 from prov_interop.component import RestComponent
+from prov_interop.component import find_executable
 
 class ConfigurableComponentTestCase(unittest.TestCase):
 
@@ -61,6 +67,27 @@ class ConfigurableComponentTestCase(unittest.TestCase):
     with self.assertRaises(ConfigError):
       self.component.check_configuration(["a", "c", "expectfail"])
 
+  def test_fingerprint(self):
+    self.component.configure(self.config)
+    fingerprint = self.component.fingerprint()
+    other = ConfigurableComponent()
+    other.configure(dict(self.config))
+    self.assertEqual(fingerprint, other.fingerprint())
+
+  def test_fingerprint_reconfigure(self):
+    self.component.configure(self.config)
+    fingerprint = self.component.fingerprint()
+    self.component.configure({"a":"b"})
+    self.assertNotEqual(fingerprint, self.component.fingerprint())
+
+  def test_fingerprint_skip_tests(self):
+    self.component.configure(dict(self.config))
+    fingerprint = self.component.fingerprint()
+    config = dict(self.config)
+    config["skip-tests"] = [1, 2]
+    self.component.configure(config)
+    self.assertEqual(fingerprint, self.component.fingerprint())
+
 
 class CommandLineComponentTestCase(unittest.TestCase):
 
@@ -117,6 +144,63 @@ class CommandLineComponentTestCase(unittest.TestCase):
     with self.assertRaises(ConfigError):
       self.command_line.configure({CommandLineComponent.EXECUTABLE: "a"})
 
+  def test_fingerprint_executable_changed(self):
+    (_, script) = tempfile.mkstemp(suffix=".py")
+    try:
+      config = {CommandLineComponent.EXECUTABLE: "python " + script, 
+                CommandLineComponent.ARGUMENTS: "b"}
+      self.command_line.configure(config)
+      fingerprint = self.command_line.fingerprint()
+      self.assertEqual(fingerprint, self.command_line.fingerprint())
+      with open(script, "w") as f:
+        f.write("print('updated')")
+      self.assertNotEqual(fingerprint, self.command_line.fingerprint())
+    finally:
+      os.remove(script)
+
+  def test_run(self):
+    timing.start()
+    try:
+      return_code = self.command_line.run(
+        [sys.executable, "-c", "import sys; sys.exit(3)"])
+    finally:
+      spans = timing.stop()
+    self.assertEqual(3, return_code)
+    self.assertEqual(["spawn", "wait"],
+                     [span[timing.NAME] for span in spans])
+
+  def test_run_usage(self):
+    timing.start()
+    usage.start()
+    try:
+      with timing.span("convert"):
+        return_code = self.command_line.run(
+          [sys.executable, "-c", "import sys; sys.exit(2)"])
+    finally:
+      timing.stop()
+      resources = usage.stop()
+    self.assertEqual(2, return_code)
+    if not hasattr(os, "wait4"):
+      self.assertEqual({}, resources)
+      return
+    self.assertEqual(["convert"], list(resources.keys()))
+    self.assertEqual(1, resources["convert"][usage.PROCESSES])
+    self.assertTrue(resources["convert"][usage.MAX_RSS] > 0)
+
+  def test_run_oserror(self):
+    with self.assertRaises(OSError):
+      self.command_line.run(["/nosuchexecutable"])
+
+  def test_find_executable(self):
+    (_, script) = tempfile.mkstemp(suffix=".py")
+    try:
+      self.assertEqual(os.path.abspath(script), find_executable(script))
+    finally:
+      os.remove(script)
+
+  def test_find_executable_missing(self):
+    self.assertIsNone(find_executable("/nosuchexecutable"))
+
 
 class RestComponentTestCase(unittest.TestCase):
 
@@ -141,3 +225,9 @@ class RestComponentTestCase(unittest.TestCase):
   def test_configure_no_url(self):
     with self.assertRaises(ConfigError):
       self.rest.configure({})
+
+  def test_fingerprint_version(self):
+    self.rest.configure({RestComponent.URL: "a", "version": "1.0"})
+    fingerprint = self.rest.fingerprint()
+    self.rest.configure({RestComponent.URL: "a", "version": "1.1"})
+    self.assertNotEqual(fingerprint, self.rest.fingerprint())
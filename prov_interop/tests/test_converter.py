@@ -50,6 +50,7 @@ class ConverterTestCase(unittest.TestCase):
   def test_init(self):
     self.assertEqual([], self.converter.input_formats)
     self.assertEqual([], self.converter.output_formats)
+    self.assertFalse(self.converter.supports_convert_many)
 
   def test_configure(self):
     self.converter.configure(self.config)
@@ -86,6 +87,13 @@ class ConverterTestCase(unittest.TestCase):
     with self.assertRaises(ConversionError):
       self.converter.convert(self.in_file, self.out_file)
 
+  def test_convert_many_missing_input_file(self):
+    self.in_file = "nosuchfile.json"
+    out_files = {standards.PROVN: "convert_many_missing_input_file." + 
+                 standards.PROVN}
+    with self.assertRaises(ConversionError):
+      self.converter.convert_many(self.in_file, out_files)
+
   def test_check_formats_invalid_input_format(self):
     self.converter.configure(self.config)
     with self.assertRaises(ConversionError):
@@ -104,3 +104,30 @@ class FactoryTestCase(unittest.TestCase):
   def test_get_instance_non_zero_arity_constructor(self):
     with self.assertRaises(TypeError):
       factory.get_instance(str(self.__module__) + ".Value")
+
+  def test_check_class(self):
+    factory.check_class(str(self.__module__) + ".NoSuchClass")
+
+  def test_check_class_no_prefix(self):
+    with self.assertRaises(ValueError):
+      factory.check_class("Counter")
+
+  def test_check_class_no_such_module(self):
+    with self.assertRaises(ImportError):
+      factory.check_class("nosuchmodule.NoSuchClass")
+
+  def test_get_entry_points(self):
+    self.assertEqual({}, factory.get_entry_points("nosuchgroup"))
+
+  def test_get_class_name(self):
+    group = "prov_interop.tests.counters"
+    factory._entry_points[group] = {
+      "Counter": str(self.__module__) + ".Counter"}
+    try:
+      self.assertEqual(str(self.__module__) + ".Counter",
+                       factory.get_class_name("Counter", group))
+      self.assertEqual("mymodule.Counter",
+                       factory.get_class_name("mymodule.Counter", group))
+      self.assertEqual("Value", factory.get_class_name("Value", group))
+    finally:
+      del factory._entry_points[group]
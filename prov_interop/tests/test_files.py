@@ -25,13 +25,19 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import hashlib
+import json
 import os
 import shutil
 import tempfile
 import unittest
 import yaml
 
+from prov_interop.files import hash_file
 from prov_interop.files import load_yaml
+from prov_interop.files import SNAPSHOT_DIR_ENV
+from prov_interop.files import SNAPSHOT_SUFFIX
+from prov_interop.files import STRING_TYPES
 from prov_interop.files import YamlError
 
 class FilesTestCase(unittest.TestCase):
@@ -44,11 +50,27 @@ class FilesTestCase(unittest.TestCase):
       yaml_file.write(yaml.dump(self.config, default_flow_style=False))
     self.env_var = "PROV_LOAD_CONFIG"
     self.default_file = os.path.join(os.getcwd(), "test_component.yaml")
+    self.snapshot_dir = None
+    self.snapshot_env = os.environ.pop(SNAPSHOT_DIR_ENV, None)
 
   def tearDown(self):
     super(FilesTestCase, self).tearDown()
     if self.yaml != None and os.path.isfile(self.yaml):
       os.remove(self.yaml)
+    if self.snapshot_dir is not None:
+      shutil.rmtree(self.snapshot_dir)
+    os.environ.pop(SNAPSHOT_DIR_ENV, None)
+    if self.snapshot_env is not None:
+      os.environ[SNAPSHOT_DIR_ENV] = self.snapshot_env
+
+  def use_snapshots(self):
+    self.snapshot_dir = tempfile.mkdtemp()
+    os.environ[SNAPSHOT_DIR_ENV] = os.path.join(self.snapshot_dir, 
+                                                "snapshots")
+    with open(self.yaml, "rb") as f:
+      return os.path.join(self.snapshot_dir, "snapshots",
+                          hashlib.sha1(f.read()).hexdigest() + 
+                          SNAPSHOT_SUFFIX)
       
   def test_load_yaml_from_file(self):
     config = load_yaml(self.env_var,
@@ -83,3 +105,74 @@ class FilesTestCase(unittest.TestCase):
         config = load_yaml(self.env_var,
                            self.default_file,
                            self.yaml)
+
+  def test_load_yaml_schema(self):
+    config = load_yaml(self.env_var, self.default_file, self.yaml,
+                       {"counter": int, "name": STRING_TYPES})
+    self.assertEqual(12345, config["counter"])
+
+  def test_load_yaml_schema_invalid_type(self):
+    with self.assertRaises(YamlError) as context:
+      load_yaml(self.env_var, self.default_file, self.yaml,
+                {"counter": STRING_TYPES})
+    self.assertIn("counter", str(context.exception))
+
+  def test_load_yaml_snapshot(self):
+    snapshot_file = self.use_snapshots()
+    config = load_yaml(self.env_var, self.default_file, self.yaml)
+    self.assertEqual(self.config, config)
+    self.assertTrue(os.path.isfile(snapshot_file))
+    # Loaded from snapshot rather than parsed.
+    with open(snapshot_file, "w") as f:
+      json.dump({"counter": 54321}, f)
+    config = load_yaml(self.env_var, self.default_file, self.yaml)
+    self.assertEqual(54321, config["counter"])
+
+  def test_load_yaml_snapshot_schema(self):
+    self.use_snapshots()
+    schema = {"counter": int}
+    load_yaml(self.env_var, self.default_file, self.yaml, schema)
+    snapshot_dir = os.environ[SNAPSHOT_DIR_ENV]
+    [snapshot_file] = os.listdir(snapshot_dir)
+    # Snapshot was validated when saved, so is not checked again.
+    with open(os.path.join(snapshot_dir, snapshot_file), "w") as f:
+      json.dump({"counter": "54321"}, f)
+    config = load_yaml(self.env_var, self.default_file, self.yaml, schema)
+    self.assertEqual("54321", config["counter"])
+
+  def test_load_yaml_snapshot_schema_invalid_type(self):
+    self.use_snapshots()
+    load_yaml(self.env_var, self.default_file, self.yaml)
+    # Snapshot saved without a schema is not used with one.
+    with self.assertRaises(YamlError):
+      load_yaml(self.env_var, self.default_file, self.yaml,
+                {"counter": STRING_TYPES})
+    self.assertEqual(1, len(os.listdir(os.environ[SNAPSHOT_DIR_ENV])))
+
+  def test_load_yaml_snapshot_changed_file(self):
+    snapshot_file = self.use_snapshots()
+    load_yaml(self.env_var, self.default_file, self.yaml)
+    with open(self.yaml, "w") as yaml_file:
+      yaml_file.write(yaml.dump({"counter": 1}, default_flow_style=False))
+    config = load_yaml(self.env_var, self.default_file, self.yaml)
+    self.assertEqual(1, config["counter"])
+    self.assertEqual(2, len(os.listdir(os.path.dirname(snapshot_file))))
+
+  def test_load_yaml_snapshot_not_json(self):
+    with open(self.yaml, "w") as yaml_file:
+      yaml_file.write(yaml.dump({"skip-tests": {1: "reason"}}, 
+                                default_flow_style=False))
+    snapshot_file = self.use_snapshots()
+    config = load_yaml(self.env_var, self.default_file, self.yaml)
+    self.assertEqual({1: "reason"}, config["skip-tests"])
+    self.assertFalse(os.path.exists(snapshot_file))
+
+  def test_hash_file(self):
+    with open(self.yaml, "rb") as f:
+      expected = hashlib.sha1(f.read()).hexdigest()
+    self.assertEqual(expected, hash_file(self.yaml))
+    self.assertEqual(expected, hash_file(self.yaml, block_size=3))
+
+  def test_hash_file_missing_file(self):
+    with self.assertRaises(IOError):
+      hash_file("nosuchfile.yaml")
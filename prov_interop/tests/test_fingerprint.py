@@ -0,0 +1,89 @@
+"""Unit tests for :mod:`prov_interop.fingerprint`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import tempfile
+import unittest
+
+from prov_interop import fingerprint
+from prov_interop import standards
+from prov_interop.comparator import Comparator
+from prov_interop.converter import Converter
+from prov_interop.files import hash_file
+
+class FingerprintTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(FingerprintTestCase, self).setUp()
+    (_, self.file1) = tempfile.mkstemp(suffix="." + standards.JSON)
+    (_, self.file2) = tempfile.mkstemp(suffix="." + standards.PROVX)
+    with open(self.file1, "w") as f:
+      f.write("{}")
+    self.converter = Converter()
+    self.converter.configure({Converter.INPUT_FORMATS: [standards.JSON],
+                              Converter.OUTPUT_FORMATS: [standards.PROVX]})
+    self.comparator = Comparator()
+    self.comparator.configure({Comparator.FORMATS: [standards.PROVX]})
+
+  def tearDown(self):
+    super(FingerprintTestCase, self).tearDown()
+    for tmp in [self.file1, self.file2]:
+      if os.path.isfile(tmp):
+        os.remove(tmp)
+
+  def test_file_fingerprint(self):
+    self.assertEqual(hash_file(self.file1), 
+                     fingerprint.file_fingerprint(self.file1))
+
+  def test_file_fingerprint_changed(self):
+    value = fingerprint.file_fingerprint(self.file1)
+    with open(self.file1, "w") as f:
+      f.write("{\"entity\": {}}")
+    self.assertNotEqual(value, fingerprint.file_fingerprint(self.file1))
+
+  def test_file_fingerprint_missing_file(self):
+    with self.assertRaises(OSError):
+      fingerprint.file_fingerprint("nosuchfile.json")
+
+  def test_job_fingerprints(self):
+    fingerprints = fingerprint.job_fingerprints(
+      self.converter, self.comparator, self.file1, self.file2)
+    self.assertEqual(self.converter.fingerprint(), 
+                     fingerprints[fingerprint.CONVERTER])
+    self.assertEqual(self.comparator.fingerprint(), 
+                     fingerprints[fingerprint.COMPARATOR])
+    self.assertEqual(hash_file(self.file1), fingerprints[fingerprint.INPUT])
+    self.assertEqual(hash_file(self.file2), 
+                     fingerprints[fingerprint.EXPECTED])
+
+  def test_job_fingerprints_converter_changed(self):
+    fingerprints = fingerprint.job_fingerprints(
+      self.converter, self.comparator, self.file1, self.file2)
+    self.converter.configure({Converter.INPUT_FORMATS: [standards.JSON],
+                              Converter.OUTPUT_FORMATS: [standards.JSON]})
+    self.assertNotEqual(fingerprints, fingerprint.job_fingerprints(
+      self.converter, self.comparator, self.file1, self.file2))
@@ -30,11 +30,16 @@ import shutil
 import tempfile
 import unittest
 
+from prov_interop import factory
 from prov_interop import standards
 from prov_interop.comparator import Comparator
+from prov_interop.comparator import TieredComparator
 from prov_interop.component import ConfigurableComponent
 from prov_interop.component import ConfigError
 from prov_interop.harness import HarnessResources
+from prov_interop.journal import Journal
+from prov_interop.progress import ProgressLog
+from prov_interop.results import ResultsStore
 
 class DummyComparator(Comparator):
   """Dummy comparator.
@@ -101,6 +106,12 @@ class HarnessResourcesTestCase(unittest.TestCase):
     self.assertEqual("", self.harness.test_cases_dir)
     self.assertEqual({}, self.harness.comparators)
     self.assertEqual({}, self.harness.format_comparators)
+    self.assertIsNone(self.harness.journal)
+    self.assertFalse(self.harness.resume)
+    self.assertFalse(self.harness.incremental)
+    self.assertIsNone(self.harness.baseline)
+    self.assertEqual(0, self.harness.chains.nodes())
+    self.assertIsNone(self.harness.results)
 
   def test_configure(self):
     self.harness.configure(self.config)
@@ -122,6 +133,86 @@ class HarnessResourcesTestCase(unittest.TestCase):
       self.assertIsInstance(format_comparator, DummyComparator)
       self.assertEqual(comparator, format_comparator)
 
+  def test_configure_journal(self):
+    journal_file = os.path.join(self.test_cases_dir, "journal.jsonl")
+    self.config[HarnessResources.JOURNAL] = journal_file
+    self.config[HarnessResources.RESUME] = True
+    self.harness.configure(self.config)
+    self.assertIsInstance(self.harness.journal, Journal)
+    self.assertEqual(journal_file, self.harness.journal.file_name)
+    self.assertTrue(self.harness.resume)
+    self.assertFalse(self.harness.incremental)
+
+  def test_configure_baseline(self):
+    baseline_file = os.path.join(self.test_cases_dir, "baseline.jsonl")
+    self.config[HarnessResources.BASELINE] = baseline_file
+    self.harness.configure(self.config)
+    self.assertIsNone(self.harness.journal)
+    self.assertIsInstance(self.harness.baseline, Journal)
+    self.assertEqual(baseline_file, self.harness.baseline.file_name)
+
+  def test_configure_incremental(self):
+    self.config[HarnessResources.INCREMENTAL] = True
+    self.harness.configure(self.config)
+    self.assertFalse(self.harness.resume)
+    self.assertTrue(self.harness.incremental)
+
+  def test_configure_results(self):
+    results_file = os.path.join(self.test_cases_dir, "results.jsonl")
+    self.config[HarnessResources.RESULTS] = results_file
+    self.harness.configure(self.config)
+    self.assertIsInstance(self.harness.results, ResultsStore)
+    self.assertEqual(results_file, self.harness.results.file_name)
+
+  def test_configure_run_id(self):
+    self.config[HarnessResources.RESULTS] = os.path.join(
+      self.test_cases_dir, "results.jsonl")
+    self.config[HarnessResources.RUN_ID] = "run1"
+    self.harness.configure(self.config)
+    self.assertEqual("run1", self.harness.results.run_id)
+
+  def test_configure_trace(self):
+    trace_dir = os.path.join(self.test_cases_dir, "trace")
+    self.config[HarnessResources.TRACE] = trace_dir
+    self.harness.configure(self.config)
+    self.assertEqual(trace_dir, self.harness.trace)
+
+  def test_configure_progress(self):
+    progress_dir = os.path.join(self.test_cases_dir, "progress")
+    self.config[HarnessResources.PROGRESS] = progress_dir
+    self.harness.configure(self.config)
+    self.assertIsInstance(self.harness.progress, ProgressLog)
+    self.assertEqual(progress_dir, self.harness.progress.directory)
+
+  def test_configure_log(self):
+    log_dir = os.path.join(self.test_cases_dir, "log")
+    self.config[HarnessResources.LOG] = log_dir
+    self.config[HarnessResources.LOG_LEVEL] = "debug"
+    self.harness.configure(self.config)
+    self.assertEqual(log_dir, self.harness.log)
+    self.assertEqual("DEBUG", self.harness.log_level)
+
+  def test_configure_log_level_error(self):
+    self.config[HarnessResources.LOG_LEVEL] = "LOUD"
+    with self.assertRaises(ConfigError):
+      self.harness.configure(self.config)
+
+  def test_configure_chains(self):
+    self.config[HarnessResources.CHAINS] = {
+      "AB": [{"converter": "A", "format": standards.PROVX},
+             {"converter": "B", "format": standards.JSON}],
+      "AC": [{"converter": "A", "format": standards.PROVX},
+             {"converter": "C", "format": standards.PROVN}]}
+    self.harness.configure(self.config)
+    self.assertEqual(3, self.harness.chains.nodes())
+    self.assertEqual(["A", "B", "C"], self.harness.chains.converters)
+
+  def test_configure_chains_error(self):
+    self.config[HarnessResources.CHAINS] = {
+      "AB": [{"converter": "A", "format": "invalidFormat"}]}
+    with self.assertRaises(ConfigError):
+      self.harness.configure(self.config)
+
   def test_configure_no_test_cases(self):
     del self.config[HarnessResources.TEST_CASES_DIR]
     with self.assertRaises(ConfigError):
@@ -143,6 +234,58 @@ class HarnessResourcesTestCase(unittest.TestCase):
     with self.assertRaises(ImportError):
       self.harness.configure(self.config)
 
+  def test_register_comparators_lazy(self):
+    self.harness.configure(self.config)
+    self.assertIn(standards.JSON, self.harness.format_comparators)
+    self.assertFalse(self.harness.comparators.is_loaded(
+      DummyComparator.__name__))
+    comparator = self.harness.format_comparators[standards.PROVX]
+    self.assertTrue(self.harness.comparators.is_loaded(
+      DummyComparator.__name__))
+    self.assertIs(comparator, 
+                  self.harness.comparators[DummyComparator.__name__])
+    self.assertIs(comparator, 
+                  self.harness.format_comparators[standards.JSON])
+
+  def test_register_comparator_entry_point(self):
+    factory._entry_points[factory.COMPARATORS_GROUP] = {
+      "Dummy": DummyComparator.__module__ + "." + DummyComparator.__name__}
+    self.comparators[DummyComparator.__name__][
+      HarnessResources.CLASS] = "Dummy"
+    try:
+      self.harness.configure(self.config)
+    finally:
+      del factory._entry_points[factory.COMPARATORS_GROUP]
+    self.assertIsInstance(self.harness.format_comparators[standards.JSON],
+                          DummyComparator)
+
+  def test_register_comparators_tiered(self):
+    self.comparators["Cheap"] = {
+      HarnessResources.CLASS: self.comparators[DummyComparator.__name__][
+        HarnessResources.CLASS],
+      Comparator.FORMATS: [standards.JSON],
+      Comparator.TIER: 0}
+    self.comparators[DummyComparator.__name__][Comparator.TIER] = 1
+    self.harness.configure(self.config)
+    self.assertIs(self.harness.comparators[DummyComparator.__name__],
+                  self.harness.format_comparators[standards.PROVX])
+    comparator = self.harness.format_comparators[standards.JSON]
+    self.assertIsInstance(comparator, TieredComparator)
+    self.assertEqual([self.harness.comparators["Cheap"],
+                      self.harness.comparators[DummyComparator.__name__]],
+                     comparator.comparators)
+
+  def test_register_comparator_tier_error(self):
+    self.comparators[DummyComparator.__name__][Comparator.TIER] = "high"
+    with self.assertRaises(ConfigError):
+      self.harness.configure(self.config)
+
+  def test_register_comparator_format_error(self):
+    self.comparators[DummyComparator.__name__][Comparator.FORMATS] = \
+        ["invalidFormat"]
+    with self.assertRaises(ConfigError):
+      self.harness.configure(self.config)
+
   def test_register_comparator_config_error(self):
     del self.comparators[DummyComparator.__name__][Comparator.FORMATS]
     with self.assertRaises(ConfigError):
@@ -239,6 +382,35 @@ class HarnessResourcesTestCase(unittest.TestCase):
     self.assertEqual((len(standards.FORMATS) ** 2) * 3, len(test_cases))
     self.check_cases(3, standards.FORMATS, test_cases)
 
+  def test_test_case_files_generator(self):
+    self.harness.configure(self.config)
+    self.create_cases(2, standards.FORMATS)
+    test_cases = list(self.harness.test_case_files_generator())
+    self.assertEqual(2, len(test_cases))
+    for (index, files) in test_cases:
+      test_case_dir = os.path.join(self.test_cases_dir,
+                                   HarnessResources.TEST_CASE_PREFIX + index)
+      # Files for all formats, not just those with comparators.
+      self.assertEqual(sorted(standards.FORMATS),
+                       sorted([format for (format, _) in files]))
+      for (format, file_name) in files:
+        self.assertEqual(os.path.join(test_case_dir, "file." + format),
+                         file_name)
+
+  def test_test_cases(self):
+    self.harness.configure(self.config)
+    self.create_cases(2, standards.FORMATS)
+    test_cases = self.harness.test_cases()
+    self.assertEqual(list(self.harness.test_cases_generator()), test_cases)
+    # Cached, so new test cases are not seen.
+    os.mkdir(os.path.join(self.test_cases_dir,
+                          HarnessResources.TEST_CASE_PREFIX + "3"))
+    self.assertIs(test_cases, self.harness.test_cases())
+    self.assertEqual(2, len(self.harness.test_case_files()))
+    # Reconfiguring discards the cache.
+    self.harness.configure(self.config)
+    self.assertEqual(3, len(self.harness.test_case_files()))
+
   def register_test_cases_single_format(self):
     self.harness.configure(self.config)
     self.create_cases(3, [standards.JSON])
@@ -0,0 +1,156 @@
+"""Unit tests for :mod:`prov_interop.journal`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import os
+import tempfile
+import unittest
+
+from prov_interop import fingerprint
+from prov_interop import standards
+from prov_interop.journal import Journal
+
+class JournalTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(JournalTestCase, self).setUp()
+    (_, self.journal_file) = tempfile.mkstemp(suffix=".jsonl")
+    os.remove(self.journal_file)
+
+  def tearDown(self):
+    super(JournalTestCase, self).tearDown()
+    if os.path.isfile(self.journal_file):
+      os.remove(self.journal_file)
+
+  def test_init(self):
+    journal = Journal(self.journal_file)
+    self.assertEqual(self.journal_file, journal.file_name)
+    self.assertEqual({}, journal.entries)
+    self.assertFalse(os.path.isfile(self.journal_file))
+
+  def test_get_missing(self):
+    journal = Journal(self.journal_file)
+    self.assertIsNone(journal.get("Converter", "case1", 
+                                  standards.JSON, standards.PROVX))
+
+  def test_record(self):
+    journal = Journal(self.journal_file)
+    entry = journal.record("Converter", "case1", 
+                           standards.JSON, standards.PROVX,
+                           Journal.PASS, "1234")
+    self.assertEqual(entry, journal.get("Converter", "case1", 
+                                        standards.JSON, standards.PROVX))
+    self.assertEqual(Journal.PASS, entry[Journal.VERDICT])
+    self.assertEqual("1234", entry[Journal.OUTPUT_HASH])
+    with open(self.journal_file, "r") as f:
+      lines = f.readlines()
+    self.assertEqual(1, len(lines))
+    self.assertEqual(entry, json.loads(lines[0]))
+
+  def test_record_values(self):
+    journal = Journal(self.journal_file)
+    entry = journal.record("Converter", 1, standards.JSON, standards.PROVX,
+                           Journal.PASS, "1234", extra="value")
+    self.assertEqual("value", entry["extra"])
+    self.assertEqual("1", entry[Journal.INDEX])
+
+  def test_load(self):
+    journal = Journal(self.journal_file)
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.PASS, "1234")
+    journal.record("Converter", "case1", standards.JSON, standards.JSON,
+                   Journal.FAIL, "5678")
+    journal = Journal(self.journal_file)
+    self.assertEqual(2, len(journal.entries))
+    entry = journal.get("Converter", "case1", standards.JSON, standards.JSON)
+    self.assertEqual(Journal.FAIL, entry[Journal.VERDICT])
+
+  def test_load_latest_entry_wins(self):
+    journal = Journal(self.journal_file)
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.FAIL, "1234")
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.PASS, "5678")
+    journal = Journal(self.journal_file)
+    self.assertEqual(1, len(journal.entries))
+    entry = journal.get("Converter", "case1", standards.JSON, standards.PROVX)
+    self.assertEqual(Journal.PASS, entry[Journal.VERDICT])
+
+  def test_load_truncated_entry(self):
+    journal = Journal(self.journal_file)
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.PASS, "1234")
+    with open(self.journal_file, "a") as f:
+      f.write("{\"converter\": \"Conv")
+    journal = Journal(self.journal_file)
+    self.assertEqual(1, len(journal.entries))
+
+  def test_matches_baseline(self):
+    journal = Journal(self.journal_file)
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.PASS, "1234")
+    self.assertTrue(journal.matches_baseline(
+      "Converter", "case1", standards.JSON, standards.PROVX, "1234"))
+
+  def test_matches_baseline_missing(self):
+    journal = Journal(self.journal_file)
+    self.assertFalse(journal.matches_baseline(
+      "Converter", "case1", standards.JSON, standards.PROVX, "1234"))
+
+  def test_matches_baseline_different_hash(self):
+    journal = Journal(self.journal_file)
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.PASS, "1234")
+    self.assertFalse(journal.matches_baseline(
+      "Converter", "case1", standards.JSON, standards.PROVX, "5678"))
+
+  def test_matches_baseline_fail(self):
+    journal = Journal(self.journal_file)
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.FAIL, "1234")
+    self.assertFalse(journal.matches_baseline(
+      "Converter", "case1", standards.JSON, standards.PROVX, "1234"))
+
+  def test_matches_baseline_fingerprints(self):
+    fingerprints = {fingerprint.CONVERTER: "a",
+                    fingerprint.COMPARATOR: "b",
+                    fingerprint.INPUT: "c",
+                    fingerprint.EXPECTED: "d"}
+    journal = Journal(self.journal_file)
+    journal.record("Converter", "case1", standards.JSON, standards.PROVX,
+                   Journal.PASS, "1234", fingerprints=fingerprints)
+    # Converter and input changes do not matter if the output is the same
+    current = dict(fingerprints)
+    current[fingerprint.CONVERTER] = "e"
+    current[fingerprint.INPUT] = "f"
+    self.assertTrue(journal.matches_baseline(
+      "Converter", "case1", standards.JSON, standards.PROVX, "1234",
+      current))
+    current[fingerprint.EXPECTED] = "g"
+    self.assertFalse(journal.matches_baseline(
+      "Converter", "case1", standards.JSON, standards.PROVX, "1234",
+      current))
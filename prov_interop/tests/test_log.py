@@ -0,0 +1,117 @@
+"""Unit tests for :mod:`prov_interop.log`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop import log
+
+class JsonLinesHandlerTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(JsonLinesHandlerTestCase, self).setUp()
+    self.log_dir = os.path.join(tempfile.mkdtemp(), "log")
+    self.logger = logging.getLogger(log.LOGGER_NAME + ".tests")
+
+  def tearDown(self):
+    super(JsonLinesHandlerTestCase, self).tearDown()
+    log.configure()
+    shutil.rmtree(os.path.dirname(self.log_dir))
+
+  def log_file(self):
+    return os.path.join(self.log_dir, log.FILE_PREFIX + 
+                        str(os.getpid()) + log.FILE_SUFFIX)
+
+  def load_records(self):
+    with open(self.log_file(), "r") as f:
+      return [json.loads(line) for line in f]
+
+  def test_buffered(self):
+    log.configure("INFO", self.log_dir)
+    self.assertTrue(os.path.isdir(self.log_dir))
+    self.logger.info("Test case: %s", "case1")
+    self.assertFalse(os.path.exists(self.log_file()))
+    log.flush()
+    records = self.load_records()
+    self.assertEqual(1, len(records))
+    record = records[0]
+    self.assertEqual("INFO", record["level"])
+    self.assertEqual("Test case: case1", record["message"])
+    self.assertEqual(self.logger.name, record["logger"])
+    self.assertEqual(os.getpid(), record["pid"])
+    self.assertIn("time", record)
+
+  def test_level(self):
+    log.configure("INFO", self.log_dir)
+    self.logger.debug("prov-convert -f json in.provn out.json")
+    self.logger.info("Test case: %s", "case1")
+    log.flush()
+    self.assertEqual(["INFO"], 
+                     [record["level"] for record in self.load_records()])
+
+  def test_warning_flushes(self):
+    log.configure("INFO", self.log_dir)
+    self.logger.info("Test case: %s", "case1")
+    self.logger.warning("Converting to all formats failed")
+    self.assertEqual(["INFO", "WARNING"], 
+                     [record["level"] for record in self.load_records()])
+
+  def test_capacity_flushes(self):
+    handler = log.JsonLinesHandler(self.log_dir, capacity=2)
+    self.logger.addHandler(handler)
+    self.logger.setLevel(logging.INFO)
+    try:
+      self.logger.info("one")
+      self.assertFalse(os.path.exists(self.log_file()))
+      self.logger.info("two")
+      self.assertEqual(2, len(self.load_records()))
+      self.logger.info("three")
+      self.assertEqual(2, len(self.load_records()))
+    finally:
+      self.logger.removeHandler(handler)
+      self.logger.setLevel(logging.NOTSET)
+      handler.close()
+    self.assertEqual(3, len(self.load_records()))
+
+  def test_reconfigure_closes(self):
+    log.configure("INFO", self.log_dir)
+    self.logger.info("Test case: %s", "case1")
+    log.configure()
+    self.assertEqual(1, len(self.load_records()))
+    handlers = logging.getLogger(log.LOGGER_NAME).handlers
+    self.assertEqual(1, len(handlers))
+    self.assertIsInstance(handlers[0], logging.StreamHandler)
+
+  def test_configure_invalid_level(self):
+    with self.assertRaises(ValueError):
+      log.configure("LOUD", self.log_dir)
@@ -0,0 +1,135 @@
+"""Unit tests for :mod:`prov_interop.progress`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop import progress
+from prov_interop.progress import ProgressLog
+from prov_interop.progress import ProgressMonitor
+
+class ProgressTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(ProgressTestCase, self).setUp()
+    self.work_dir = tempfile.mkdtemp()
+    self.progress_dir = os.path.join(self.work_dir, "progress")
+
+  def tearDown(self):
+    super(ProgressTestCase, self).tearDown()
+    shutil.rmtree(self.work_dir)
+
+  def write_events(self, worker, events):
+    file_name = os.path.join(self.progress_dir, progress.FILE_PREFIX + 
+                             worker + progress.FILE_SUFFIX)
+    with open(file_name, "a") as f:
+      for event in events:
+        f.write(json.dumps(event) + "\n")
+
+  def test_job_name(self):
+    self.assertEqual("ProvPyConverter case1 json->provx",
+                     progress.job_name("ProvPyConverter", "case1",
+                                       "json", "provx"))
+
+  def test_log(self):
+    log = ProgressLog(self.progress_dir)
+    self.assertEqual(self.progress_dir, log.directory)
+    log.total(4)
+    log.start("A case1 json->provx")
+    log.end("pass")
+    log.end("pass")
+    file_name = os.path.join(self.progress_dir, progress.FILE_PREFIX + 
+                             str(os.getpid()) + progress.FILE_SUFFIX)
+    with open(file_name, "r") as f:
+      events = [json.loads(line) for line in f]
+    self.assertEqual([progress.TOTAL, progress.START, progress.END],
+                     [event[progress.EVENT] for event in events])
+    self.assertEqual(4, events[0][progress.JOBS])
+    self.assertEqual("A case1 json->provx", events[2][progress.JOB])
+    self.assertEqual("pass", events[2][progress.VERDICT])
+    for event in events:
+      self.assertIn(progress.TIME, event)
+
+  def test_monitor_missing_directory(self):
+    monitor = ProgressMonitor(self.progress_dir)
+    self.assertEqual(0, monitor.update())
+    status = monitor.status(now=100)
+    self.assertEqual(0, status["total"])
+    self.assertIsNone(status["eta"])
+
+  def test_monitor(self):
+    os.makedirs(self.progress_dir)
+    self.write_events("1", [
+      {"event": "total", "jobs": 5, "time": 99},
+      {"event": "start", "job": "A case1 json->provx", "time": 100},
+      {"event": "end", "job": "A case1 json->provx", "verdict": "pass", 
+       "time": 102},
+      {"event": "start", "job": "A case2 json->provx", "time": 102}])
+    self.write_events("2", [
+      {"event": "total", "jobs": 5, "time": 99},
+      {"event": "start", "job": "B case1 json->provx", "time": 101},
+      {"event": "end", "job": "B case1 json->provx", "verdict": "skip", 
+       "time": 101},
+      {"event": "start", "job": "B case2 json->provx", "time": 103}])
+    with open(os.path.join(self.progress_dir, "progress.2.jsonl"), "a") as f:
+      f.write('{"event": "end", "job": "B cas')
+    monitor = ProgressMonitor(self.progress_dir)
+    self.assertEqual(8, monitor.update())
+    status = monitor.status(now=110, slowest=1)
+    self.assertEqual(10, status["total"])
+    self.assertEqual(2, status["completed"])
+    self.assertEqual(2, status["in_flight"])
+    self.assertEqual({"pass": 1, "skip": 1}, status["verdicts"])
+    self.assertEqual(10, status["elapsed"])
+    self.assertEqual(0.2, status["jobs_per_sec"])
+    self.assertEqual(40, status["eta"])
+    self.assertEqual([{"worker": "1", "job": "A case2 json->provx",
+                       "elapsed": 8}], status["slowest"])
+    self.assertEqual(103, status["updated"])
+    with open(os.path.join(self.progress_dir, "progress.2.jsonl"), "a") as f:
+      f.write('e2 json->provx", "verdict": "fail", "time": 111}\n')
+    self.assertEqual(1, monitor.update())
+    self.assertEqual(0, monitor.update())
+    # Total is at least the number of completed and in-flight jobs
+    status = monitor.status(now=112, total=3)
+    self.assertEqual(4, status["total"])
+    self.assertEqual(1, status["in_flight"])
+    self.assertEqual({"pass": 1, "skip": 1, "fail": 1}, status["verdicts"])
+    text = progress.format_status(status)
+    self.assertTrue(text.startswith("Completed: 3/4"))
+    self.assertIn("A case2 json->provx (worker 1)", text)
+
+  def test_write_status(self):
+    status_file = os.path.join(self.work_dir, "status.json")
+    progress.write_status({"completed": 1}, status_file)
+    progress.write_status({"completed": 2}, status_file)
+    with open(status_file, "r") as f:
+      self.assertEqual({"completed": 2}, json.load(f))
+    self.assertEqual(["status.json"], os.listdir(self.work_dir))
@@ -0,0 +1,87 @@
+"""Unit tests for :mod:`prov_interop.registry`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import unittest
+
+from prov_interop import standards
+from prov_interop.provpy.comparator import ProvPyComparator
+from prov_interop.registry import create_component
+from prov_interop.registry import LazyRegistry
+
+class LazyRegistryTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(LazyRegistryTestCase, self).setUp()
+    self.registry = LazyRegistry()
+    self.loads = []
+
+  def loader(self, value):
+    def load():
+      self.loads.append(value)
+      return value
+    return load
+
+  def test_empty(self):
+    self.assertEqual(0, len(self.registry))
+    self.assertEqual({}, self.registry)
+    self.assertFalse("a" in self.registry)
+    with self.assertRaises(KeyError):
+      self.registry["a"]
+
+  def test_lazy(self):
+    self.registry.register("a", self.loader(1))
+    self.registry.register("b", self.loader(2))
+    self.assertTrue("a" in self.registry)
+    self.assertEqual(["a", "b"], sorted(self.registry))
+    self.assertEqual(2, len(self.registry))
+    self.assertEqual([], self.loads)
+    self.assertFalse(self.registry.is_loaded("a"))
+    self.assertEqual(1, self.registry["a"])
+    self.assertEqual(1, self.registry["a"])
+    self.assertTrue(self.registry.is_loaded("a"))
+    self.assertFalse(self.registry.is_loaded("b"))
+    self.assertEqual([1], self.loads)
+    self.assertEqual({"a": 1, "b": 2}, self.registry)
+    self.assertEqual([1, 2], self.loads)
+
+  def test_register_replaces(self):
+    self.registry.register("a", self.loader(1))
+    self.assertEqual(1, self.registry["a"])
+    self.registry.register("a", self.loader(2))
+    self.assertFalse(self.registry.is_loaded("a"))
+    self.assertEqual(2, self.registry["a"])
+
+  def test_create_component(self):
+    comparator = create_component(
+      "prov_interop.provpy.comparator.ProvPyComparator",
+      {"executable": "prov-compare",
+       "arguments": "-f FORMAT1 -F FORMAT2 FILE1 FILE2",
+       "formats": [standards.JSON]})
+    self.assertIsInstance(comparator, ProvPyComparator)
+    self.assertEqual([standards.JSON], comparator.formats)
@@ -0,0 +1,111 @@
+"""Unit tests for :mod:`prov_interop.regression`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import unittest
+
+from prov_interop import regression
+from prov_interop.results import ResultsStore
+
+def result(run_id, index, convert, max_rss=None, verdict=ResultsStore.PASS,
+           fingerprint="f1", timestamp=0):
+  """Create a result, as recorded by
+  :class:`prov_interop.results.ResultsStore`.
+  """
+  value = {ResultsStore.CONVERTER: "Converter",
+           ResultsStore.INDEX: str(index),
+           ResultsStore.EXT_IN: "json",
+           ResultsStore.EXT_OUT: "provx",
+           ResultsStore.VERDICT: verdict,
+           ResultsStore.TIMESTAMP: timestamp,
+           ResultsStore.RUN: run_id,
+           ResultsStore.FINGERPRINT: fingerprint,
+           ResultsStore.DURATIONS: {"convert": convert}}
+  if max_rss is not None:
+    value[ResultsStore.USAGE] = {"convert": {"max_rss": max_rss}}
+  return value
+
+class RegressionTestCase(unittest.TestCase):
+
+  def test_get_metrics(self):
+    self.assertEqual({regression.LATENCY: 1.0, regression.MEMORY: 100},
+                     regression.get_metrics(result("a", 1, 1.0, 100)))
+    self.assertEqual({regression.LATENCY: 1.0},
+                     regression.get_metrics(result("a", 1, 1.0)))
+    self.assertEqual({}, regression.get_metrics({}))
+
+  def test_get_metrics_convert_many(self):
+    self.assertEqual({}, regression.get_metrics({
+      ResultsStore.DURATIONS: {"convert_many": 1.0},
+      ResultsStore.USAGE: {"convert_many": {regression.MAX_RSS: 100}}}))
+
+  def test_get_runs(self):
+    results = [result("b", 1, 1.0, timestamp=5),
+               result("a", 1, 1.0, timestamp=2),
+               result("b", 2, 1.0, timestamp=1),
+               result(None, 2, 1.0, timestamp=0)]
+    self.assertEqual(["b", "a"], regression.get_runs(results))
+
+  def test_get_jobs(self):
+    results = [result("a", 1, 1.0),
+               result("a", 1, 2.0),
+               result("a", 2, 1.0, verdict=ResultsStore.ERROR),
+               result("b", 3, 1.0)]
+    jobs = regression.get_jobs(results, "a")
+    key = ("Converter", "json", "provx")
+    self.assertEqual([key], list(jobs.keys()))
+    self.assertEqual(["1"], list(jobs[key].keys()))
+    self.assertEqual(2.0, regression.get_metrics(jobs[key]["1"])["latency"])
+
+  def test_compare_runs(self):
+    results = [result("a", 1, 1.0, 100),
+               result("a", 2, 2.0, 100),
+               result("a", 3, 3.0, 100),
+               result("b", 1, 1.5, 110, fingerprint="f2"),
+               result("b", 2, 2.5, 110, fingerprint="f2"),
+               result("b", 4, 9.0, 900, fingerprint="f2")]
+    comparisons = regression.compare_runs(results, "a", "b", 0.3)
+    self.assertEqual([regression.LATENCY, regression.MEMORY],
+                     [comparison["metric"] for comparison in comparisons])
+    latency = comparisons[0]
+    self.assertEqual(2, latency["jobs"])
+    self.assertEqual(1.5, latency["baseline"])
+    self.assertEqual(2.0, latency["candidate"])
+    self.assertAlmostEqual(4 / 3, latency["ratio"])
+    self.assertTrue(latency["regressed"])
+    self.assertEqual(["f1"], latency["baseline_fingerprints"])
+    self.assertEqual(["f2"], latency["candidate_fingerprints"])
+    memory = comparisons[1]
+    self.assertAlmostEqual(1.1, memory["ratio"])
+    self.assertFalse(memory["regressed"])
+    table = regression.format_comparisons(comparisons).split("\n")
+    self.assertEqual(3, len(table))
+    self.assertTrue(table[1].endswith("* REGRESSED"))
+    self.assertTrue(table[2].endswith("*"))
+
+  def test_compare_runs_no_common_jobs(self):
+    results = [result("a", 1, 1.0), result("b", 2, 5.0)]
+    self.assertEqual([], regression.compare_runs(results, "a", "b"))
@@ -0,0 +1,98 @@
+"""Unit tests for :mod:`prov_interop.results`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from prov_interop import standards
+from prov_interop import results as results_module
+from prov_interop.results import ResultsStore
+
+class ResultsStoreTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(ResultsStoreTestCase, self).setUp()
+    (_, self.results_file) = tempfile.mkstemp(suffix=".jsonl")
+    os.remove(self.results_file)
+    self.run_id = os.environ.pop(results_module.RUN_ID_ENV, None)
+
+  def tearDown(self):
+    super(ResultsStoreTestCase, self).tearDown()
+    if os.path.isfile(self.results_file):
+      os.remove(self.results_file)
+    os.environ.pop(results_module.RUN_ID_ENV, None)
+    if self.run_id is not None:
+      os.environ[results_module.RUN_ID_ENV] = self.run_id
+
+  def test_init(self):
+    results = ResultsStore(self.results_file)
+    self.assertEqual(self.results_file, results.file_name)
+    self.assertIsNone(results.run_id)
+    self.assertEqual([], results.load())
+    self.assertFalse(os.path.isfile(self.results_file))
+
+  def test_record(self):
+    results = ResultsStore(self.results_file)
+    result = results.record("Converter", 1, standards.JSON, standards.PROVX,
+                            ResultsStore.PASS, sizes={"input": 10})
+    self.assertEqual("Converter", result[ResultsStore.CONVERTER])
+    self.assertEqual("1", result[ResultsStore.INDEX])
+    self.assertEqual(standards.JSON, result[ResultsStore.EXT_IN])
+    self.assertEqual(standards.PROVX, result[ResultsStore.EXT_OUT])
+    self.assertEqual(ResultsStore.PASS, result[ResultsStore.VERDICT])
+    self.assertEqual(os.getpid(), result[ResultsStore.PID])
+    self.assertIn(ResultsStore.TIMESTAMP, result)
+    self.assertEqual({"input": 10}, result[ResultsStore.SIZES])
+    self.assertNotIn(ResultsStore.RUN, result)
+    with open(self.results_file, "r") as f:
+      lines = f.readlines()
+    self.assertEqual(1, len(lines))
+    self.assertEqual(result, json.loads(lines[0]))
+
+  def test_record_run_id(self):
+    results = ResultsStore(self.results_file, "run1")
+    self.assertEqual("run1", results.run_id)
+    result = results.record("Converter", 1, standards.JSON, standards.PROVX,
+                            ResultsStore.PASS)
+    self.assertEqual("run1", result[ResultsStore.RUN])
+
+  def test_run_id_env(self):
+    os.environ[results_module.RUN_ID_ENV] = "run2"
+    self.assertEqual("run2", ResultsStore(self.results_file).run_id)
+    self.assertEqual("run1", ResultsStore(self.results_file, "run1").run_id)
+
+  def test_load(self):
+    results = ResultsStore(self.results_file)
+    expected = [results.record("Converter", 1, standards.JSON, format, 
+                               ResultsStore.FAIL)
+                for format in [standards.PROVX, standards.PROVN]]
+    with open(self.results_file, "a") as f:
+      f.write('{"converter": "Conv')
+    self.assertEqual(expected, ResultsStore(self.results_file).load())
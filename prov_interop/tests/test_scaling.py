@@ -0,0 +1,115 @@
+"""Unit tests for :mod:`prov_interop.scaling`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import unittest
+
+from prov_interop import scaling
+from prov_interop.regression import LATENCY
+from prov_interop.regression import MEMORY
+from prov_interop.results import ResultsStore
+
+def result(index, size, convert, max_rss=None, converter="Converter",
+           verdict=ResultsStore.PASS, run_id="a"):
+  """Create a result, as recorded by
+  :class:`prov_interop.results.ResultsStore`.
+  """
+  value = {ResultsStore.CONVERTER: converter,
+           ResultsStore.INDEX: index,
+           ResultsStore.EXT_IN: "json",
+           ResultsStore.EXT_OUT: "provx",
+           ResultsStore.VERDICT: verdict,
+           ResultsStore.RUN: run_id,
+           ResultsStore.SIZES: {"input": size},
+           ResultsStore.DURATIONS: {"convert": convert}}
+  if max_rss is not None:
+    value[ResultsStore.USAGE] = {"convert": {"max_rss": max_rss}}
+  return value
+
+class ScalingTestCase(unittest.TestCase):
+
+  def test_get_size(self):
+    value = result("synthetic-1000", 2048, 1.0)
+    self.assertEqual(2048, scaling.get_size(value))
+    self.assertEqual(1000, scaling.get_size(value, scaling.RECORDS))
+    self.assertIsNone(scaling.get_size(result("case1", 10, 1.0),
+                                       scaling.RECORDS))
+    self.assertIsNone(scaling.get_size({}))
+
+  def test_get_points(self):
+    results = [result("case1", 10, 1.0),
+               result("case2", 10, 3.0),
+               result("case3", 100, 2.0, 50),
+               result("case4", 100, 9.0, verdict=ResultsStore.ERROR),
+               result("case5", 0, 9.0),
+               result("case6", 100, 9.0, run_id="b")]
+    points = scaling.get_points(results, run_id="a")
+    key = ("Converter", "json", "provx")
+    self.assertEqual([key], list(points.keys()))
+    self.assertEqual({10: [1.0, 3.0], 100: [2.0]}, points[key][LATENCY])
+    self.assertEqual({100: [50]}, points[key][MEMORY])
+
+  def test_fit_curve(self):
+    sizes = [10, 100, 1000, 10000]
+    (exponent, coefficient, r_squared) = scaling.fit_curve(
+      sizes, [0.002 * size ** 1.5 for size in sizes])
+    self.assertAlmostEqual(1.5, exponent)
+    self.assertAlmostEqual(0.002, coefficient)
+    self.assertAlmostEqual(1.0, r_squared)
+
+  def test_fit_curve_one_size(self):
+    with self.assertRaises(ValueError):
+      scaling.fit_curve([10, 10], [1.0, 2.0])
+
+  def test_budget_size(self):
+    self.assertAlmostEqual(10000, scaling.budget_size(2, 0.5, 5e7))
+    self.assertIsNone(scaling.budget_size(0, 0.5, 10))
+
+  def test_analyse(self):
+    results = []
+    for size in [1000, 10000, 100000]:
+      results.append(result("synthetic-" + str(size), size * 10, 
+                             size * 0.001, size * 0.5, "Linear"))
+      results.append(result("synthetic-" + str(size), size * 10, 
+                             (size ** 2) * 1e-6, converter="Quadratic"))
+    results.append(result("case1", 10, 1.0, converter="Single"))
+    curves = scaling.analyse(results, scaling.RECORDS, 
+                             budgets={LATENCY: 60, MEMORY: None})
+    self.assertEqual([("Linear", LATENCY), ("Linear", MEMORY),
+                      ("Quadratic", LATENCY)],
+                     [(curve["converter"], curve["metric"])
+                      for curve in curves])
+    (linear, memory, quadratic) = curves
+    self.assertEqual([1000, 10000, 100000], linear["sizes"])
+    self.assertAlmostEqual(1.0, linear["exponent"])
+    self.assertFalse(linear["superlinear"])
+    self.assertAlmostEqual(60000, linear["budget_size"])
+    self.assertNotIn("budget", memory)
+    self.assertAlmostEqual(2.0, quadratic["exponent"])
+    self.assertTrue(quadratic["superlinear"])
+    lines = scaling.format_curves(curves).split("\n")
+    self.assertEqual(4, len(lines))
+    self.assertTrue(lines[3].endswith("SUPERLINEAR"))
@@ -0,0 +1,63 @@
+"""Unit tests for :mod:`prov_interop.stats`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+
+import unittest
+
+from prov_interop import stats
+
+class StatsTestCase(unittest.TestCase):
+
+  def test_median_odd(self):
+    self.assertEqual(3, stats.median([5, 1, 3]))
+
+  def test_median_even(self):
+    self.assertEqual(2.5, stats.median([4, 1, 3, 2]))
+
+  def test_median_empty(self):
+    with self.assertRaises(ValueError):
+      stats.median([])
+
+  def test_mad(self):
+    # Median 2, deviations [1, 1, 0, 0, 2, 4, 7] => median 1
+    self.assertEqual(1, stats.mad([1, 1, 2, 2, 4, 6, 9]))
+
+  def test_mad_single(self):
+    self.assertEqual(0, stats.mad([7]))
+
+  def test_percentile(self):
+    values = list(range(1, 101))
+    self.assertEqual(1, stats.percentile(values, 0))
+    self.assertEqual(100, stats.percentile(values, 100))
+    self.assertAlmostEqual(95.05, stats.percentile(values, 95))
+
+  def test_percentile_single(self):
+    self.assertEqual(4, stats.percentile([4], 95))
+
+  def test_percentile_out_of_range(self):
+    with self.assertRaises(ValueError):
+      stats.percentile([1, 2], 101)
@@ -0,0 +1,109 @@
+"""Unit tests for :mod:`prov_interop.timing`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+
+import unittest
+
+from prov_interop import timing
+
+class TimingTestCase(unittest.TestCase):
+
+  def tearDown(self):
+    super(TimingTestCase, self).tearDown()
+    timing.stop()
+
+  def test_stop_not_started(self):
+    self.assertFalse(timing.is_timing())
+    self.assertEqual([], timing.stop())
+
+  def test_span_not_started(self):
+    with timing.span("convert"):
+      pass
+    self.assertEqual([], timing.stop())
+
+  def test_span(self):
+    timing.start()
+    self.assertTrue(timing.is_timing())
+    with timing.span("convert"):
+      pass
+    spans = timing.stop()
+    self.assertFalse(timing.is_timing())
+    self.assertEqual(1, len(spans))
+    self.assertEqual("convert", spans[0][timing.NAME])
+    self.assertTrue(spans[0][timing.START] >= 0)
+    self.assertTrue(spans[0][timing.DURATION] >= 0)
+
+  def test_nested_spans(self):
+    timing.start()
+    with timing.span("convert"):
+      with timing.span("spawn"):
+        pass
+      with timing.span("wait"):
+        pass
+    with timing.span("compare"):
+      pass
+    spans = timing.stop()
+    self.assertEqual(["convert.spawn", "convert.wait", "convert", "compare"],
+                     [span[timing.NAME] for span in spans])
+    (spawn, wait, convert, _) = spans
+    self.assertTrue(convert[timing.START] <= spawn[timing.START])
+    self.assertTrue(spawn[timing.START] <= wait[timing.START])
+    self.assertTrue(convert[timing.DURATION] >= 
+                    spawn[timing.DURATION] + wait[timing.DURATION])
+
+  def test_current(self):
+    self.assertIsNone(timing.current())
+    timing.start()
+    self.assertIsNone(timing.current())
+    with timing.span("convert"):
+      with timing.span("spawn"):
+        self.assertEqual("convert.spawn", timing.current())
+      self.assertEqual("convert", timing.current())
+    self.assertIsNone(timing.current())
+
+  def test_span_exception(self):
+    timing.start()
+    with self.assertRaises(ValueError):
+      with timing.span("convert"):
+        raise ValueError("error")
+    with timing.span("compare"):
+      pass
+    self.assertEqual(["convert", "compare"],
+                     [span[timing.NAME] for span in timing.stop()])
+
+  def test_start_discards(self):
+    timing.start()
+    with timing.span("convert"):
+      pass
+    timing.start()
+    self.assertEqual([], timing.stop())
+
+  def test_durations(self):
+    spans = [{timing.NAME: "post", timing.START: 0, timing.DURATION: 1.5},
+             {timing.NAME: "get", timing.START: 2, timing.DURATION: 1},
+             {timing.NAME: "post", timing.START: 3, timing.DURATION: 0.5}]
+    self.assertEqual({"post": 2.0, "get": 1}, timing.durations(spans))
@@ -0,0 +1,110 @@
+"""Unit tests for :mod:`prov_interop.trace`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from prov_interop import timing
+from prov_interop import trace
+
+class TraceTestCase(unittest.TestCase):
+
+  def setUp(self):
+    super(TraceTestCase, self).setUp()
+    self.trace_dir = os.path.join(tempfile.mkdtemp(), "trace")
+
+  def tearDown(self):
+    super(TraceTestCase, self).tearDown()
+    trace.stop()
+    timing.stop()
+    shutil.rmtree(os.path.dirname(self.trace_dir))
+
+  def load_events(self):
+    trace_file = trace.trace_file(self.trace_dir, os.getpid())
+    with open(trace_file, "r") as f:
+      return [json.loads(line) for line in f]
+
+  def test_not_started(self):
+    self.assertFalse(trace.is_tracing())
+    with trace.span("convert"):
+      pass
+    trace.event("convert", 0, 1)
+    trace.flush()
+    self.assertFalse(os.path.exists(self.trace_dir))
+
+  def test_span(self):
+    trace.start(self.trace_dir)
+    self.assertTrue(trace.is_tracing())
+    with trace.span("job", test="test_case_1"):
+      pass
+    trace.stop()
+    self.assertFalse(trace.is_tracing())
+    events = self.load_events()
+    self.assertEqual(1, len(events))
+    event = events[0]
+    self.assertEqual("job", event["name"])
+    self.assertEqual("X", event["ph"])
+    self.assertEqual(os.getpid(), event["pid"])
+    self.assertEqual(os.getpid(), event["tid"])
+    self.assertEqual({"test": "test_case_1"}, event["args"])
+    self.assertTrue(event["dur"] >= 0)
+
+  def test_timing_span(self):
+    trace.start(self.trace_dir)
+    with timing.span("convert"):
+      with timing.span("post"):
+        pass
+    self.assertFalse(timing.is_timing())
+    trace.stop()
+    self.assertEqual(["post", "convert"],
+                     [event["name"] for event in self.load_events()])
+
+  def test_buffer(self):
+    trace.start(self.trace_dir)
+    for index in range(trace.BUFFER_SIZE - 1):
+      trace.event("convert", index, 1)
+    self.assertEqual([], os.listdir(self.trace_dir))
+    trace.event("convert", trace.BUFFER_SIZE, 1)
+    self.assertEqual(trace.BUFFER_SIZE, len(self.load_events()))
+
+  def test_merge(self):
+    os.makedirs(self.trace_dir)
+    for (pid, start) in [(2, 0.5), (1, 0.25)]:
+      with open(trace.trace_file(self.trace_dir, pid), "w") as f:
+        f.write(json.dumps({"name": "convert", "ph": "X", "ts": start,
+                            "dur": 1, "pid": pid, "tid": pid}) + "\n")
+        f.write('{"name": "conv')
+    with open(os.path.join(self.trace_dir, "other.txt"), "w") as f:
+      f.write("other")
+    merged = trace.merge(self.trace_dir)
+    events = merged["traceEvents"]
+    self.assertEqual(["M", "M", "X", "X"], [event["ph"] for event in events])
+    self.assertEqual([1, 2, 1, 2], [event["pid"] for event in events])
+    self.assertEqual("worker 1", events[0]["args"]["name"])
@@ -0,0 +1,85 @@
+"""Unit tests for :mod:`prov_interop.usage`.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import subprocess
+import sys
+import unittest
+
+from prov_interop import timing
+from prov_interop import usage
+
+class UsageTestCase(unittest.TestCase):
+
+  def tearDown(self):
+    super(UsageTestCase, self).tearDown()
+    usage.stop()
+    timing.stop()
+
+  def test_stop_not_started(self):
+    self.assertEqual({}, usage.stop())
+
+  def test_record_not_started(self):
+    usage.record({usage.UTIME: 1.0})
+    self.assertEqual({}, usage.stop())
+
+  def test_record(self):
+    timing.start()
+    usage.start()
+    with timing.span("convert"):
+      usage.record({usage.UTIME: 1.0, usage.MAX_RSS: 100})
+      usage.record({usage.UTIME: 0.5, usage.MAX_RSS: 50})
+    usage.record({usage.UTIME: 2.0})
+    usage.record(None)
+    self.assertEqual(
+      {"convert": {usage.PROCESSES: 2, usage.UTIME: 1.5, usage.MAX_RSS: 100},
+       "": {usage.PROCESSES: 1, usage.UTIME: 2.0}},
+      usage.stop())
+
+  def test_read_proc_io_missing(self):
+    self.assertEqual({}, usage.read_proc_io(-1))
+
+  def test_wait(self):
+    process = subprocess.Popen(
+      [sys.executable, "-c", "import sys; sys.exit(4)"])
+    (return_code, values) = usage.wait(process)
+    self.assertEqual(4, return_code)
+    self.assertEqual(4, process.returncode)
+    if not hasattr(os, "wait4"):
+      self.assertIsNone(values)
+      return
+    self.assertTrue(values[usage.UTIME] >= 0)
+    self.assertTrue(values[usage.STIME] >= 0)
+    self.assertTrue(values[usage.MAX_RSS] > 0)
+    if os.path.isfile("/proc/self/io") and hasattr(os, "WNOWAIT"):
+      self.assertTrue(values[usage.READ_CHARS] > 0)
+
+  def test_wait_signal(self):
+    process = subprocess.Popen(
+      [sys.executable, "-c", "import os, signal; os.kill(os.getpid(), signal.SIGTERM)"])
+    (return_code, _) = usage.wait(process)
+    self.assertTrue(return_code < 0)
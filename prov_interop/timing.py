@@ -0,0 +1,146 @@
+"""Timing of the steps within interoperability test jobs.
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import contextlib
+from timeit import default_timer
+
+from prov_interop import trace
+
+NAME = "name"
+"""str or unicode: span key for span name"""
+START = "start"
+"""str or unicode: span key for start time, in seconds, relative to
+the start of timing"""
+DURATION = "duration"
+"""str or unicode: span key for duration, in seconds"""
+
+_timing = None
+"""dict: state of the current timing, if any, holding its start time,
+the names of the open spans and the completed spans"""
+
+def start():
+  """Start timing. Any spans completed until :func:`stop` is called
+  are recorded. Any current timing is discarded.
+  """
+  global _timing
+  _timing = {START: default_timer(), NAME: [], "spans": []}
+
+def stop():
+  """Stop timing.
+
+  :return: spans completed since :func:`start` was called, in order
+    of completion, or an empty list if timing was not started
+  :rtype: list of dict
+  """
+  global _timing
+  if _timing is None:
+    return []
+  spans = _timing["spans"]
+  _timing = None
+  return spans
+
+def is_timing():
+  """Check whether timing has been started.
+
+  :return: ``True`` or ``False``
+  :rtype: bool
+  """
+  return _timing is not None
+
+def current():
+  """Get the name of the innermost open span.
+
+  :return: span name, named after the spans that enclose it, or
+    ``None`` if there is no open span or timing was not started
+  :rtype: str or unicode
+  """
+  if _timing is None or not _timing[NAME]:
+    return None
+  return ".".join(_timing[NAME])
+
+@contextlib.contextmanager
+def span(name):
+  """Context manager which times the code it encloses, if timing has
+  been started. Times are from :func:`timeit.default_timer`. This
+  is monotonic on Python 3, but on Python 2 it is
+  :func:`time.time`, so a span is skewed if the system clock is
+  adjusted while it runs. For example::
+
+    with timing.span("convert"):
+      with timing.span("spawn"):
+        process = subprocess.Popen(command_line)
+
+  Spans are named after the spans that enclose them, so the above
+  records spans, in order of completion, of form::
+
+    {"name": "convert.spawn", "start": 0.0012, "duration": 0.0051}
+    {"name": "convert", "start": 0.0011, "duration": 0.0053}
+
+  A span is recorded even if the code it encloses raises an
+  exception.
+
+  If tracing has been started (see :func:`prov_interop.trace.start`)
+  then the span is also recorded as a trace event, whether or not
+  timing has been started.
+
+  :param name: Span name
+  :type name: str or unicode
+  """
+  timing = _timing
+  tracing = trace.is_tracing()
+  if timing is None and not tracing:
+    yield
+    return
+  if timing is not None:
+    timing[NAME].append(name)
+    full_name = ".".join(timing[NAME])
+  span_start = default_timer()
+  try:
+    yield
+  finally:
+    span_end = default_timer()
+    if timing is not None:
+      timing[NAME].pop()
+      timing["spans"].append({NAME: full_name,
+                              START: span_start - timing[START],
+                              DURATION: span_end - span_start})
+    if tracing:
+      trace.event(name, span_start, span_end - span_start)
+
+def durations(spans):
+  """Get the total duration of spans with each name.
+
+  :param spans: Spans
+  :type spans: list of dict
+  :return: total durations, in seconds, keyed by span name
+  :rtype: dict from str or unicode to float
+  """
+  totals = {}
+  for completed in spans:
+    totals[completed[NAME]] = \
+        totals.get(completed[NAME], 0) + completed[DURATION]
+  return totals
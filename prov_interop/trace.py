@@ -0,0 +1,249 @@
+"""Timeline traces of interoperability test runs.
+
+When tracing is started, spans are recorded as Chrome trace events,
+which can be viewed in ``chrome://tracing`` or Perfetto. Each process writes its events to its
+own file, ``trace.<pid>.jsonl``, in a trace directory, one event per
+line::
+
+  {"name": "convert", "ph": "X", "ts": 81526310.5, "dur": 610245.1,
+   "pid": 1234, "tid": 1234}
+
+Times are in microseconds from :func:`timeit.default_timer`, which
+is shared by all processes on a host. The files of all processes are
+merged into a single trace, with one track per process, by
+:func:`merge`.
+
+Usage::
+
+    usage: trace.py [-h] [-o OUTPUT] DIRECTORY
+
+    Merge per-process trace files into a single trace.
+
+    positional arguments:
+      DIRECTORY             Trace directory
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -o OUTPUT, --output OUTPUT
+                            Output file (default standard output)
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import sys
+from timeit import default_timer
+
+TRACE_ENV = "PROV_HARNESS_TRACE"
+"""str or unicode: environment variable holding trace directory"""
+
+FILE_PREFIX = "trace."
+"""str or unicode: prefix of per-process trace files"""
+
+FILE_SUFFIX = ".jsonl"
+"""str or unicode: suffix of per-process trace files"""
+
+BUFFER_SIZE = 100
+"""int: number of events buffered before they are written"""
+
+_trace = None
+"""dict: state of the current trace, if any, holding the trace
+directory, the ID of the process that buffered the events, and the
+buffered events"""
+
+_registered = False
+"""bool: whether :func:`flush` has been registered to run at exit"""
+
+def start(directory):
+  """Start tracing. Events are written to a file in `directory`,
+  which is created if it does not exist. Any current trace is
+  stopped.
+
+  :param directory: Trace directory
+  :type directory: str or unicode
+  """
+  global _trace
+  global _registered
+  stop()
+  if not os.path.isdir(directory):
+    try:
+      os.makedirs(directory)
+    except OSError:
+      if not os.path.isdir(directory):
+        raise
+  _trace = {"directory": directory, "pid": os.getpid(), "events": []}
+  if not _registered:
+    atexit.register(flush)
+    _registered = True
+
+def stop():
+  """Stop tracing. Any buffered events are written.
+  """
+  global _trace
+  flush()
+  _trace = None
+
+def is_tracing():
+  """Check whether tracing has been started.
+
+  :return: ``True`` or ``False``
+  :rtype: bool
+  """
+  return _trace is not None
+
+def trace_file(directory, pid):
+  """Get the name of a process's trace file.
+
+  :param directory: Trace directory
+  :type directory: str or unicode
+  :param pid: Process ID
+  :type pid: int
+  :return: file name
+  :rtype: str or unicode
+  """
+  return os.path.join(directory, FILE_PREFIX + str(pid) + FILE_SUFFIX)
+
+def event(name, start, duration, args=None):
+  """Record a complete event, if tracing has been started. If the
+  process has been forked since the events were buffered, then the
+  buffered events are discarded, as they belong to the parent
+  process.
+
+  :param name: Event name
+  :type name: str or unicode
+  :param start: Start time, in seconds, from
+    :func:`timeit.default_timer`
+  :type start: float
+  :param duration: Duration, in seconds
+  :type duration: float
+  :param args: Additional information shown with the event (optional)
+  :type args: dict
+  """
+  if _trace is None:
+    return
+  pid = os.getpid()
+  if pid != _trace["pid"]:
+    _trace["pid"] = pid
+    _trace["events"] = []
+  trace_event = {"name": name,
+                 "ph": "X",
+                 "ts": start * 1000000,
+                 "dur": duration * 1000000,
+                 "pid": pid,
+                 "tid": pid}
+  if args:
+    trace_event["args"] = args
+  _trace["events"].append(trace_event)
+  if len(_trace["events"]) >= BUFFER_SIZE:
+    flush()
+
+def flush():
+  """Write buffered events to the process's trace file. The events
+  are written using a single ``write`` to a file opened in append
+  mode.
+  """
+  if _trace is None or not _trace["events"] or \
+     _trace["pid"] != os.getpid():
+    return
+  lines = "".join([json.dumps(trace_event, sort_keys=True) + "\n"
+                   for trace_event in _trace["events"]])
+  _trace["events"] = []
+  fd = os.open(trace_file(_trace["directory"], _trace["pid"]),
+               os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+  try:
+    os.write(fd, lines.encode("utf-8"))
+  finally:
+    os.close(fd)
+
+@contextlib.contextmanager
+def span(name, **args):
+  """Context manager which records the code it encloses as an event,
+  if tracing has been started. Unlike
+  :func:`prov_interop.timing.span`, which also records events when
+  tracing, the span is not named after enclosing spans nor recorded
+  in test job results. The event is recorded even if the code it
+  encloses raises an exception.
+
+  :param name: Event name
+  :type name: str or unicode
+  :param args: Additional information shown with the event
+  :type args: dict
+  """
+  if _trace is None:
+    yield
+    return
+  span_start = default_timer()
+  try:
+    yield
+  finally:
+    event(name, span_start, default_timer() - span_start, args)
+
+def merge(directory):
+  """Merge the trace files in a directory into a single trace. Lines
+  that are not valid JSON are ignored. A ``process_name`` metadata
+  event is added for each process, so each has a labelled track.
+
+  :param directory: Trace directory
+  :type directory: str or unicode
+  :return: trace, with events sorted by start time
+  :rtype: dict
+  """
+  events = []
+  for file_name in sorted(os.listdir(directory)):
+    if not (file_name.startswith(FILE_PREFIX) and 
+            file_name.endswith(FILE_SUFFIX)):
+      continue
+    with open(os.path.join(directory, file_name), "r") as f:
+      for line in f:
+        try:
+          events.append(json.loads(line))
+        except ValueError:
+          continue
+  events.sort(key=lambda trace_event: trace_event["ts"])
+  pids = sorted(set([trace_event["pid"] for trace_event in events]))
+  metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": pid,
+               "args": {"name": "worker " + str(pid)}}
+              for pid in pids]
+  return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Merge per-process trace files into a single trace.")
+  parser.add_argument("directory", metavar="DIRECTORY",
+                      help="Trace directory")
+  parser.add_argument("-o", "--output",
+                      help="Output file (default standard output)")
+  args = parser.parse_args()
+  output = json.dumps(merge(args.directory))
+  if args.output is None:
+    print(output)
+  else:
+    with open(args.output, "w") as f:
+      f.write(output + "\n")
+  sys.exit(0)
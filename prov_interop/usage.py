@@ -0,0 +1,177 @@
+"""Resource usage accounting for child processes.
+
+Like :mod:`prov_interop.timing`, usage is only recorded between calls
+to :func:`start` and :func:`stop`. Usage is recorded against the name
+of the :func:`prov_interop.timing.span` enclosing the child process,
+so the usage of converters and comparators can be told apart. For
+example::
+
+  timing.start()
+  usage.start()
+  with timing.span("convert"):
+    converter.convert(in_file, out_file)
+  resources = usage.stop()
+  spans = timing.stop()
+
+gives resource usage of form::
+
+  {"convert": {"processes": 1, "utime": 0.52, "stime": 0.04,
+               "max_rss": 98304, "read_chars": 10342,
+               "write_chars": 20480, "read_bytes": 0,
+               "write_bytes": 20480}}
+
+Usage is only available on platforms with ``os.wait4``. I/O counts
+are only available on platforms with ``/proc/<pid>/io`` (i.e. Linux)
+and ``os.waitid`` (Python 3.3+).
+"""
+# Copyright (c) 2015 University of Southampton
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions: 
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software. 
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.  
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import sys
+
+from prov_interop import timing
+
+PROCESSES = "processes"
+"""str or unicode: usage key for number of child processes"""
+UTIME = "utime"
+"""str or unicode: usage key for user CPU time, in seconds"""
+STIME = "stime"
+"""str or unicode: usage key for system CPU time, in seconds"""
+MAX_RSS = "max_rss"
+"""str or unicode: usage key for peak resident set size, in
+kilobytes"""
+READ_CHARS = "read_chars"
+"""str or unicode: usage key for bytes read, including from caches"""
+WRITE_CHARS = "write_chars"
+"""str or unicode: usage key for bytes written, including to
+caches"""
+READ_BYTES = "read_bytes"
+"""str or unicode: usage key for bytes read from storage"""
+WRITE_BYTES = "write_bytes"
+"""str or unicode: usage key for bytes written to storage"""
+
+PROC_IO = {"rchar": READ_CHARS,
+           "wchar": WRITE_CHARS,
+           "read_bytes": READ_BYTES,
+           "write_bytes": WRITE_BYTES}
+"""dict: ``/proc/<pid>/io`` fields mapped to usage keys"""
+
+_usage = None
+"""dict: usage recorded since :func:`start`, keyed by span name"""
+
+def start():
+  """Start recording usage. Any current usage is discarded.
+  """
+  global _usage
+  _usage = {}
+
+def stop():
+  """Stop recording usage.
+
+  :return: usage recorded since :func:`start` was called, keyed by
+    span name, or an empty dict if recording was not started
+  :rtype: dict
+  """
+  global _usage
+  if _usage is None:
+    return {}
+  usage = _usage
+  _usage = None
+  return usage
+
+def record(values):
+  """Add the usage of a child process to that recorded for the
+  current :func:`prov_interop.timing.span`. Times and byte counts are
+  summed, and the maximum resident set size kept. If there is no
+  open span then usage is recorded against ``""``. Nothing is
+  recorded if recording was not started or `values` is ``None``.
+
+  :param values: Usage, as returned by :func:`wait`
+  :type values: dict
+  """
+  if _usage is None or values is None:
+    return
+  name = timing.current() or ""
+  totals = _usage.setdefault(name, {PROCESSES: 0})
+  totals[PROCESSES] += 1
+  for (key, value) in values.items():
+    if key == MAX_RSS:
+      totals[key] = max(totals.get(key, 0), value)
+    else:
+      totals[key] = totals.get(key, 0) + value
+
+def read_proc_io(pid):
+  """Read the I/O counts of a process from ``/proc/<pid>/io``.
+
+  :param pid: Process ID
+  :type pid: int
+  :return: counts keyed by usage key, or an empty dict if unavailable
+  :rtype: dict
+  """
+  counts = {}
+  try:
+    with open("/proc/" + str(pid) + "/io", "r") as f:
+      for line in f:
+        (field, _, value) = line.partition(":")
+        if field in PROC_IO:
+          counts[PROC_IO[field]] = int(value)
+  except (IOError, OSError, ValueError):
+    return {}
+  return counts
+
+def wait(process):
+  """Wait for a child process to exit and get its resource
+  usage. Where ``os.waitid`` is available, the process is waited for
+  without being reaped, so its ``/proc/<pid>/io`` can still be read,
+  then it is reaped using ``os.wait4``, which provides its CPU times
+  and peak resident set size. The usage includes that of any
+  descendants the process itself waited for. If ``os.wait4`` is not
+  available, then the process is waited for as usual.
+
+  :param process: Process
+  :type process: :class:`subprocess.Popen`
+  :return: exit code and usage, or ``None`` if not available
+  :rtype: tuple of (int, dict)
+  """
+  if not hasattr(os, "wait4"):
+    return (process.wait(), None)
+  io_counts = {}
+  if hasattr(os, "waitid") and hasattr(os, "WNOWAIT"):
+    os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+    io_counts = read_proc_io(process.pid)
+  (_, status, rusage) = os.wait4(process.pid, 0)
+  if os.WIFSIGNALED(status):
+    process.returncode = -os.WTERMSIG(status)
+  else:
+    process.returncode = os.WEXITSTATUS(status)
+  max_rss = rusage.ru_maxrss
+  if sys.platform == "darwin":
+    max_rss = max_rss // 1024
+  values = {UTIME: rusage.ru_utime,
+            STIME: rusage.ru_stime,
+            MAX_RSS: max_rss}
+  values.update(io_counts)
+  return (process.returncode, values)